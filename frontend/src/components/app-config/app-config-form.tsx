@@ -18,6 +18,7 @@ import {
 } from "../../core/config/config-schema";
 import { Input } from "../ui/input";
 import { NativeSelect } from "../ui/native-select";
+import { Checkbox } from "../ui/checkbox";
 import { useAppConfig } from "@/core/config/config";
 import { saveAppConfig } from "@/core/network/requests";
 import { SettingTitle, SettingDescription } from "./common";
@@ -112,6 +113,33 @@ export const AppConfigForm: React.FC = () => {
             </div>
           )}
         />
+        <FormField
+          control={form.control}
+          name="defer_offscreen_cells"
+          render={({ field }) => (
+            <div className="flex flex-col gap-y-1">
+              <FormItem className="flex flex-row items-start space-x-2 space-y-0">
+                <FormControl>
+                  <Checkbox
+                    data-testid="defer-offscreen-cells-checkbox"
+                    checked={field.value}
+                    disabled={field.disabled}
+                    onCheckedChange={(checked) => {
+                      field.onChange(Boolean(checked));
+                    }}
+                  />
+                </FormControl>
+                <FormLabel className="font-normal">
+                  Defer offscreen cells
+                </FormLabel>
+              </FormItem>
+              <FormDescription>
+                When running as an app, cells only run once their outputs are
+                scrolled into view, or when a visible cell needs them.
+              </FormDescription>
+            </div>
+          )}
+        />
       </form>
     </Form>
   );
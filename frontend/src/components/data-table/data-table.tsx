@@ -35,6 +35,19 @@ interface DataTableProps<TData> extends Partial<DownloadActionProps> {
   selection?: "single" | "multi" | null;
   rowSelection?: RowSelectionState;
   onRowSelectionChange?: OnChangeFn<RowSelectionState>;
+  manual?: DataTableManualProps;
+}
+
+/**
+ * Pagination and sorting done by the caller (e.g. in the kernel): `data` is
+ * the current page
+ */
+export interface DataTableManualProps {
+  totalRows: number;
+  paginationState: PaginationState;
+  setPaginationState: OnChangeFn<PaginationState>;
+  sorting: SortingState;
+  setSorting: OnChangeFn<SortingState>;
 }
 
 const DataTableInternal = <TData,>({
@@ -47,6 +60,7 @@ const DataTableInternal = <TData,>({
   downloadAs,
   pagination = false,
   onRowSelectionChange,
+  manual,
 }: DataTableProps<TData>) => {
   const [sorting, setSorting] = React.useState<SortingState>([]);
   const [paginationState, setPaginationState] = React.useState<PaginationState>(
@@ -58,18 +72,33 @@ const DataTableInternal = <TData,>({
     columns,
     getCoreRowModel: getCoreRowModel(),
     // pagination
-    onPaginationChange: setPaginationState,
-    getPaginationRowModel: pagination ? getPaginationRowModel() : undefined,
+    onPaginationChange: manual?.setPaginationState ?? setPaginationState,
+    getPaginationRowModel:
+      pagination && !manual ? getPaginationRowModel() : undefined,
+    manualPagination: !!manual,
+    rowCount: manual?.totalRows,
     // sorting
-    onSortingChange: setSorting,
-    getSortedRowModel: getSortedRowModel(),
+    onSortingChange: manual?.setSorting ?? setSorting,
+    getSortedRowModel: manual ? undefined : getSortedRowModel(),
+    manualSorting: !!manual,
     // selection
     onRowSelectionChange: onRowSelectionChange,
+    // rows of a page are identified by their position in all rows
+    getRowId: manual
+      ? (_row, index) =>
+          String(
+            manual.paginationState.pageIndex *
+              manual.paginationState.pageSize +
+              index,
+          )
+      : undefined,
     state: {
-      sorting,
-      pagination: pagination
-        ? { ...paginationState, pageSize: pageSize }
-        : { pageIndex: 0, pageSize: data.length },
+      sorting: manual?.sorting ?? sorting,
+      pagination: manual
+        ? manual.paginationState
+        : pagination
+          ? { ...paginationState, pageSize: pageSize }
+          : { pageIndex: 0, pageSize: data.length },
       rowSelection,
     },
   });
@@ -9,6 +9,9 @@ import {
 
 import { Button } from "@/components/ui/button";
 
+// Above this many pages, the page is entered instead of picked
+const MAX_PAGE_OPTIONS = 1000;
+
 interface DataTablePaginationProps<TData> {
   table: Table<TData>;
 }
@@ -20,9 +23,11 @@ export const DataTablePagination = <TData,>({
     const selected = table.getSelectedRowModel().rows.length;
     const isAllSelected = table.getIsAllRowsSelected();
     const isAllPageSelected = table.getIsAllPageRowsSelected();
-    const count = table.getFilteredRowModel().rows.length;
+    const count = table.getRowCount();
+    // Only the current page is loaded when paginating in the kernel
+    const canSelectAll = !table.options.manualPagination;
 
-    if (isAllPageSelected && !isAllSelected) {
+    if (isAllPageSelected && !isAllSelected && canSelectAll) {
       return (
         <span>
           {prettyNumber(selected)} selected
@@ -90,18 +95,35 @@ export const DataTablePagination = <TData,>({
         </Button>
         <div className="flex items-center justify-center text-xs font-medium gap-1">
           <span>Page</span>
-          <select
-            className="cursor-pointer border rounded"
-            value={currentPage}
-            data-testid="page-select"
-            onChange={(e) => table.setPageIndex(Number(e.target.value) - 1)}
-          >
-            {Array.from({ length: totalPages }, (_, i) => (
-              <option key={i} value={i + 1}>
-                {i + 1}
-              </option>
-            ))}
-          </select>
+          {totalPages > MAX_PAGE_OPTIONS ? (
+            <input
+              type="number"
+              className="border rounded w-16"
+              min={1}
+              max={totalPages}
+              value={currentPage}
+              data-testid="page-input"
+              onChange={(e) => {
+                const page = Number(e.target.value);
+                if (page >= 1 && page <= totalPages) {
+                  table.setPageIndex(page - 1);
+                }
+              }}
+            />
+          ) : (
+            <select
+              className="cursor-pointer border rounded"
+              value={currentPage}
+              data-testid="page-select"
+              onChange={(e) => table.setPageIndex(Number(e.target.value) - 1)}
+            >
+              {Array.from({ length: totalPages }, (_, i) => (
+                <option key={i} value={i + 1}>
+                  {i + 1}
+                </option>
+              ))}
+            </select>
+          )}
           <span className="flex-shrink-0">of {prettyNumber(totalPages)}</span>
         </div>
         <Button
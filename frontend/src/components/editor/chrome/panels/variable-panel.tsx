@@ -2,13 +2,17 @@
 import { VariableTable } from "@/components/variables/variables-table";
 import { useCellIds } from "@/core/cells/cells";
 import { useVariables } from "@/core/variables/state";
-import React from "react";
+import React, { useEffect } from "react";
 import { PanelEmptyState } from "./empty-state";
 import { FunctionSquareIcon } from "lucide-react";
+import { useDebounce } from "@/hooks/useDebounce";
+import { previewVariableValues } from "@/core/network/requests";
+import { VariableName, Variables } from "@/core/variables/types";
 
 export const VariablePanel: React.FC = () => {
   const variables = useVariables();
   const cellIds = useCellIds();
+  usePreviewVariableValues(variables);
 
   if (Object.keys(variables).length === 0) {
     return (
@@ -24,3 +28,25 @@ export const VariablePanel: React.FC = () => {
     <VariableTable className="flex-1" cellIds={cellIds} variables={variables} />
   );
 };
+
+/**
+ * The kernel only sends the types of variables; request previews of their
+ * values while the panel is open.
+ */
+function usePreviewVariableValues(variables: Variables) {
+  const pending = Object.values(variables)
+    .filter((v) => v.dataType != null && v.value == null)
+    .map((v) => v.name)
+    .sort()
+    .join(",");
+  // Wait for cells to finish running before requesting
+  const debouncedPending = useDebounce(pending, 200);
+
+  useEffect(() => {
+    if (!debouncedPending) {
+      return;
+    }
+    const names = debouncedPending.split(",") as VariableName[];
+    void previewVariableValues({ names });
+  }, [debouncedPending]);
+}
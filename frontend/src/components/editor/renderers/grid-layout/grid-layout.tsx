@@ -4,6 +4,7 @@ import React, {
   memo,
   useEffect,
   useMemo,
+  useRef,
   useState,
 } from "react";
 import { Responsive, WidthProvider } from "react-grid-layout";
@@ -18,6 +19,7 @@ import { CellId } from "@/core/cells/ids";
 import { AppMode } from "@/core/mode";
 import { TinyCode } from "@/components/editor/cell/TinyCode";
 import { cn } from "@/utils/cn";
+import { useRunWhenVisible } from "../useRunWhenVisible";
 import {
   AlignEndVerticalIcon,
   AlignHorizontalSpaceAroundIcon,
@@ -56,8 +58,10 @@ export const GridLayoutRenderer: React.FC<Props> = ({
   setLayout,
   cells,
   mode,
+  appConfig,
 }) => {
   const isReading = mode === "read";
+  const deferOffscreen = isReading && Boolean(appConfig.defer_offscreen_cells);
   const inGridIds = new Set(layout.cells.map((cell) => cell.i));
   const [droppingItem, setDroppingItem] = useState<{
     i: string;
@@ -217,6 +221,7 @@ export const GridLayoutRenderer: React.FC<Props> = ({
               isScrollable={isScrollable}
               side={side}
               hidden={cell.errored || cell.interrupted || cell.stopped}
+              deferOffscreen={deferOffscreen}
             />
           );
 
@@ -348,6 +353,7 @@ interface GridCellProps extends Pick<CellRuntimeState, "output" | "status"> {
   hidden: boolean;
   isScrollable: boolean;
   side?: GridLayoutCellSide;
+  deferOffscreen?: boolean;
 }
 
 const GridCell = memo(
@@ -361,8 +367,11 @@ const GridCell = memo(
     isScrollable,
     side,
     className,
+    deferOffscreen = false,
   }: GridCellProps) => {
     const loading = status === "running" || status === "queued";
+    const cellRef = useRef<HTMLDivElement>(null);
+    useRunWhenVisible(cellRef, cellId, deferOffscreen);
 
     const isOutputEmpty = output == null || output.data === "";
     // If not reading, show code when there is no output
@@ -372,6 +381,7 @@ const GridCell = memo(
 
     return (
       <div
+        ref={cellRef}
         className={cn(
           className,
           "h-full w-full p-2 overflow-x-auto",
@@ -0,0 +1,76 @@
+/* Copyright 2024 Marimo. All rights reserved. */
+import { RefObject, useEffect } from "react";
+import { atom, useAtomValue } from "jotai";
+import { CellId } from "@/core/cells/ids";
+import { sendRunVisible } from "@/core/network/requests";
+import { store } from "@/core/state/jotai";
+
+// Cells are reported once per kernel; cells that enter the viewport
+// together are batched into a single request.
+const reported = new Set<CellId>();
+const pending = new Set<CellId>();
+let timeout: ReturnType<typeof setTimeout> | undefined;
+
+// Bumped when a new kernel is ready, so that visible cells are observed
+// and reported again
+const kernelEpochAtom = atom(0);
+
+function reportVisible(cellId: CellId) {
+  if (reported.has(cellId)) {
+    return;
+  }
+  reported.add(cellId);
+  pending.add(cellId);
+  if (timeout === undefined) {
+    timeout = setTimeout(() => {
+      const cellIds = [...pending];
+      pending.clear();
+      timeout = undefined;
+      void sendRunVisible({ cell_ids: cellIds });
+    }, 50);
+  }
+}
+
+/**
+ * Forget the cells reported to the previous kernel.
+ *
+ * Called when a kernel is ready, since a new (or restarted) kernel defers
+ * its cells again.
+ */
+export function resetRunWhenVisible() {
+  reported.clear();
+  pending.clear();
+  if (timeout !== undefined) {
+    clearTimeout(timeout);
+    timeout = undefined;
+  }
+  store.set(kernelEpochAtom, (epoch) => epoch + 1);
+}
+
+/**
+ * Report a cell to the kernel once its output enters the viewport, so that
+ * the kernel runs it if it was deferred.
+ *
+ * Only used in apps that defer offscreen cells.
+ */
+export function useRunWhenVisible(
+  ref: RefObject<HTMLElement>,
+  cellId: CellId,
+  enabled: boolean,
+) {
+  const kernelEpoch = useAtomValue(kernelEpochAtom);
+  useEffect(() => {
+    const element = ref.current;
+    if (!enabled || !element || reported.has(cellId)) {
+      return;
+    }
+    const observer = new IntersectionObserver((entries) => {
+      if (entries.some((entry) => entry.isIntersecting)) {
+        reportVisible(cellId);
+        observer.disconnect();
+      }
+    });
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, [ref, cellId, enabled, kernelEpoch]);
+}
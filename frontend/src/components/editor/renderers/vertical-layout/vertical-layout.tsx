@@ -15,6 +15,7 @@ import { Button } from "@/components/ui/button";
 import { outputIsStale } from "@/core/cells/cell";
 import { isStaticNotebook } from "@/core/static/static-state";
 import { ConsoleOutput } from "@/components/editor/output/ConsoleOutput";
+import { useRunWhenVisible } from "../useRunWhenVisible";
 
 type VerticalLayout = null;
 type VerticalLayoutProps = ICellRendererProps<VerticalLayout>;
@@ -43,6 +44,8 @@ const VerticalLayoutRenderer: React.FC<VerticalLayoutProps> = ({
   };
 
   const canShowCode = evaluateCanShowCode();
+  const deferOffscreen =
+    mode === "read" && Boolean(appConfig.defer_offscreen_cells);
 
   return (
     <VerticalLayoutWrapper invisible={invisible} appConfig={appConfig}>
@@ -63,6 +66,7 @@ const VerticalLayoutRenderer: React.FC<VerticalLayoutProps> = ({
           interrupted={cell.interrupted}
           staleInputs={cell.staleInputs}
           name={cell.name}
+          deferOffscreen={deferOffscreen}
         />
       ))}
       {canShowCode && (
@@ -108,6 +112,10 @@ interface VerticalCellProps
   mode: AppMode;
   showCode: boolean;
   name: string;
+  /**
+   * Whether the kernel defers the cell until its output is visible.
+   */
+  deferOffscreen: boolean;
 }
 
 const VerticalCell = memo(
@@ -126,8 +134,10 @@ const VerticalCell = memo(
     showCode,
     mode,
     name,
+    deferOffscreen,
   }: VerticalCellProps) => {
     const cellRef = useRef<HTMLDivElement>(null);
+    useRunWhenVisible(cellRef, cellId, deferOffscreen);
 
     const outputStale = outputIsStale(
       {
@@ -145,6 +155,10 @@ const VerticalCell = memo(
       interactive: mode === "edit",
       "has-error": errored,
       stopped: stopped,
+      // Cells that are deferred (and marked stale) or haven't run yet take
+      // up space, so that only the cells in view are reported as visible;
+      // cells that ran with an empty output don't
+      "min-h-[4rem]": deferOffscreen && (staleInputs || output == null),
     });
 
     const HTMLId = HTMLCellId.create(cellId);
@@ -1,6 +1,6 @@
 /* Copyright 2024 Marimo. All rights reserved. */
 import { expect, describe, it } from "vitest";
-import { outputIsStale } from "../cell";
+import { appendToOutput, outputIsStale } from "../cell";
 import { CellStatus } from "../types";
 import { OutputMessage } from "@/core/kernel/messages";
 import { Seconds } from "@/utils/time";
@@ -172,3 +172,23 @@ describe("outputIsStale", () => {
     expect(outputIsStale(cell, edited)).toBe(false);
   });
 });
+
+describe("appendToOutput", () => {
+  function createHtmlOutput(data: string, timestamp: number): OutputMessage {
+    return { channel: "output", mimetype: "text/html", data, timestamp };
+  }
+
+  it("should insert the item before the stack's closing tag", () => {
+    const output = createHtmlOutput("<div><div>a</div></div>", 1);
+    const item = createHtmlOutput("<div>b</div>", 2);
+    expect(appendToOutput(output, item)).toEqual(
+      createHtmlOutput("<div><div>a</div><div>b</div></div>", 2),
+    );
+  });
+
+  it("should use the item if there is no stack", () => {
+    const item = createHtmlOutput("<div>b</div>", 2);
+    expect(appendToOutput(null, item)).toBe(item);
+    expect(appendToOutput(createOutput(), item)).toBe(item);
+  });
+});
@@ -58,6 +58,9 @@ export function transitionCell(
   }
 
   nextCell.output = message.output ?? nextCell.output;
+  if (message.output_append) {
+    nextCell.output = appendToOutput(nextCell.output, message.output_append);
+  }
   nextCell.staleInputs = message.stale_inputs ?? nextCell.staleInputs;
   nextCell.status = message.status ?? nextCell.status;
 
@@ -126,6 +129,36 @@ export function transitionCell(
   return nextCell;
 }
 
+// Closing tag of an output built with mo.output.append; appended items are
+// inserted right before it.
+const STACK_CLOSING_TAG = "</div>";
+
+/**
+ * Append an item to an output that is a stack of items.
+ */
+export function appendToOutput(
+  output: OutputMessage | null,
+  item: OutputMessage,
+): OutputMessage {
+  if (
+    output === null ||
+    typeof output.data !== "string" ||
+    typeof item.data !== "string" ||
+    !output.data.endsWith(STACK_CLOSING_TAG)
+  ) {
+    // Not a stack; shouldn't happen, but keep the new item
+    return item;
+  }
+  return {
+    ...output,
+    data:
+      output.data.slice(0, -STACK_CLOSING_TAG.length) +
+      item.data +
+      STACK_CLOSING_TAG,
+    timestamp: item.timestamp,
+  } as OutputMessage;
+}
+
 // Should be called when a cell's code is registered with the kernel for
 // execution.
 export function prepareCellForExecution(
@@ -6,6 +6,7 @@ test("default AppConfig", () => {
   const defaultConfig = AppConfigSchema.parse({});
   expect(defaultConfig).toMatchInlineSnapshot(`
   {
+    "defer_offscreen_cells": false,
     "width": "normal",
   }
   `);
@@ -19,6 +20,7 @@ test("another AppConfig", () => {
   expect(config).toMatchInlineSnapshot(`
     {
       "app_title": null,
+      "defer_offscreen_cells": false,
       "width": "medium",
     }
   `);
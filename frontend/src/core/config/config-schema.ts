@@ -52,6 +52,7 @@ export const UserConfigSchema = z
         auto_instantiate: z.boolean().default(true),
         on_cell_change: z.enum(["lazy", "autorun"]).default("autorun"),
         auto_reload: z.enum(["off", "lazy", "autorun"]).default("off"),
+        auto_lazy_threshold: z.number().nonnegative().optional(),
       })
       .default({}),
     display: z
@@ -112,6 +113,7 @@ export const AppConfigSchema = z
   .object({
     width: z.enum(APP_WIDTHS).default("normal"),
     app_title: AppTitleSchema.nullish(),
+    defer_offscreen_cells: z.boolean().default(false),
   })
   .default({ width: "normal" });
 export type AppConfig = z.infer<typeof AppConfigSchema>;
@@ -15,6 +15,24 @@ interface IUIElement extends HTMLElement {
   reset(): void;
 }
 
+/**
+ * Whether UI elements are read-only, e.g. for viewers of a shared session.
+ */
+let readOnly = false;
+
+/**
+ * Make all UI elements, including those rendered later, read-only (or
+ * interactive again).
+ */
+export function setUIElementsReadOnly(value: boolean) {
+  readOnly = value;
+  document
+    .querySelectorAll<HTMLElement>(UI_ELEMENT_TAG_NAME.toLowerCase())
+    .forEach((element) => {
+      element.inert = value;
+    });
+}
+
 /**
  * Lazily initialize the UIElement component.
  */
@@ -133,6 +151,8 @@ export function initializeUIElement() {
         const objectId = UIElementId.parseOrThrow(this);
         const child = this.firstElementChild as HTMLElement;
         UI_ELEMENT_REGISTRY.registerInstance(objectId, child);
+        // Read-only elements can't be focused or interacted with
+        this.inert = readOnly;
 
         // Listen to marimo input events provided by the child element: these
         // events are signals to this UIElement that our value should change.
@@ -119,6 +119,10 @@ export class IslandsPyodideBridge implements RunRequests, EditRequests {
     await this.putControlRequest(request);
     return null;
   };
+  sendRunVisible = async (): Promise<null> => {
+    // Islands don't defer cells
+    return null;
+  };
   sendRun = async (cellIds: CellId[], codes: string[]): Promise<null> => {
     await this.rpc.proxy.request.loadPackages(codes.join("\n"));
 
@@ -140,6 +144,8 @@ export class IslandsPyodideBridge implements RunRequests, EditRequests {
   sendFormat = throwNotImplemented;
   sendDeleteCell = throwNotImplemented;
   sendInstallMissingPackages = throwNotImplemented;
+  previewVariableValues = throwNotImplemented;
+  planExecution = throwNotImplemented;
   sendCodeCompletionRequest = throwNotImplemented;
   saveUserConfig = throwNotImplemented;
   saveAppConfig = throwNotImplemented;
@@ -26,6 +26,7 @@ import { Functions } from "@/utils/functions";
 import { defineCustomElement } from "../dom/defineCustomElement";
 import { MarimoIslandElement } from "./components/web-components";
 import { RuntimeState } from "../kernel/RuntimeState";
+import type { OperationMessage } from "../kernel/messages";
 import { sendComponentValues } from "../network/requests";
 
 /**
@@ -51,14 +52,13 @@ export async function initialize() {
     store.set(notebookAtom, (state) => notebookReducer(state, action));
   });
 
-  // Consume messages from the kernel
-  IslandsPyodideBridge.INSTANCE.consumeMessages((message) => {
-    const msg = jsonParseWithSpecialChar(message);
+  const handleOperation = (msg: OperationMessage) => {
     switch (msg.op) {
       case "banner":
       case "missing-package-alert":
       case "installing-package-alert":
       case "completion-result":
+      case "execution-plan":
       case "reload":
         // Unsupported
         return;
@@ -75,6 +75,7 @@ export async function initialize() {
         defineCustomElement(MarimoIslandElement.tagName, MarimoIslandElement);
         return;
       case "completed-run":
+      case "virtual-file-usage":
         return;
       case "interrupted":
         return;
@@ -112,9 +113,17 @@ export async function initialize() {
       case "query-params-clear":
         queryParamHandlers.clear();
         return;
+      case "batch":
+        msg.data.messages.forEach(handleOperation);
+        return;
       default:
         logNever(msg);
     }
+  };
+
+  // Consume messages from the kernel
+  IslandsPyodideBridge.INSTANCE.consumeMessages((message) => {
+    handleOperation(jsonParseWithSpecialChar(message));
   });
 
   // Start the runtime
@@ -0,0 +1,20 @@
+/* Copyright 2024 Marimo. All rights reserved. */
+
+import { planExecution } from "@/core/network/requests";
+import { ExecutionPlanMessage } from "./messages";
+import { DeferredRequestRegistry } from "../network/DeferredRequestRegistry";
+import { ExecutionPlanRequest } from "../network/types";
+
+/**
+ * Plans of the cells that an edit or UI element update would run, without
+ * running anything.
+ */
+export const EXECUTION_PLANS = new DeferredRequestRegistry<
+  Omit<ExecutionPlanRequest, "plan_id">,
+  ExecutionPlanMessage
+>("execution-plan", async (requestId, req) => {
+  await planExecution({
+    plan_id: requestId,
+    ...req,
+  });
+});
@@ -9,6 +9,8 @@ import { LayoutType } from "@/components/editor/renderers/types";
 import { AppConfig } from "../config/config-schema";
 import { CellData, createCell } from "../cells/types";
 import { VirtualFileTracker } from "../static/virtual-file-tracker";
+import { resetRunWhenVisible } from "@/components/editor/renderers/useRunWhenVisible";
+import { setUIElementsReadOnly } from "../dom/ui-element";
 
 export type OperationMessageData<T extends OperationMessage["op"]> = Extract<
   OperationMessage,
@@ -41,8 +43,14 @@ export function handleKernelReady(
     cell_ids,
     last_executed_code = {},
     app_config,
+    viewer = false,
   } = data;
 
+  // The kernel defers offscreen cells anew
+  resetRunWhenVisible();
+  // The kernel refuses interactions from viewers of a shared session
+  setUIElementsReadOnly(viewer);
+
   // Set the layout, initial codes, cells
   const cells = codes.map((code, i) => {
     const cellId = cell_ids[i];
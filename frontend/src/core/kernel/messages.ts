@@ -92,6 +92,11 @@ export interface CellMessage {
    * The output of the cell, if any
    */
   output: OutputMessage | null;
+  /**
+   * HTML to append to the cell's output, which is a stack of items built
+   * with `mo.output.append`; only the new item is sent
+   */
+  output_append?: OutputMessage | null;
   /**
    * The console output of the cell, if any
    */
@@ -145,6 +150,26 @@ export interface HumanReadableStatus {
 /**
  * Message for function call results
  */
+export interface ExecutionPlanMessage {
+  /**
+   * The ID of the plan request
+   */
+  plan_id: RequestId;
+  /**
+   * Cells that would run, in order, with the duration of their last run in
+   * seconds (null if they haven't run)
+   */
+  cells: Array<{ cell_id: CellId; estimated_duration: number | null }>;
+  /**
+   * Cells that would be marked stale instead of run
+   */
+  deferred: CellId[];
+  /**
+   * Sum of the estimated durations, in seconds
+   */
+  estimated_duration: number;
+}
+
 export interface FunctionCallResultMessage {
   /**
    * The ID of the function call
@@ -223,11 +248,25 @@ export type OperationMessage =
          * App config
          */
         app_config: AppConfig;
+        /**
+         * Whether this page is a read-only viewer of a shared session
+         */
+        viewer?: boolean;
       };
     }
   | {
       op: "completed-run";
     }
+  | {
+      op: "virtual-file-usage";
+      data: {
+        memory_bytes: number;
+        memory_files: number;
+        spilled_bytes: number;
+        spilled_files: number;
+        spills: number;
+      };
+    }
   | {
       op: "reload";
     }
@@ -251,6 +290,10 @@ export type OperationMessage =
       op: "function-call-result";
       data: FunctionCallResultMessage;
     }
+  | {
+      op: "execution-plan";
+      data: ExecutionPlanMessage;
+    }
   | {
       op: "cell-op";
       data: CellMessage;
@@ -271,7 +314,10 @@ export type OperationMessage =
         variables: Array<{
           name: VariableName;
           datatype?: string;
-          value?: string;
+          /**
+           * Preview of the value; null until requested
+           */
+          value?: string | null;
         }>;
       };
     }
@@ -334,4 +380,17 @@ export type OperationMessage =
         variant?: "danger";
         action?: "restart";
       };
+    }
+  | {
+      // messages sent together, to be handled in order
+      op: "batch";
+      data: {
+        messages: OperationMessage[];
+      };
     };
+
+/**
+ * Messages from the kernel are numbered, so that the frontend can resume
+ * after reconnecting without receiving every message again.
+ */
+export type SequencedOperationMessage = OperationMessage & { seq?: number };
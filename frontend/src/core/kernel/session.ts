@@ -37,3 +37,24 @@ const sessionId = (() => {
 export function getSessionId(): SessionId {
   return sessionId;
 }
+
+const SESSION_ID_STORAGE_KEY = "marimo:session_id";
+
+/**
+ * The id of the session this tab had before the page was refreshed, so that
+ * the server can hand the owner of a shared session back their session.
+ */
+const previousSessionId = (() => {
+  try {
+    const id = sessionStorage.getItem(SESSION_ID_STORAGE_KEY);
+    sessionStorage.setItem(SESSION_ID_STORAGE_KEY, sessionId);
+    return isSessionId(id) && id !== sessionId ? id : null;
+  } catch {
+    // sessionStorage is not available, e.g. in sandboxed iframes
+    return null;
+  }
+})();
+
+export function getPreviousSessionId(): SessionId | null {
+  return previousSessionId;
+}
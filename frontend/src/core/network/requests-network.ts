@@ -19,6 +19,9 @@ import type {
   EditRequests,
   SendStdin,
   SendInstallMissingPackages,
+  PreviewVariableValuesRequest,
+  ExecutionPlanRequest,
+  RunVisibleRequest,
   FileListResponse,
   FileCreateRequest,
   FileOperationResponse,
@@ -140,6 +143,9 @@ export function createNetworkRequests(): EditRequests & RunRequests {
     sendFunctionRequest: (request) => {
       return API.post<SendFunctionRequest>("/kernel/function_call", request);
     },
+    sendRunVisible: (request) => {
+      return API.post<RunVisibleRequest>("/kernel/run_visible", request);
+    },
     sendStdin: (request) => {
       return API.post<SendStdin>("/kernel/stdin", request);
     },
@@ -149,6 +155,15 @@ export function createNetworkRequests(): EditRequests & RunRequests {
         request,
       );
     },
+    previewVariableValues: (request) => {
+      return API.post<PreviewVariableValuesRequest>(
+        "/kernel/preview_variable_values",
+        request,
+      );
+    },
+    planExecution: (request) => {
+      return API.post<ExecutionPlanRequest>("/kernel/plan_execution", request);
+    },
     readCode: () => {
       return API.post<{}, { contents: string }>("/kernel/read_code", {});
     },
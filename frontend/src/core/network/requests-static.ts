@@ -36,6 +36,10 @@ export function createStaticRequests(): EditRequests & RunRequests {
       Logger.log("Function requests are not supported in static mode");
       return null;
     },
+    sendRunVisible: async () => {
+      // Static notebooks have no deferred cells
+      return null;
+    },
     sendRestart: throwNotInEditMode,
     sendRun: throwNotInEditMode,
     sendRename: throwNotInEditMode,
@@ -60,6 +64,8 @@ export function createStaticRequests(): EditRequests & RunRequests {
     sendUpdateFile: throwNotInEditMode,
     sendFileDetails: throwNotInEditMode,
     sendInstallMissingPackages: throwNotInEditMode,
+    previewVariableValues: throwNotInEditMode,
+    planExecution: throwNotInEditMode,
     getRecentFiles: throwNotInEditMode,
     getWorkspaceFiles: throwNotInEditMode,
     getRunningNotebooks: throwNotInEditMode,
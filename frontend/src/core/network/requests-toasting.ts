@@ -12,6 +12,7 @@ export function createErrorToastingRequests(
     sendComponentValues: "Failed update value",
     sendInstantiate: "Failed to instantiate",
     sendFunctionRequest: "Failed to send function request",
+    sendRunVisible: "Failed to run visible cells",
     sendRestart: "Failed to restart",
     sendRun: "Failed to run",
     sendRename: "Failed to rename",
@@ -36,6 +37,8 @@ export function createErrorToastingRequests(
     sendUpdateFile: "Failed to update file",
     sendFileDetails: "Failed to get file details",
     sendInstallMissingPackages: "Failed to install missing packages",
+    previewVariableValues: "Failed to fetch variable values",
+    planExecution: "Failed to plan execution",
     getRecentFiles: "Failed to get recent files",
     getWorkspaceFiles: "Failed to get workspace files",
     getRunningNotebooks: "Failed to get running notebooks",
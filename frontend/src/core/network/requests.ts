@@ -42,7 +42,10 @@ export const {
   saveAppConfig,
   saveCellConfig,
   sendFunctionRequest,
+  sendRunVisible,
   sendInstallMissingPackages,
+  previewVariableValues,
+  planExecution,
   readCode,
   readSnippets,
   openFile,
@@ -7,6 +7,7 @@ import { RequestId } from "./DeferredRequestRegistry";
 import { FilePath } from "@/utils/paths";
 import { PackageManagerName } from "../config/config-schema";
 import { SessionId } from "@/core/kernel/session";
+import { VariableName } from "../variables/types";
 
 // Ideally this would be generated from server.py, but for now we just
 // manually keep them in sync.
@@ -101,6 +102,26 @@ export interface SendInstallMissingPackages {
   manager: PackageManagerName;
 }
 
+export interface RunVisibleRequest {
+  cell_ids: CellId[];
+}
+
+export interface ExecutionPlanRequest {
+  plan_id: RequestId;
+  /**
+   * Cells that would be edited or run
+   */
+  execution_requests?: Array<{ cell_id: CellId; code: string }>;
+  /**
+   * UI elements whose values would be set
+   */
+  ui_element_ids?: string[];
+}
+
+export interface PreviewVariableValuesRequest {
+  names: VariableName[];
+}
+
 export interface ValueUpdate {
   objectId: string;
   value: unknown;
@@ -231,6 +252,7 @@ export interface RunRequests {
   sendComponentValues: (valueUpdates: ValueUpdate[]) => Promise<null>;
   sendInstantiate: (request: InstantiateRequest) => Promise<null>;
   sendFunctionRequest: (request: SendFunctionRequest) => Promise<null>;
+  sendRunVisible: (request: RunVisibleRequest) => Promise<null>;
 }
 
 /**
@@ -253,6 +275,10 @@ export interface EditRequests {
   sendInstallMissingPackages: (
     request: SendInstallMissingPackages,
   ) => Promise<null>;
+  previewVariableValues: (
+    request: PreviewVariableValuesRequest,
+  ) => Promise<null>;
+  planExecution: (request: ExecutionPlanRequest) => Promise<null>;
   readCode: () => Promise<{ contents: string }>;
   readSnippets: () => Promise<SnippetsResponse>;
   openFile: (request: { path: string }) => Promise<null>;
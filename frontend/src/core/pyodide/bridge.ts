@@ -25,6 +25,9 @@ import type {
   SaveUserConfigRequest,
   SendFunctionRequest,
   SendInstallMissingPackages,
+  PreviewVariableValuesRequest,
+  ExecutionPlanRequest,
+  RunVisibleRequest,
   SendStdin,
   SnippetsResponse,
   ValueUpdate,
@@ -232,6 +235,16 @@ export class PyodideBridge implements RunRequests, EditRequests {
     this.putControlRequest(request);
     return null;
   };
+  previewVariableValues = async (
+    request: PreviewVariableValuesRequest,
+  ): Promise<null> => {
+    this.putControlRequest(request);
+    return null;
+  };
+  planExecution = async (request: ExecutionPlanRequest): Promise<null> => {
+    this.putControlRequest(request);
+    return null;
+  };
   sendCodeCompletionRequest = async (
     request: CodeCompletionRequest,
   ): Promise<null> => {
@@ -338,6 +351,11 @@ export class PyodideBridge implements RunRequests, EditRequests {
     return null;
   };
 
+  sendRunVisible = async (request: RunVisibleRequest): Promise<null> => {
+    await this.putControlRequest(request);
+    return null;
+  };
+
   sendCreateFileOrFolder = async (
     request: FileCreateRequest,
   ): Promise<FileOperationResponse> => {
@@ -45,4 +45,26 @@ describe("createWsUrl", () => {
     const url = new URL(result);
     expect(url.searchParams.get("session_id")).toBe(sessionId);
   });
+
+  it("should include the last sequence number when reconnecting", () => {
+    Object.defineProperty(document, "baseURI", {
+      value: "http://marimo.app",
+      writable: true,
+    });
+
+    const result = createWsUrl("1234", 42);
+    expect(result).toBe("ws://marimo.app/ws?session_id=1234&last_seq=42");
+  });
+
+  it("should include the previous session id after a refresh", () => {
+    Object.defineProperty(document, "baseURI", {
+      value: "http://marimo.app",
+      writable: true,
+    });
+
+    const result = createWsUrl("1234", undefined, "5678");
+    expect(result).toBe(
+      "ws://marimo.app/ws?session_id=1234&previous_session_id=5678",
+    );
+  });
 });
@@ -0,0 +1,61 @@
+/* Copyright 2024 Marimo. All rights reserved. */
+import { describe, expect, it, vi } from "vitest";
+import { createFrameHandler, decodeFrame } from "../frames";
+
+async function compress(text: string): Promise<ArrayBuffer> {
+  const stream = new Blob([text])
+    .stream()
+    .pipeThrough(new CompressionStream("deflate"));
+  return new Response(stream).arrayBuffer();
+}
+
+describe("decodeFrame", () => {
+  it("should return text frames as-is", async () => {
+    expect(await decodeFrame('{"op": "reload"}')).toBe('{"op": "reload"}');
+  });
+
+  it("should decompress binary frames", async () => {
+    const frame = await compress('{"op": "reload"}');
+    expect(await decodeFrame(frame)).toBe('{"op": "reload"}');
+  });
+});
+
+describe("createFrameHandler", () => {
+  it("should handle text frames synchronously", () => {
+    const handle = vi.fn();
+    const handleFrame = createFrameHandler(handle, vi.fn());
+    handleFrame("a");
+    expect(handle).toHaveBeenCalledWith("a");
+  });
+
+  it("should handle frames in order", async () => {
+    const messages: string[] = [];
+    const handleFrame = createFrameHandler(
+      (message) => messages.push(message),
+      vi.fn(),
+    );
+    handleFrame("a");
+    handleFrame(await compress("b"));
+    handleFrame("c");
+    expect(messages).toEqual(["a"]);
+
+    await vi.waitFor(() => expect(messages).toEqual(["a", "b", "c"]));
+  });
+
+  it("should report errors and keep handling frames", async () => {
+    const messages: string[] = [];
+    const onError = vi.fn();
+    const handleFrame = createFrameHandler((message) => {
+      if (message === "bad") {
+        throw new Error("bad");
+      }
+      messages.push(message);
+    }, onError);
+    handleFrame("bad");
+    handleFrame(new ArrayBuffer(1));
+    handleFrame("c");
+
+    await vi.waitFor(() => expect(messages).toEqual(["c"]));
+    expect(onError).toHaveBeenCalledTimes(2);
+  });
+});
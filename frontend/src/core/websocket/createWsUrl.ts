@@ -1,5 +1,15 @@
 /* Copyright 2024 Marimo. All rights reserved. */
-export function createWsUrl(sessionId: string): string {
+/**
+ * @param lastSeq the sequence number of the last message received, when
+ * reconnecting; the server then only sends the messages that were missed.
+ * @param previousSessionId the id of the session before the page was
+ * refreshed, which proves ownership of a shared session.
+ */
+export function createWsUrl(
+  sessionId: string,
+  lastSeq?: number,
+  previousSessionId?: string | null,
+): string {
   const baseURI = document.baseURI;
 
   const url = new URL(baseURI);
@@ -9,6 +19,12 @@ export function createWsUrl(sessionId: string): string {
 
   const searchParams = new URLSearchParams(window.location.search);
   searchParams.set("session_id", sessionId);
+  if (lastSeq !== undefined) {
+    searchParams.set("last_seq", lastSeq.toString());
+  }
+  if (previousSessionId) {
+    searchParams.set("previous_session_id", previousSessionId);
+  }
   url.search = searchParams.toString();
 
   return url.toString();
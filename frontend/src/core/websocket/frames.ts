@@ -0,0 +1,60 @@
+/* Copyright 2024 Marimo. All rights reserved. */
+import { OperationMessage } from "@/core/kernel/messages";
+import { JsonString } from "@/utils/json/base64";
+
+type Frame = string | ArrayBuffer;
+type Message = JsonString<OperationMessage>;
+
+/**
+ * Decode a websocket frame sent by the server.
+ *
+ * Large messages are sent as binary frames, compressed with deflate.
+ */
+export async function decodeFrame(data: Frame): Promise<Message> {
+  if (typeof data === "string") {
+    return data as Message;
+  }
+  const stream = new Blob([data])
+    .stream()
+    .pipeThrough(new DecompressionStream("deflate"));
+  return (await new Response(stream).text()) as Message;
+}
+
+/**
+ * Create a handler for websocket frames that passes their messages to
+ * `handle`, in the order the frames were received.
+ *
+ * Text frames are handled synchronously, unless a binary frame received
+ * before them is still being decoded.
+ */
+export function createFrameHandler(
+  handle: (message: Message) => void,
+  onError: (error: unknown) => void,
+): (data: Frame) => void {
+  let pending: Promise<void> | undefined;
+
+  const handleSafely = (message: Message) => {
+    try {
+      handle(message);
+    } catch (error) {
+      onError(error);
+    }
+  };
+
+  return (data: Frame) => {
+    if (pending === undefined && typeof data === "string") {
+      handleSafely(data as Message);
+      return;
+    }
+
+    const next = (pending ?? Promise.resolve())
+      .then(() => decodeFrame(data))
+      .then(handleSafely, onError);
+    pending = next;
+    void next.then(() => {
+      if (pending === next) {
+        pending = undefined;
+      }
+    });
+  };
+}
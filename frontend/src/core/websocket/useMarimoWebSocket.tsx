@@ -6,7 +6,10 @@ import { useWebSocket } from "@/core/websocket/useWebSocket";
 import { logNever } from "@/utils/assertNever";
 import { useCellActions } from "@/core/cells/cells";
 import { AUTOCOMPLETER } from "@/core/codemirror/completion/Autocompleter";
-import { OperationMessage } from "@/core/kernel/messages";
+import {
+  OperationMessage,
+  SequencedOperationMessage,
+} from "@/core/kernel/messages";
 import { CellData } from "../cells/types";
 import { useErrorBoundary } from "react-error-boundary";
 import { Logger } from "@/utils/Logger";
@@ -15,15 +18,17 @@ import { useVariablesActions } from "../variables/state";
 import { toast } from "@/components/ui/use-toast";
 import { renderHTML } from "@/plugins/core/RenderHTML";
 import { FUNCTIONS_REGISTRY } from "../functions/FunctionRegistry";
+import { EXECUTION_PLANS } from "../kernel/ExecutionPlanRegistry";
 import { prettyError } from "@/utils/errors";
 import { isStaticNotebook } from "../static/static-state";
-import { useRef } from "react";
+import { useRef, useState } from "react";
 import { jsonParseWithSpecialChar } from "@/utils/json/json-parser";
-import { SessionId } from "../kernel/session";
+import { SessionId, getPreviousSessionId } from "../kernel/session";
 import { useBannersActions } from "../errors/state";
 import { useAlertActions } from "../alerts/state";
 import { generateUUID } from "@/utils/uuid";
 import { createWsUrl } from "./createWsUrl";
+import { createFrameHandler } from "./frames";
 import { useSetAppConfig } from "../config/config";
 import {
   handleCellOperation,
@@ -54,8 +59,21 @@ export function useMarimoWebSocket(opts: {
   const { addBanner } = useBannersActions();
   const { addPackageAlert } = useAlertActions();
 
-  const handleMessage = (e: MessageEvent<JsonString<OperationMessage>>) => {
-    const msg = jsonParseWithSpecialChar(e.data);
+  // Sequence number of the last kernel message received
+  const lastSeq = useRef<number | undefined>(undefined);
+
+  const handleMessage = (message: JsonString<OperationMessage>) => {
+    const msg = jsonParseWithSpecialChar<SequencedOperationMessage>(message);
+    if (msg.seq !== undefined) {
+      lastSeq.current = msg.seq;
+    }
+    handleOperation(msg);
+  };
+  // The frame handler is created once, so it calls the latest handler
+  const handleMessageRef = useRef(handleMessage);
+  handleMessageRef.current = handleMessage;
+
+  const handleOperation = (msg: OperationMessage) => {
     switch (msg.op) {
       case "reload":
         window.location.reload();
@@ -71,6 +89,7 @@ export function useMarimoWebSocket(opts: {
         return;
 
       case "completed-run":
+      case "virtual-file-usage":
         return;
       case "interrupted":
         return;
@@ -85,6 +104,9 @@ export function useMarimoWebSocket(opts: {
       case "function-call-result":
         FUNCTIONS_REGISTRY.resolve(msg.data.function_call_id, msg.data);
         return;
+      case "execution-plan":
+        EXECUTION_PLANS.resolve(msg.data.plan_id, msg.data);
+        return;
       case "cell-op":
         handleCellOperation(msg.data, handleCellMessage);
         return;
@@ -103,7 +125,7 @@ export function useMarimoWebSocket(opts: {
           msg.data.variables.map((v) => ({
             name: v.name,
             dataType: v.datatype,
-            value: v.value,
+            value: v.value ?? undefined,
           })),
         );
         return;
@@ -150,11 +172,30 @@ export function useMarimoWebSocket(opts: {
         queryParamHandlers.clear();
         return;
 
+      case "batch":
+        msg.data.messages.forEach(handleOperation);
+        return;
+
       default:
         logNever(msg);
     }
   };
 
+  // Large messages arrive compressed, as binary frames
+  // eslint-disable-next-line react/hook-use-state
+  const [handleFrame] = useState(() =>
+    createFrameHandler(
+      (message) => handleMessageRef.current(message),
+      (error) => {
+        toast({
+          title: "Failed to handle message",
+          description: prettyError(error),
+          variant: "danger",
+        });
+      },
+    ),
+  );
+
   const tryReconnecting = (code?: number, reason?: string) => {
     // If not properly gated, we could try reconnecting forever if the
     // issue is not transient. So we want to try reconnecting only once after an
@@ -170,7 +211,8 @@ export function useMarimoWebSocket(opts: {
     /**
      * Unique URL for this session.
      */
-    url: createWsUrl(sessionId),
+    url: () =>
+      createWsUrl(sessionId, lastSeq.current, getPreviousSessionId()),
 
     /**
      * Open callback. Set the connection status to open.
@@ -185,15 +227,7 @@ export function useMarimoWebSocket(opts: {
      * Message callback. Handle messages sent by the kernel.
      */
     onMessage: (e) => {
-      try {
-        handleMessage(e);
-      } catch (error) {
-        toast({
-          title: "Failed to handle message",
-          description: prettyError(error),
-          variant: "danger",
-        });
-      }
+      handleFrame(e.data);
     },
 
     /**
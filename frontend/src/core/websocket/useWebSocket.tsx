@@ -7,7 +7,10 @@ import { isPyodide } from "../pyodide/utils";
 import { PyodideBridge, PyodideWebsocket } from "../pyodide/bridge";
 
 interface UseWebSocketOptions {
-  url: string;
+  /**
+   * The URL, or a function that returns the URL on each (re)connect.
+   */
+  url: string | (() => string);
   static: boolean;
   onOpen?: (event: WebSocketEventMap["open"]) => void;
   onMessage?: (event: WebSocketEventMap["message"]) => void;
@@ -34,6 +37,8 @@ export function useWebSocket(options: UseWebSocketOptions) {
             maxRetries: 10,
             debug: false,
           });
+    // Binary frames are decoded by the message handler
+    socket.binaryType = "arraybuffer";
 
     onOpen && socket.addEventListener("open", onOpen);
     onClose && socket.addEventListener("close", onClose);
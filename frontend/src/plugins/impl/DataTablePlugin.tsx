@@ -1,7 +1,11 @@
 /* Copyright 2024 Marimo. All rights reserved. */
-import { memo, useMemo } from "react";
+import { memo, useMemo, useRef, useState } from "react";
+import { PaginationState, SortingState } from "@tanstack/react-table";
 import { z } from "zod";
-import { DataTable } from "../../components/data-table/data-table";
+import {
+  DataTable,
+  DataTableManualProps,
+} from "../../components/data-table/data-table";
 import {
   generateColumns,
   generateIndexColumns,
@@ -17,6 +21,7 @@ import { getVegaFieldTypes } from "./vega/utils";
 import { Arrays } from "@/utils/arrays";
 import { Banner } from "./common/error-banner";
 import { prettyNumber } from "@/utils/numbers";
+import { DebouncedInput } from "@/components/ui/input";
 
 /**
  * Arguments for a data table
@@ -27,6 +32,7 @@ import { prettyNumber } from "@/utils/numbers";
 interface Data<T> {
   label: string | null;
   data: T[] | string;
+  lazy: boolean;
   hasMore: boolean;
   totalRows: number;
   pagination: boolean;
@@ -40,6 +46,12 @@ interface Data<T> {
 // eslint-disable-next-line @typescript-eslint/consistent-type-definitions
 type Functions = {
   download_as: (req: { format: "csv" | "json" }) => Promise<string>;
+  search: (req: {
+    query?: string;
+    sort?: { by: string; descending: boolean };
+    page_size: number;
+    page_number: number;
+  }) => Promise<{ data: unknown[] | string; total_rows: number }>;
 };
 
 type S = Array<string | number>;
@@ -50,6 +62,7 @@ export const DataTablePlugin = createPlugin<S>("marimo-table")
       initialValue: z.array(z.number()),
       label: z.string().nullable(),
       data: z.union([z.string(), z.array(z.object({}).passthrough())]),
+      lazy: z.boolean().default(false),
       hasMore: z.boolean().default(false),
       totalRows: z.number(),
       pagination: z.boolean().default(false),
@@ -68,8 +81,35 @@ export const DataTablePlugin = createPlugin<S>("marimo-table")
     download_as: rpc
       .input(z.object({ format: z.enum(["csv", "json"]) }))
       .output(z.string()),
+    search: rpc
+      .input(
+        z.object({
+          query: z.string().optional(),
+          sort: z
+            .object({ by: z.string(), descending: z.boolean() })
+            .optional(),
+          page_size: z.number(),
+          page_number: z.number(),
+        }),
+      )
+      .output(
+        z.object({
+          data: z.union([z.string(), z.array(z.object({}).passthrough())]),
+          total_rows: z.number(),
+        }),
+      ),
   })
   .renderer((props) => {
+    if (props.data.lazy) {
+      return (
+        <LazyDataTableComponent
+          {...props.data}
+          {...props.functions}
+          value={props.value}
+          setValue={props.setValue}
+        />
+      );
+    }
     if (typeof props.data.data === "string") {
       return (
         <LoadingDataTableComponent
@@ -98,18 +138,123 @@ interface DataTableProps extends Data<unknown>, Functions {
   setValue: (value: S) => void;
 }
 
+function loadRows(
+  data: unknown[] | string,
+  fieldTypes: Data<unknown>["fieldTypes"],
+): Promise<unknown[]> {
+  if (typeof data !== "string") {
+    return Promise.resolve(data);
+  }
+  if (!data) {
+    return Promise.resolve([]);
+  }
+  return vegaLoadData(
+    data,
+    { type: "csv", parse: getVegaFieldTypes(fieldTypes) },
+    true,
+  );
+}
+
+/**
+ * A table that is paginated, sorted and searched in the kernel, which only
+ * sends the rows of the current page.
+ */
+export const LazyDataTableComponent = memo((props: DataTableProps) => {
+  const [paginationState, setPaginationState] = useState<PaginationState>({
+    pageIndex: 0,
+    pageSize: props.pageSize,
+  });
+  const [sorting, setSorting] = useState<SortingState>([]);
+  const [query, setQuery] = useState("");
+  // Whether the kernel's search differs from the table it was created with
+  const searched = useRef(false);
+
+  const { data, error } = useAsyncData(async () => {
+    // The first page is sent with the table
+    if (
+      !searched.current &&
+      paginationState.pageIndex === 0 &&
+      sorting.length === 0 &&
+      !query
+    ) {
+      return {
+        rows: await loadRows(props.data, props.fieldTypes),
+        totalRows: props.totalRows,
+      };
+    }
+    searched.current = true;
+    const response = await props.search({
+      query: query || undefined,
+      sort:
+        sorting.length > 0
+          ? { by: sorting[0].id, descending: sorting[0].desc }
+          : undefined,
+      page_size: paginationState.pageSize,
+      page_number: paginationState.pageIndex,
+    });
+    return {
+      rows: await loadRows(response.data, props.fieldTypes),
+      totalRows: response.total_rows,
+    };
+  }, [props.data, props.fieldTypes, paginationState, sorting, query]);
+
+  // Selected rows are identified by their position in the search, so the
+  // selection is cleared when the search changes
+  const resetSearch = () => {
+    setPaginationState((state) => ({ ...state, pageIndex: 0 }));
+    if (props.value.length > 0) {
+      props.setValue([]);
+    }
+  };
+
+  if (error) {
+    return (
+      <Alert variant="destructive">
+        <AlertTitle>Error</AlertTitle>
+        <div className="text-md">
+          {error.message || "An unknown error occurred"}
+        </div>
+      </Alert>
+    );
+  }
+
+  return (
+    <div className="flex flex-col space-y-2">
+      <DebouncedInput
+        placeholder="Search"
+        value={query}
+        onValueChange={(value) => {
+          setQuery(value);
+          resetSearch();
+        }}
+        className="h-7"
+      />
+      <DataTableComponent
+        {...props}
+        data={data?.rows || Arrays.EMPTY}
+        totalRows={data?.totalRows ?? props.totalRows}
+        manual={{
+          totalRows: data?.totalRows ?? props.totalRows,
+          paginationState,
+          setPaginationState,
+          sorting,
+          setSorting: (updater) => {
+            setSorting(updater);
+            resetSearch();
+          },
+        }}
+      />
+    </div>
+  );
+});
+LazyDataTableComponent.displayName = "LazyDataTableComponent";
+
 export const LoadingDataTableComponent = memo(
   (props: DataTableProps & { data: string }) => {
-    const { data, loading, error } = useAsyncData<unknown[]>(() => {
-      if (!props.data) {
-        return Promise.resolve([]);
-      }
-      return vegaLoadData(
-        props.data,
-        { type: "csv", parse: getVegaFieldTypes(props.fieldTypes) },
-        true,
-      );
-    }, [props.data, props.fieldTypes]);
+    const { data, loading, error } = useAsyncData<unknown[]>(
+      () => loadRows(props.data, props.fieldTypes),
+      [props.data, props.fieldTypes],
+    );
 
     if (loading && !data) {
       return null;
@@ -145,8 +290,10 @@ const DataTableComponent = ({
   download_as: downloadAs,
   className,
   setValue,
+  manual,
 }: DataTableProps & {
   data: unknown[];
+  manual?: DataTableManualProps;
 }): JSX.Element => {
   const columns = useMemo(
     () => generateColumns(data, generateIndexColumns(rowHeaders), selection),
@@ -171,6 +318,7 @@ const DataTableComponent = ({
           pageSize={pageSize}
           rowSelection={rowSelection}
           downloadAs={showDownload ? downloadAs : undefined}
+          manual={manual}
           onRowSelectionChange={(updater) => {
             if (selection === "single") {
               const nextValue =
@@ -38,9 +38,10 @@ type PluginFunctions = {
     total_rows: number;
     row_headers: Array<[string, string[]]>;
   }>;
-  get_column_values: (req: { column: string }) => Promise<{
+  get_column_values: (req: { column: string; prefix?: string }) => Promise<{
     values: unknown[];
     too_many_values: boolean;
+    counts?: number[] | null;
   }>;
 };
 
@@ -68,12 +69,15 @@ export const DataFramePlugin = createPlugin<S>("marimo-dataframe")
         row_headers: z.array(z.tuple([z.string(), z.array(z.any())])),
       }),
     ),
-    get_column_values: rpc.input(z.object({ column: z.string() })).output(
-      z.object({
-        values: z.array(z.any()),
-        too_many_values: z.boolean(),
-      }),
-    ),
+    get_column_values: rpc
+      .input(z.object({ column: z.string(), prefix: z.string().optional() }))
+      .output(
+        z.object({
+          values: z.array(z.any()),
+          too_many_values: z.boolean(),
+          counts: z.array(z.number()).nullish(),
+        }),
+      ),
   })
   .renderer((props) => (
     <TooltipProvider>
@@ -6,8 +6,9 @@ export const ColumnInfoContext = createContext<ColumnDataTypes>(new Map());
 
 export const ColumnNameContext = createContext<string>("");
 export const ColumnFetchValuesContext = createContext<
-  (req: { column: string }) => Promise<{
+  (req: { column: string; prefix?: string }) => Promise<{
     values: unknown[];
     too_many_values: boolean;
+    counts?: number[] | null;
   }>
 >(() => Promise.resolve({ values: [], too_many_values: false }));
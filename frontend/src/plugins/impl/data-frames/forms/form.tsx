@@ -997,8 +997,8 @@ const ColumnValuesFormField = ({
 
   const options = data?.values || [];
 
-  // loaded with no options
-  if (options.length === 0 && !loading) {
+  // loaded with no options, or only the most frequent ones
+  if ((options.length === 0 || data?.too_many_values) && !loading) {
     return <StringFormField schema={schema} form={form} path={path} />;
   }
 
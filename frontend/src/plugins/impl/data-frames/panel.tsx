@@ -50,9 +50,10 @@ interface Props {
   initialValue: Transformations;
   onChange: (value: Transformations) => void;
   onInvalidChange: (value: Transformations) => void;
-  getColumnValues: (req: { column: string }) => Promise<{
+  getColumnValues: (req: { column: string; prefix?: string }) => Promise<{
     values: unknown[];
     too_many_values: boolean;
+    counts?: number[] | null;
   }>;
 }
 
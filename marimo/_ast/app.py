@@ -60,6 +60,10 @@ class _AppConfig:
     # The file path of the layout file, relative to the app file.
     layout_file: Optional[str] = None
 
+    # Whether, when running as an app, cells are only run once their
+    # outputs are scrolled into view (or a visible cell needs their defs).
+    defer_offscreen_cells: bool = False
+
     @staticmethod
     def from_untrusted_dict(updates: dict[str, Any]) -> _AppConfig:
         config = _AppConfig()
@@ -411,6 +411,18 @@ Example:
     help="Base URL for the server. Should start with a /.",
     callback=validators.base_url,
 )
+@click.option(
+    "--shared-session",
+    is_flag=True,
+    default=False,
+    show_default=True,
+    type=bool,
+    help="""
+    Share a single kernel among all viewers of the app, e.g. for
+    dashboards displayed on many screens. Only the first viewer can
+    interact with the app; later viewers see it read-only.
+    """,
+)
 @click.argument("name", required=True)
 @click.argument("args", nargs=-1, type=click.UNPROCESSED)
 def run(
@@ -422,6 +434,7 @@ def run(
     include_code: bool,
     watch: bool,
     base_url: str,
+    shared_session: bool,
     name: str,
     args: tuple[str],
 ) -> None:
@@ -447,6 +460,7 @@ def run(
         base_url=base_url,
         cli_args=parse_args(args),
         auth_token=_resolve_token(token, token_password),
+        shared_session=shared_session,
     )
 
 
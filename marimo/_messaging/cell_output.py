@@ -26,6 +26,11 @@ class CellChannel(str, Enum):
         return self.value
 
 
+# Closing tag of a cell output built with `mo.output.append`; appended
+# items are inserted right before it.
+STACK_CLOSING_TAG = "</div>"
+
+
 @dataclass
 class CellOutput:
     # descriptive name about the kind of output: e.g., stdout, stderr, ...
@@ -37,6 +42,22 @@ class CellOutput:
     def asdict(self) -> dict[str, Any]:
         return asdict(self)
 
+    def append(self, item: CellOutput) -> CellOutput:
+        """This output, a stack of items, with `item`'s HTML appended."""
+        assert isinstance(self.data, str)
+        assert isinstance(item.data, str)
+        if not self.data.endswith(STACK_CLOSING_TAG):
+            # Not a stack; shouldn't happen, but keep the new item
+            return item
+        return CellOutput(
+            channel=self.channel,
+            mimetype=self.mimetype,
+            data=self.data[: -len(STACK_CLOSING_TAG)]
+            + item.data
+            + STACK_CLOSING_TAG,
+            timestamp=item.timestamp,
+        )
+
     @staticmethod
     def stdout(data: str) -> CellOutput:
         return CellOutput(
@@ -1,25 +1,36 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import os
+import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Tuple
 
 from marimo._ast.cell import CellId_t
 from marimo._messaging.cell_output import CellChannel, CellOutput
 from marimo._messaging.mimetypes import KnownMimeType
 
 if TYPE_CHECKING:
-    from collections import deque
-    from threading import Condition
-    from typing import Optional
-
     from marimo._messaging.types import Stream
 
 StreamT = Literal[CellChannel.STDERR, CellChannel.STDOUT, CellChannel.STDIN]
 
-# Flush console outputs every 10ms
+# Flush console outputs every 10ms, or less often (up to every 250ms)
+# while large volumes of output are written
 TIMEOUT_S = 0.01
+MAX_TIMEOUT_S = 0.25
+
+# Number of characters of console output flushed at once above which the
+# flush interval grows
+CONSOLE_FLUSH_RATE_THRESHOLD = 16 * 1024
+
+# Maximum number of characters of console output flushed at once for a
+# single cell; older output is dropped
+CONSOLE_BUFFER_MAX_SIZE = int(
+    os.getenv("MARIMO_CONSOLE_BUFFER_MAX_SIZE", 256 * 1024)
+)
 
 
 @dataclass
@@ -49,68 +60,150 @@ def _write_console_output(
     ).broadcast(stream)
 
 
-def _add_output_to_buffer(
-    console_output: ConsoleMsg,
-    outputs_buffered_per_cell: dict[CellId_t, list[ConsoleMsg]],
-) -> None:
-    cell_id = console_output.cell_id
-    buffer = (
-        outputs_buffered_per_cell[cell_id]
-        if cell_id in outputs_buffered_per_cell
-        else None
-    )
-    if buffer and buffer[-1].stream == console_output.stream:
-        buffer[-1].data += console_output.data
-    elif buffer:
-        buffer.append(console_output)
-    else:
-        outputs_buffered_per_cell[cell_id] = [console_output]
-
-
-def buffered_writer(
-    msg_queue: deque[ConsoleMsg],
-    stream: Stream,
-    cv: Condition,
-) -> None:
+class CellConsoleBuffer:
+    """Console outputs of a cell, pending a flush.
+
+    Flushes at most `max_size` characters of output, as a ring buffer: when
+    it is full, the oldest outputs are dropped, and a marker reporting the
+    number of dropped lines is flushed in their place. Prompts for stdin
+    are never dropped.
     """
-    Writes standard out and standard error to frontend in batches
 
-    Buffers console messages, writing them out in batches. A condition
-    variable is used to synchronize access to `msg_queue`, and to obtain
-    notifications when messages have been added. (A deque + condition variable
-    was noticeably faster than the builtin queue.Queue in testing.)
+    def __init__(
+        self, cell_id: CellId_t, max_size: int = CONSOLE_BUFFER_MAX_SIZE
+    ) -> None:
+        self.cell_id = cell_id
+        self.max_size = max_size
+        self.size = 0
+        # Consecutive outputs written to the same stream are merged; their
+        # data is joined when flushed
+        self._outputs: List[Tuple[StreamT, KnownMimeType, deque[str]]] = []
+        self._dropped_lines = 0
+        self._dropped_stream: Optional[StreamT] = None
+
+    def add(self, stream: StreamT, data: str, mimetype: KnownMimeType) -> None:
+        if self._outputs and self._outputs[-1][0] == stream:
+            self._outputs[-1][2].append(data)
+        else:
+            self._outputs.append((stream, mimetype, deque([data])))
+        self.size += len(data)
+        # Dropping is amortized over many writes
+        if self.size > 2 * self.max_size:
+            self._drop_oldest()
+
+    def _drop_oldest(self) -> None:
+        emptied = False
+        for stream, _, chunks in self._outputs:
+            if stream == CellChannel.STDIN:
+                continue
+            while chunks and self.size > self.max_size:
+                chunk = chunks[0]
+                excess = self.size - self.max_size
+                if len(chunk) > excess:
+                    dropped, chunks[0] = chunk[:excess], chunk[excess:]
+                else:
+                    dropped = chunks.popleft()
+                    emptied = emptied or not chunks
+                self.size -= len(dropped)
+                self._dropped_lines += dropped.count("\n")
+                self._dropped_stream = stream
+            if self.size <= self.max_size:
+                break
+        if emptied:
+            self._outputs = [output for output in self._outputs if output[2]]
+
+    def flush(self) -> List[ConsoleMsg]:
+        """Remove and return the pending outputs."""
+        if self.size > self.max_size:
+            self._drop_oldest()
+        outputs: List[ConsoleMsg] = []
+        if self._dropped_stream is not None:
+            lines = max(self._dropped_lines, 1)
+            outputs.append(
+                ConsoleMsg(
+                    stream=self._dropped_stream,
+                    cell_id=self.cell_id,
+                    data=f"... {lines} line{'s' if lines > 1 else ''} of "
+                    "output dropped ...\n",
+                    mimetype="text/plain",
+                )
+            )
+        for stream, mimetype, chunks in self._outputs:
+            outputs.append(
+                ConsoleMsg(
+                    stream=stream,
+                    cell_id=self.cell_id,
+                    data="".join(chunks),
+                    mimetype=mimetype,
+                )
+            )
+        self._outputs = []
+        self.size = 0
+        self._dropped_lines = 0
+        self._dropped_stream = None
+        return outputs
+
+
+class ConsoleBuffer:
+    """Console outputs of all cells, pending a flush by `buffered_writer`.
+
+    Writes are cheap: the data is added to its cell's buffer, and the
+    writer thread is only notified of the first write after a flush.
     """
 
-    # only have a non-None timer when there's at least one output buffered
-    #
-    # when the timer expires, all buffered outputs are flushed
-    timer: Optional[float] = None
+    def __init__(self) -> None:
+        self._cv = threading.Condition(threading.Lock())
+        self._buffers: Dict[CellId_t, CellConsoleBuffer] = {}
+
+    def write(
+        self,
+        stream: StreamT,
+        cell_id: CellId_t,
+        data: str,
+        mimetype: KnownMimeType,
+    ) -> None:
+        with self._cv:
+            buffer = self._buffers.get(cell_id)
+            if buffer is None:
+                buffer = self._buffers[cell_id] = CellConsoleBuffer(cell_id)
+                if len(self._buffers) == 1:
+                    self._cv.notify()
+            buffer.add(stream, data, mimetype)
+
+    def wait(self) -> None:
+        """Wait until there are outputs to flush."""
+        with self._cv:
+            while not self._buffers:
+                self._cv.wait()
+
+    def take(self) -> Dict[CellId_t, CellConsoleBuffer]:
+        """Remove and return the buffers of cells with pending outputs."""
+        with self._cv:
+            buffers = self._buffers
+            self._buffers = {}
+        return buffers
+
+
+def buffered_writer(buffer: ConsoleBuffer, stream: Stream) -> None:
+    """
+    Writes standard out and standard error to frontend in batches
 
-    outputs_buffered_per_cell: dict[CellId_t, list[ConsoleMsg]] = {}
+    Once an output is written, waits for the flush interval so that more
+    outputs can accumulate, then writes out the outputs of each cell. The
+    interval grows while large volumes of output are written, and shrinks
+    back when the output slows down; each cell's output is capped per flush
+    (see `CellConsoleBuffer`).
+    """
+
+    interval = TIMEOUT_S
     while True:
-        with cv:
-            # We wait for messages until the timer (if any) expires
-            while timer is None or timer > 0:
-                time_started_waiting = time.time()
-                # if the timer is set or if the message queue is empty, wait;
-                # otherwise, no timer is set but we received a message, so
-                # process it
-                if timer is not None or not msg_queue:
-                    cv.wait(timeout=timer)
-                while msg_queue:
-                    _add_output_to_buffer(
-                        msg_queue.popleft(), outputs_buffered_per_cell
-                    )
-                if outputs_buffered_per_cell and timer is None:
-                    # start the timeout timer
-                    timer = TIMEOUT_S
-                elif timer is not None:
-                    time_waited = time.time() - time_started_waiting
-                    timer -= time_waited
-
-        # the timer has expired: flush the outputs
-        for cell_id, buffer in outputs_buffered_per_cell.items():
-            for output in buffer:
+        buffer.wait()
+        time.sleep(interval)
+
+        size = 0
+        for cell_id, cell_buffer in buffer.take().items():
+            size += cell_buffer.size
+            for output in cell_buffer.flush():
                 _write_console_output(
                     stream,
                     output.stream,
@@ -118,5 +211,8 @@ def buffered_writer(
                     output.data,
                     output.mimetype,
                 )
-        outputs_buffered_per_cell = {}
-        timer = None
+
+        if size > CONSOLE_FLUSH_RATE_THRESHOLD:
+            interval = min(interval * 2, MAX_TIMEOUT_S)
+        else:
+            interval = max(interval / 2, TIMEOUT_S)
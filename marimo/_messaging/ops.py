@@ -72,11 +72,13 @@ class CellOp(Op):
 
     A CellOp's data has three optional fields:
 
-    output       - a CellOutput
-    console      - a CellOutput (console msg to append), or a list of
-                   CellOutputs
-    status       - execution status
-    stale_inputs - whether the cell has stale inputs (variables, modules, ...)
+    output        - a CellOutput
+    output_append - a CellOutput (HTML to append to an output stacked with
+                    `mo.output.append`)
+    console       - a CellOutput (console msg to append), or a list of
+                    CellOutputs
+    status        - execution status
+    stale_inputs  - whether the cell has stale inputs (variables, ...)
 
     Omitting a field means that its value should be unchanged!
 
@@ -88,6 +90,7 @@ class CellOp(Op):
     name: ClassVar[str] = "cell-op"
     cell_id: CellId_t
     output: Optional[CellOutput] = None
+    output_append: Optional[CellOutput] = None
     console: Optional[Union[CellOutput, List[CellOutput]]] = None
     status: Optional[CellStatusType] = None
     stale_inputs: Optional[bool] = None
@@ -138,11 +141,27 @@ class CellOp(Op):
         status: Optional[CellStatusType],
         stream: Stream | None = None,
     ) -> None:
+        """Broadcast a cell's output.
+
+        The output is only sent if it differs from the last output sent for
+        the cell; otherwise only the status is sent, and the frontend keeps
+        showing the output it already has.
+        """
         mimetype, data = CellOp.maybe_truncate_output(mimetype, data)
         cell_id = (
             cell_id if cell_id is not None else get_context().stream.cell_id
         )
         assert cell_id is not None
+        output_hashes = CellOp._output_hashes(stream)
+        if output_hashes is not None:
+            output_hash = hash((channel, mimetype, data))
+            if output_hashes.get(cell_id) == output_hash:
+                if status is not None:
+                    CellOp(cell_id=cell_id, status=status).broadcast(
+                        stream=stream
+                    )
+                return
+            output_hashes[cell_id] = output_hash
         CellOp(
             cell_id=cell_id,
             output=CellOutput(
@@ -154,25 +173,43 @@ class CellOp(Op):
         ).broadcast(stream=stream)
 
     @staticmethod
-    def broadcast_empty_output(
-        cell_id: Optional[CellId_t],
-        status: Optional[CellStatusType],
+    def broadcast_output_append(
+        data: str,
+        cell_id: CellId_t,
         stream: Stream | None = None,
     ) -> None:
-        cell_id = (
-            cell_id if cell_id is not None else get_context().stream.cell_id
-        )
-        assert cell_id is not None
+        """Broadcast HTML to append to a cell's stacked output.
+
+        The HTML is spliced in before the closing tag of the cell's current
+        output, so that only the new item is sent.
+        """
+        # The cell's full output is no longer known here, so the next
+        # output must be sent in full
+        CellOp.forget_output(cell_id, stream)
         CellOp(
             cell_id=cell_id,
-            output=CellOutput(
+            output_append=CellOutput(
                 channel=CellChannel.OUTPUT,
-                mimetype="text/plain",
-                data="",
+                mimetype="text/html",
+                data=data,
             ),
-            status=status,
         ).broadcast(stream=stream)
 
+    @staticmethod
+    def broadcast_empty_output(
+        cell_id: Optional[CellId_t],
+        status: Optional[CellStatusType],
+        stream: Stream | None = None,
+    ) -> None:
+        CellOp.broadcast_output(
+            channel=CellChannel.OUTPUT,
+            mimetype="text/plain",
+            data="",
+            cell_id=cell_id,
+            status=status,
+            stream=stream,
+        )
+
     @staticmethod
     def broadcast_console_output(
         channel: CellChannel,
@@ -217,6 +254,9 @@ class CellOp(Op):
         status: Optional[CellStatusType],
     ) -> None:
         console: Optional[list[CellOutput]] = [] if clear_console else None
+        # Errors are always sent, since the frontend derives the cell's
+        # errored state from them; the next output must be sent too.
+        CellOp.forget_output(cell_id)
         CellOp(
             cell_id=cell_id,
             output=CellOutput(
@@ -228,6 +268,26 @@ class CellOp(Op):
             status=status,
         ).broadcast()
 
+    @staticmethod
+    def forget_output(cell_id: CellId_t, stream: Stream | None = None) -> None:
+        """Make the next output broadcast for a cell be sent in full."""
+        output_hashes = CellOp._output_hashes(stream)
+        if output_hashes is not None:
+            output_hashes.pop(cell_id, None)
+
+    @staticmethod
+    def _output_hashes(
+        stream: Stream | None,
+    ) -> Optional[Dict[CellId_t, int]]:
+        from marimo._runtime.context.types import ContextNotInitializedError
+
+        if stream is None:
+            try:
+                stream = get_context().stream
+            except ContextNotInitializedError:
+                return None
+        return stream.output_hashes
+
     @staticmethod
     def broadcast_stale(
         cell_id: CellId_t, stale: bool, stream: Stream | None = None
@@ -255,6 +315,30 @@ class FunctionCallResult(Op):
     status: HumanReadableStatus
 
 
+@dataclass
+class PlannedCell:
+    cell_id: CellId_t
+    # duration of the cell's last run, in seconds; None if it hasn't run
+    estimated_duration: Optional[float]
+
+
+@dataclass
+class ExecutionPlan(Op):
+    """Cells that a run would execute, without running them.
+
+    Cells are listed in the order they would run. Deferred cells would be
+    marked stale instead of running.
+    """
+
+    name: ClassVar[str] = "execution-plan"
+
+    plan_id: str
+    cells: List[PlannedCell]
+    deferred: List[CellId_t]
+    # sum of the estimated durations of the cells that have run before
+    estimated_duration: float
+
+
 @dataclass
 class RemoveUIElements(Op):
     """Invalidate UI elements for a given cell."""
@@ -277,6 +361,21 @@ class CompletedRun(Op):
     name: ClassVar[str] = "completed-run"
 
 
+@dataclass
+class VirtualFileUsage(Op):
+    """Usage of the kernel's virtual files; written when it changes."""
+
+    name: ClassVar[str] = "virtual-file-usage"
+    # bytes and number of files in shared memory
+    memory_bytes: int
+    memory_files: int
+    # bytes and number of files spilled to disk
+    spilled_bytes: int
+    spilled_files: int
+    # number of files spilled to disk since the kernel started
+    spills: int
+
+
 @dataclass
 class KernelReady(Op):
     """Kernel is ready for execution."""
@@ -295,6 +394,8 @@ class KernelReady(Op):
     last_executed_code: Optional[Dict[CellId_t, str]]
     # App config
     app_config: _AppConfig
+    # Whether the client is a read-only viewer of a shared session
+    viewer: bool = False
 
 
 @dataclass
@@ -386,11 +487,29 @@ class VariableValue:
         else:
             self.datatype = datatype
 
+        if value is None and self.datatype is not None:
+            # Only the datatype is known; the value wasn't previewed
+            self.value = None
+            return
+
         try:
             self.value = self._format_value(value)
         except Exception:
             self.value = None
 
+    @staticmethod
+    def without_preview(name: str, value: object) -> VariableValue:
+        """A variable's name and datatype, without a preview of its value.
+
+        Formatting a preview of a large object can be expensive, so previews
+        are only computed when requested.
+        """
+        if value is None:
+            return VariableValue(name=name, value=value)
+        return VariableValue(
+            name=name, value=None, datatype=type(value).__name__
+        )
+
     def _stringify(self, value: object) -> str:
         return str(value)[:50]
 
@@ -456,6 +575,7 @@ MessageOperation = Union[
     # Cell operations
     CellOp,
     FunctionCallResult,
+    ExecutionPlan,
     RemoveUIElements,
     # Notebook operations
     Reload,
@@ -463,6 +583,7 @@ MessageOperation = Union[
     Interrupted,
     CompletedRun,
     KernelReady,
+    VirtualFileUsage,
     # Editor operations
     CompletionResult,
     # Alerts
@@ -0,0 +1,56 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Serialization of kernel messages.
+
+The kernel encodes each message to JSON exactly once, in the same shape
+the frontend expects (`{"op": ..., "data": ...}`). The server forwards the
+encoded text to websockets as-is, and only decodes the messages it needs to
+track.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Dict, Sequence, cast
+
+from marimo._messaging.types import KernelMessage
+from marimo._plugins.core.json_encoder import WebComponentEncoder
+
+# Name of a message that groups other messages; its data is the list
+# of grouped messages, in order.
+BATCH_OP = "batch"
+
+
+def serialize_kernel_message(op: str, data: Dict[Any, Any]) -> str:
+    """Encode a message as the text of a websocket frame."""
+    return json.dumps({"op": op, "data": data}, cls=WebComponentEncoder)
+
+
+def deserialize_kernel_message(payload: str) -> Dict[str, Any]:
+    """Decode the data of a message encoded by `serialize_kernel_message`."""
+    return cast(Dict[str, Any], json.loads(payload)["data"])
+
+
+def serialize_batch(messages: Sequence[KernelMessage]) -> str:
+    """Encode already-serialized messages as a single websocket frame.
+
+    The messages' payloads are spliced in as-is, without decoding them.
+    """
+    return '{"op": "%s", "data": {"messages": [%s]}}' % (
+        BATCH_OP,
+        ", ".join(payload for _, payload in messages),
+    )
+
+
+def with_sequence_number(payload: str, seq: int) -> str:
+    """Add a sequence number to an encoded message, as its `seq` field."""
+    return '%s, "seq": %d}' % (payload[:-1], seq)
+
+
+def compress_frame(payload: str) -> bytes:
+    """Compress the text of a websocket frame, to be sent as a binary frame.
+
+    The lowest compression level shrinks JSON-encoded outputs several-fold,
+    at a fraction of the encode time of the default level.
+    """
+    return zlib.compress(payload.encode("utf-8"), 1)
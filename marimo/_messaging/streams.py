@@ -1,19 +1,23 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import codecs
 import contextlib
 import io
 import os
 import sys
 import threading
-from collections import deque
-from typing import Any, Iterable, Iterator, Optional
+from typing import Any, Iterable, Iterator, List, Optional
 
 from marimo import _loggers
 from marimo._ast.cell import CellId_t
 from marimo._messaging.cell_output import CellChannel
-from marimo._messaging.console_output_worker import ConsoleMsg, buffered_writer
+from marimo._messaging.console_output_worker import (
+    ConsoleBuffer,
+    buffered_writer,
+)
 from marimo._messaging.mimetypes import KnownMimeType
+from marimo._messaging.serde import BATCH_OP, serialize_kernel_message
 from marimo._messaging.types import (
     KernelMessage,
     Stderr,
@@ -51,6 +55,9 @@ OUTPUT_MAX_BYTES = int(os.getenv("MARIMO_OUTPUT_MAX_BYTES", 5_000_000))
 # Standard stream truncated if larger than STD_STREAM_MAX_BYTES=1MB
 STD_STREAM_MAX_BYTES = int(os.getenv("MARIMO_STD_STREAM_MAX_BYTES", 1_000_000))
 
+# Number of bytes read at once from a redirected file descriptor
+FD_READ_SIZE = 64 * 1024
+
 
 class ThreadSafeStream(Stream):
     """A thread-safe wrapper around a pipe."""
@@ -68,30 +75,80 @@ class ThreadSafeStream(Stream):
         self.stream_lock = threading.Lock()
 
         # Console outputs are buffered
-        self.console_msg_cv = threading.Condition(threading.Lock())
-        self.console_msg_queue: deque[ConsoleMsg] = deque()
+        self.console_buffer = ConsoleBuffer()
         self.buffered_console_thread = threading.Thread(
             target=buffered_writer,
-            args=(self.console_msg_queue, self, self.console_msg_cv),
+            args=(self.console_buffer, self),
         )
         self.buffered_console_thread.start()
 
         # stdin messages are pulled from this queue
         self.input_queue = input_queue
 
+        # Messages written by the batching thread are held here until the
+        # batch is flushed
+        self._batch_owner: Optional[int] = None
+        self._batch: List[KernelMessage] = []
+
     def write(self, op: str, data: dict[Any, Any]) -> None:
+        # Encode outside the lock; the server forwards the encoded message
+        # to the frontend without decoding it
+        try:
+            payload = serialize_kernel_message(op, data)
+        except (TypeError, ValueError) as e:
+            LOGGER.error("Failed to serialize message (op: %s): %s", op, e)
+            return
         with self.stream_lock:
-            try:
-                self.pipe.send((op, data))
-            except OSError as e:
-                # Most likely a BrokenPipeError, caused by the
-                # server process shutting down
-                LOGGER.debug("Error when writing (op: %s) to pipe: %s", op, e)
+            if self._batch_owner == threading.get_ident():
+                self._batch.append((op, payload))
+            else:
+                self._send((op, payload))
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Send messages written by this thread as a single message.
+
+        Nested batches are merged into the outermost one. Messages written
+        by other threads, such as console outputs, are not held back.
+        """
+        with self.stream_lock:
+            is_owner = self._batch_owner is None
+            if is_owner:
+                self._batch_owner = threading.get_ident()
+        if not is_owner:
+            yield
+            return
+
+        try:
+            yield
+        finally:
+            with self.stream_lock:
+                messages = self._batch
+                self._batch = []
+                self._batch_owner = None
+                if len(messages) == 1:
+                    self._send(messages[0])
+                elif messages:
+                    self._send((BATCH_OP, messages))
+
+    def _send(self, message: KernelMessage) -> None:
+        try:
+            self.pipe.send(message)
+        except OSError as e:
+            # Most likely a BrokenPipeError, caused by the
+            # server process shutting down
+            LOGGER.debug(
+                "Error when writing (op: %s) to pipe: %s", message[0], e
+            )
 
 
 def _forward_os_stream(standard_stream: Stdout | Stderr, fd: int) -> None:
     """Watch a file descriptor and forward it to a stream object."""
 
+    # Reads are decoded incrementally, since a multi-byte character can be
+    # split across reads
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
     # This coarse try/except block silences exceptions; a raised exception
     # at this point could cause bad errors, such as an infinite stream of data
     # to be written to the fd/routed through the stream.
@@ -101,10 +158,15 @@ def _forward_os_stream(standard_stream: Stdout | Stderr, fd: int) -> None:
     # and print it to the terminal later (outside an execution context).
     try:
         while True:
-            data = os.read(fd, 1024)
+            data = os.read(fd, FD_READ_SIZE)
             if not data:
                 break
-            standard_stream.write(data.decode())
+            text = decoder.decode(data)
+            if text:
+                standard_stream.write(text)
+        text = decoder.decode(b"", final=True)
+        if text:
+            standard_stream.write(text)
     except Exception:
         ...
 
@@ -190,16 +252,9 @@ class ThreadSafeStdout(Stdout):
                 "Warning: marimo truncated a very large console output.\n"
             )
             data = data[: int(STD_STREAM_MAX_BYTES)] + " ... "
-        self._stream.console_msg_queue.append(
-            ConsoleMsg(
-                stream=CellChannel.STDOUT,
-                cell_id=self._stream.cell_id,
-                data=data,
-                mimetype=mimetype,
-            )
+        self._stream.console_buffer.write(
+            CellChannel.STDOUT, self._stream.cell_id, data, mimetype
         )
-        with self._stream.console_msg_cv:
-            self._stream.console_msg_cv.notify()
         return len(data)
 
     # Buffer type not available python < 3.12, hence type ignore
@@ -252,16 +307,9 @@ class ThreadSafeStderr(Stderr):
                 + " ... "
             )
 
-        with self._stream.console_msg_cv:
-            self._stream.console_msg_queue.append(
-                ConsoleMsg(
-                    stream=CellChannel.STDERR,
-                    cell_id=self._stream.cell_id,
-                    data=data,
-                    mimetype=mimetype,
-                )
-            )
-            self._stream.console_msg_cv.notify()
+        self._stream.console_buffer.write(
+            CellChannel.STDERR, self._stream.cell_id, data, mimetype
+        )
         return len(data)
 
     def writelines(self, sequence: Iterable[str]) -> None:  # type: ignore[override] # noqa: E501
@@ -303,17 +351,10 @@ class ThreadSafeStdin(Stdin):
                 + " ... "
             )
 
-        with self._stream.console_msg_cv:
-            # This sends a prompt request to the frontend.
-            self._stream.console_msg_queue.append(
-                ConsoleMsg(
-                    stream=CellChannel.STDIN,
-                    cell_id=self._stream.cell_id,
-                    data=prompt,
-                    mimetype="text/plain",
-                )
-            )
-            self._stream.console_msg_cv.notify()
+        # This sends a prompt request to the frontend.
+        self._stream.console_buffer.write(
+            CellChannel.STDIN, self._stream.cell_id, prompt, "text/plain"
+        )
 
         return self._stream.input_queue.get()
 
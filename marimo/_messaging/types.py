@@ -1,13 +1,19 @@
 # Copyright 2024 Marimo. All rights reserved.
 import abc
+import contextlib
 import io
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
 
 from marimo._ast.cell import CellId_t
 from marimo._messaging.mimetypes import KnownMimeType
 
 # The message from the kernel is a tuple of message type
 # and a json representation of the message
+#
+# Messages sent over the kernel's connection to the server carry the
+# message already encoded as a JSON string (see `marimo._messaging.serde`),
+# so that the server can forward them to the frontend without re-encoding.
+# Batched messages carry a list of such messages instead.
 KernelMessage = Tuple[str, Any]
 
 
@@ -19,11 +25,28 @@ class Stream(abc.ABC):
     """
 
     cell_id: Optional[CellId_t] = None
+    # Hash of the last output written for each cell; see
+    # `CellOp.broadcast_output`
+    _output_hashes: Optional[Dict[CellId_t, int]] = None
 
     @abc.abstractmethod
     def write(self, op: str, data: Dict[Any, Any]) -> None:
         pass
 
+    @property
+    def output_hashes(self) -> Dict[CellId_t, int]:
+        if self._output_hashes is None:
+            self._output_hashes = {}
+        return self._output_hashes
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group messages written in this context into a single message.
+
+        Streams that don't support batching write messages as usual.
+        """
+        yield
+
 
 class NoopStream(Stream):
     def write(self, op: str, data: Dict[Any, Any]) -> None:
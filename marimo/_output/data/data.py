@@ -89,6 +89,20 @@ def json(data: Union[str, bytes, io.BytesIO]) -> VirtualFile:
     return any_data(data, ext="json")  # type: ignore
 
 
+def arrow(data: bytes) -> VirtualFile:
+    """Create a virtual file for Arrow IPC data, in the stream format.
+
+    **Args.**
+
+    - data: Arrow IPC stream in bytes
+
+    **Returns.**
+
+    A `VirtualFile` object.
+    """
+    return any_data(data, ext="arrows")
+
+
 def js(data: str) -> VirtualFile:
     """Create a virtual file for JavaScript data.
 
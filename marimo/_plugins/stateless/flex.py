@@ -59,12 +59,26 @@ def _flex(
         return create_style({"flex": f"{width}"})
 
     grid_items = [
-        h.div(as_html(item).text, style=create_style_for_item(i))
+        _flex_item(item, style=create_style_for_item(i))
         for i, item in enumerate(items)
     ]
     return Html(h.div(grid_items, style=style))
 
 
+def _flex_item(item: object, style: Optional[str]) -> str:
+    return h.div(as_html(item).text, style=style)
+
+
+def vstack_item(item: object) -> str:
+    """The HTML of an item in the output of `vstack`.
+
+    The items of a stack are the children of its outer element, in order,
+    so a stack with one more item is obtained by inserting the new item's
+    HTML before the stack's closing tag.
+    """
+    return _flex_item(item, style=None)
+
+
 @mddoc
 def vstack(
     items: Sequence[object],
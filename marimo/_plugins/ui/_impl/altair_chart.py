@@ -11,6 +11,7 @@ from typing import (
     List,
     Literal,
     Optional,
+    Tuple,
     Union,
 )
 
@@ -18,12 +19,18 @@ from marimo import _loggers
 from marimo._dependencies.dependencies import DependencyManager
 from marimo._output.rich_help import mddoc
 from marimo._plugins.ui._core.ui_element import UIElement
+from marimo._plugins.ui._impl.charts.kernel_transforms import (
+    MAX_POINTS,
+    EvaluatedChart,
+    evaluate_chart,
+)
 from marimo._utils import flatten
 
 LOGGER = _loggers.marimo_logger()
 
 if TYPE_CHECKING:
     import altair  # type: ignore[import-not-found,import-untyped,unused-ignore] # noqa: E501
+    import numpy as np
     import pandas as pd
 
 # Selection is a dictionary of the form:
@@ -49,61 +56,126 @@ def _has_binning(spec: VegaSpec) -> bool:
 def _filter_dataframe(
     df: pd.DataFrame, selection: ChartSelection
 ) -> pd.DataFrame:
-    import numpy as np
+    return _SelectionIndex(df).filter(selection)
 
-    for _channel, fields in selection.items():
-        # This is a case when altair does not pass back the fields to filter on
-        # and instead passes an individual selected point.
-        if len(fields) == 2 and "vlPoint" in fields and "_vgsid_" in fields:
-            # Vega is 1-indexed, so subtract 1
-            indexes = [int(i) - 1 for i in fields["_vgsid_"]]
-            df = df.iloc[indexes]
-            continue
-
-        # If vlPoint is in the selection,
-        # then the selection is a point selection
-        # otherwise, it is an interval selection
-        is_point_selection = "vlPoint" in fields
-        for field, values in fields.items():
-            # Skip vlPoint and _vgsid_ field
-            if field == "vlPoint" or field == "_vgsid_":
-                continue
 
-            # values may come back as strings if using the CSV transformer;
-            # convert back to original datatype
-            dtype = df[field].dtype
-            try:
-                resolved_values = [dtype.type(v) for v in values]
-            except Exception:
-                resolved_values = values  # type: ignore[assignment]
-            del values
-            if is_point_selection:
-                df = df[df[field].isin(resolved_values)]
-            elif len(resolved_values) == 1:
-                df = df[df[field] == resolved_values[0]]
-            # Range selection
-            elif len(resolved_values) == 2 and isinstance(
-                resolved_values[0], (int, float, np.number)
+class _SelectionIndex:
+    """Answers selections on a dataframe with vectorized lookups.
+
+    Interval selections on numeric and temporal fields are answered with a
+    binary search of the field's sorted values; the sorted values are
+    computed on first use and reused by later selections, so that brushing
+    an interval does not scan the field's column on every change.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._df = df
+        # field -> (sorted values, position of each sorted value)
+        self._sorted: Dict[str, Tuple[np.ndarray[Any, Any], ...]] = {}
+
+    def filter(self, selection: ChartSelection) -> pd.DataFrame:
+        import numpy as np
+
+        df = self._df
+        mask = np.ones(len(df), dtype=bool)
+        for _channel, fields in selection.items():
+            # This is a case when altair does not pass back the fields to
+            # filter on and instead passes an individual selected point.
+            if (
+                len(fields) == 2
+                and "vlPoint" in fields
+                and "_vgsid_" in fields
             ):
-                left_value = _coerce_value(dtype, resolved_values[0])
-                right_value = _coerce_value(dtype, resolved_values[1])
-                df = df[(df[field] >= left_value) & (df[field] <= right_value)]
-            # Multi-selection via range
-            # This can happen when you use an interval selection
-            # on categorical data
-            elif len(resolved_values) > 1:
-                df = df[df[field].isin(resolved_values)]
-            else:
-                raise ValueError(
-                    f"Invalid selection: {field}={resolved_values}"
-                ) from None
-    return df
+                # Vega is 1-indexed, so subtract 1; ids are positions in
+                # the rows selected so far
+                indexes = [int(i) - 1 for i in fields["_vgsid_"]]
+                positions = np.flatnonzero(mask)[indexes]
+                mask = np.zeros(len(df), dtype=bool)
+                mask[positions] = True
+                continue
+
+            # If vlPoint is in the selection,
+            # then the selection is a point selection
+            # otherwise, it is an interval selection
+            is_point_selection = "vlPoint" in fields
+            for field, values in fields.items():
+                # Skip vlPoint and _vgsid_ field
+                if field == "vlPoint" or field == "_vgsid_":
+                    continue
+                mask &= self._field_mask(field, values, is_point_selection)
+        return df[mask]
+
+    def _field_mask(
+        self, field: str, values: List[Any], is_point_selection: bool
+    ) -> np.ndarray[Any, Any]:
+        import numpy as np
+
+        column = self._df[field]
+        # values may come back as strings if using the CSV transformer;
+        # convert back to original datatype
+        dtype = column.dtype
+        try:
+            resolved_values = [dtype.type(v) for v in values]
+        except Exception:
+            resolved_values = values
+        if is_point_selection:
+            matches = column.isin(resolved_values)
+        elif len(resolved_values) == 1:
+            matches = column == resolved_values[0]
+        # Range selection
+        elif len(resolved_values) == 2 and isinstance(
+            resolved_values[0], (int, float, np.number)
+        ):
+            left_value = _coerce_value(dtype, resolved_values[0])
+            right_value = _coerce_value(dtype, resolved_values[1])
+            if _is_sortable(dtype):
+                return self._range_mask(field, left_value, right_value)
+            matches = (column >= left_value) & (column <= right_value)
+        # Multi-selection via range
+        # This can happen when you use an interval selection
+        # on categorical data
+        elif len(resolved_values) > 1:
+            matches = column.isin(resolved_values)
+        else:
+            raise ValueError(
+                f"Invalid selection: {field}={resolved_values}"
+            ) from None
+        return matches.to_numpy(dtype=bool, na_value=False)
+
+    def _range_mask(
+        self, field: str, left_value: Any, right_value: Any
+    ) -> np.ndarray[Any, Any]:
+        import numpy as np
+
+        if field not in self._sorted:
+            values = self._df[field].to_numpy()
+            order = np.argsort(values, kind="stable")
+            self._sorted[field] = (values[order], order)
+        values, order = self._sorted[field]
+
+        left_value, right_value = (
+            value.to_datetime64() if hasattr(value, "to_datetime64") else value
+            for value in (left_value, right_value)
+        )
+        # NaN and NaT are sorted last, so they are never in the range
+        start = np.searchsorted(values, left_value, side="left")
+        stop = np.searchsorted(values, right_value, side="right")
+        mask = np.zeros(len(values), dtype=bool)
+        mask[order[start:stop]] = True
+        return mask
+
+
+def _is_sortable(dtype: Any) -> bool:
+    """Return True if the values of a column can be binary searched."""
+    import numpy as np
+
+    return isinstance(dtype, np.dtype) and dtype.kind in "iufM"
 
 
 def _coerce_value(dtype: Any, value: Any) -> Any:
-    # If dtype is datetime[ns], then we need to convert the value
+    # If dtype is a datetime, then we need to convert the value
     # from milliseconds (which is what vega returns for dates)
-    if dtype == "datetime64[ns]":
+    if getattr(dtype, "kind", None) == "M":
         import pandas as pd
 
         return pd.to_datetime(value, unit="ms")
@@ -179,6 +251,14 @@ class altair_chart(UIElement[ChartSelection, "pd.DataFrame"]):
     - `legend_selection`: optional list of legend fields (columns) for which to
         enable selection, `True` to enable selection for all fields, or
         `False` to disable selection entirely
+    - `server_side`: if `True`, evaluate the chart's filter, bin and
+        aggregate transforms in the kernel and send only their result to the
+        browser, instead of the full data; scatter plots with more than
+        `max_points` points are downsampled. Selections are resolved against
+        the full data. Charts whose transforms can't be evaluated in the
+        kernel are sent as is.
+    - `max_points`: the number of points above which scatter plots are
+        downsampled, when `server_side` is `True`
     - `label`: optional text label for the element
     - `on_change`: optional callback to run when this element's value changes
     """
@@ -191,6 +271,8 @@ class altair_chart(UIElement[ChartSelection, "pd.DataFrame"]):
         chart_selection: Literal["point"] | Literal["interval"] | bool = True,
         legend_selection: list[str] | bool = True,
         *,
+        server_side: bool = False,
+        max_points: int = MAX_POINTS,
         label: str = "",
         on_change: Optional[Callable[[pd.DataFrame], None]] = None,
     ) -> None:
@@ -211,7 +293,14 @@ class altair_chart(UIElement[ChartSelection, "pd.DataFrame"]):
         ):
             chart = chart.properties(width="container")
 
-        vega_spec = _parse_spec(chart)
+        self._evaluated: Optional[EvaluatedChart] = (
+            evaluate_chart(chart, max_points) if server_side else None
+        )
+        vega_spec = (
+            self._evaluated.spec
+            if self._evaluated is not None
+            else _parse_spec(chart)
+        )
 
         if label:
             vega_spec["title"] = label
@@ -245,6 +334,7 @@ class altair_chart(UIElement[ChartSelection, "pd.DataFrame"]):
         # Private attributes
         self._chart = chart
         self._spec = vega_spec
+        self._selection_index: Optional[_SelectionIndex] = None
 
         super().__init__(
             component_name="marimo-vega",
@@ -270,12 +360,32 @@ class altair_chart(UIElement[ChartSelection, "pd.DataFrame"]):
 
             return pd.DataFrame()
 
+        if self._evaluated is None:
+            return self._get_selection_index().filter(value)
+        return self._evaluated.drop_bin_columns(
+            self._get_selection_index().filter(
+                self._evaluated.resolve_selection(value)
+            )
+        )
+
+    def _get_selection_index(self) -> _SelectionIndex:
+        """Index of the rows against which selections are resolved.
+
+        The rows are computed on the first selection and reused by later
+        ones, since evaluating the chart's transforms can be expensive.
+        """
+        if self._selection_index is not None:
+            return self._selection_index
+
+        # Selections on charts evaluated in the kernel are resolved against
+        # the rows before aggregation and downsampling
+        if self._evaluated is not None:
+            df = self._evaluated.get_selection_dataframe()
         # If we have transforms, we need to filter the dataframe
         # with those transforms, before applying the selection
-        if _has_transforms(self._spec):
+        elif _has_transforms(self._spec):
             try:
-                df: pd.DataFrame = self._chart.transformed_data()
-                return _filter_dataframe(df, value)
+                df = self._chart.transformed_data()
             except ImportError as e:
                 sys.stderr.write(
                     "Failed to filter dataframe that includes a transform. "
@@ -283,6 +393,8 @@ class altair_chart(UIElement[ChartSelection, "pd.DataFrame"]):
                     + e.msg
                 )
                 # Fall back to the untransformed dataframe
-                return _filter_dataframe(self.dataframe, value)
-
-        return _filter_dataframe(self.dataframe, value)
+                df = self.dataframe
+        else:
+            df = self.dataframe
+        self._selection_index = _SelectionIndex(df)
+        return self._selection_index
@@ -0,0 +1,852 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Evaluate the transforms of Altair charts in the kernel.
+
+Instead of sending a chart's full dataset to the browser and letting Vega
+filter, bin and aggregate it, the transforms are evaluated on the
+dataframe in the kernel and only their result is sent. Scatter plots with
+more points than can usefully be drawn are downsampled.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import marimo._output.data.data as mo_data
+from marimo import _loggers
+from marimo._dependencies.dependencies import DependencyManager
+
+LOGGER = _loggers.marimo_logger()
+
+if TYPE_CHECKING:
+    import altair  # type: ignore[import-not-found,import-untyped,unused-ignore] # noqa: E501
+    import numpy as np
+    import pandas as pd
+    import polars as pl
+
+T = TypeVar("T")
+VegaSpec = Dict[str, Any]
+
+# Scatter plots with more points than this are downsampled
+MAX_POINTS = int(os.getenv("MARIMO_CHART_MAX_POINTS", 20_000))
+
+# Marks that draw one shape per row
+POINT_MARKS = ("point", "circle", "square")
+
+# Number of cells along each axis of the grid used for downsampling
+DOWNSAMPLE_GRID_SIZE = 64
+
+# Aggregate ops that can be evaluated in the kernel
+AGGREGATE_OPS = (
+    "count",
+    "valid",
+    "missing",
+    "distinct",
+    "sum",
+    "mean",
+    "average",
+    "median",
+    "min",
+    "max",
+    "stdev",
+    "variance",
+)
+
+# A filter expression comparing a field to a literal, such as
+# `(datum.x > 5)` or `datum['name'] == 'a'`
+_COMPARISON_EXPRESSION = re.compile(
+    r"""^\(?\s*datum(?:\.(?P<name>\w+)|\[(?P<quote>['"])(?P<key>.+?)(?P=quote)\])"""  # noqa: E501
+    r"""\s*(?P<op>===?|!==?|<=|>=|<|>)\s*(?P<value>.+?)\s*\)?$"""
+)
+
+# Vega uses this to guard against floating point error when binning
+_BIN_EPSILON = 1e-14
+
+
+class UnsupportedTransform(Exception):
+    """Raised when a chart can't be evaluated in the kernel."""
+
+
+@dataclass
+class EvaluatedChart:
+    """A chart whose transforms were evaluated in the kernel."""
+
+    # Vega-Lite spec, with the evaluated data inlined as a virtual file
+    spec: VegaSpec
+    # Rows of the chart before aggregation, against which selections are
+    # resolved
+    selection_data: Any
+    # Position in `selection_data` of each row sent to the browser, if the
+    # rows were downsampled
+    positions: Optional[List[int]] = None
+    # Columns added to `selection_data` by binning encodings; selections
+    # can be made on them, but they are not part of the chart's data
+    bin_columns: List[str] = field(default_factory=list)
+    _selection_dataframe: Optional[pd.DataFrame] = field(
+        default=None, repr=False
+    )
+
+    def get_selection_dataframe(self) -> pd.DataFrame:
+        """The rows against which selections are resolved, in pandas."""
+        if self._selection_dataframe is None:
+            import pandas as pd
+
+            data = self.selection_data
+            if not isinstance(data, pd.DataFrame):
+                data = data.to_pandas()
+            self._selection_dataframe = data
+        return self._selection_dataframe
+
+    def resolve_selection(
+        self, selection: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Translate a selection made on the evaluated chart to a selection
+        on `selection_data`.
+
+        Fields computed by aggregation are dropped, and the indexes of
+        selected points are mapped to the rows they were sampled from.
+        """
+        columns = set(self.get_selection_dataframe().columns)
+        resolved: Dict[str, Dict[str, Any]] = {}
+        for channel, fields in selection.items():
+            resolved_fields: Dict[str, Any] = {}
+            for name, values in fields.items():
+                if name == "_vgsid_" and self.positions is not None:
+                    # Vega is 1-indexed
+                    values = [self.positions[int(i) - 1] + 1 for i in values]
+                elif name not in columns and name not in (
+                    "vlPoint",
+                    "_vgsid_",
+                ):
+                    continue
+                resolved_fields[name] = values
+            resolved[channel] = resolved_fields
+        return resolved
+
+    def drop_bin_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop the columns added by binning encodings from selected rows."""
+        return df.drop(
+            columns=[name for name in self.bin_columns if name in df.columns]
+        )
+
+
+class DataFrameOps(abc.ABC, Generic[T]):
+    """The dataframe operations needed to evaluate chart transforms.
+
+    Masks are built from `column` with Python operators, which both
+    pandas series and polars expressions support.
+    """
+
+    @staticmethod
+    @abc.abstractmethod
+    def get_column_names(df: T) -> List[str]:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def num_rows(df: T) -> int:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def column(df: T, name: str) -> Any:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def is_valid(column: Any) -> Any:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def is_in(column: Any, values: List[Any]) -> Any:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def filter(df: T, mask: Any) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def extent(df: T, name: str) -> Tuple[Optional[float], Optional[float]]:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def with_bins(
+        df: T, name: str, start: float, stop: float, step: float, as_: str
+    ) -> T:
+        """Add columns `as_` and `{as_}_end` with the bin of each row."""
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def aggregate(
+        df: T,
+        groupby: List[str],
+        aggregates: List[Tuple[str, Optional[str], str]],
+    ) -> T:
+        """Aggregate the rows of each group, with aggregates given as
+        (op, field, as) triples."""
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def to_numpy(df: T, name: str) -> np.ndarray[Any, Any]:
+        """A column as floats, with nulls as NaN."""
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def take(df: T, positions: np.ndarray[Any, Any]) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def to_csv(df: T) -> bytes:
+        raise NotImplementedError
+
+    @staticmethod
+    def data_errors() -> Tuple[Type[Exception], ...]:
+        """Errors raised when the data doesn't fit the transforms, e.g. a
+        missing field or values of the wrong type."""
+        return (KeyError, TypeError, ValueError)
+
+
+class PandasOps(DataFrameOps["pd.DataFrame"]):
+    @staticmethod
+    def get_column_names(df: pd.DataFrame) -> List[str]:
+        return [str(name) for name in df.columns]
+
+    @staticmethod
+    def num_rows(df: pd.DataFrame) -> int:
+        return len(df)
+
+    @staticmethod
+    def column(df: pd.DataFrame, name: str) -> Any:
+        return df[name]
+
+    @staticmethod
+    def is_valid(column: Any) -> Any:
+        return column.notna()
+
+    @staticmethod
+    def is_in(column: Any, values: List[Any]) -> Any:
+        return column.isin(values)
+
+    @staticmethod
+    def filter(df: pd.DataFrame, mask: Any) -> pd.DataFrame:
+        return df[mask.fillna(False).astype(bool)]  # type: ignore[no-any-return]
+
+    @staticmethod
+    def extent(
+        df: pd.DataFrame, name: str
+    ) -> Tuple[Optional[float], Optional[float]]:
+        import pandas as pd
+
+        low, high = df[name].min(), df[name].max()
+        if pd.isna(low) or pd.isna(high):
+            return None, None
+        return float(low), float(high)
+
+    @staticmethod
+    def with_bins(
+        df: pd.DataFrame,
+        name: str,
+        start: float,
+        stop: float,
+        step: float,
+        as_: str,
+    ) -> pd.DataFrame:
+        import numpy as np
+
+        values = df[name].astype(float).clip(start, stop - step)
+        bins = start + step * np.floor(_BIN_EPSILON + (values - start) / step)
+        return df.assign(**{as_: bins, f"{as_}_end": bins + step})
+
+    @staticmethod
+    def aggregate(
+        df: pd.DataFrame,
+        groupby: List[str],
+        aggregates: List[Tuple[str, Optional[str], str]],
+    ) -> pd.DataFrame:
+        import pandas as pd
+
+        # Without keys, all rows are in a single group
+        grouped = df.groupby(
+            groupby or (lambda _: 0),  # type: ignore[arg-type]
+            dropna=False,
+            sort=False,
+        )
+        columns: Dict[str, Any] = {}
+        for op, name, as_ in aggregates:
+            if op == "count" or name is None:
+                columns[as_] = grouped.size()
+                continue
+            values = grouped[name]
+            if op == "valid":
+                columns[as_] = values.count()
+            elif op == "missing":
+                columns[as_] = values.size() - values.count()
+            elif op == "distinct":
+                columns[as_] = values.nunique(dropna=False)
+            elif op in ("mean", "average"):
+                columns[as_] = values.mean()
+            elif op == "stdev":
+                columns[as_] = values.std()
+            elif op == "variance":
+                columns[as_] = values.var()
+            else:
+                columns[as_] = getattr(values, op)()
+        result = pd.DataFrame(columns)
+        return result.reset_index(drop=not groupby)
+
+    @staticmethod
+    def to_numpy(df: pd.DataFrame, name: str) -> np.ndarray[Any, Any]:
+        import numpy as np
+        import pandas as pd
+
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(
+            dtype=float, na_value=np.nan
+        )
+
+    @staticmethod
+    def take(
+        df: pd.DataFrame, positions: np.ndarray[Any, Any]
+    ) -> pd.DataFrame:
+        return df.iloc[positions]
+
+    @staticmethod
+    def to_csv(df: pd.DataFrame) -> bytes:
+        return df.to_csv(index=False, na_rep="null").encode("utf-8")
+
+
+class PolarsOps(DataFrameOps["pl.DataFrame"]):
+    @staticmethod
+    def data_errors() -> Tuple[Type[Exception], ...]:
+        import polars as pl
+
+        return DataFrameOps.data_errors() + (
+            pl.exceptions.ColumnNotFoundError,
+            pl.exceptions.ComputeError,
+            pl.exceptions.InvalidOperationError,
+            pl.exceptions.SchemaError,
+        )
+
+    @staticmethod
+    def get_column_names(df: pl.DataFrame) -> List[str]:
+        return df.columns
+
+    @staticmethod
+    def num_rows(df: pl.DataFrame) -> int:
+        return df.height
+
+    @staticmethod
+    def column(df: pl.DataFrame, name: str) -> Any:
+        import polars as pl
+
+        del df
+        return pl.col(name)
+
+    @staticmethod
+    def is_valid(column: Any) -> Any:
+        return column.is_not_null()
+
+    @staticmethod
+    def is_in(column: Any, values: List[Any]) -> Any:
+        return column.is_in(values)
+
+    @staticmethod
+    def filter(df: pl.DataFrame, mask: Any) -> pl.DataFrame:
+        return df.filter(mask.fill_null(False))
+
+    @staticmethod
+    def extent(
+        df: pl.DataFrame, name: str
+    ) -> Tuple[Optional[float], Optional[float]]:
+        column = df.get_column(name)
+        low, high = column.min(), column.max()
+        if low is None or high is None:
+            return None, None
+        return float(low), float(high)  # type: ignore[arg-type]
+
+    @staticmethod
+    def with_bins(
+        df: pl.DataFrame,
+        name: str,
+        start: float,
+        stop: float,
+        step: float,
+        as_: str,
+    ) -> pl.DataFrame:
+        import polars as pl
+
+        values = pl.col(name).cast(pl.Float64).clip(start, stop - step)
+        bins = start + step * (_BIN_EPSILON + (values - start) / step).floor()
+        return df.with_columns(
+            bins.alias(as_), (bins + step).alias(f"{as_}_end")
+        )
+
+    @staticmethod
+    def aggregate(
+        df: pl.DataFrame,
+        groupby: List[str],
+        aggregates: List[Tuple[str, Optional[str], str]],
+    ) -> pl.DataFrame:
+        import polars as pl
+
+        exprs: List[pl.Expr] = []
+        for op, name, as_ in aggregates:
+            if op == "count" or name is None:
+                # pl.len is new in polars 0.20.5
+                rows = pl.len() if hasattr(pl, "len") else pl.count()
+                exprs.append(rows.alias(as_))
+                continue
+            values = pl.col(name)
+            if op == "valid":
+                expr = values.count()
+            elif op == "missing":
+                expr = values.null_count()
+            elif op == "distinct":
+                expr = values.n_unique()
+            elif op in ("mean", "average"):
+                expr = values.mean()
+            elif op == "stdev":
+                expr = values.std()
+            elif op == "variance":
+                expr = values.var()
+            else:
+                expr = getattr(values, op)()
+            exprs.append(expr.alias(as_))
+        if not groupby:
+            return df.select(exprs)
+        return df.group_by(groupby, maintain_order=True).agg(exprs)
+
+    @staticmethod
+    def to_numpy(df: pl.DataFrame, name: str) -> np.ndarray[Any, Any]:
+        import polars as pl
+
+        return (
+            df.get_column(name)
+            .cast(pl.Float64, strict=False)
+            .fill_null(float("nan"))
+            .to_numpy()
+        )
+
+    @staticmethod
+    def take(
+        df: pl.DataFrame, positions: np.ndarray[Any, Any]
+    ) -> pl.DataFrame:
+        return df[positions]
+
+    @staticmethod
+    def to_csv(df: pl.DataFrame) -> bytes:
+        return df.write_csv(null_value="null").encode("utf-8")
+
+
+def get_ops_for_dataframe(df: Any) -> Optional[DataFrameOps[Any]]:
+    if DependencyManager.has_pandas():
+        import pandas as pd
+
+        if isinstance(df, pd.DataFrame):
+            return PandasOps()
+    if DependencyManager.has_polars():
+        import polars as pl
+
+        if isinstance(df, pl.DataFrame):
+            return PolarsOps()
+    return None
+
+
+def evaluate_chart(
+    chart: altair.TopLevelMixin, max_points: int = MAX_POINTS
+) -> Optional[EvaluatedChart]:
+    """Evaluate the filter, bin and aggregate transforms of a chart in the
+    kernel, and downsample it if it is a scatter plot with more than
+    `max_points` points.
+
+    Returns None if the chart can't be evaluated in the kernel, in which
+    case it should be sent as is.
+    """
+    import altair
+
+    # VegaFusion already evaluates transforms in the kernel
+    if altair.data_transformers.active == "vegafusion":
+        return None
+    # Only single view charts of dataframes are supported
+    if not isinstance(chart, altair.Chart):
+        return None
+    ops = get_ops_for_dataframe(chart.data)
+    if ops is None:
+        return None
+
+    # Build the spec without data; the empty frame is only used to infer
+    # the types of encoded fields
+    empty = chart.copy(deep=False)
+    empty.data = chart.data.head(0)
+    with altair.data_transformers.enable("default"):
+        spec: VegaSpec = empty.to_dict()
+    spec.pop("datasets", None)
+    spec.pop("data", None)
+
+    try:
+        return _evaluate(ops, chart.data, spec, max_points)
+    except UnsupportedTransform as e:
+        LOGGER.debug("Sending chart to the browser as is: %s", e)
+        return None
+    except ops.data_errors() as e:
+        LOGGER.warning("Failed to evaluate chart in the kernel: %s", e)
+        return None
+
+
+def _evaluate(
+    ops: DataFrameOps[Any], df: Any, spec: VegaSpec, max_points: int
+) -> EvaluatedChart:
+    # Rows before the first aggregation
+    selection_data = None
+
+    for transform in spec.pop("transform", []):
+        if "filter" in transform:
+            df = ops.filter(df, _predicate(ops, df, transform["filter"]))
+        elif "bin" in transform:
+            as_ = transform["as"]
+            if isinstance(as_, list):
+                if len(as_) != 2 or as_[1] != f"{as_[0]}_end":
+                    raise UnsupportedTransform(f"bin as {as_}")
+                as_ = as_[0]
+            field_ = _get_field(ops, df, transform["field"])
+            start, stop, step = _bin_extent(
+                ops.extent(df, field_), transform["bin"]
+            )
+            df = ops.with_bins(df, field_, start, stop, step, as_)
+        elif "aggregate" in transform:
+            if selection_data is None:
+                selection_data = df
+            aggregates = []
+            for aggregate in transform["aggregate"]:
+                op = aggregate["op"]
+                if op not in AGGREGATE_OPS:
+                    raise UnsupportedTransform(f"aggregate op {op}")
+                name = aggregate.get("field")
+                if name is not None:
+                    name = _get_field(ops, df, name)
+                aggregates.append((op, name, aggregate["as"]))
+            groupby = [
+                _get_field(ops, df, name)
+                for name in transform.get("groupby", [])
+            ]
+            df = ops.aggregate(df, groupby, aggregates)
+        else:
+            raise UnsupportedTransform(f"transform {sorted(transform)}")
+
+    # Evaluate the bins and aggregates of encodings, rewriting them to
+    # encode the evaluated fields
+    encoding: Dict[str, Any] = spec.get("encoding", {})
+    rewritten: Dict[str, Any] = {}
+    groupby = []
+    aggregates = []
+    bin_columns: List[str] = []
+    for channel, definition in encoding.items():
+        definitions = (
+            definition if isinstance(definition, list) else [definition]
+        )
+        results = []
+        for definition in definitions:
+            if not isinstance(definition, dict) or (
+                "field" not in definition and "aggregate" not in definition
+            ):
+                results.append(definition)
+                continue
+            definition = _check_definition(definition)
+
+            op = definition.pop("aggregate", None)
+            if op is not None:
+                if op not in AGGREGATE_OPS:
+                    raise UnsupportedTransform(f"aggregate op {op}")
+                name = definition.get("field")
+                if name is None:
+                    as_ = "__count"
+                    definition.setdefault("title", "Count of Records")
+                else:
+                    name = _get_field(ops, df, name)
+                    as_ = f"{op}_{name}"
+                    definition.setdefault(
+                        "title", f"{op.capitalize()} of {name}"
+                    )
+                definition["field"] = as_
+                aggregates.append((op, name, as_))
+                results.append(definition)
+                continue
+
+            name = _get_field(ops, df, definition["field"])
+            bin_ = definition.get("bin")
+            if bin_ and bin_ != "binned" and not _is_binned(bin_):
+                if channel not in ("x", "y") or f"{channel}2" in encoding:
+                    raise UnsupportedTransform(f"bin on {channel}")
+                start, stop, step = _bin_extent(ops.extent(df, name), bin_)
+                as_ = f"bin_{name}"
+                df = ops.with_bins(df, name, start, stop, step, as_)
+                definition["field"] = as_
+                definition["bin"] = {"binned": True, "step": step}
+                definition.setdefault("title", f"{name} (binned)")
+                rewritten[f"{channel}2"] = {"field": f"{as_}_end"}
+                groupby.extend([as_, f"{as_}_end"])
+                bin_columns.extend([as_, f"{as_}_end"])
+            else:
+                groupby.append(name)
+            results.append(definition)
+        rewritten[channel] = (
+            results if isinstance(encoding[channel], list) else results[0]
+        )
+    if encoding:
+        spec["encoding"] = rewritten
+
+    positions = None
+    if aggregates:
+        if selection_data is None:
+            selection_data = df
+        df = ops.aggregate(df, list(dict.fromkeys(groupby)), aggregates)
+    elif selection_data is None:
+        selection_data = df
+        if (
+            _get_mark_type(spec) in POINT_MARKS
+            and ops.num_rows(df) > max_points
+        ):
+            axes = [
+                ops.to_numpy(df, rewritten[channel]["field"])
+                for channel in ("x", "y")
+                if isinstance(rewritten.get(channel), dict)
+                and rewritten[channel].get("type") == "quantitative"
+                and "field" in rewritten[channel]
+            ]
+            sample = downsample(axes, ops.num_rows(df), max_points)
+            positions = sample.tolist()
+            df = ops.take(df, sample)
+
+    virtual_file = mo_data.csv(ops.to_csv(df))
+    spec["data"] = {"url": virtual_file.url, "format": {"type": "csv"}}
+    return EvaluatedChart(
+        spec=spec,
+        selection_data=selection_data,
+        positions=positions,
+        bin_columns=bin_columns,
+    )
+
+
+def downsample(
+    axes: Sequence[np.ndarray[Any, Any]],
+    num_rows: int,
+    max_points: int,
+    seed: int = 0,
+) -> np.ndarray[Any, Any]:
+    """Positions of about `max_points` rows, sampled so that the density
+    of points is preserved.
+
+    Rows are divided into the cells of a grid over the given axes, and the
+    same fraction of rows is sampled from each cell, keeping at least one
+    row per cell so that sparse regions and outliers stay visible.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    cells = np.zeros(num_rows, dtype=np.int64)
+    for values in axes:
+        finite = np.isfinite(values)
+        bins = np.full(num_rows, DOWNSAMPLE_GRID_SIZE, dtype=np.int64)
+        if finite.any():
+            low, high = values[finite].min(), values[finite].max()
+            scale = DOWNSAMPLE_GRID_SIZE / (high - low) if high > low else 0
+            bins[finite] = np.minimum(
+                ((values[finite] - low) * scale).astype(np.int64),
+                DOWNSAMPLE_GRID_SIZE - 1,
+            )
+        # Non-finite values get a cell of their own
+        cells = cells * (DOWNSAMPLE_GRID_SIZE + 1) + bins
+
+    # Rank the rows of each cell in a random order, and keep those ranked
+    # below the cell's quota
+    order = np.lexsort((rng.random(num_rows), cells))
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, num_rows])
+    ranks = np.arange(num_rows) - np.repeat(starts, counts)
+    quotas = np.maximum(1, counts * max_points // num_rows)
+    return np.sort(order[ranks < np.repeat(quotas, counts)])
+
+
+def _bin_extent(
+    extent: Tuple[Optional[float], Optional[float]], params: Any
+) -> Tuple[float, float, float]:
+    """The start, stop and step of bins, as computed by Vega."""
+    params = params if isinstance(params, dict) else {}
+    unsupported = set(params) - {
+        "maxbins",
+        "step",
+        "extent",
+        "nice",
+        "minstep",
+    }
+    if unsupported:
+        raise UnsupportedTransform(f"bin params {sorted(unsupported)}")
+    low, high = params.get("extent", extent)
+    if low is None or high is None:
+        raise UnsupportedTransform("bin over an empty field")
+
+    maxbins = params.get("maxbins", 10)
+    base = 10
+    span = (high - low) or abs(low) or 1
+    if "step" in params:
+        step = params["step"]
+    else:
+        level = math.ceil(math.log(maxbins) / math.log(base))
+        minstep = params.get("minstep", 0)
+        step = max(
+            minstep,
+            base ** (round(math.log(span) / math.log(base)) - level),
+        )
+        while math.ceil(span / step) > maxbins:
+            step *= base
+        for divide in (5, 2):
+            candidate = step / divide
+            if candidate >= minstep and span / candidate <= maxbins:
+                step = candidate
+
+    if params.get("nice", True):
+        v = math.log(step)
+        precision = 0 if v >= 0 else int(-v / math.log(base)) + 1
+        eps = base ** (-precision - 1)
+        v = math.floor(low / step + eps) * step
+        low = v - step if low < v else v
+        high = math.ceil(high / step) * step
+    return low, (low + step if high == low else high), step
+
+
+def _is_binned(params: Any) -> bool:
+    return isinstance(params, dict) and bool(params.get("binned"))
+
+
+def _check_definition(definition: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy an encoding's definition, if it can be evaluated."""
+    if "timeUnit" in definition:
+        raise UnsupportedTransform("timeUnit")
+    condition = definition.get("condition")
+    if isinstance(condition, dict) and "field" in condition:
+        raise UnsupportedTransform("conditional field")
+    sort = definition.get("sort")
+    if isinstance(sort, dict) and ("op" in sort or "field" in sort):
+        raise UnsupportedTransform("sort by field")
+    return dict(definition)
+
+
+def _get_field(ops: DataFrameOps[Any], df: Any, name: str) -> str:
+    # Nested fields, such as `a.b`, are not columns of the dataframe
+    if name not in ops.get_column_names(df):
+        raise UnsupportedTransform(f"field {name}")
+    return name
+
+
+def _get_mark_type(spec: VegaSpec) -> Optional[str]:
+    mark = spec.get("mark")
+    if isinstance(mark, dict):
+        return mark.get("type")  # type: ignore[no-any-return]
+    return mark
+
+
+def _predicate(ops: DataFrameOps[Any], df: Any, predicate: Any) -> Any:
+    """A mask of the rows matching a Vega-Lite filter predicate."""
+    if isinstance(predicate, str):
+        return _expression(ops, df, predicate)
+    if not isinstance(predicate, dict):
+        raise UnsupportedTransform(f"filter {predicate}")
+    if "and" in predicate or "or" in predicate:
+        masks = [
+            _predicate(ops, df, operand)
+            for operand in predicate.get("and", predicate.get("or"))
+        ]
+        result = masks[0]
+        for mask in masks[1:]:
+            result = result & mask if "and" in predicate else result | mask
+        return result
+    if "not" in predicate:
+        return ~_predicate(ops, df, predicate["not"])
+    if "field" not in predicate or "timeUnit" in predicate:
+        raise UnsupportedTransform(f"filter {predicate}")
+
+    column = ops.column(df, _get_field(ops, df, predicate["field"]))
+    for key in ("equal", "lt", "lte", "gt", "gte", "range", "oneOf"):
+        if key in predicate:
+            value = predicate[key]
+            values = value if isinstance(value, list) else [value]
+            if any(isinstance(v, dict) for v in values):
+                raise UnsupportedTransform(f"filter {predicate}")
+    if "equal" in predicate:
+        return column == predicate["equal"]
+    if "lt" in predicate:
+        return column < predicate["lt"]
+    if "lte" in predicate:
+        return column <= predicate["lte"]
+    if "gt" in predicate:
+        return column > predicate["gt"]
+    if "gte" in predicate:
+        return column >= predicate["gte"]
+    if "range" in predicate:
+        low, high = predicate["range"]
+        mask = ops.is_valid(column)
+        if low is not None:
+            mask = mask & (column >= low)
+        if high is not None:
+            mask = mask & (column <= high)
+        return mask
+    if "oneOf" in predicate:
+        return ops.is_in(column, predicate["oneOf"])
+    if "valid" in predicate:
+        valid = ops.is_valid(column)
+        return valid if predicate["valid"] else ~valid
+    raise UnsupportedTransform(f"filter {predicate}")
+
+
+def _expression(ops: DataFrameOps[Any], df: Any, expression: str) -> Any:
+    """A mask of the rows matching an expression that compares a field to
+    a literal; other expressions are unsupported."""
+    match = _COMPARISON_EXPRESSION.match(expression.strip())
+    if match is None:
+        raise UnsupportedTransform(f"filter {expression}")
+    name = match.group("name") or match.group("key")
+    literal = match.group("value")
+    if literal[0] == literal[-1] == "'":
+        literal = json.dumps(literal[1:-1])
+    try:
+        value = json.loads(literal)
+    except ValueError:
+        raise UnsupportedTransform(f"filter {expression}") from None
+
+    column = ops.column(df, _get_field(ops, df, name))
+    op = match.group("op")
+    if op in ("==", "==="):
+        return column == value
+    if op in ("!=", "!=="):
+        return column != value
+    if op == "<":
+        return column < value
+    if op == "<=":
+        return column <= value
+    if op == ">":
+        return column > value
+    return column >= value
@@ -12,17 +12,31 @@ from typing import (
     List,
     Optional,
     Union,
+    cast,
 )
 
 from marimo._dependencies.dependencies import DependencyManager
-from marimo._plugins.ui._impl.dataframes.handlers import TransformsContainer
+from marimo._plugins.ui._impl.dataframes.handlers import (
+    DataFrameType,
+    TransformsContainer,
+    get_handler_for_dataframe,
+)
 from marimo._plugins.ui._impl.dataframes.transforms import Transformations
-from marimo._plugins.ui._impl.tables.pandas_table import (
-    PandasTableManagerFactory,
+from marimo._plugins.ui._impl.table import (
+    ColumnNotFound,
+    GetColumnSummariesArgs,
+    GetColumnSummariesResponse,
+)
+from marimo._plugins.ui._impl.tables.table_manager import (
+    ColumnName,
+    ColumnSummary,
 )
+from marimo._plugins.ui._impl.tables.utils import get_table_manager
 
 if TYPE_CHECKING:
     import pandas as pd
+    import polars as pl
+    import pyarrow as pa  # type: ignore
 
 from dataclasses import dataclass
 
@@ -44,18 +58,18 @@ class GetDataFrameResponse:
 @dataclass
 class GetColumnValuesArgs:
     column: str
+    # Only return values starting with this prefix, ignoring case
+    prefix: Optional[str] = None
 
 
 @dataclass
 class GetColumnValuesResponse:
-    values: List[str | int | float]
+    # Missing values are None
+    values: List[str | int | float | None]
     too_many_values: bool
-
-
-class ColumnNotFound(Exception):
-    def __init__(self, column: str):
-        self.column = column
-        super().__init__(f"Column {column} does not exist")
+    # If there are too many values, `values` are the most frequent ones,
+    # and these are their (estimated) numbers of rows
+    counts: Optional[List[int]] = None
 
 
 class GetDataFrameError(Exception):
@@ -65,14 +79,13 @@ class GetDataFrameError(Exception):
 
 
 @mddoc
-class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
+class dataframe(UIElement[Dict[str, Any], DataFrameType]):
     """
     Run transformations on a DataFrame or series.
-    Currently only Pandas DataFrames are supported.
 
-    For Polars DataFrames, you can convert to a Pandas DataFrame.
-    However the returned DataFrame will still be a Pandas DataFrame,
-    so you will need to convert back to a Polars DataFrame if you want.
+    Pandas DataFrames, Polars DataFrames and PyArrow Tables are supported;
+    transformations run natively on each, and the transformed value has
+    the same type as the original.
 
     **Example.**
 
@@ -80,17 +93,13 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
     dataframe = mo.ui.dataframe(data)
     ```
 
-    ```python
-    dataframe = mo.ui.dataframe(polars_df.to_pandas())
-    ```
-
     **Attributes.**
 
     - `value`: the transformed DataFrame or series
 
     **Initialization Args.**
 
-    - `df`: the DataFrame or series to transform
+    - `df`: the DataFrame, Polars DataFrame or PyArrow Table to transform
     - `page_size`: the number of rows to show in the table
     """
 
@@ -98,17 +107,17 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
 
     def __init__(
         self,
-        df: pd.DataFrame,
-        on_change: Optional[Callable[[pd.DataFrame], None]] = None,
+        df: Union[pd.DataFrame, pl.DataFrame, pa.Table],
+        on_change: Optional[Callable[[DataFrameType], None]] = None,
         page_size: Optional[int] = 5,
     ) -> None:
-        DependencyManager.require_pandas("to use the dataframe plugin")
-        import pandas as pd
-
-        if not isinstance(df, pd.DataFrame):
+        try:
+            handler = get_handler_for_dataframe(df)
+        except ValueError:
             raise ValueError(
-                "Dataframe plugin only supports Pandas DataFrames"
-            )
+                "Dataframe plugin only supports Pandas DataFrames, "
+                "Polars DataFrames and PyArrow Tables"
+            ) from None
 
         # HACK: this is a hack to get the name of the variable that was passed
         dataframe_name = "df"
@@ -126,9 +135,15 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
             pass
 
         self._data = df
-        self._manager = PandasTableManagerFactory.create()(df)
-        self._transform_container = TransformsContainer(df)
+        self._manager = get_table_manager(df)
+        self._transform_container = TransformsContainer(df, handler)
         self._error: Optional[str] = None
+        # Column summaries of the transformed dataframe, computed on first
+        # request
+        self._summaries: Dict[ColumnName, ColumnSummary] = {}
+        # Values of columns of the original dataframe, computed on first
+        # request
+        self._column_values: Dict[ColumnName, GetColumnValuesResponse] = {}
 
         super().__init__(
             component_name=dataframe._name,
@@ -140,7 +155,7 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
             args={
                 "columns": self._get_column_types(),
                 "dataframe-name": dataframe_name,
-                "total": len(df),
+                "total": self._manager.get_num_rows(),
                 "page-size": page_size,
             },
             functions=(
@@ -154,10 +169,32 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
                     arg_cls=GetColumnValuesArgs,
                     function=self.get_column_values,
                 ),
+                Function(
+                    name=self.get_column_summaries.__name__,
+                    arg_cls=GetColumnSummariesArgs,
+                    function=self.get_column_summaries,
+                ),
             ),
         )
 
     def _get_column_types(self) -> List[List[Union[str, int]]]:
+        # The frontend picks operators by numpy data type names
+        if DependencyManager.has_polars():
+            import polars as pl
+
+            if isinstance(self._data, pl.DataFrame):
+                return [
+                    [name, _polars_dtype_name(dtype)]
+                    for name, dtype in self._data.schema.items()
+                ]
+        if DependencyManager.has_pyarrow():
+            import pyarrow as pa
+
+            if isinstance(self._data, pa.Table):
+                return [
+                    [field.name, _pyarrow_dtype_name(field.type)]
+                    for field in self._data.schema
+                ]
         return [[name, dtype] for name, dtype in self._data.dtypes.items()]  # type: ignore
 
     def get_dataframe(self, _args: EmptyArgs) -> GetDataFrameResponse:
@@ -168,9 +205,10 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
         if self._error is not None:
             raise GetDataFrameError(self._error)
 
-        manager = PandasTableManagerFactory.create()(self._value.head(LIMIT))
+        manager = get_table_manager(self._value)
+        total_rows = manager.get_num_rows()
+        manager = manager.slice(0, LIMIT)
         url = mo_data.csv(manager.to_csv()).url
-        total_rows = len(self._value)
         return GetDataFrameResponse(
             url=url,
             total_rows=total_rows,
@@ -181,27 +219,96 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
     def get_column_values(
         self, args: GetColumnValuesArgs
     ) -> GetColumnValuesResponse:
-        """Get all the unique values in a column."""
-        LIMIT = 500
+        """Get the unique values in a column.
 
-        if args.column not in self._data.columns:
+        Columns with too many values get their most frequent values instead.
+        """
+        if args.column not in self._manager.get_column_names():
             raise ColumnNotFound(args.column)
 
-        # We get the unique values from the original dataframe, not the
-        # transformed one
-        unique_values = self._data[args.column].unique().tolist()
-        if len(unique_values) <= LIMIT:
-            return GetColumnValuesResponse(
-                values=list(sorted(unique_values, key=str)),
-                too_many_values=False,
+        # We get the values from the original dataframe, not the
+        # transformed one, so they can be cached
+        if args.column not in self._column_values:
+            self._column_values[args.column] = self._count_column_values(
+                args.column
             )
-        else:
+        response = self._column_values[args.column]
+        if not args.prefix:
+            return response
+        if response.too_many_values:
+            # The most frequent values may not include those with the prefix
+            return self._count_column_values(args.column, args.prefix)
+        prefix = args.prefix.lower()
+        return GetColumnValuesResponse(
+            values=[
+                value
+                for value in response.values
+                # Missing values don't start with any prefix
+                if value is not None and str(value).lower().startswith(prefix)
+            ],
+            too_many_values=False,
+        )
+
+    def _count_column_values(
+        self, column: ColumnName, prefix: Optional[str] = None
+    ) -> GetColumnValuesResponse:
+        LIMIT = 500
+        # Number of most frequent values returned if there are too many
+        TOP_K = 50
+        SAMPLE_SIZE = 10_000
+
+        # Columns with many distinct values in a sample have too many
+        # values, which we don't need to count exactly
+        counts = self._manager.get_value_counts(
+            column, LIMIT, sample_size=SAMPLE_SIZE, prefix=prefix
+        )
+        if counts.sampled and counts.unique <= LIMIT:
+            # The sample may have missed rare values
+            counts = self._manager.get_value_counts(
+                column, LIMIT, prefix=prefix
+            )
+
+        if counts.unique <= LIMIT:
             return GetColumnValuesResponse(
-                values=[],
-                too_many_values=True,
+                values=sorted(
+                    (
+                        cast(Optional[Union[str, int, float]], value)
+                        for value, _ in counts.values
+                    ),
+                    key=str,
+                ),
+                too_many_values=False,
             )
+        top = counts.values[:TOP_K]
+        return GetColumnValuesResponse(
+            values=[
+                cast(Optional[Union[str, int, float]], value)
+                for value, _ in top
+            ],
+            too_many_values=True,
+            counts=[count for _, count in top],
+        )
 
-    def _convert_value(self, value: Dict[str, Any]) -> pd.DataFrame:
+    def get_column_summaries(
+        self, args: GetColumnSummariesArgs
+    ) -> GetColumnSummariesResponse:
+        """Summaries of columns of the transformed dataframe."""
+        manager = get_table_manager(self._value)
+        column_names = manager.get_column_names()
+        for column in args.columns:
+            if column not in column_names:
+                raise ColumnNotFound(column)
+            if column not in self._summaries:
+                self._summaries[column] = manager.get_summary(column)
+        return GetColumnSummariesResponse(
+            summaries={
+                column: self._summaries[column] for column in args.columns
+            }
+        )
+
+    def _convert_value(self, value: Dict[str, Any]) -> DataFrameType:
+        # The transformed dataframe changes with the value
+        self._summaries = {}
         if value is None:
             self._error = None
             return self._data
@@ -216,3 +323,36 @@ class dataframe(UIElement[Dict[str, Any], "pd.DataFrame"]):
             sys.stderr.write(error)
             self._error = error
             return self._data
+
+
+def _polars_dtype_name(dtype: Any) -> str:
+    import polars as pl
+
+    if dtype == pl.Boolean:
+        return "bool"
+    if dtype in pl.NUMERIC_DTYPES:
+        # e.g. Int64 -> int64, Float32 -> float32
+        return str(dtype).lower()
+    if dtype == pl.Utf8:
+        return "string"
+    if dtype == pl.Datetime:
+        return "datetime64[ns]"
+    return str(dtype)
+
+
+def _pyarrow_dtype_name(dtype: Any) -> str:
+    import pyarrow as pa
+
+    if pa.types.is_boolean(dtype):
+        return "bool"
+    if pa.types.is_floating(dtype):
+        return f"float{dtype.bit_width}"
+    if (
+        pa.types.is_string(dtype)
+        or pa.types.is_large_string(dtype)
+        or str(dtype) == "string_view"
+    ):
+        return "string"
+    if pa.types.is_timestamp(dtype):
+        return "datetime64[ns]"
+    return str(dtype)
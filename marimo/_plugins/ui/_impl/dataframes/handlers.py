@@ -1,8 +1,25 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, List, NoReturn, cast
+import abc
+import os
+import random
+from collections import OrderedDict
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    List,
+    NoReturn,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
+from marimo._dependencies.dependencies import DependencyManager
 from marimo._plugins.ui._impl.dataframes.transforms import (
     AggregateTransform,
     ColumnConversionTransform,
@@ -20,57 +37,146 @@ from marimo._plugins.ui._impl.dataframes.transforms import (
 
 if TYPE_CHECKING:
     import pandas as pd
+    import polars as pl
+    import pyarrow as pa  # type: ignore
+
+# Dataframes accepted by mo.ui.dataframe
+DataFrameType = Union["pd.DataFrame", "pl.DataFrame", "pa.Table"]
+
+T = TypeVar("T")
+
+# Bounds on the intermediate results cached by a TransformsContainer
+SNAPSHOT_CACHE_MAX_ENTRIES = int(
+    os.getenv("MARIMO_DATAFRAME_SNAPSHOT_CACHE_ENTRIES", 16)
+)
+SNAPSHOT_CACHE_MAX_BYTES = int(
+    os.getenv("MARIMO_DATAFRAME_SNAPSHOT_CACHE_BYTES", 256 * 1024 * 1024)
+)
+
 
+class TransformHandler(abc.ABC, Generic[T]):
+    """Applies transforms to the dataframes of one library.
+
+    Transforms operate on frames of type `T`. Dataframes are converted to
+    `T` with `lazy` before a sequence of transforms, and back with
+    `collect` after it.
+    """
+
+    @staticmethod
+    def lazy(df: Any) -> T:
+        return cast(T, df)
 
-class TransformHandlers:
     @staticmethod
-    def handle(df: "pd.DataFrame", transform: Transform) -> "pd.DataFrame":
+    def collect(df: T) -> Any:
+        return df
+
+    @staticmethod
+    @abc.abstractmethod
+    def memory_usage(df: Any) -> int:
+        """Estimated size in bytes of a collected dataframe."""
+        raise NotImplementedError
+
+    @classmethod
+    def handle(cls, df: T, transform: Transform) -> T:
         transform_type: TransformType = transform.type
 
         if transform_type is TransformType.COLUMN_CONVERSION:
-            return TransformHandlers.handle_column_conversion(
+            return cls.handle_column_conversion(
                 df, cast(ColumnConversionTransform, transform)
             )
         elif transform_type is TransformType.RENAME_COLUMN:
-            return TransformHandlers.handle_rename_column(
+            return cls.handle_rename_column(
                 df, cast(RenameColumnTransform, transform)
             )
         elif transform_type is TransformType.SORT_COLUMN:
-            return TransformHandlers.handle_sort_column(
+            return cls.handle_sort_column(
                 df, cast(SortColumnTransform, transform)
             )
         elif transform_type is TransformType.FILTER_ROWS:
-            return TransformHandlers.handle_filter_rows(
+            return cls.handle_filter_rows(
                 df, cast(FilterRowsTransform, transform)
             )
         elif transform_type is TransformType.GROUP_BY:
-            return TransformHandlers.handle_group_by(
-                df, cast(GroupByTransform, transform)
-            )
+            return cls.handle_group_by(df, cast(GroupByTransform, transform))
         elif transform_type is TransformType.AGGREGATE:
-            return TransformHandlers.handle_aggregate(
+            return cls.handle_aggregate(
                 df, cast(AggregateTransform, transform)
             )
         elif transform_type is TransformType.SELECT_COLUMNS:
-            return TransformHandlers.handle_select_columns(
+            return cls.handle_select_columns(
                 df, cast(SelectColumnsTransform, transform)
             )
         elif transform_type is TransformType.SHUFFLE_ROWS:
-            return TransformHandlers.handle_shuffle_rows(
+            return cls.handle_shuffle_rows(
                 df, cast(ShuffleRowsTransform, transform)
             )
         elif transform_type is TransformType.SAMPLE_ROWS:
-            return TransformHandlers.handle_sample_rows(
+            return cls.handle_sample_rows(
                 df, cast(SampleRowsTransform, transform)
             )
 
         else:
             _assert_never(transform_type)
 
+    @staticmethod
+    @abc.abstractmethod
+    def handle_column_conversion(
+        df: T, transform: ColumnConversionTransform
+    ) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_rename_column(df: T, transform: RenameColumnTransform) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_sort_column(df: T, transform: SortColumnTransform) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_filter_rows(df: T, transform: FilterRowsTransform) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_group_by(df: T, transform: GroupByTransform) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_aggregate(df: T, transform: AggregateTransform) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_select_columns(df: T, transform: SelectColumnsTransform) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_shuffle_rows(df: T, transform: ShuffleRowsTransform) -> T:
+        raise NotImplementedError
+
+    @staticmethod
+    @abc.abstractmethod
+    def handle_sample_rows(df: T, transform: SampleRowsTransform) -> T:
+        raise NotImplementedError
+
+
+class PandasTransformHandler(TransformHandler["pd.DataFrame"]):
+    @staticmethod
+    def memory_usage(df: Any) -> int:
+        return int(cast("pd.DataFrame", df).memory_usage(deep=True).sum())
+
     @staticmethod
     def handle_column_conversion(
         df: "pd.DataFrame", transform: ColumnConversionTransform
     ) -> "pd.DataFrame":
+        # Don't modify the input, which may be a cached result
+        df = df.copy(deep=False)
         df[transform.column_id] = df[transform.column_id].astype(
             transform.data_type,
             errors=transform.errors,
@@ -93,6 +199,8 @@ class TransformHandlers:
             by=cast(str, transform.column_id),
             ascending=transform.ascending,
             na_position=transform.na_position,
+            # Stable, so that filters can be applied before sorting
+            kind="stable",
         )
 
     @staticmethod
@@ -209,14 +317,469 @@ class TransformHandlers:
         )
 
 
+class PolarsTransformHandler(TransformHandler["pl.LazyFrame"]):
+    """Transforms polars dataframes as a LazyFrame, so that a sequence of
+    transforms runs as a single query."""
+
+    @staticmethod
+    def lazy(df: Any) -> pl.LazyFrame:
+        return cast("pl.DataFrame", df).lazy()
+
+    @staticmethod
+    def collect(df: pl.LazyFrame) -> pl.DataFrame:
+        return df.collect()
+
+    @staticmethod
+    def memory_usage(df: Any) -> int:
+        return int(cast("pl.DataFrame", df).estimated_size())
+
+    @staticmethod
+    def handle_column_conversion(
+        df: pl.LazyFrame, transform: ColumnConversionTransform
+    ) -> pl.LazyFrame:
+        import polars as pl
+
+        column = pl.col(str(transform.column_id)).cast(
+            _polars_dtype(transform.data_type)
+        )
+        if transform.errors == "ignore":
+            # Keep the column as is if any value can't be converted, which
+            # is only known once the conversion runs
+            try:
+                df.select(column).collect()
+            except (
+                pl.exceptions.ComputeError,
+                pl.exceptions.InvalidOperationError,
+            ):
+                return df
+        return df.with_columns(column)
+
+    @staticmethod
+    def handle_rename_column(
+        df: pl.LazyFrame, transform: RenameColumnTransform
+    ) -> pl.LazyFrame:
+        return df.rename(
+            {str(transform.column_id): str(transform.new_column_id)}
+        )
+
+    @staticmethod
+    def handle_sort_column(
+        df: pl.LazyFrame, transform: SortColumnTransform
+    ) -> pl.LazyFrame:
+        return df.sort(
+            str(transform.column_id),
+            descending=not transform.ascending,
+            nulls_last=transform.na_position == "last",
+            # Stable, so that filters can be applied before sorting
+            maintain_order=True,
+        )
+
+    @staticmethod
+    def handle_filter_rows(
+        df: pl.LazyFrame, transform: FilterRowsTransform
+    ) -> pl.LazyFrame:
+        import polars as pl
+
+        schema = df.schema
+        for condition in transform.where:
+            column_id = str(condition.column_id)
+            if column_id not in schema:
+                raise KeyError(condition.column_id)
+            column = pl.col(column_id)
+            value: Any = condition.value
+            if condition.operator in _COMPARISON_OPERATORS:
+                dtype = schema[column_id]
+                if isinstance(value, str) and dtype in pl.TEMPORAL_DTYPES:
+                    value = pl.lit(value).str.to_datetime().cast(dtype)
+                else:
+                    value = pl.lit(value).cast(dtype)
+
+            if condition.operator == "==":
+                df_filter = column == value
+            elif condition.operator == "!=":
+                df_filter = column != value
+            elif condition.operator == ">":
+                df_filter = column > value
+            elif condition.operator == "<":
+                df_filter = column < value
+            elif condition.operator == ">=":
+                df_filter = column >= value
+            elif condition.operator == "<=":
+                df_filter = column <= value
+            elif condition.operator == "is_true":
+                df_filter = column.eq(True)
+            elif condition.operator == "is_false":
+                df_filter = column.eq(False)
+            elif condition.operator == "is_nan":
+                df_filter = _polars_is_missing(column, schema[column_id])
+            elif condition.operator == "is_not_nan":
+                df_filter = ~_polars_is_missing(column, schema[column_id])
+            elif condition.operator == "equals":
+                df_filter = column == value
+            elif condition.operator == "does_not_equal":
+                df_filter = column != value
+            elif condition.operator == "contains":
+                df_filter = column.str.contains(value, literal=True)
+            elif condition.operator == "regex":
+                df_filter = column.str.contains(value)
+            elif condition.operator == "starts_with":
+                df_filter = column.str.starts_with(value)
+            elif condition.operator == "ends_with":
+                df_filter = column.str.ends_with(value)
+            elif condition.operator == "in":
+                df_filter = column.is_in(value)
+            else:
+                _assert_never(condition.operator)
+
+            # As in pandas, rows with missing values don't match
+            df_filter = df_filter.fill_null(False)
+            if transform.operation == "keep_rows":
+                df = df.filter(df_filter)
+            elif transform.operation == "remove_rows":
+                df = df.filter(~df_filter)
+            else:
+                _assert_never(transform.operation)
+        return df
+
+    @staticmethod
+    def handle_group_by(
+        df: pl.LazyFrame, transform: GroupByTransform
+    ) -> pl.LazyFrame:
+        import polars as pl
+
+        column_ids = [str(column_id) for column_id in transform.column_ids]
+        if transform.drop_na:
+            df = df.drop_nulls(column_ids)
+        aggregation = transform.aggregation
+        columns = [
+            column
+            for column, dtype in df.schema.items()
+            if column not in column_ids
+            and (
+                aggregation in ("count", "min", "max")
+                or dtype in pl.NUMERIC_DTYPES
+            )
+        ]
+        return (
+            df.group_by(column_ids)
+            .agg(
+                [getattr(pl.col(column), aggregation)() for column in columns]
+            )
+            .sort(column_ids, nulls_last=True)
+        )
+
+    @staticmethod
+    def handle_aggregate(
+        df: pl.LazyFrame, transform: AggregateTransform
+    ) -> pl.LazyFrame:
+        import polars as pl
+
+        # One row, with a column for each column and aggregation
+        return df.select(
+            [
+                getattr(pl.col(str(column_id)), aggregation)().alias(
+                    f"{column_id}_{aggregation}"
+                )
+                for column_id in transform.column_ids
+                for aggregation in transform.aggregations
+            ]
+        )
+
+    @staticmethod
+    def handle_select_columns(
+        df: pl.LazyFrame, transform: SelectColumnsTransform
+    ) -> pl.LazyFrame:
+        return df.select(
+            [str(column_id) for column_id in transform.column_ids]
+        )
+
+    @staticmethod
+    def handle_shuffle_rows(
+        df: pl.LazyFrame, transform: ShuffleRowsTransform
+    ) -> pl.LazyFrame:
+        # Lazy frames can't be sampled
+        return (
+            df.collect()
+            .sample(fraction=1, shuffle=True, seed=transform.seed)
+            .lazy()
+        )
+
+    @staticmethod
+    def handle_sample_rows(
+        df: pl.LazyFrame, transform: SampleRowsTransform
+    ) -> pl.LazyFrame:
+        return (
+            df.collect()
+            .sample(
+                n=transform.n,
+                with_replacement=transform.replace,
+                seed=transform.seed,
+            )
+            .lazy()
+        )
+
+
+class PyArrowTransformHandler(TransformHandler["pa.Table"]):
+    """Transforms pyarrow tables with Arrow compute functions."""
+
+    @staticmethod
+    def memory_usage(df: Any) -> int:
+        return int(cast("pa.Table", df).nbytes)
+
+    @staticmethod
+    def handle_column_conversion(
+        df: pa.Table, transform: ColumnConversionTransform
+    ) -> pa.Table:
+        import pyarrow as pa
+        import pyarrow.compute as pc  # type: ignore
+
+        index = df.schema.get_field_index(str(transform.column_id))
+        if index < 0:
+            raise KeyError(transform.column_id)
+        try:
+            column = pc.cast(
+                df.column(index), _pyarrow_dtype(transform.data_type)
+            )
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            if transform.errors == "ignore":
+                return df
+            raise
+        return df.set_column(index, df.field(index).name, column)
+
+    @staticmethod
+    def handle_rename_column(
+        df: pa.Table, transform: RenameColumnTransform
+    ) -> pa.Table:
+        return df.rename_columns(
+            [
+                str(transform.new_column_id)
+                if name == str(transform.column_id)
+                else name
+                for name in df.column_names
+            ]
+        )
+
+    @staticmethod
+    def handle_sort_column(
+        df: pa.Table, transform: SortColumnTransform
+    ) -> pa.Table:
+        import pyarrow.compute as pc  # type: ignore
+
+        indices = pc.array_sort_indices(
+            df.column(str(transform.column_id)),
+            order="ascending" if transform.ascending else "descending",
+            null_placement=(
+                "at_end" if transform.na_position == "last" else "at_start"
+            ),
+        )
+        return df.take(indices)
+
+    @staticmethod
+    def handle_filter_rows(
+        df: pa.Table, transform: FilterRowsTransform
+    ) -> pa.Table:
+        import pyarrow as pa
+        import pyarrow.compute as pc  # type: ignore
+
+        for condition in transform.where:
+            column_id = str(condition.column_id)
+            if column_id not in df.column_names:
+                raise KeyError(condition.column_id)
+            column = df.column(column_id)
+            value: Any = condition.value
+            if condition.operator in _COMPARISON_OPERATORS:
+                value = pc.cast(pa.scalar(value), column.type)
+
+            if condition.operator == "==":
+                df_filter = pc.equal(column, value)
+            elif condition.operator == "!=":
+                df_filter = pc.not_equal(column, value)
+            elif condition.operator == ">":
+                df_filter = pc.greater(column, value)
+            elif condition.operator == "<":
+                df_filter = pc.less(column, value)
+            elif condition.operator == ">=":
+                df_filter = pc.greater_equal(column, value)
+            elif condition.operator == "<=":
+                df_filter = pc.less_equal(column, value)
+            elif condition.operator == "is_true":
+                df_filter = pc.equal(column, True)
+            elif condition.operator == "is_false":
+                df_filter = pc.equal(column, False)
+            elif condition.operator == "is_nan":
+                df_filter = pc.is_null(column, nan_is_null=True)
+            elif condition.operator == "is_not_nan":
+                df_filter = pc.invert(pc.is_null(column, nan_is_null=True))
+            elif condition.operator == "equals":
+                df_filter = pc.equal(column, value)
+            elif condition.operator == "does_not_equal":
+                df_filter = pc.not_equal(column, value)
+            elif condition.operator == "contains":
+                df_filter = pc.match_substring(column, value)
+            elif condition.operator == "regex":
+                df_filter = pc.match_substring_regex(column, value)
+            elif condition.operator == "starts_with":
+                df_filter = pc.starts_with(column, value)
+            elif condition.operator == "ends_with":
+                df_filter = pc.ends_with(column, value)
+            elif condition.operator == "in":
+                df_filter = pc.is_in(
+                    column, value_set=pa.array(value, type=column.type)
+                )
+            else:
+                _assert_never(condition.operator)
+
+            # As in pandas, rows with missing values don't match
+            df_filter = pc.fill_null(df_filter, False)
+            if transform.operation == "keep_rows":
+                df = df.filter(df_filter)
+            elif transform.operation == "remove_rows":
+                df = df.filter(pc.invert(df_filter))
+            else:
+                _assert_never(transform.operation)
+        return df
+
+    @staticmethod
+    def handle_group_by(df: pa.Table, transform: GroupByTransform) -> pa.Table:
+        import pyarrow.compute as pc  # type: ignore
+
+        column_ids = [str(column_id) for column_id in transform.column_ids]
+        if transform.drop_na:
+            for column_id in column_ids:
+                df = df.filter(pc.is_valid(df.column(column_id)))
+        aggregation = transform.aggregation
+        columns = [
+            field.name
+            for field in df.schema
+            if field.name not in column_ids
+            and (
+                aggregation in ("count", "min", "max")
+                or _is_pyarrow_numeric(field.type)
+            )
+        ]
+        function = _pyarrow_aggregation(aggregation)
+        grouped = df.group_by(column_ids).aggregate(
+            [(column, function) for column in columns]
+        )
+        # Aggregated columns are named `{column}_{function}`
+        grouped = grouped.select(
+            column_ids + [f"{column}_{function}" for column in columns]
+        ).rename_columns(column_ids + columns)
+        indices = pc.sort_indices(
+            grouped,
+            sort_keys=[(column_id, "ascending") for column_id in column_ids],
+        )
+        return grouped.take(indices)
+
+    @staticmethod
+    def handle_aggregate(
+        df: pa.Table, transform: AggregateTransform
+    ) -> pa.Table:
+        import pyarrow as pa
+        import pyarrow.compute as pc  # type: ignore
+
+        # One row, with a column for each column and aggregation
+        columns: Dict[str, Any] = {}
+        for column_id in transform.column_ids:
+            column = df.column(str(column_id))
+            for aggregation in transform.aggregations:
+                scalar = getattr(pc, _pyarrow_aggregation(aggregation))(column)
+                columns[f"{column_id}_{aggregation}"] = pa.array(
+                    [scalar.as_py()], type=scalar.type
+                )
+        return pa.table(columns)
+
+    @staticmethod
+    def handle_select_columns(
+        df: pa.Table, transform: SelectColumnsTransform
+    ) -> pa.Table:
+        return df.select(
+            [str(column_id) for column_id in transform.column_ids]
+        )
+
+    @staticmethod
+    def handle_shuffle_rows(
+        df: pa.Table, transform: ShuffleRowsTransform
+    ) -> pa.Table:
+        indices = list(range(df.num_rows))
+        random.Random(transform.seed).shuffle(indices)
+        return df.take(indices)
+
+    @staticmethod
+    def handle_sample_rows(
+        df: pa.Table, transform: SampleRowsTransform
+    ) -> pa.Table:
+        rows = range(df.num_rows)
+        rng = random.Random(transform.seed)
+        if transform.replace:
+            return df.take(rng.choices(rows, k=transform.n))
+        return df.take(rng.sample(rows, transform.n))
+
+
+def get_handler_for_dataframe(df: Any) -> TransformHandler[Any]:
+    """The transform handler for a dataframe's library."""
+    if DependencyManager.has_pandas():
+        import pandas as pd
+
+        if isinstance(df, pd.DataFrame):
+            return PandasTransformHandler()
+    if DependencyManager.has_polars():
+        import polars as pl
+
+        if isinstance(df, pl.DataFrame):
+            return PolarsTransformHandler()
+    if DependencyManager.has_pyarrow():
+        import pyarrow as pa
+
+        if isinstance(df, pa.Table):
+            return PyArrowTransformHandler()
+    raise ValueError(
+        "Unsupported dataframe type. Must be a pandas, polars or pyarrow "
+        f"dataframe; got {type(df)}"
+    )
+
+
 def apply_transforms(
-    df: "pd.DataFrame", transforms: Transformations
-) -> "pd.DataFrame":
+    df: DataFrameType,
+    transforms: Transformations,
+    handler: Optional[TransformHandler[Any]] = None,
+) -> DataFrameType:
     if not transforms.transforms:
         return df
-    for transform in transforms.transforms:
-        df = TransformHandlers.handle(df, transform)
-    return df
+    if handler is None:
+        handler = get_handler_for_dataframe(df)
+    frame = handler.lazy(df)
+    for transform in optimize_transforms(transforms.transforms):
+        frame = handler.handle(frame, transform)
+    return cast(DataFrameType, handler.collect(frame))
+
+
+def optimize_transforms(transforms: List[Transform]) -> List[Transform]:
+    """Reorder transforms so that rows and columns are dropped early.
+
+    Row filters, and column selections that keep the sorted column, are
+    moved before the sorts that precede them, so that fewer rows and columns
+    are sorted. Sorts are stable, so the result is unchanged. Polars also
+    optimizes the query it builds, but pandas and pyarrow apply transforms
+    in order.
+    """
+    optimized: List[Transform] = []
+    for transform in transforms:
+        index = len(optimized)
+        while index > 0 and _can_apply_before(transform, optimized[index - 1]):
+            index -= 1
+        optimized.insert(index, transform)
+    return optimized
+
+
+def _can_apply_before(transform: Transform, previous: Transform) -> bool:
+    if previous.type is not TransformType.SORT_COLUMN:
+        return False
+    if transform.type is TransformType.FILTER_ROWS:
+        return True
+    if transform.type is TransformType.SELECT_COLUMNS:
+        return previous.column_id in transform.column_ids
+    return False
 
 
 def _assert_never(value: NoReturn) -> NoReturn:
@@ -231,64 +794,174 @@ def _coerce_value(dtype: Any, value: Any) -> Any:
 
 class TransformsContainer:
     """
-    Keeps internal state of the last transformation applied to the dataframe.
-    So that we can incrementally apply transformations.
+    Keeps the results of transformations applied to the dataframe, so that
+    we can incrementally apply transformations.
+
+    Results are cached by the transforms that produced them, which are a
+    prefix of the transforms applied later: new transforms are applied to
+    the result of the longest cached prefix, one at a time, and the result
+    of each is cached. Adding a transform only applies that transform, and
+    editing or removing the k-th transform re-applies transforms from the
+    k-th on. Since each result is cached, transforms applied together are
+    not reordered by `optimize_transforms`. The least recently used results
+    are evicted when there are more than `max_entries` of them, or when
+    they take more than an estimated `max_bytes` of memory.
     """
 
-    def __init__(self, df: "pd.DataFrame") -> None:
+    def __init__(
+        self,
+        df: DataFrameType,
+        handler: Optional[TransformHandler[Any]] = None,
+        max_entries: int = SNAPSHOT_CACHE_MAX_ENTRIES,
+        max_bytes: int = SNAPSHOT_CACHE_MAX_BYTES,
+    ) -> None:
         self._original_df = df
-        # The dataframe for the given transform.
-        self._snapshot_df = df
-        self._transforms: List[Transform] = []
-
-    def apply(self, transform: Transformations) -> "pd.DataFrame":
+        self._handler = handler or get_handler_for_dataframe(df)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        # Results and their sizes, keyed by the transforms that produced
+        # them, least recently used first
+        self._snapshots: OrderedDict[
+            Tuple[str, ...], Tuple[DataFrameType, int]
+        ] = OrderedDict()
+        self._snapshots_size = 0
+
+    def apply(self, transform: Transformations) -> DataFrameType:
         """
         Applies the given transformations to the dataframe.
         """
-        # If the new transformations are a superset of the existing ones,
-        # then we can just apply the new ones to the snapshot dataframe.
-        if self._is_superset(transform):
-            transforms_to_apply = self._get_next_transformations(transform)
-            self._snapshot_df = apply_transforms(
-                self._snapshot_df, transforms_to_apply
+        transforms = transform.transforms
+        key = _transforms_key(transforms)
+        start, df = 0, self._original_df
+        for end in range(len(transforms), 0, -1):
+            snapshot = self._snapshots.get(key[:end])
+            if snapshot is not None:
+                self._snapshots.move_to_end(key[:end])
+                start, df = end, snapshot[0]
+                break
+
+        for end in range(start + 1, len(transforms) + 1):
+            df = apply_transforms(
+                df, Transformations([transforms[end - 1]]), self._handler
             )
-            self._transforms = transform.transforms
-            return self._snapshot_df
-
-        # If the new transformations are not a superset of the existing ones,
-        # then we need to start from the original dataframe.
-        else:
-            self._snapshot_df = apply_transforms(self._original_df, transform)
-            self._transforms = transform.transforms
-            return self._snapshot_df
-
-    def _is_superset(self, transforms: Transformations) -> bool:
-        """
-        Checks if the new transformations are a superset of the existing ones.
-        """
-        if not self._transforms:
-            return False
-
-        # If the new transformations are smaller than the existing ones,
-        # then it's not a superset.
-        if len(self._transforms) > len(transforms.transforms):
-            return False
+            self._cache(key[:end], df)
+        return df
 
-        for i, transform in enumerate(self._transforms):
-            if transform != transforms.transforms[i]:
-                return False
+    def _cache(self, key: Tuple[str, ...], df: DataFrameType) -> None:
+        size = self._handler.memory_usage(df)
+        if size > self._max_bytes:
+            return
+        self._snapshots[key] = (df, size)
+        self._snapshots_size += size
+        while (
+            len(self._snapshots) > self._max_entries
+            or self._snapshots_size > self._max_bytes
+        ):
+            _, (_, evicted_size) = self._snapshots.popitem(last=False)
+            self._snapshots_size -= evicted_size
+
+
+def _transforms_key(transforms: List[Transform]) -> Tuple[str, ...]:
+    # Transforms aren't hashable, but their reprs identify them
+    return tuple(repr(transform) for transform in transforms)
+
+
+# Operators whose value is coerced to the column's type
+_COMPARISON_OPERATORS = (
+    "==",
+    "!=",
+    ">",
+    "<",
+    ">=",
+    "<=",
+    "equals",
+    "does_not_equal",
+)
 
-        return True
 
-    def _get_next_transformations(
-        self, transforms: Transformations
-    ) -> Transformations:
-        """
-        Gets the next transformations to apply.
-        """
-        if self._is_superset(transforms):
-            return Transformations(
-                transforms.transforms[len(self._transforms) :]
-            )
-        else:
-            return transforms
+def _polars_dtype(data_type: str) -> Any:
+    """The polars type for a numpy data type name."""
+    import polars as pl
+
+    dtypes: Dict[str, Any] = {
+        "int8": pl.Int8,
+        "int16": pl.Int16,
+        "int32": pl.Int32,
+        "int64": pl.Int64,
+        "int": pl.Int64,
+        "uint8": pl.UInt8,
+        "uint16": pl.UInt16,
+        "uint32": pl.UInt32,
+        "uint64": pl.UInt64,
+        "float16": pl.Float32,
+        "float32": pl.Float32,
+        "float64": pl.Float64,
+        "float128": pl.Float64,
+        "float": pl.Float64,
+        "bool": pl.Boolean,
+        "object": pl.Utf8,
+        "string_": pl.Utf8,
+        "unicode_": pl.Utf8,
+        "str": pl.Utf8,
+        "datetime64": pl.Datetime,
+        "timedelta64": pl.Duration,
+    }
+    if data_type not in dtypes:
+        raise ValueError(f"Unsupported data type for polars: {data_type}")
+    return dtypes[data_type]
+
+
+def _polars_is_missing(column: Any, dtype: Any) -> Any:
+    # Unlike pandas and pyarrow, polars doesn't treat NaN as missing
+    import polars as pl
+
+    if dtype in pl.FLOAT_DTYPES:
+        return column.is_null() | column.is_nan()
+    return column.is_null()
+
+
+def _pyarrow_dtype(data_type: str) -> Any:
+    """The pyarrow type for a numpy data type name."""
+    import pyarrow as pa
+
+    dtypes: Dict[str, Any] = {
+        "int8": pa.int8(),
+        "int16": pa.int16(),
+        "int32": pa.int32(),
+        "int64": pa.int64(),
+        "int": pa.int64(),
+        "uint8": pa.uint8(),
+        "uint16": pa.uint16(),
+        "uint32": pa.uint32(),
+        "uint64": pa.uint64(),
+        "float16": pa.float16(),
+        "float32": pa.float32(),
+        "float64": pa.float64(),
+        "float128": pa.float64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "object": pa.string(),
+        "string_": pa.string(),
+        "unicode_": pa.string(),
+        "str": pa.string(),
+        "datetime64": pa.timestamp("ns"),
+        "timedelta64": pa.duration("ns"),
+    }
+    if data_type not in dtypes:
+        raise ValueError(f"Unsupported data type for pyarrow: {data_type}")
+    return dtypes[data_type]
+
+
+def _is_pyarrow_numeric(dtype: Any) -> bool:
+    import pyarrow as pa
+
+    return bool(
+        pa.types.is_integer(dtype)
+        or pa.types.is_floating(dtype)
+        or pa.types.is_decimal(dtype)
+    )
+
+
+def _pyarrow_aggregation(aggregation: str) -> str:
+    # Arrow only computes approximate medians
+    return "approximate_median" if aggregation == "median" else aggregation
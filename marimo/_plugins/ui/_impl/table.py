@@ -22,6 +22,9 @@ from marimo._output.rich_help import mddoc
 from marimo._plugins.core.web_component import JSONType
 from marimo._plugins.ui._core.ui_element import UIElement
 from marimo._plugins.ui._impl.tables.table_manager import (
+    ColumnName,
+    ColumnSummary,
+    DataFormat,
     TableManager,
 )
 from marimo._plugins.ui._impl.tables.utils import get_table_manager
@@ -42,6 +45,45 @@ class DownloadAsArgs:
     format: Literal["csv", "json"]
 
 
+@dataclass
+class SortArgs:
+    by: ColumnName
+    descending: bool
+
+
+@dataclass
+class SearchTableArgs:
+    page_size: int
+    page_number: int
+    query: Optional[str] = None
+    sort: Optional[SortArgs] = None
+    # format of the page's data; clients that can read Arrow IPC may
+    # request it instead of CSV
+    format: DataFormat = "csv"
+
+
+@dataclass
+class SearchTableResponse:
+    data: JSONType
+    total_rows: int
+
+
+class ColumnNotFound(Exception):
+    def __init__(self, column: str):
+        self.column = column
+        super().__init__(f"Column {column} does not exist")
+
+
+@dataclass
+class GetColumnSummariesArgs:
+    columns: List[ColumnName]
+
+
+@dataclass
+class GetColumnSummariesResponse:
+    summaries: Dict[ColumnName, ColumnSummary]
+
+
 @mddoc
 class table(
     UIElement[List[str], Union[List[JSONType], "pd.DataFrame", "pl.DataFrame"]]
@@ -114,7 +156,10 @@ class table(
           entry is a list representing a column
         - as a single column: a list of values
     - `pagination`: whether to paginate; if `False`, all rows will be shown
-      defaults to `True` when above 10 rows, `False` otherwise
+      defaults to `True` when above 10 rows, `False` otherwise. Paginated
+      tables with more than 10,000 rows are paged, sorted and searched in
+      the kernel, which only sends the rows of the current page; other
+      tables are truncated to 10,000 rows.
     - `page_size`: the number of rows to show per page.
       defaults to 10
     - `selection`: 'single' or 'multi' to enable row selection, or `None` to
@@ -159,14 +204,25 @@ class table(
         self._manager = get_table_manager(data)
         self._filtered_manager: Optional[TableManager[Any]] = None
 
-        totalRows = len(self._manager.data)
-        hasMore = totalRows > TableManager.DEFAULT_LIMIT
+        totalRows = self._manager.get_num_rows()
+        # pagination defaults to True if there are more than 10 rows
+        if pagination is None:
+            pagination = totalRows > 10
+
+        # Large paginated tables are sent a page at a time
+        lazy = pagination and totalRows > TableManager.DEFAULT_LIMIT
+        hasMore = not lazy and totalRows > TableManager.DEFAULT_LIMIT
         if hasMore:
             self._manager = self._manager.limit(TableManager.DEFAULT_LIMIT)
 
-        # pagination defaults to True if there are more than 10 rows
-        if pagination is None:
-            pagination = len(self._data) > 10
+        # Rows of the current search, in which rows are selected
+        self._searched_manager = self._manager
+        self._search_key: tuple[Optional[str], Optional[SortArgs]] = (
+            None,
+            None,
+        )
+        # Column summaries, computed on first request
+        self._summaries: Dict[ColumnName, ColumnSummary] = {}
 
         can_download = (
             DependencyManager.has_pandas() or DependencyManager.has_polars()
@@ -178,7 +234,12 @@ class table(
             label=label,
             initial_value=[],
             args={
-                "data": self._manager.to_data(),
+                "data": (
+                    self._manager.slice(0, page_size).to_data()
+                    if lazy
+                    else self._manager.to_data()
+                ),
+                "lazy": lazy,
                 "has-more": hasMore,
                 "total-rows": totalRows,
                 "pagination": pagination,
@@ -195,6 +256,16 @@ class table(
                     arg_cls=DownloadAsArgs,
                     function=self.download_as,
                 ),
+                Function(
+                    name=self.search.__name__,
+                    arg_cls=SearchTableArgs,
+                    function=self.search,
+                ),
+                Function(
+                    name=self.get_column_summaries.__name__,
+                    arg_cls=GetColumnSummariesArgs,
+                    function=self.get_column_summaries,
+                ),
             ),
         )
 
@@ -208,7 +279,7 @@ class table(
         self, value: list[str]
     ) -> Union[List[JSONType], "pd.DataFrame", "pl.DataFrame"]:
         indices = [int(v) for v in value]
-        self._filtered_manager = self._manager.select_rows(indices)
+        self._filtered_manager = self._searched_manager.select_rows(indices)
         self._has_any_selection = len(indices) > 0
         return self._filtered_manager.data  # type: ignore[no-any-return]
 
@@ -227,3 +298,44 @@ class table(
             return mo_data.json(manager.to_json()).url
         else:
             raise ValueError("format must be one of 'csv' or 'json'.")
+
+    def search(self, args: SearchTableArgs) -> SearchTableResponse:
+        """Search and sort the rows, and return one page of them.
+
+        Rows are selected by their position in the last search.
+        """
+        key = (args.query or None, args.sort)
+        if key != self._search_key:
+            manager = self._manager
+            if args.query:
+                manager = manager.search(args.query)
+            if args.sort:
+                manager = manager.sort_values(
+                    args.sort.by, args.sort.descending
+                )
+            self._searched_manager = manager
+            self._search_key = key
+
+        offset = args.page_number * args.page_size
+        return SearchTableResponse(
+            data=self._searched_manager.slice(offset, args.page_size).to_data(
+                args.format
+            ),
+            total_rows=self._searched_manager.get_num_rows(),
+        )
+
+    def get_column_summaries(
+        self, args: GetColumnSummariesArgs
+    ) -> GetColumnSummariesResponse:
+        """Summaries of columns of the table, which are cached."""
+        column_names = self._manager.get_column_names()
+        for column in args.columns:
+            if column not in column_names:
+                raise ColumnNotFound(column)
+            if column not in self._summaries:
+                self._summaries[column] = self._manager.get_summary(column)
+        return GetColumnSummariesResponse(
+            summaries={
+                column: self._summaries[column] for column in args.columns
+            }
+        )
@@ -5,6 +5,7 @@ from typing import (
     Any,
     Dict,
     List,
+    Optional,
     Sequence,
     Union,
     cast,
@@ -19,7 +20,13 @@ from marimo._plugins.ui._impl.tables.pandas_table import (
 from marimo._plugins.ui._impl.tables.polars_table import (
     PolarsTableManagerFactory,
 )
-from marimo._plugins.ui._impl.tables.table_manager import TableManager
+from marimo._plugins.ui._impl.tables.table_manager import (
+    ColumnName,
+    ColumnSummary,
+    DataFormat,
+    TableManager,
+    ValueCounts,
+)
 
 JsonTableData = Union[
     Sequence[Union[str, int, float, bool, MIME, None]],
@@ -33,7 +40,9 @@ class DefaultTableManager(TableManager[JsonTableData]):
     def __init__(self, data: JsonTableData):
         self.data = data
 
-    def to_data(self) -> JSONType:
+    def to_data(self, data_format: DataFormat = "csv") -> JSONType:
+        # Rows are sent as JSON, whatever the format
+        del data_format
         return self._normalize_data(self.data)
 
     def to_csv(self) -> bytes:
@@ -42,6 +51,9 @@ class DefaultTableManager(TableManager[JsonTableData]):
     def to_json(self) -> bytes:
         return self._as_table_manager().to_json()
 
+    def to_arrow_ipc(self) -> bytes:
+        return self._as_table_manager().to_arrow_ipc()
+
     def select_rows(self, indices: List[int]) -> DefaultTableManager:
         # Column major data
         if isinstance(self.data, dict):
@@ -62,9 +74,81 @@ class DefaultTableManager(TableManager[JsonTableData]):
             )
         return DefaultTableManager(self.data[:num])
 
+    def get_num_rows(self) -> int:
+        if isinstance(self.data, dict):
+            return len(next(iter(self.data.values()), []))
+        return len(self.data)
+
+    def slice(self, offset: int, num: int) -> DefaultTableManager:
+        if offset < 0 or num < 0:
+            raise ValueError("Offset and num must be positive")
+        if isinstance(self.data, dict):
+            return DefaultTableManager(
+                {
+                    key: value[offset : offset + num]
+                    for key, value in self.data.items()
+                }
+            )
+        return DefaultTableManager(self.data[offset : offset + num])
+
+    def sort_values(
+        self, by: ColumnName, descending: bool
+    ) -> DefaultTableManager:
+        rows = self._normalize_data(self.data)
+        present = [i for i, row in enumerate(rows) if row.get(by) is not None]
+        missing = [i for i, row in enumerate(rows) if row.get(by) is None]
+        try:
+            present.sort(key=lambda i: rows[i][by], reverse=descending)
+        except TypeError:
+            # Values of mixed types are sorted as strings
+            present.sort(key=lambda i: str(rows[i][by]), reverse=descending)
+        return self.select_rows(present + missing)
+
+    def search(self, query: str) -> DefaultTableManager:
+        query = query.lower()
+        return self.select_rows(
+            [
+                i
+                for i, row in enumerate(self._normalize_data(self.data))
+                if any(
+                    value is not None and query in str(value).lower()
+                    for value in row.values()
+                )
+            ]
+        )
+
     def get_row_headers(self) -> list[tuple[str, list[str | int | float]]]:
         return []
 
+    def get_column_names(self) -> list[ColumnName]:
+        # Columns of the rows, as named in the frontend
+        return (
+            DefaultTableManager(self._normalize_data(self.data))
+            ._as_table_manager()
+            .get_column_names()
+        )
+
+    def get_value_counts(
+        self,
+        column: ColumnName,
+        limit: int,
+        sample_size: Optional[int] = None,
+        prefix: Optional[str] = None,
+    ) -> ValueCounts:
+        return (
+            DefaultTableManager(self._normalize_data(self.data))
+            ._as_table_manager()
+            .get_value_counts(column, limit, sample_size, prefix)
+        )
+
+    def get_summary(self, column: ColumnName) -> ColumnSummary:
+        # Summarize the rows, so columns are named as in the frontend
+        return (
+            DefaultTableManager(self._normalize_data(self.data))
+            ._as_table_manager()
+            .get_summary(column)
+        )
+
     def _as_table_manager(self) -> TableManager[Any]:
         if DependencyManager.has_pandas():
             import pandas as pd
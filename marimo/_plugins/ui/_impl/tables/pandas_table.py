@@ -1,13 +1,22 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Optional, cast
 
 from marimo._plugins.ui._impl.tables.table_manager import (
+    SUMMARY_HISTOGRAM_BINS,
+    SUMMARY_SAMPLE_SIZE,
+    SUMMARY_TOP_K,
+    ColumnName,
+    ColumnSummary,
     FieldType,
     FieldTypes,
+    Histogram,
     TableManager,
     TableManagerFactory,
+    ValueCounts,
+    histogram_edges,
+    to_json_value,
 )
 
 
@@ -29,6 +38,17 @@ class PandasTableManagerFactory(TableManagerFactory):
             def to_json(self) -> bytes:
                 return self.data.to_json(orient="records").encode("utf-8")
 
+            def to_arrow_ipc(self) -> bytes:
+                import pyarrow as pa  # type: ignore
+
+                from marimo._plugins.ui._impl.tables.pyarrow_table import (
+                    PyArrowTableManagerFactory,
+                )
+
+                return PyArrowTableManagerFactory.create()(
+                    pa.Table.from_pandas(self.data, preserve_index=False)
+                ).to_arrow_ipc()
+
             def select_rows(
                 self, indices: list[int]
             ) -> TableManager[pd.DataFrame]:
@@ -119,6 +139,177 @@ class PandasTableManagerFactory(TableManagerFactory):
                     raise ValueError("Limit must be a positive integer")
                 return PandasTableManager(self.data.head(num))
 
+            def get_num_rows(self) -> int:
+                return len(self.data)
+
+            def slice(self, offset: int, num: int) -> PandasTableManager:
+                if offset < 0 or num < 0:
+                    raise ValueError("Offset and num must be positive")
+                return PandasTableManager(
+                    self.data.iloc[offset : offset + num]
+                )
+
+            def sort_values(
+                self, by: ColumnName, descending: bool
+            ) -> PandasTableManager:
+                column = self._get_column_label(by)
+                try:
+                    data = self.data.sort_values(
+                        column, ascending=not descending, na_position="last"
+                    )
+                except TypeError:
+                    # Values of mixed types are sorted as strings
+                    data = self.data.sort_values(
+                        column,
+                        ascending=not descending,
+                        na_position="last",
+                        key=lambda values: values.astype(str).where(
+                            values.notna()
+                        ),
+                    )
+                return PandasTableManager(data)
+
+            def _get_column_label(self, column: ColumnName) -> Any:
+                """The label of a column, given its name as sent by the
+                frontend, which is a string even for other labels."""
+                if column in self.data.columns:
+                    return column
+                for label in self.data.columns:
+                    if str(label) == column:
+                        return label
+                raise KeyError(column)
+
+            def search(self, query: str) -> PandasTableManager:
+                import numpy as np
+
+                query = query.lower()
+                mask = np.zeros(len(self.data), dtype=bool)
+                # Select columns by position, since names may be duplicated
+                for i in range(len(self.data.columns)):
+                    column = self.data.iloc[:, i]
+                    values = cast(
+                        "pd.Series[str]", column.astype(str)
+                    ).str.lower()
+                    mask |= (
+                        column.notna()
+                        & values.str.contains(query, regex=False)
+                    ).to_numpy()
+                return PandasTableManager(self.data[mask])
+
+            def get_column_names(self) -> list[ColumnName]:
+                return self.data.columns.tolist()
+
+            def get_unique_column_values(
+                self, column: ColumnName
+            ) -> list[Any]:
+                return self.data[column].unique().tolist()  # type: ignore[no-any-return]
+
+            def get_value_counts(
+                self,
+                column: ColumnName,
+                limit: int,
+                sample_size: Optional[int] = None,
+                prefix: Optional[str] = None,
+            ) -> ValueCounts:
+                series = self.data[column]
+                # Duplicate column names select a dataframe
+                if isinstance(series, pd.DataFrame):
+                    series = series.iloc[:, 0]
+                if prefix:
+                    # Missing values don't start with any prefix
+                    values = cast("pd.Series[str]", series.astype(str))
+                    series = series[
+                        series.notna()
+                        & values.str.lower().str.startswith(prefix.lower())
+                    ]
+
+                scale = 1.0
+                if sample_size is not None and len(series) > sample_size:
+                    scale = len(series) / sample_size
+                    series = series.sample(sample_size, random_state=0)
+                counts = series.value_counts(dropna=False)
+                return ValueCounts(
+                    values=[
+                        (to_json_value(value), round(count * scale))
+                        for value, count in counts.head(limit).items()
+                    ],
+                    unique=len(counts),
+                    sampled=scale != 1.0,
+                )
+
+            def get_summary(self, column: ColumnName) -> ColumnSummary:
+                import numpy as np
+
+                series = self.data[column]
+                # Duplicate column names select a dataframe
+                if isinstance(series, pd.DataFrame):
+                    series = series.iloc[:, 0]
+
+                summary = ColumnSummary(
+                    total=len(series), nulls=int(series.isna().sum())
+                )
+                sample = series.dropna()
+                if len(sample) > SUMMARY_SAMPLE_SIZE:
+                    sample = sample.sample(SUMMARY_SAMPLE_SIZE, random_state=0)
+                    summary.sampled = True
+                try:
+                    summary.unique = int(sample.nunique())
+                except TypeError:
+                    # Unhashable values, such as lists or dicts, can't be
+                    # counted
+                    pass
+
+                is_bool = pd.api.types.is_bool_dtype(series)
+                is_numeric = (
+                    pd.api.types.is_numeric_dtype(series)
+                    and not is_bool
+                    and not pd.api.types.is_complex_dtype(series)
+                )
+                if not is_numeric and not (
+                    pd.api.types.is_datetime64_any_dtype(series)
+                    or pd.api.types.is_timedelta64_dtype(series)
+                ):
+                    try:
+                        top = sample.value_counts().head(SUMMARY_TOP_K)
+                    except TypeError:
+                        return summary
+                    summary.top_values = [
+                        (to_json_value(value), int(count))
+                        for value, count in top.items()
+                    ]
+                    return summary
+                if len(sample) == 0:
+                    return summary
+
+                summary.min = to_json_value(series.min())
+                summary.max = to_json_value(series.max())
+                if not is_numeric:
+                    return summary
+                summary.mean = cast(
+                    Optional[float], to_json_value(float(series.mean()))
+                )
+
+                values = sample.to_numpy(dtype=float)
+                values = values[np.isfinite(values)]
+                if len(values) == 0:
+                    return summary
+                low, high = float(values.min()), float(values.max())
+                bins = np.zeros(len(values), dtype=np.int64)
+                if high > low:
+                    bins = np.clip(
+                        (values - low)
+                        * SUMMARY_HISTOGRAM_BINS
+                        // (high - low),
+                        0,
+                        SUMMARY_HISTOGRAM_BINS - 1,
+                    ).astype(np.int64)
+                counts = np.bincount(bins, minlength=SUMMARY_HISTOGRAM_BINS)
+                edges = histogram_edges(low, high)
+                summary.histogram = Histogram(
+                    edges=edges, counts=[int(count) for count in counts]
+                )
+                return summary
+
             @staticmethod
             def _get_field_type(
                 series: pd.Series[Any] | pd.DataFrame,
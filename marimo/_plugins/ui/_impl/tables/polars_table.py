@@ -1,13 +1,23 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
-from typing import Any
+import io
+from typing import Any, Optional, cast
 
 from marimo._plugins.ui._impl.tables.table_manager import (
+    SUMMARY_HISTOGRAM_BINS,
+    SUMMARY_SAMPLE_SIZE,
+    SUMMARY_TOP_K,
+    ColumnName,
+    ColumnSummary,
     FieldType,
     FieldTypes,
+    Histogram,
     TableManager,
     TableManagerFactory,
+    ValueCounts,
+    histogram_edges,
+    to_json_value,
 )
 
 
@@ -27,6 +37,15 @@ class PolarsTableManagerFactory(TableManagerFactory):
             def to_json(self) -> bytes:
                 return self.data.write_json(row_oriented=True).encode("utf-8")
 
+            def to_arrow_ipc(self) -> bytes:
+                kwargs: dict[str, Any] = {}
+                if hasattr(pl, "CompatLevel"):
+                    # Not all Arrow readers support string views
+                    kwargs["compat_level"] = pl.CompatLevel.oldest()
+                buffer = io.BytesIO()
+                self.data.write_ipc_stream(buffer, **kwargs)
+                return buffer.getvalue()
+
             def select_rows(
                 self, indices: list[int]
             ) -> TableManager[pl.DataFrame]:
@@ -54,6 +73,134 @@ class PolarsTableManagerFactory(TableManagerFactory):
                     raise ValueError("Limit must be a positive integer")
                 return PolarsTableManager(self.data.head(num))
 
+            def get_num_rows(self) -> int:
+                return self.data.height
+
+            def slice(self, offset: int, num: int) -> PolarsTableManager:
+                if offset < 0 or num < 0:
+                    raise ValueError("Offset and num must be positive")
+                return PolarsTableManager(self.data.slice(offset, num))
+
+            def sort_values(
+                self, by: ColumnName, descending: bool
+            ) -> PolarsTableManager:
+                return PolarsTableManager(
+                    self.data.sort(by, descending=descending, nulls_last=True)
+                )
+
+            def search(self, query: str) -> PolarsTableManager:
+                query = query.lower()
+                # Nested columns can't be cast to strings
+                expressions = [
+                    pl.col(column)
+                    .cast(pl.Utf8)
+                    .str.to_lowercase()
+                    .str.contains(query, literal=True)
+                    for column, dtype in self.data.schema.items()
+                    if dtype not in pl.NESTED_DTYPES
+                ]
+                if not expressions:
+                    return PolarsTableManager(self.data.clear())
+                return PolarsTableManager(
+                    self.data.filter(pl.any_horizontal(expressions))
+                )
+
+            def get_column_names(self) -> list[ColumnName]:
+                return self.data.columns
+
+            def get_unique_column_values(
+                self, column: ColumnName
+            ) -> list[Any]:
+                return self.data[column].unique().to_list()
+
+            def get_value_counts(
+                self,
+                column: ColumnName,
+                limit: int,
+                sample_size: Optional[int] = None,
+                prefix: Optional[str] = None,
+            ) -> ValueCounts:
+                series = self.data[column]
+                if prefix:
+                    # Missing values don't start with any prefix, and are
+                    # filtered out
+                    series = series.filter(
+                        series.cast(pl.Utf8)
+                        .str.to_lowercase()
+                        .str.starts_with(prefix.lower())
+                    )
+
+                scale = 1.0
+                if sample_size is not None and len(series) > sample_size:
+                    scale = len(series) / sample_size
+                    series = series.sample(sample_size, seed=0)
+                counts = series.value_counts(sort=True)
+                return ValueCounts(
+                    values=[
+                        (to_json_value(value), round(count * scale))
+                        for value, count in counts.head(limit).iter_rows()
+                    ],
+                    unique=counts.height,
+                    sampled=scale != 1.0,
+                )
+
+            def get_summary(self, column: ColumnName) -> ColumnSummary:
+                series = self.data[column]
+                summary = ColumnSummary(
+                    total=len(series), nulls=series.null_count()
+                )
+                sample = series.drop_nulls()
+                if len(sample) > SUMMARY_SAMPLE_SIZE:
+                    sample = sample.sample(SUMMARY_SAMPLE_SIZE, seed=0)
+                    summary.sampled = True
+                summary.unique = sample.n_unique()
+
+                dtype = series.dtype
+                is_numeric = dtype in pl.NUMERIC_DTYPES
+                if not is_numeric and dtype not in pl.TEMPORAL_DTYPES:
+                    top = sample.value_counts(sort=True).head(SUMMARY_TOP_K)
+                    summary.top_values = [
+                        (to_json_value(value), int(count))
+                        for value, count in top.iter_rows()
+                    ]
+                    return summary
+                if len(sample) == 0:
+                    return summary
+
+                summary.min = to_json_value(series.min())
+                summary.max = to_json_value(series.max())
+                if not is_numeric:
+                    return summary
+                summary.mean = cast(
+                    Optional[float], to_json_value(series.mean())
+                )
+
+                values = sample.cast(pl.Float64)
+                values = values.filter(values.is_finite())
+                if len(values) == 0:
+                    return summary
+                low = cast(float, values.min())
+                high = cast(float, values.max())
+                counts = [0] * SUMMARY_HISTOGRAM_BINS
+                if high > low:
+                    bins = (
+                        (
+                            (values - low)
+                            * SUMMARY_HISTOGRAM_BINS
+                            // (high - low)
+                        )
+                        .clip(0, SUMMARY_HISTOGRAM_BINS - 1)
+                        .cast(pl.Int64)
+                    )
+                    for index, count in bins.value_counts().iter_rows():
+                        counts[index] = int(count)
+                else:
+                    counts[0] = len(values)
+                summary.histogram = Histogram(
+                    edges=histogram_edges(low, high), counts=counts
+                )
+                return summary
+
             @staticmethod
             def _get_field_type(column: pl.Series) -> FieldType:
                 if column.is_utf8():
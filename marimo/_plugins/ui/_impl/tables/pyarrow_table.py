@@ -2,13 +2,23 @@
 from __future__ import annotations
 
 import io
-from typing import Any, Union, cast
+import random
+from typing import Any, List, Optional, Union, cast
 
 from marimo._plugins.ui._impl.tables.table_manager import (
+    SUMMARY_HISTOGRAM_BINS,
+    SUMMARY_SAMPLE_SIZE,
+    SUMMARY_TOP_K,
+    ColumnName,
+    ColumnSummary,
     FieldType,
     FieldTypes,
+    Histogram,
     TableManager,
     TableManagerFactory,
+    ValueCounts,
+    histogram_edges,
+    to_json_value,
 )
 
 
@@ -31,6 +41,12 @@ class PyArrowTableManagerFactory(TableManagerFactory):
                 csv.write_csv(self.data, buffer)
                 return buffer.getvalue()
 
+            def to_arrow_ipc(self) -> bytes:
+                sink = pa.BufferOutputStream()
+                with pa.ipc.new_stream(sink, self.data.schema) as writer:
+                    writer.write(self.data)
+                return cast(bytes, sink.getvalue().to_pybytes())
+
             def to_json(self) -> bytes:
                 # Arrow does not have a built-in JSON writer
                 return (
@@ -72,6 +88,181 @@ class PyArrowTableManagerFactory(TableManagerFactory):
                     raise ValueError("Limit must be a positive integer")
                 return PyArrowTableManager(self.data.take(list(range(num))))
 
+            def get_num_rows(self) -> int:
+                return cast(int, self.data.num_rows)
+
+            def slice(self, offset: int, num: int) -> PyArrowTableManager:
+                if offset < 0 or num < 0:
+                    raise ValueError("Offset and num must be positive")
+                return PyArrowTableManager(self.data.slice(offset, num))
+
+            def sort_values(
+                self, by: ColumnName, descending: bool
+            ) -> PyArrowTableManager:
+                import pyarrow.compute as pc  # type: ignore
+
+                # Missing values are placed last
+                indices = pc.sort_indices(
+                    self.data,
+                    sort_keys=[
+                        (by, "descending" if descending else "ascending")
+                    ],
+                )
+                return PyArrowTableManager(self.data.take(indices))
+
+            def search(self, query: str) -> PyArrowTableManager:
+                import pyarrow.compute as pc  # type: ignore
+
+                mask = None
+                for column in self.data.columns:
+                    # Nested columns can't be cast to strings
+                    if pa.types.is_nested(column.type):
+                        continue
+                    matches = pc.fill_null(
+                        pc.match_substring(
+                            pc.cast(column, pa.string()),
+                            query,
+                            ignore_case=True,
+                        ),
+                        False,
+                    )
+                    mask = matches if mask is None else pc.or_(mask, matches)
+                if mask is None:
+                    return self.select_rows([])
+                return PyArrowTableManager(self.data.filter(mask))
+
+            def get_column_names(self) -> list[ColumnName]:
+                return cast(List[ColumnName], self.data.column_names)
+
+            def get_unique_column_values(
+                self, column: ColumnName
+            ) -> list[Any]:
+                import pyarrow.compute as pc  # type: ignore
+
+                return cast(
+                    List[Any], pc.unique(self.data.column(column)).to_pylist()
+                )
+
+            def get_value_counts(
+                self,
+                column: ColumnName,
+                limit: int,
+                sample_size: Optional[int] = None,
+                prefix: Optional[str] = None,
+            ) -> ValueCounts:
+                import pyarrow.compute as pc  # type: ignore
+
+                array = self.data.column(column)
+                if prefix:
+                    # Missing values don't start with any prefix, and are
+                    # filtered out
+                    array = array.filter(
+                        pc.starts_with(
+                            pc.utf8_lower(pc.cast(array, pa.string())),
+                            prefix.lower(),
+                        )
+                    )
+
+                scale = 1.0
+                if sample_size is not None and len(array) > sample_size:
+                    scale = len(array) / sample_size
+                    indices = random.Random(0).sample(
+                        range(len(array)), sample_size
+                    )
+                    array = array.take(sorted(indices))
+                counts = pc.value_counts(array)
+                top = pc.sort_indices(
+                    counts.field("counts"), sort_keys=[("", "descending")]
+                )[:limit]
+                return ValueCounts(
+                    values=[
+                        (
+                            to_json_value(value["values"]),
+                            round(value["counts"] * scale),
+                        )
+                        for value in counts.take(top).to_pylist()
+                    ],
+                    unique=len(counts),
+                    sampled=scale != 1.0,
+                )
+
+            def get_summary(self, column: ColumnName) -> ColumnSummary:
+                import pyarrow.compute as pc  # type: ignore
+
+                array = self.data.column(column)
+                summary = ColumnSummary(
+                    total=len(array), nulls=array.null_count
+                )
+                sample = pc.drop_null(array)
+                if len(sample) > SUMMARY_SAMPLE_SIZE:
+                    indices = random.Random(0).sample(
+                        range(len(sample)), SUMMARY_SAMPLE_SIZE
+                    )
+                    sample = sample.take(sorted(indices))
+                    summary.sampled = True
+                summary.unique = pc.count_distinct(sample).as_py()
+
+                dtype = array.type
+                is_numeric = (
+                    pa.types.is_integer(dtype)
+                    or pa.types.is_floating(dtype)
+                    or pa.types.is_decimal(dtype)
+                )
+                if not is_numeric and not pa.types.is_temporal(dtype):
+                    counts = pc.value_counts(sample)
+                    top = pc.sort_indices(
+                        counts.field("counts"), sort_keys=[("", "descending")]
+                    )[:SUMMARY_TOP_K]
+                    summary.top_values = [
+                        (to_json_value(value["values"]), value["counts"])
+                        for value in counts.take(top).to_pylist()
+                    ]
+                    return summary
+                if len(sample) == 0:
+                    return summary
+
+                min_max = pc.min_max(array)
+                summary.min = to_json_value(min_max["min"].as_py())
+                summary.max = to_json_value(min_max["max"].as_py())
+                if not is_numeric:
+                    return summary
+                summary.mean = cast(
+                    Optional[float], to_json_value(pc.mean(array).as_py())
+                )
+
+                values = pc.cast(sample, pa.float64())
+                values = values.filter(pc.is_finite(values))
+                if len(values) == 0:
+                    return summary
+                min_max = pc.min_max(values)
+                low = cast(float, min_max["min"].as_py())
+                high = cast(float, min_max["max"].as_py())
+                counts = [0] * SUMMARY_HISTOGRAM_BINS
+                if high > low:
+                    bins = pc.cast(
+                        pc.min_element_wise(
+                            pc.floor(
+                                pc.divide(
+                                    pc.multiply(
+                                        pc.subtract(values, low),
+                                        float(SUMMARY_HISTOGRAM_BINS),
+                                    ),
+                                    high - low,
+                                )
+                            ),
+                            float(SUMMARY_HISTOGRAM_BINS - 1),
+                        ),
+                        pa.int64(),
+                    )
+                    for value in pc.value_counts(bins).to_pylist():
+                        counts[value["values"]] = value["counts"]
+                else:
+                    counts[0] = len(values)
+                summary.histogram = Histogram(
+                    edges=histogram_edges(low, high), counts=counts
+                )
+                return summary
+
             @staticmethod
             def _get_field_type(column: pa.Array[Any, Any]) -> FieldType:
                 if isinstance(column, pa.NullArray):
@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 import abc
-from typing import Any, Dict, Generic, Literal, TypeVar
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Generic, List, Literal, Optional, Tuple, TypeVar
 
 import marimo._output.data.data as mo_data
 from marimo._plugins.core.web_component import JSONType
@@ -16,6 +18,75 @@ FieldType = Literal[
 ]
 FieldTypes = Dict[str, FieldType]
 
+ColumnName = str
+
+# How table data is sent to the frontend
+DataFormat = Literal["csv", "arrow"]
+
+# Column summaries of larger tables are computed on a random sample of rows
+SUMMARY_SAMPLE_SIZE = int(os.getenv("MARIMO_SUMMARY_SAMPLE_SIZE", 100_000))
+SUMMARY_TOP_K = 10
+SUMMARY_HISTOGRAM_BINS = 10
+
+
+@dataclass
+class Histogram:
+    # `bins + 1` edges, from the column's minimum to its maximum
+    edges: List[float]
+    counts: List[int]
+
+
+@dataclass
+class ColumnSummary:
+    total: int
+    nulls: int
+    # Distinct non-null values; estimated from the sample if `sampled`
+    unique: Optional[int] = None
+    # Numeric and temporal columns only
+    min: JSONType = None
+    max: JSONType = None
+    # Numeric columns only
+    mean: Optional[float] = None
+    histogram: Optional[Histogram] = None
+    # Most common values and their counts, for other columns
+    top_values: Optional[List[Tuple[JSONType, int]]] = None
+    # Whether `unique`, `histogram` and `top_values` were computed on a
+    # sample of the rows; the other statistics cover all rows
+    sampled: bool = False
+
+
+@dataclass
+class ValueCounts:
+    # The most frequent values and the number of rows with each, most
+    # frequent first
+    values: List[Tuple[JSONType, int]]
+    # Number of distinct values
+    unique: int
+    # Whether values were counted on a sample of rows; if so, counts are
+    # scaled to all rows, and `unique` is a lower bound
+    sampled: bool = False
+
+
+def to_json_value(value: Any) -> JSONType:
+    """Convert a scalar from a table library to a JSON-serializable value."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        # NaN and infinities aren't valid JSON
+        return float(value) if value - value == 0 else None
+    if hasattr(value, "isoformat"):
+        # pandas' NaT isn't equal to itself
+        return str(value.isoformat()) if value == value else None
+    if hasattr(value, "item"):
+        # numpy scalars
+        return to_json_value(value.item())
+    return str(value)
+
+
+def histogram_edges(low: float, high: float) -> List[float]:
+    width = (high - low) / SUMMARY_HISTOGRAM_BINS
+    return [low + width * i for i in range(SUMMARY_HISTOGRAM_BINS)] + [high]
+
 
 class TableManager(abc.ABC, Generic[T]):
     DEFAULT_LIMIT = 10_000
@@ -23,13 +94,22 @@ class TableManager(abc.ABC, Generic[T]):
     def __init__(self, data: T) -> None:
         self.data = data
 
-    def to_data(self) -> JSONType:
+    def to_data(self, data_format: DataFormat = "csv") -> JSONType:
         """
         The best way to represent the data in a table as JSON.
 
-        By default, this method calls `to_csv` and returns the result as
-        a string.
+        By default, this method calls `to_csv` and returns the URL of the
+        result. If `data_format` is "arrow", the data is sent as an Arrow IPC
+        stream instead (with mimetype application/vnd.apache.arrow.stream),
+        falling back to CSV if the table can't be converted to Arrow.
         """
+        if data_format == "arrow":
+            try:
+                return mo_data.arrow(self.to_arrow_ipc()).url
+            except (ImportError, NotImplementedError, TypeError, ValueError):
+                # e.g. pyarrow isn't installed, or a column holds values of
+                # mixed types
+                pass
         return mo_data.csv(self.to_csv()).url
 
     @abc.abstractmethod
@@ -40,6 +120,44 @@ class TableManager(abc.ABC, Generic[T]):
     def to_json(self) -> bytes:
         raise NotImplementedError
 
+    def to_arrow_ipc(self) -> bytes:
+        """Serialize the table to the Arrow IPC stream format."""
+        raise NotImplementedError
+
+    def get_column_names(self) -> List[ColumnName]:
+        raise NotImplementedError
+
+    def get_unique_column_values(self, column: ColumnName) -> List[Any]:
+        """Distinct values of a column, in no particular order."""
+        del column
+        raise NotImplementedError
+
+    def get_value_counts(
+        self,
+        column: ColumnName,
+        limit: int,
+        sample_size: Optional[int] = None,
+        prefix: Optional[str] = None,
+    ) -> ValueCounts:
+        """Count the values of a column; missing values are counted as None.
+
+        Returns the `limit` most frequent values. If `sample_size` is given,
+        values are counted on a random sample of at most that many rows. If
+        `prefix` is given, only values starting with it, ignoring case, are
+        counted.
+        """
+        del column, limit, sample_size, prefix
+        raise NotImplementedError
+
+    def get_summary(self, column: ColumnName) -> ColumnSummary:
+        """Statistics of a column, for the column's header.
+
+        Computed on at most `SUMMARY_SAMPLE_SIZE` random rows, except for
+        the counts of rows and nulls and the minimum, maximum and mean.
+        """
+        del column
+        raise NotImplementedError
+
     @abc.abstractmethod
     def select_rows(self, indices: list[int]) -> TableManager[T]:
         raise NotImplementedError
@@ -57,6 +175,25 @@ class TableManager(abc.ABC, Generic[T]):
     def limit(self, num: int) -> TableManager[T]:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def get_num_rows(self) -> int:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def slice(self, offset: int, num: int) -> TableManager[T]:
+        """The `num` rows starting at row `offset`."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def sort_values(self, by: ColumnName, descending: bool) -> TableManager[T]:
+        """Sort rows by a column, with missing values last."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def search(self, query: str) -> TableManager[T]:
+        """Rows with a value containing `query`, ignoring case."""
+        raise NotImplementedError
+
     @staticmethod
     @abc.abstractmethod
     def is_type(value: Any) -> bool:
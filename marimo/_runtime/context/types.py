@@ -54,6 +54,9 @@ class ExecutionContext:
     setting_element_value: bool
     # output object set imperatively
     output: Optional[list[Html]] = None
+    # size of the output last sent to the frontend, if it is the stack of
+    # `output`; items appended to it are sent on their own
+    stacked_output_size: Optional[int] = None
 
 
 @dataclass
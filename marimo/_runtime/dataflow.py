@@ -1,6 +1,7 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import heapq
 import threading
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
@@ -106,63 +107,7 @@ class DirectedGraph:
         Requires that `cell_id` is not already in the graph.
         """
         with self.lock:
-            assert cell_id not in self.cells
-            self.cells[cell_id] = cell
-            # Children are the set of cells that refer to a name defined in
-            # `cell`
-            children: set[CellId_t] = set()
-            # Cells that define the same name as this one
-            siblings: set[CellId_t] = set()
-            # Parents are the set of cells that define a name referred to by
-            # `cell`
-            parents: set[CellId_t] = set()
-
-            # Populate children, siblings, and parents
-            self.children[cell_id] = children
-            self.siblings[cell_id] = siblings
-            self.parents[cell_id] = parents
-            for name in cell.defs:
-                self.definitions.setdefault(name, set()).add(cell_id)
-                for sibling in self.definitions[name]:
-                    if sibling != cell_id:
-                        siblings.add(sibling)
-                        self.siblings[sibling].add(cell_id)
-
-                # a cell can refer to its own defs, but that doesn't add an
-                # edge to the dependency graph
-                referring_cells = self.get_referring_cells(name) - set(
-                    (cell_id,)
-                )
-                # we will add an edge (cell_id, v) for each v in
-                # referring_cells; if there is a path from v to cell_id, then
-                # the new edge will form a cycle
-                for v in referring_cells:
-                    path = self.get_path(v, cell_id)
-                    if path:
-                        self.cycles.add(tuple([(cell_id, v)] + path))
-
-                children.update(referring_cells)
-                for child in referring_cells:
-                    self.parents[child].add(cell_id)
-
-            for name in cell.refs:
-                other_ids = (
-                    self.definitions[name]
-                    if name in self.definitions
-                    else set()
-                ) - set((cell_id,))
-                # if other is empty, this means that the user is going to
-                # get a NameError once the cell is run, unless the symbol
-                # is say a builtin
-                for other_id in other_ids:
-                    parents.add(other_id)
-                    # we are adding an edge (other_id, cell_id). If there
-                    # is a path from cell_id to other_id, then the new
-                    # edge forms a cycle
-                    path = self.get_path(cell_id, other_id)
-                    if path:
-                        self.cycles.add(tuple([(other_id, cell_id)] + path))
-                    self.children[other_id].add(cell_id)
+            self._add_cell(cell_id, cell)
 
         if self.is_any_ancestor_stale(cell_id):
             self.set_stale(set([cell_id]))
@@ -170,6 +115,76 @@ class DirectedGraph:
         if self.is_any_ancestor_disabled(cell_id):
             cell.set_status(status="disabled-transitively")
 
+    def with_cells(self, cells: dict[CellId_t, CellImpl]) -> DirectedGraph:
+        """Return a copy of the graph in which `cells` replace the cells
+        with the same ids, or are added if new.
+
+        Unlike `register_cell`, doesn't change the state of any cell.
+        """
+        graph = DirectedGraph()
+        for cell_id, cell in self.cells.items():
+            if cell_id not in cells:
+                graph._add_cell(cell_id, cell)
+        for cell_id, cell in cells.items():
+            graph._add_cell(cell_id, cell)
+        return graph
+
+    def _add_cell(self, cell_id: CellId_t, cell: CellImpl) -> None:
+        """Add a cell and its edges to the graph; requires `self.lock`."""
+        assert cell_id not in self.cells
+        self.cells[cell_id] = cell
+        # Children are the set of cells that refer to a name defined in
+        # `cell`
+        children: set[CellId_t] = set()
+        # Cells that define the same name as this one
+        siblings: set[CellId_t] = set()
+        # Parents are the set of cells that define a name referred to by
+        # `cell`
+        parents: set[CellId_t] = set()
+
+        # Populate children, siblings, and parents
+        self.children[cell_id] = children
+        self.siblings[cell_id] = siblings
+        self.parents[cell_id] = parents
+        for name in cell.defs:
+            self.definitions.setdefault(name, set()).add(cell_id)
+            for sibling in self.definitions[name]:
+                if sibling != cell_id:
+                    siblings.add(sibling)
+                    self.siblings[sibling].add(cell_id)
+
+            # a cell can refer to its own defs, but that doesn't add an
+            # edge to the dependency graph
+            referring_cells = self.get_referring_cells(name) - set((cell_id,))
+            # we will add an edge (cell_id, v) for each v in
+            # referring_cells; if there is a path from v to cell_id, then
+            # the new edge will form a cycle
+            for v in referring_cells:
+                path = self.get_path(v, cell_id)
+                if path:
+                    self.cycles.add(tuple([(cell_id, v)] + path))
+
+            children.update(referring_cells)
+            for child in referring_cells:
+                self.parents[child].add(cell_id)
+
+        for name in cell.refs:
+            other_ids = (
+                self.definitions[name] if name in self.definitions else set()
+            ) - set((cell_id,))
+            # if other is empty, this means that the user is going to
+            # get a NameError once the cell is run, unless the symbol
+            # is say a builtin
+            for other_id in other_ids:
+                parents.add(other_id)
+                # we are adding an edge (other_id, cell_id). If there
+                # is a path from cell_id to other_id, then the new
+                # edge forms a cycle
+                path = self.get_path(cell_id, other_id)
+                if path:
+                    self.cycles.add(tuple([(other_id, cell_id)] + path))
+                self.children[other_id].add(cell_id)
+
     def is_any_ancestor_stale(self, cell_id: CellId_t) -> bool:
         return any(self.cells[cid].stale for cid in self.ancestors(cell_id))
 
@@ -385,9 +400,16 @@ def get_cycles(
 
 
 def topological_sort(
-    graph: DirectedGraph, cell_ids: Collection[CellId_t]
+    graph: DirectedGraph,
+    cell_ids: Collection[CellId_t],
+    key: Optional[Callable[[CellId_t], Any]] = None,
 ) -> list[CellId_t]:
-    """Sort `cell_ids` in a topological order."""
+    """Sort `cell_ids` in a topological order.
+
+    If `key` is given, then among the cells whose parents have all been
+    sorted, the cell with the smallest key comes next; ties are broken by
+    the order without a key.
+    """
     parents, children = induced_subgraph(graph, cell_ids)
     roots = [cid for cid in cell_ids if not parents[cid]]
     sorted_cell_ids = []
@@ -399,7 +421,26 @@ def topological_sort(
             if not parents[child]:
                 roots.append(child)
     # TODO make sure parents for each id is empty, otherwise cycle
-    return sorted_cell_ids
+    if key is None:
+        return sorted_cell_ids
+
+    position = {cid: index for index, cid in enumerate(sorted_cell_ids)}
+    parents, children = induced_subgraph(graph, cell_ids)
+    ready = [
+        (key(cid), position[cid], cid)
+        for cid in sorted_cell_ids
+        if not parents[cid]
+    ]
+    heapq.heapify(ready)
+    prioritized_cell_ids = []
+    while ready:
+        _, _, cid = heapq.heappop(ready)
+        prioritized_cell_ids.append(cid)
+        for child in children[cid]:
+            parents[child].remove(cid)
+            if not parents[child]:
+                heapq.heappush(ready, (key(child), position[child], child))
+    return prioritized_cell_ids
 
 
 class Runner:
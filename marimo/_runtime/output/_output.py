@@ -1,12 +1,15 @@
 # Copyright 2024 Marimo. All rights reserved.
 
+import sys
+
 from marimo._ast.cell import CellId_t
 from marimo._messaging.cell_output import CellChannel
 from marimo._messaging.ops import CellOp
+from marimo._messaging.streams import OUTPUT_MAX_BYTES
 from marimo._messaging.tracebacks import write_traceback
 from marimo._output import formatting
 from marimo._output.rich_help import mddoc
-from marimo._plugins.stateless.flex import vstack
+from marimo._plugins.stateless.flex import vstack, vstack_item
 from marimo._runtime.context import get_context
 
 
@@ -41,6 +44,7 @@ def replace(value: object) -> None:
         ctx.execution_context.output = None
     else:
         ctx.execution_context.output = [formatting.as_html(value)]
+    ctx.execution_context.stacked_output_size = None
     write_internal(cell_id=ctx.execution_context.cell_id, value=value)
 
 
@@ -59,14 +63,24 @@ def append(value: object) -> None:
     if ctx.execution_context is None:
         return
 
+    html = formatting.as_html(value)
     if ctx.execution_context.output is None:
-        ctx.execution_context.output = [formatting.as_html(value)]
+        ctx.execution_context.output = [html]
     else:
-        ctx.execution_context.output.append(formatting.as_html(value))
-    write_internal(
-        cell_id=ctx.execution_context.cell_id,
-        value=vstack(ctx.execution_context.output),
-    )
+        ctx.execution_context.output.append(html)
+
+    size = ctx.execution_context.stacked_output_size
+    if size is not None:
+        # The frontend already shows the previous items: only send the new
+        # one, unless the output grows too large and needs truncating
+        item = vstack_item(html)
+        if size + len(item) <= OUTPUT_MAX_BYTES:
+            ctx.execution_context.stacked_output_size = size + len(item)
+            CellOp.broadcast_output_append(
+                data=item, cell_id=ctx.execution_context.cell_id
+            )
+            return
+    flush()
 
 
 @mddoc
@@ -83,8 +97,15 @@ def flush() -> None:
 
     if ctx.execution_context.output is not None:
         value = vstack(ctx.execution_context.output)
+        # Items can't be appended to an output that will be truncated
+        ctx.execution_context.stacked_output_size = (
+            len(value.text)
+            if sys.getsizeof(value.text) <= OUTPUT_MAX_BYTES
+            else None
+        )
     else:
         value = None
+        ctx.execution_context.stacked_output_size = None
     write_internal(cell_id=ctx.execution_context.cell_id, value=value)
 
 
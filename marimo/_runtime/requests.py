@@ -7,6 +7,7 @@ from uuid import uuid4
 
 from marimo._ast.cell import CellId_t
 from marimo._config.config import MarimoConfig
+from marimo._runtime.layout.layout import LayoutConfig
 
 UIElementId = str
 CompletionRequestId = str
@@ -29,6 +30,12 @@ class ExecutionRequest:
 class ExecuteStaleRequest: ...
 
 
+@dataclass
+class ExecuteVisibleRequest:
+    # cells whose outputs entered the viewport
+    cell_ids: List[CellId_t]
+
+
 @dataclass
 class ExecuteMultipleRequest:
     execution_requests: List[ExecutionRequest]
@@ -76,6 +83,10 @@ class SetUserConfigRequest:
 class CreationRequest:
     execution_requests: Tuple[ExecutionRequest, ...]
     set_ui_element_value_request: SetUIElementValueRequest
+    # Layout of the app, used to run visible cells first
+    layout: Optional[LayoutConfig] = None
+    # Defer cells until their outputs are visible, see ExecuteVisibleRequest
+    defer_offscreen_cells: bool = False
 
 
 @dataclass
@@ -101,9 +112,26 @@ class InstallMissingPackagesRequest:
     manager: str
 
 
+@dataclass
+class ExecutionPlanRequest:
+    # identifies the plan sent back to the client
+    plan_id: str
+    # cells that would be edited or run
+    execution_requests: List[ExecutionRequest] = field(default_factory=list)
+    # UI elements whose values would be set
+    ui_element_ids: List[UIElementId] = field(default_factory=list)
+
+
+@dataclass
+class PreviewVariableValuesRequest:
+    # names of the variables whose values to preview
+    names: List[str]
+
+
 ControlRequest = Union[
     ExecuteMultipleRequest,
     ExecuteStaleRequest,
+    ExecuteVisibleRequest,
     CreationRequest,
     DeleteRequest,
     FunctionCallRequest,
@@ -112,4 +140,6 @@ ControlRequest = Union[
     SetUIElementValueRequest,
     StopRequest,
     InstallMissingPackagesRequest,
+    PreviewVariableValuesRequest,
+    ExecutionPlanRequest,
 ]
@@ -7,9 +7,17 @@ import functools
 import io
 import signal
 import threading
+import time
 import traceback
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Iterator,
+    Optional,
+)
 
 from marimo._ast.cell import (
     CellId_t,
@@ -21,6 +29,8 @@ from marimo._config.config import OnCellChangeType
 from marimo._loggers import marimo_logger
 from marimo._messaging.tracebacks import write_traceback
 from marimo._runtime import dataflow
+from marimo._runtime.context import get_context
+from marimo._runtime.context.types import ContextNotInitializedError
 from marimo._runtime.control_flow import MarimoInterrupt, MarimoStopError
 from marimo._runtime.marimo_pdb import MarimoPdb
 
@@ -75,6 +85,9 @@ class Runner:
         ]
         | None = None,
         on_finish_hooks: Sequence[Callable[["Runner"], Any]] | None = None,
+        priority: Callable[[CellId_t], Any] | None = None,
+        deferred_cells: set[CellId_t] | None = None,
+        lazy_cells: set[CellId_t] | None = None,
     ):
         self.graph = graph
         self.debugger = debugger
@@ -116,12 +129,43 @@ class Runner:
                 predicate=lambda cell: cell.stale,
             )
         )
+        # cells that won't run, left for the caller to mark as stale
+        self.cells_deferred: set[CellId_t] = set()
         if self.execution_mode == "autorun":
             # in autorun/eager mode, descendants are also run
-            cells_to_run = dataflow.transitive_closure(graph, cells_to_run)
+            descendants = (
+                dataflow.transitive_closure(graph, cells_to_run) - cells_to_run
+            )
+            cells_to_run = cells_to_run | descendants
+            if lazy_cells and (roots | descendants) & lazy_cells:
+                # lazy cells are run as if in lazy mode: they and their
+                # descendants wait until they're run explicitly
+                held = dataflow.transitive_closure(
+                    graph, (roots | descendants) & lazy_cells
+                ) & (roots | descendants)
+                self.cells_deferred |= held
+                cells_to_run = cells_to_run - held
+
+        # deferred cells are not run, unless a cell that runs needs their
+        # defs
+        if deferred_cells:
+            needed = cells_to_run - deferred_cells
+            run_set = cells_to_run
+            needed |= dataflow.transitive_closure(
+                graph,
+                needed,
+                children=False,
+                predicate=lambda cell: cell.cell_id in run_set or cell.stale,
+            )
+            self.cells_deferred |= cells_to_run - needed
+            cells_to_run = needed
+
+        # among cells whose ancestors have run, cells with a smaller
+        # priority key run first
         self.cells_to_run = dataflow.topological_sort(
             graph,
             cells_to_run - self.excluded_cells,
+            key=priority,
         )
 
         # map from a cell that was cancelled to its descendants that have
@@ -131,6 +175,8 @@ class Runner:
         self.interrupted = False
         # mapping from cell_id to exception it raised
         self.exceptions: dict[CellId_t, BaseException] = {}
+        # mapping from cell_id to the time it took to run, in seconds
+        self.run_times: dict[CellId_t, float] = {}
 
         # each cell's position in the run queue
         self._run_position = {
@@ -362,27 +408,48 @@ class Runner:
 
         return run_result
 
+    @staticmethod
+    def _batch_messages() -> ContextManager[None]:
+        try:
+            return get_context().stream.batch()
+        except ContextNotInitializedError:
+            return contextlib.nullcontext()
+
     async def run_all(self) -> None:
-        for prep_hook in self.preparation_hooks:
-            prep_hook(self)
-
-        while self.pending():
-            cell_id = self.pop_cell()
-            if self.cancelled(cell_id):
-                continue
-            if self.graph.is_disabled(cell_id):
-                continue
-            cell = self.graph.cells[cell_id]
-            for pre_hook in self.pre_execution_hooks:
-                pre_hook(cell, self)
-            if self.execution_context is not None:
-                with self.execution_context(cell_id) as exc_ctx:
+        # Messages broadcast by hooks are batched: the status transitions of
+        # all cells to run are sent together, and messages sent after a cell
+        # runs are sent together with those sent before the next cell runs.
+        # The batch is flushed before each cell runs, so that the frontend
+        # sees which cell is running.
+        batch = contextlib.ExitStack()
+        batch.enter_context(self._batch_messages())
+        try:
+            for prep_hook in self.preparation_hooks:
+                prep_hook(self)
+
+            while self.pending():
+                cell_id = self.pop_cell()
+                if self.cancelled(cell_id):
+                    continue
+                if self.graph.is_disabled(cell_id):
+                    continue
+                cell = self.graph.cells[cell_id]
+                for pre_hook in self.pre_execution_hooks:
+                    pre_hook(cell, self)
+                batch.close()
+                start = time.perf_counter()
+                if self.execution_context is not None:
+                    with self.execution_context(cell_id) as exc_ctx:
+                        run_result = await self.run(cell_id)
+                        run_result.accumulated_output = exc_ctx.output
+                else:
                     run_result = await self.run(cell_id)
-                    run_result.accumulated_output = exc_ctx.output
-            else:
-                run_result = await self.run(cell_id)
-            for post_hook in self.post_execution_hooks:
-                post_hook(cell, self, run_result)
+                self.run_times[cell_id] = time.perf_counter() - start
+                batch.enter_context(self._batch_messages())
+                for post_hook in self.post_execution_hooks:
+                    post_hook(cell, self, run_result)
 
-        for finish_hook in self.on_finish_hooks:
-            finish_hook(self)
+            for finish_hook in self.on_finish_hooks:
+                finish_hook(self)
+        finally:
+            batch.close()
@@ -32,8 +32,9 @@ def _broadcast_variables(
     run_result: cell_runner.RunResult,
 ) -> None:
     del run_result
+    # Previews of the values are only sent on request
     values = [
-        VariableValue(
+        VariableValue.without_preview(
             name=variable,
             value=(
                 runner.glbls[variable] if variable in runner.glbls else None
@@ -0,0 +1,76 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+from marimo._ast.cell import CellId_t
+from marimo._runtime.layout.layout import LayoutConfig
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+
+Priority = Tuple[int, int, float]
+
+
+class CellScheduler:
+    """Priorities of cells, for choosing the order in which cells run.
+
+    The runner still runs cells in a topological order; among cells whose
+    ancestors have run, it picks the one with the highest priority, so that
+    the cells a user is waiting on run first:
+
+    1. the cells the user just ran,
+    2. cells that are visible in the app's layout, top to bottom, before
+       hidden cells,
+    3. cells that ran fastest in previous runs.
+    """
+
+    def __init__(self) -> None:
+        # position of each visible cell in the layout, in reading order;
+        # empty when there is no layout
+        self._layout_position: dict[CellId_t, int] = {}
+        # duration of each cell's last run, in seconds
+        self.run_times: dict[CellId_t, float] = {}
+
+    def set_layout(
+        self, layout: Optional[LayoutConfig], cell_ids: Sequence[CellId_t]
+    ) -> None:
+        """Set the layout of the app, with cells in notebook order."""
+        self._layout_position = {}
+        if layout is None or layout.type != "grid":
+            return
+        # Grid layouts hold a position [x, y, w, h] for each cell, by index,
+        # or None if the cell is hidden
+        visible: list[Tuple[int, int, CellId_t]] = []
+        for cell_id, cell in zip(cell_ids, layout.data.get("cells", [])):
+            position = cell.get("position")
+            if position:
+                x, y = position[0], position[1]
+                visible.append((y, x, cell_id))
+        for index, (_, _, cell_id) in enumerate(sorted(visible)):
+            self._layout_position[cell_id] = index
+
+    def record_run_time(self, cell_id: CellId_t, seconds: float) -> None:
+        self.run_times[cell_id] = seconds
+
+    def forget(self, cell_id: CellId_t) -> None:
+        self.run_times.pop(cell_id, None)
+        self._layout_position.pop(cell_id, None)
+
+    def priority(
+        self, focus: Collection[CellId_t] = ()
+    ) -> Callable[[CellId_t], Priority]:
+        """Key for sorting cells by priority, highest first.
+
+        `focus` are the cells the user just ran.
+        """
+        hidden = len(self._layout_position)
+
+        def key(cell_id: CellId_t) -> Priority:
+            return (
+                0 if cell_id in focus else 1,
+                self._layout_position.get(cell_id, hidden),
+                self.run_times.get(cell_id, 0.0),
+            )
+
+        return key
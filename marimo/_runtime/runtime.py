@@ -18,7 +18,7 @@ from multiprocessing import connection
 from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, cast
 
 from marimo import _loggers
-from marimo._ast.cell import CellConfig, CellId_t
+from marimo._ast.cell import CellConfig, CellId_t, CellImpl
 from marimo._ast.compiler import compile_cell
 from marimo._ast.visitor import Name, is_local
 from marimo._config.config import MarimoConfig, OnCellChangeType
@@ -28,16 +28,19 @@ from marimo._messaging.ops import (
     Alert,
     CellOp,
     CompletedRun,
+    ExecutionPlan,
     FunctionCallResult,
     HumanReadableStatus,
     InstallingPackageAlert,
     MissingPackageAlert,
     PackageStatusType,
+    PlannedCell,
     RemoveUIElements,
     VariableDeclaration,
     Variables,
     VariableValue,
     VariableValues,
+    VirtualFileUsage,
 )
 from marimo._messaging.streams import (
     ThreadSafeStderr,
@@ -84,9 +87,12 @@ from marimo._runtime.requests import (
     DeleteRequest,
     ExecuteMultipleRequest,
     ExecuteStaleRequest,
+    ExecuteVisibleRequest,
+    ExecutionPlanRequest,
     ExecutionRequest,
     FunctionCallRequest,
     InstallMissingPackagesRequest,
+    PreviewVariableValuesRequest,
     SetCellConfigRequest,
     SetUIElementValueRequest,
     SetUserConfigRequest,
@@ -99,6 +105,7 @@ from marimo._runtime.runner.hooks import (
     PRE_EXECUTION_HOOKS,
     PREPARATION_HOOKS,
 )
+from marimo._runtime.runner.scheduler import CellScheduler
 from marimo._runtime.state import State
 from marimo._runtime.utils.set_ui_element_request_manager import (
     SetUIElementRequestManager,
@@ -326,9 +333,19 @@ class Kernel:
         self.ui_initializers: dict[str, Any] = {}
         # errored cells
         self.errors: dict[CellId_t, tuple[Error, ...]] = {}
+        # Previews of variable values, computed on request and cached until
+        # the variable's defining cell runs again
+        self.variable_previews: dict[Name, VariableValue] = {}
+        # Last usage of virtual files sent to the frontend
+        self.virtual_file_usage: Optional[VirtualFileUsage] = None
         # Mapping from state to the cell when its setter
         # was invoked. New state updates evict older ones.
         self.state_updates: dict[State[Any], CellId_t] = {}
+        # Priorities for the order in which cells run
+        self.scheduler = CellScheduler()
+        # Cells whose outputs have been visible, when cells are deferred
+        # until they are visible; None if cells aren't deferred
+        self.visible_cells: Optional[set[CellId_t]] = None
 
         if not is_pyodide():
             patches.patch_micropip(self.globals)
@@ -353,6 +370,10 @@ class Kernel:
         package_manager = config["package_management"]["manager"]
         autoreload_mode = config["runtime"]["auto_reload"]
         self.reactive_execution_mode = config["runtime"]["on_cell_change"]
+        # Cells that took longer than this to run aren't autorun
+        self.auto_lazy_threshold: Optional[float] = config["runtime"].get(
+            "auto_lazy_threshold"
+        )
 
         if (
             self.package_manager is None
@@ -561,6 +582,8 @@ class Kernel:
             self.module_registry.missing_modules()
         )
         defs_to_delete = self.graph.cells[cell_id].defs
+        for name in defs_to_delete:
+            self.variable_previews.pop(name, None)
         self._delete_names(
             defs_to_delete, exclude_defs if exclude_defs is not None else set()
         )
@@ -623,6 +646,8 @@ class Kernel:
         Deletion from graph is forwarded to graph object.
         """
         del self.cell_metadata[cell_id]
+        CellOp.forget_output(cell_id, self.stream)
+        self.scheduler.forget(cell_id)
         return self._deactivate_cell(cell_id)
 
     def mutate_graph(
@@ -827,8 +852,16 @@ class Kernel:
         else:
             return cells_registered_without_error.union(stale_cells)
 
-    async def _run_cells(self, cell_ids: set[CellId_t]) -> None:
-        """Run cells and any state updates they trigger"""
+    async def _run_cells(
+        self,
+        cell_ids: set[CellId_t],
+        focus: Optional[set[CellId_t]] = None,
+    ) -> None:
+        """Run cells and any state updates they trigger
+
+        `focus` are cells the user asked to run; they run as soon as their
+        ancestors have run.
+        """
 
         # This patch is an attempt to mitigate problems caused by the fact
         # that in run mode, kernels run in threads and share the same
@@ -836,14 +869,17 @@ class Kernel:
         # common cases. We could also be more aggressive and run this before
         # every cell, or even before pickle.dump/pickle.dumps()
         patches.patch_sys_module(self._module)
-        while cell_ids := await self._run_cells_internal(cell_ids):
+        while cell_ids := await self._run_cells_internal(cell_ids, focus):
+            focus = None
             LOGGER.debug("Running state updates ...")
             if self.lazy() and cell_ids:
                 self.graph.set_stale(cell_ids)
                 break
         LOGGER.debug("Finished run.")
 
-    async def _run_cells_internal(self, roots: set[CellId_t]) -> set[CellId_t]:
+    async def _run_cells_internal(
+        self, roots: set[CellId_t], focus: Optional[set[CellId_t]] = None
+    ) -> set[CellId_t]:
         """Run cells, send outputs to frontends
 
         Returns set of cells that need to be re-run due to state updates.
@@ -896,7 +932,12 @@ class Kernel:
             pre_execution_hooks=PRE_EXECUTION_HOOKS,
             post_execution_hooks=POST_EXECUTION_HOOKS,
             on_finish_hooks=ON_FINISH_HOOKS + [broadcast_missing_packages],
+            priority=self.scheduler.priority(focus or ()),
+            deferred_cells=self._deferred_cells(self.graph),
+            lazy_cells=self._lazy_cells(self.graph, focus or ()),
         )
+        if runner.cells_deferred:
+            self.graph.set_stale(runner.cells_deferred)
 
         # I/O
         #
@@ -904,12 +945,112 @@ class Kernel:
         #                 redirected to frontend (it's printed to console),
         #                 which is incorrect
         await runner.run_all()
+        for cid, run_time in runner.run_times.items():
+            self.scheduler.record_run_time(cid, run_time)
         cells_with_stale_state = runner.resolve_state_updates(
             self.state_updates
         )
         self.state_updates.clear()
         return cells_with_stale_state
 
+    def _deferred_cells(
+        self, graph: dataflow.DirectedGraph
+    ) -> Optional[set[CellId_t]]:
+        """Cells that only run once visible, or when a visible cell needs
+        them."""
+        if self.visible_cells is None:
+            return None
+        return set(graph.cells) - self.visible_cells
+
+    def _lazy_cells(
+        self, graph: dataflow.DirectedGraph, focus: Iterable[CellId_t]
+    ) -> Optional[set[CellId_t]]:
+        """Cells too expensive to autorun.
+
+        Cells the user runs (`focus`) and their ancestors are always run.
+        """
+        if self.auto_lazy_threshold is None:
+            return None
+        return set(
+            cid
+            for cid, run_time in self.scheduler.run_times.items()
+            if run_time > self.auto_lazy_threshold
+        ) - dataflow.transitive_closure(
+            graph, set(focus) & set(graph.cells), children=False
+        )
+
+    def plan_execution(self, request: ExecutionPlanRequest) -> None:
+        """Broadcast the cells that a request would run, without running
+        them.
+
+        Plans either running cells with (possibly edited) code, or setting
+        the values of UI elements; durations are estimated from each cell's
+        last run.
+        """
+        graph = self.graph
+        roots: set[CellId_t] = set()
+        if request.execution_requests:
+            # Plan on a copy of the graph with the edited cells
+            edited: dict[CellId_t, CellImpl] = {}
+            for er in request.execution_requests:
+                cell = self.graph.cells.get(er.cell_id)
+                if cell is None or cell.code != er.code:
+                    try:
+                        cell = compile_cell(er.code, cell_id=er.cell_id)
+                    except Exception:
+                        continue
+                edited[er.cell_id] = cell
+            graph = self.graph.with_cells(edited)
+            roots.update(edited)
+
+        ui_element_registry = get_context().ui_element_registry
+        for object_id in request.ui_element_ids:
+            try:
+                object_id, _ = ui_element_registry.resolve_lens(
+                    object_id, None
+                )
+                bound_names = ui_element_registry.bound_names(object_id)
+            except (KeyError, NameError, RuntimeError):
+                continue
+            for name in bound_names:
+                if not is_local(name):
+                    roots.update(
+                        graph.get_referring_cells(name)
+                        - graph.get_defining_cells(name)
+                    )
+
+        runner = cell_runner.Runner(
+            roots=roots,
+            graph=graph,
+            glbls=self.globals,
+            debugger=self.debugger,
+            execution_mode=self.reactive_execution_mode,
+            excluded_cells=set(self.errors.keys()) - roots,
+            priority=self.scheduler.priority(
+                roots if request.execution_requests else ()
+            ),
+            deferred_cells=self._deferred_cells(graph),
+            lazy_cells=self._lazy_cells(
+                graph, roots if request.execution_requests else ()
+            ),
+        )
+        cells = [
+            PlannedCell(
+                cell_id=cid,
+                estimated_duration=self.scheduler.run_times.get(cid),
+            )
+            for cid in runner.cells_to_run
+            if not graph.is_disabled(cid)
+        ]
+        ExecutionPlan(
+            plan_id=request.plan_id,
+            cells=cells,
+            deferred=sorted(runner.cells_deferred),
+            estimated_duration=sum(
+                cell.estimated_duration or 0.0 for cell in cells
+            ),
+        ).broadcast()
+
     def register_state_update(self, state: State[Any]) -> None:
         """Register a state object as having been updated.
 
@@ -945,7 +1086,8 @@ class Kernel:
         """
 
         await self._run_cells(
-            self.mutate_graph(execution_requests, deletion_requests=[])
+            self.mutate_graph(execution_requests, deletion_requests=[]),
+            focus={er.cell_id for er in execution_requests},
         )
 
     async def run_stale_cells(self) -> None:
@@ -956,11 +1098,27 @@ class Kernel:
         # TODO: should there just be one reactive exec mode, and one
         # reload mode? ie no mix and match? otherwise what do we do here?
         await self._run_cells(
-            dataflow.transitive_closure(self.graph, cells_to_run)
+            dataflow.transitive_closure(self.graph, cells_to_run),
+            focus=cells_to_run,
         )
         if self.module_watcher is not None:
             self.module_watcher.run_is_processed.set()
 
+    async def execute_visible(self, request: ExecuteVisibleRequest) -> None:
+        """Run deferred cells whose outputs entered the viewport."""
+        if self.visible_cells is None:
+            return
+        self.visible_cells.update(request.cell_ids)
+        cells_to_run = set(
+            cid
+            for cid in request.cell_ids
+            if cid in self.graph.cells
+            and self.graph.cells[cid].stale
+            and not self.graph.is_disabled(cid)
+        )
+        if cells_to_run:
+            await self._run_cells(cells_to_run)
+
     async def set_cell_config(self, request: SetCellConfigRequest) -> None:
         """Update cell configs.
 
@@ -1076,8 +1234,9 @@ class Kernel:
             for name in bound_names:
                 # subtracting self.graph.definitions[name]: never rerun the
                 # cell that created the name
+                self.variable_previews.pop(name, None)
                 variable_values.append(
-                    VariableValue(name=name, value=component)
+                    VariableValue.without_preview(name=name, value=component)
                 )
                 try:
                     referring_cells.update(
@@ -1204,6 +1363,12 @@ class Kernel:
                 initial_value,
             ) in request.set_ui_element_value_request.ids_and_values:
                 self.ui_initializers[object_id] = initial_value
+            self.scheduler.set_layout(
+                request.layout,
+                [er.cell_id for er in request.execution_requests],
+            )
+            if request.defer_offscreen_cells:
+                self.visible_cells = set()
             await self.run(request.execution_requests)
             self.reset_ui_initializers()
 
@@ -1269,6 +1434,22 @@ class Kernel:
             else:
                 self.graph.set_stale(cells_to_run)
 
+    def preview_variable_values(
+        self, request: PreviewVariableValuesRequest
+    ) -> None:
+        """Broadcast previews of the values of the requested variables."""
+        values: list[VariableValue] = []
+        for name in request.names:
+            if name not in self.graph.definitions or name not in self.globals:
+                continue
+            if name not in self.variable_previews:
+                self.variable_previews[name] = VariableValue(
+                    name=name, value=self.globals[name]
+                )
+            values.append(self.variable_previews[name])
+        if values:
+            VariableValues(variables=values).broadcast()
+
     async def handle_message(self, request: ControlRequest) -> None:
         """Handle a message from the client.
 
@@ -1282,6 +1463,9 @@ class Kernel:
             CompletedRun().broadcast()
         elif isinstance(request, ExecuteStaleRequest):
             await self.run_stale_cells()
+        elif isinstance(request, ExecuteVisibleRequest):
+            await self.execute_visible(request)
+            CompletedRun().broadcast()
         elif isinstance(request, SetCellConfigRequest):
             await self.set_cell_config(request)
         elif isinstance(request, SetUserConfigRequest):
@@ -1302,10 +1486,27 @@ class Kernel:
         elif isinstance(request, InstallMissingPackagesRequest):
             await self.install_missing_packages(request)
             CompletedRun().broadcast()
+        elif isinstance(request, PreviewVariableValuesRequest):
+            self.preview_variable_values(request)
+        elif isinstance(request, ExecutionPlanRequest):
+            self.plan_execution(request)
         elif isinstance(request, StopRequest):
             return None
         else:
             raise ValueError(f"Unknown request {request}")
+        self.broadcast_virtual_file_usage()
+
+    def broadcast_virtual_file_usage(self) -> None:
+        """Broadcast the usage of virtual files, if it changed."""
+        ctx = get_context()
+        if not ctx.virtual_files_supported:
+            return
+        usage = VirtualFileUsage(
+            **dataclasses.asdict(ctx.virtual_file_registry.stats)
+        )
+        if usage != self.virtual_file_usage:
+            self.virtual_file_usage = usage
+            usage.broadcast()
 
 
 def launch_kernel(
@@ -1410,6 +1611,9 @@ def launch_kernel(
             signal.signal(
                 signal.SIGTERM, handlers.construct_sigterm_handler(kernel)
             )
+    else:
+        # Users of apps can't run stale cells, so all cells are autorun
+        kernel.auto_lazy_threshold = None
 
     ui_element_request_mgr = SetUIElementRequestManager(set_ui_element_queue)
 
@@ -3,10 +3,13 @@ from __future__ import annotations
 
 import base64
 import dataclasses
+import itertools
 import mimetypes
+import os
 import random
 import string
 import sys
+import tempfile
 import threading
 from typing import TYPE_CHECKING, Optional, cast
 
@@ -19,12 +22,15 @@ from marimo._server.api.status import HTTPException, HTTPStatus
 from marimo._utils.platform import is_pyodide
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator
 
     from marimo._runtime.context.types import RuntimeContext
 
 LOGGER = _loggers.marimo_logger()
 
+# Not registered on all platforms
+mimetypes.add_type("application/vnd.apache.arrow.stream", ".arrows")
+
 if not is_pyodide():
     # the shared_memory module is not supported in the Pyodide distribution
     from multiprocessing import shared_memory
@@ -32,6 +38,18 @@ if not is_pyodide():
 
 _ALPHABET = string.ascii_letters + string.digits
 
+# Bytes of virtual files kept in shared memory; beyond this budget, the
+# least recently used files are spilled to disk
+VIRTUAL_FILE_MAX_MEMORY = int(
+    os.getenv("MARIMO_VIRTUAL_FILE_MAX_MEMORY", 512 * 1024 * 1024)
+)
+
+# Environment variable naming the directory of spilled virtual files,
+# which are read from there by the server when they are not in shared
+# memory. The server creates a private directory for each run and passes it
+# to its kernels; without one, virtual files are never spilled.
+VIRTUAL_FILE_SPILL_DIR_ENV = "MARIMO_VIRTUAL_FILE_SPILL_DIR"
+
 
 def random_filename(ext: str) -> str:
     # adapted from: https://stackoverflow.com/questions/13484726/safe-enough-8-character-short-unique-random-string  # noqa: E501
@@ -163,10 +181,27 @@ class VirtualFileLifecycleItem(CellLifecycleItem):
 
 @dataclasses.dataclass
 class VirtualFileRegistryItem:
-    # contents of the file
-    shm: shared_memory.SharedMemory
+    # contents of the file, or None if the file was spilled to disk
+    shm: Optional[shared_memory.SharedMemory]
     # number of HTML objects that are referencing this virtual file
     refcount: int
+    # size of the contents, in bytes
+    size: int = 0
+    # when the file was last added or referenced, for spilling the least
+    # recently used files first
+    last_used: int = 0
+
+
+@dataclasses.dataclass
+class VirtualFileRegistryStats:
+    # bytes and number of files in shared memory
+    memory_bytes: int = 0
+    memory_files: int = 0
+    # bytes and number of files spilled to disk
+    spilled_bytes: int = 0
+    spilled_files: int = 0
+    # number of files spilled to disk since the registry was created
+    spills: int = 0
 
 
 @dataclasses.dataclass
@@ -179,11 +214,24 @@ class VirtualFileRegistry:
 
     The registry itself doesn't maintain the reference counts, it only
     exposes methods for incrementing, decrementing, and getting the counts.
+
+    Contents are kept in shared memory, up to `max_memory` bytes. Past
+    that, the least recently added or referenced files are spilled to
+    disk, unreferenced files first; `read_virtual_file` reads files from
+    either place. Files stay in shared memory if there is no spill
+    directory or it can't be written to.
     """
 
     registry: dict[str, VirtualFileRegistryItem] = dataclasses.field(
         default_factory=dict
     )
+    max_memory: int = VIRTUAL_FILE_MAX_MEMORY
+    stats: VirtualFileRegistryStats = dataclasses.field(
+        default_factory=VirtualFileRegistryStats
+    )
+    _clock: Iterator[int] = dataclasses.field(
+        default_factory=itertools.count, repr=False
+    )
     shutting_down = False
 
     def __del__(self) -> None:
@@ -198,7 +246,9 @@ class VirtualFileRegistry:
     def reference(self, filename: str) -> None:
         """Increment the reference count"""
         if filename in self.registry:
-            self.registry[filename].refcount += 1
+            item = self.registry[filename]
+            item.refcount += 1
+            item.last_used = next(self._clock)
 
     def dereference(self, filename: str) -> None:
         """Decrement the reference count"""
@@ -225,6 +275,17 @@ class VirtualFileRegistry:
             return
 
         buffer = virtual_file.buffer
+        item = VirtualFileRegistryItem(
+            shm=None, refcount=0, size=len(buffer), last_used=next(self._clock)
+        )
+        if len(buffer) > self.max_memory and _write_spill_file(key, buffer):
+            # Too large for shared memory
+            self.registry[key] = item
+            self.stats.spilled_bytes += item.size
+            self.stats.spilled_files += 1
+            self.stats.spills += 1
+            return
+
         # Immediately writes the contents of the file to an in-memory
         # buffer; not lazy.
         #
@@ -253,16 +314,16 @@ class VirtualFileRegistry:
             shm.close()
         # We have to keep a reference to the shared memory to prevent it from
         # being destroyed on Windows
-        self.registry[key] = VirtualFileRegistryItem(shm=shm, refcount=0)
+        item.shm = shm
+        self.registry[key] = item
+        self.stats.memory_bytes += item.size
+        self.stats.memory_files += 1
+        self._spill_to_budget(keep=key)
 
     def remove(self, virtual_file: VirtualFile) -> None:
         key = virtual_file.filename
         if key in self.registry:
-            if sys.platform == "win32":
-                self.registry[key].shm.close()
-            # destroy the shared memory
-            self.registry[key].shm.unlink()
-            del self.registry[key]
+            self._delete(key, self.registry.pop(key))
 
     def shutdown(self) -> None:
         # Try to make this method re-entrant since it's called in the
@@ -273,14 +334,105 @@ class VirtualFileRegistry:
             return
         try:
             self.shutting_down = True
-            for _, item in self.registry.items():
-                if sys.platform == "win32":
-                    item.shm.close()
-                item.shm.unlink()
+            for key, item in self.registry.items():
+                self._delete(key, item)
             self.registry.clear()
         finally:
             self.shutting_down = False
 
+    def _delete(self, key: str, item: VirtualFileRegistryItem) -> None:
+        if item.shm is not None:
+            if sys.platform == "win32":
+                item.shm.close()
+            # destroy the shared memory
+            item.shm.unlink()
+            self.stats.memory_bytes -= item.size
+            self.stats.memory_files -= 1
+        else:
+            path = _spill_path(key)
+            try:
+                if path is not None:
+                    os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.stats.spilled_bytes -= item.size
+            self.stats.spilled_files -= 1
+
+    def _spill_to_budget(self, keep: str) -> None:
+        """Spill files to disk until the files in shared memory fit in
+        the budget, except for `keep`."""
+        if self.stats.memory_bytes <= self.max_memory:
+            return
+        # Unreferenced files first, then from least to most recently used
+        candidates = sorted(
+            (item.refcount > 0, item.last_used, key)
+            for key, item in self.registry.items()
+            if item.shm is not None and key != keep
+        )
+        for _, _, key in candidates:
+            if self.stats.memory_bytes <= self.max_memory:
+                return
+            if not self._spill(key, self.registry[key]):
+                # Keep the rest in shared memory if the disk can't be used
+                return
+
+    def _spill(self, key: str, item: VirtualFileRegistryItem) -> bool:
+        assert item.shm is not None
+        # The shm was closed after it was written, except on Windows
+        shm = (
+            item.shm
+            if sys.platform == "win32"
+            else shared_memory.SharedMemory(name=key)
+        )
+        try:
+            # The file is written before the shm is unlinked, so that it
+            # can always be read from one or the other
+            spilled = _write_spill_file(key, bytes(shm.buf[: item.size]))
+        finally:
+            if shm is not item.shm:
+                shm.close()
+        if not spilled:
+            return False
+        self._delete(key, item)
+        item.shm = None
+        self.stats.spilled_bytes += item.size
+        self.stats.spilled_files += 1
+        self.stats.spills += 1
+        return True
+
+
+def _spill_path(filename: str) -> Optional[str]:
+    spill_dir = os.environ.get(VIRTUAL_FILE_SPILL_DIR_ENV)
+    if not spill_dir:
+        return None
+    return os.path.join(spill_dir, filename)
+
+
+def _write_spill_file(filename: str, buffer: bytes) -> bool:
+    """Write a spilled file to disk; returns False if it couldn't be."""
+    path = _spill_path(filename)
+    if path is None:
+        return False
+    try:
+        # Write to a temporary file and rename it, so that readers never
+        # see a partially written file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    except OSError as e:
+        LOGGER.warning("Failed to spill virtual file to disk: %s", e)
+        return False
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buffer)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        os.remove(tmp_path)
+        LOGGER.warning("Failed to spill virtual file to disk: %s", e)
+        return False
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return True
+
 
 def _without_leading_dot(ext: str) -> str:
     return ext[1:] if ext.startswith(".") else ext
@@ -290,6 +442,13 @@ def read_virtual_file(filename: str, byte_length: int) -> bytes:
     if not shared_memory:
         raise RuntimeError("Shared memory is not supported on this platform")
 
+    # Filenames come from URLs, so they must not escape the spill directory
+    if os.path.basename(filename) != filename or filename in ("", ".", ".."):
+        raise HTTPException(
+            HTTPStatus.NOT_FOUND,
+            detail="File not found",
+        )
+
     key = filename
     shm = None
     try:
@@ -299,15 +458,25 @@ def read_virtual_file(filename: str, byte_length: int) -> bytes:
         shm = shared_memory.SharedMemory(name=key)
         buffer_contents = bytes(shm.buf)[: int(byte_length)]
     except FileNotFoundError as err:
-        LOGGER.debug(
-            "Error retrieving shared memory for virtual file: %s", err
-        )
-        raise HTTPException(
-            HTTPStatus.NOT_FOUND,
-            detail="File not found",
-        ) from err
+        # The file may have been spilled to disk
+        buffer_contents = _read_spill_file(filename, err)
     finally:
         if shm is not None:
             shm.close()
 
     return buffer_contents
+
+
+def _read_spill_file(filename: str, err: FileNotFoundError) -> bytes:
+    path = _spill_path(filename)
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+    LOGGER.debug("Error retrieving shared memory for virtual file: %s", err)
+    raise HTTPException(
+        HTTPStatus.NOT_FOUND,
+        detail="File not found",
+    ) from err
@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any, Optional, Union, cast
 
 from marimo._config.manager import UserConfigManager
+from marimo._server.api.status import HTTPException, HTTPStatus
 from marimo._server.ids import SessionId
 from marimo._server.model import SessionMode
 from marimo._server.sessions import Session, SessionManager
@@ -120,11 +121,26 @@ class AppState(AppStateBase):
             return None
         return self.session_manager.get_session(session_id)
 
-    def require_current_session(self) -> Session:
-        """Get the current session or raise an error."""
+    def require_current_session(self, allow_viewers: bool = False) -> Session:
+        """Get the current session or raise an error.
+
+        Viewers of a shared session are refused, unless `allow_viewers` is
+        set, in which case they are given the shared session; only use it
+        for requests that don't change the app's state.
+        """
         session_id = self.require_current_session_id()
         session = self.session_manager.get_session(session_id)
         if session is None:
+            shared_session_id = self.session_manager.viewers.get(session_id)
+            if shared_session_id is not None and allow_viewers:
+                session = self.session_manager.get_session(shared_session_id)
+                if session is not None:
+                    return session
+            if shared_session_id is not None:
+                raise HTTPException(
+                    status_code=HTTPStatus.FORBIDDEN,
+                    detail="Viewers of a shared session are read-only",
+                )
             raise ValueError(f"Invalid session id: {session_id}")
         return session
 
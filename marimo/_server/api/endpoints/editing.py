@@ -9,6 +9,7 @@ from marimo._runtime.requests import (
     CompletionRequest,
     DeleteRequest,
     InstallMissingPackagesRequest,
+    PreviewVariableValuesRequest,
     SetCellConfigRequest,
 )
 from marimo._server.api.deps import AppState
@@ -62,6 +63,17 @@ async def format_cell(request: Request) -> FormatResponse:
     return FormatResponse(codes=formatter.format(body.codes))
 
 
+@router.post("/preview_variable_values")
+@requires("edit")
+async def preview_variable_values(request: Request) -> BaseResponse:
+    """Request previews of the values of variables."""
+    app_state = AppState(request)
+    body = await parse_request(request, cls=PreviewVariableValuesRequest)
+    app_state.require_current_session().put_control_request(body)
+
+    return SuccessResponse()
+
+
 @router.post("/set_cell_config")
 @requires("edit")
 async def set_cell_config(request: Request) -> BaseResponse:
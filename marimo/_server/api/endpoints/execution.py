@@ -8,6 +8,8 @@ from starlette.authentication import requires
 
 from marimo import _loggers
 from marimo._runtime.requests import (
+    ExecuteVisibleRequest,
+    ExecutionPlanRequest,
     FunctionCallRequest,
     SetUIElementValueRequest,
 )
@@ -72,11 +74,32 @@ async def function_call(
     """Invoke an RPC"""
     app_state = AppState(request)
     body = await parse_request(request, cls=FunctionCallRequest)
+    # Not allowed for viewers of a shared session: functions can change the
+    # state of UI elements (e.g., a table's search), and run with the
+    # owner's authority
     app_state.require_current_session().put_control_request(body)
 
     return SuccessResponse()
 
 
+@router.post("/run_visible")
+async def run_visible(
+    *,
+    request: Request,
+) -> BaseResponse:
+    """Run deferred cells whose outputs entered the viewport.
+
+    Only has an effect if the app defers offscreen cells.
+    """
+    app_state = AppState(request)
+    body = await parse_request(request, cls=ExecuteVisibleRequest)
+    # Read-only, so viewers of a shared session can make this request
+    session = app_state.require_current_session(allow_viewers=True)
+    session.put_control_request(body)
+
+    return SuccessResponse()
+
+
 @router.post("/interrupt")
 @requires("edit")
 async def interrupt(
@@ -112,6 +135,27 @@ async def run_cell(
     return SuccessResponse()
 
 
+@router.post("/plan_execution")
+@requires("edit")
+async def plan_execution(
+    *,
+    request: Request,
+) -> BaseResponse:
+    """Plan running cells or setting UI element values, without running
+    anything.
+
+    The kernel broadcasts the cells that would run, in order, with their
+    estimated durations.
+
+    Only allowed in edit mode.
+    """
+    app_state = AppState(request)
+    body = await parse_request(request, cls=ExecutionPlanRequest)
+    app_state.require_current_session().put_control_request(body)
+
+    return SuccessResponse()
+
+
 @router.post("/restart_session")
 @requires("edit")
 async def restart_session(
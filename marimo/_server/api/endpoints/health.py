@@ -1,6 +1,7 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import TYPE_CHECKING
 
 from starlette.authentication import requires
@@ -8,6 +9,7 @@ from starlette.responses import JSONResponse, PlainTextResponse
 
 from marimo import __version__, _loggers
 from marimo._server.api.deps import AppState
+from marimo._server.api.endpoints.ws import WebsocketHandler
 from marimo._server.router import APIRouter
 from marimo._utils.health import get_node_version, get_required_modules_list
 
@@ -38,6 +40,23 @@ async def status(request: Request) -> JSONResponse:
         session.app_file_manager.filename or "__new__"
         for session in app_state.session_manager.sessions.values()
     ]
+    # Backpressure stats of each connected frontend's message queue
+    message_queues = {
+        session_id: asdict(session.session_consumer.message_queue.stats)
+        for session_id, session in app_state.session_manager.sessions.items()
+        if isinstance(session.session_consumer, WebsocketHandler)
+    }
+    # UI element value updates received and sent to each session's kernel
+    ui_value_coalescers = {
+        session_id: asdict(session.ui_value_coalescer.stats)
+        for session_id, session in app_state.session_manager.sessions.items()
+    }
+    # Usage of each session's virtual files, in shared memory and on disk
+    virtual_files = {
+        session_id: asdict(session.session_view.virtual_file_usage)
+        for session_id, session in app_state.session_manager.sessions.items()
+        if session.session_view.virtual_file_usage is not None
+    }
     return JSONResponse(
         {
             "status": "healthy",
@@ -48,6 +67,9 @@ async def status(request: Request) -> JSONResponse:
             "requirements": get_required_modules_list(),
             "node_version": get_node_version(),
             "lsp_running": app_state.session_manager.lsp_server.is_running(),
+            "message_queues": message_queues,
+            "ui_value_coalescers": ui_value_coalescers,
+            "virtual_files": virtual_files,
         }
     )
 
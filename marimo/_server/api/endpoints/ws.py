@@ -2,7 +2,8 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import functools
+import os
 from enum import IntEnum
 from typing import Callable, Optional
 
@@ -18,18 +19,23 @@ from marimo._messaging.ops import (
     Reconnected,
     serialize,
 )
+from marimo._messaging.serde import compress_frame, serialize_kernel_message
 from marimo._messaging.types import KernelMessage, NoopStream
-from marimo._plugins.core.json_encoder import WebComponentEncoder
 from marimo._plugins.core.web_component import JSONType
 from marimo._runtime.params import QueryParams
 from marimo._server.api.deps import AppState
 from marimo._server.file_router import MarimoFileKey
+from marimo._server.ids import SessionId
 from marimo._server.model import (
     ConnectionState,
     SessionConsumer,
     SessionMode,
 )
 from marimo._server.router import APIRouter
+from marimo._server.session.message_queue import (
+    ConsumerMessageQueue,
+    QueueOverflow,
+)
 from marimo._server.sessions import Session, SessionManager
 
 LOGGER = _loggers.marimo_logger()
@@ -38,11 +44,25 @@ router = APIRouter()
 
 SESSION_QUERY_PARAM_KEY = "session_id"
 FILE_QUERY_PARAM_KEY = "file"
+LAST_SEQ_QUERY_PARAM_KEY = "last_seq"
+PREVIOUS_SESSION_QUERY_PARAM_KEY = "previous_session_id"
+
+# Messages at least this many characters long are sent compressed, as binary
+# frames, to clients that don't compress messages with permessage-deflate
+# (e.g., when a proxy strips the extension); 0 disables compression.
+FRAME_COMPRESSION_THRESHOLD = int(
+    os.getenv("MARIMO_FRAME_COMPRESSION_THRESHOLD", 32 * 1024)
+)
+
+# Viewers of a shared session are sent the same frames, which only need to
+# be compressed once
+_compress_frame = functools.lru_cache(maxsize=4)(compress_frame)
 
 
 class WebSocketCodes(IntEnum):
     ALREADY_CONNECTED = 1003
     NORMAL_CLOSE = 1000
+    TRY_AGAIN_LATER = 1013
 
 
 @router.websocket("/ws")
@@ -101,8 +121,26 @@ class WebsocketHandler(SessionConsumer):
         self.cancel_close_handle: Optional[asyncio.TimerHandle] = None
         self.heartbeat_task: Optional[asyncio.Task[None]] = None
         # Messages from the kernel are put in this queue
-        # to be sent to the frontend
-        self.message_queue: asyncio.Queue[KernelMessage]
+        # to be sent to the frontend; their payloads are already
+        # encoded as JSON. If the frontend falls behind, superseded
+        # cell operations are coalesced.
+        self.message_queue: ConsumerMessageQueue
+        # Shared session this websocket views, if it is a read-only viewer
+        self.viewed_session: Optional[Session] = None
+        # Large messages are compressed by the server unless the websocket
+        # compresses them already
+        self.compress_frames = (
+            FRAME_COMPRESSION_THRESHOLD > 0
+            and "permessage-deflate"
+            not in websocket.headers.get("sec-websocket-extensions", "")
+        )
+
+    def _last_seq(self) -> Optional[int]:
+        """Sequence number of the last message received by the frontend."""
+        last_seq = self.websocket.query_params.get(LAST_SEQ_QUERY_PARAM_KEY)
+        if last_seq is None or not last_seq.isdigit():
+            return None
+        return int(last_seq)
 
     async def _write_kernel_ready(
         self,
@@ -110,6 +148,7 @@ class WebsocketHandler(SessionConsumer):
         resumed: bool,
         ui_values: dict[str, JSONType],
         last_executed_code: dict[CellId_t, str],
+        viewer: bool = False,
     ) -> None:
         """Communicates to the client that the kernel is ready.
 
@@ -150,32 +189,32 @@ class WebsocketHandler(SessionConsumer):
 
             last_executed_code = {}
 
-        await self.message_queue.put(
-            (
-                KernelReady.name,
-                serialize(
-                    KernelReady(
-                        codes=codes,
-                        names=names,
-                        configs=configs,
-                        layout=file_manager.read_layout_config(),
-                        cell_ids=cell_ids,
-                        resumed=resumed,
-                        ui_values=ui_values,
-                        last_executed_code=last_executed_code,
-                        app_config=app.config,
-                    )
-                ),
+        await self.write_operation(
+            KernelReady(
+                codes=codes,
+                names=names,
+                configs=configs,
+                layout=file_manager.read_layout_config(),
+                cell_ids=cell_ids,
+                resumed=resumed,
+                ui_values=ui_values,
+                last_executed_code=last_executed_code,
+                app_config=app.config,
+                viewer=viewer,
             )
         )
 
     async def _reconnect_session(
-        self, session: "Session", replay: bool
+        self, session: "Session", replay: bool, last_seq: Optional[int] = None
     ) -> None:
         """Reconnect to an existing session (kernel).
 
         A websocket can be closed when a user's computer goes to sleep,
         spurious network issues, etc.
+
+        If not replaying the whole session, a frontend that reports the
+        sequence number of the last message it received (`last_seq`) is
+        sent the messages it missed.
         """
         # Cancel previous close handle
         if self.cancel_close_handle is not None:
@@ -187,8 +226,10 @@ class WebsocketHandler(SessionConsumer):
         # Write reconnected message
         await self.write_operation(Reconnected())
 
-        # If not replaying, just send a toast
+        # If not replaying, just send missed messages and a toast
         if not replay:
+            if last_seq is not None:
+                await self._write_missed_messages(session, last_seq)
             await self.write_operation(
                 Alert(
                     title="Reconnected",
@@ -217,14 +258,54 @@ class WebsocketHandler(SessionConsumer):
         )
 
         for op in operations:
-            LOGGER.debug("Replaying operation %s", serialize(op))
+            LOGGER.debug("Replaying operation %s", op)
+            await self.write_operation(op)
+
+    async def _view_session(
+        self, shared_session_id: SessionId, session: Session
+    ) -> None:
+        """Connect to a shared session as a read-only viewer."""
+        self.status = ConnectionState.OPEN
+        self.viewed_session = session
+        self.manager.viewers[self.session_id] = shared_session_id
+        session.connect_viewer(self)
+
+        state = session.get_current_state()
+        await self._write_kernel_ready(
+            session=session,
+            resumed=True,
+            ui_values=state.ui_values,
+            last_executed_code=state.last_executed_code,
+            viewer=True,
+        )
+        for op in state.operations:
+            await self.write_operation(op)
+
+    async def _write_missed_messages(
+        self, session: "Session", last_seq: int
+    ) -> None:
+        frames = session.replay_log.since(last_seq)
+        if frames is not None:
+            LOGGER.debug("Replaying %s missed messages", len(frames))
+            for frame in frames:
+                await self.message_queue.put(frame)
+            return
+
+        # The log no longer has all the missed messages, so replay the
+        # current state of the session instead
+        operations = session.get_current_state().operations
+        LOGGER.debug(
+            "Replaying %s operations; missed messages are no longer logged",
+            len(operations),
+        )
+        for op in operations:
             await self.write_operation(op)
 
     async def start(self) -> None:
         # Accept the websocket connection
         await self.websocket.accept()
         # Create a new queue for this session
-        self.message_queue = asyncio.Queue()
+        self.message_queue = ConsumerMessageQueue()
 
         session_id = self.session_id
         mgr = self.manager
@@ -259,7 +340,11 @@ class WebsocketHandler(SessionConsumer):
                 LOGGER.debug("Reconnecting session %s", session_id)
                 # In case there is a lingering connection, close it
                 existing_session.maybe_disconnect_consumer()
-                await self._reconnect_session(existing_session, replay=False)
+                await self._reconnect_session(
+                    existing_session,
+                    replay=False,
+                    last_seq=self._last_seq(),
+                )
                 return existing_session
 
             # 2. Handle resume
@@ -273,7 +358,39 @@ class WebsocketHandler(SessionConsumer):
                 await self._reconnect_session(resumable_session, replay=True)
                 return resumable_session
 
-            # 3. Create a new session
+            # 3. Handle taking over a shared session
+
+            # The owner of a shared session refreshed their page, and sent
+            # the session's previous id; or the owner left, and the next
+            # client to connect after a grace period becomes the owner
+            owned_session = mgr.maybe_take_over_shared_session(
+                session_id,
+                self.file_key,
+                previous_session_id=self.websocket.query_params.get(
+                    PREVIOUS_SESSION_QUERY_PARAM_KEY
+                ),
+            )
+            if owned_session is not None:
+                LOGGER.debug("Taking over shared session as %s", session_id)
+                await self._reconnect_session(owned_session, replay=True)
+                return owned_session
+
+            # 4. Handle viewing a shared session
+
+            # In run mode, a session can be shared by all clients; only the
+            # client that owns it can interact with it
+            shared_session_id = mgr.get_shared_session_id(self.file_key)
+            if shared_session_id is not None:
+                LOGGER.debug(
+                    "Viewing shared session %s from %s",
+                    shared_session_id,
+                    session_id,
+                )
+                shared_session = mgr.sessions[shared_session_id]
+                await self._view_session(shared_session_id, shared_session)
+                return shared_session
+
+            # 5. Create a new session
 
             # If the client refreshed their page, there will be one
             # existing session with a closed socket for a different session
@@ -308,16 +425,26 @@ class WebsocketHandler(SessionConsumer):
 
         async def listen_for_messages() -> None:
             while True:
-                (op, data) = await self.message_queue.get()
-                await self.websocket.send_text(
-                    json.dumps(
-                        {
-                            "op": op,
-                            "data": data,
-                        },
-                        cls=WebComponentEncoder,
+                try:
+                    (_op, payload) = await self.message_queue.get()
+                except QueueOverflow:
+                    # The frontend reconnects, and is sent the messages it
+                    # missed
+                    LOGGER.debug(
+                        "Closing websocket for session %s to resync",
+                        self.session_id,
                     )
-                )
+                    await self.websocket.close(
+                        WebSocketCodes.TRY_AGAIN_LATER, "MARIMO_RESYNC"
+                    )
+                    return
+                if (
+                    self.compress_frames
+                    and len(payload) >= FRAME_COMPRESSION_THRESHOLD
+                ):
+                    await self.websocket.send_bytes(_compress_frame(payload))
+                else:
+                    await self.websocket.send_text(payload)
 
         async def listen_for_disconnect() -> None:
             try:
@@ -332,9 +459,15 @@ class WebsocketHandler(SessionConsumer):
                 # Change the status
                 self.status = ConnectionState.CLOSED
                 # Disconnect the consumer
-                session = self.manager.get_session(self.session_id)
-                if session:
-                    session.disconnect_consumer()
+                if self.viewed_session is not None:
+                    self.manager.viewers.pop(self.session_id, None)
+                    self.viewed_session.disconnect_viewer(self)
+                else:
+                    session = self.manager.get_session(self.session_id)
+                    # The frontend may have reconnected already, e.g. to
+                    # resync
+                    if session and session.session_consumer is self:
+                        session.disconnect_consumer()
 
                 if self.manager.mode == SessionMode.RUN:
                     # When the websocket is closed, we wait TTL_SECONDS before
@@ -342,14 +475,27 @@ class WebsocketHandler(SessionConsumer):
                     # being closed if the during an intermittent network issue.
                     def _close() -> None:
                         if self.status != ConnectionState.OPEN:
-                            LOGGER.debug(
-                                "Closing session %s (TTL EXPIRED)",
-                                self.session_id,
-                            )
                             # wait until TTL is expired before canceling the
                             # listener task
                             listen_for_messages_task.cancel()
-                            self.manager.close_session(self.session_id)
+                            # The shared session may have been handed over
+                            # to a new owner, under a new id
+                            session = (
+                                self.viewed_session
+                                or self.manager.get_session(self.session_id)
+                            )
+                            # A shared session is kept open while anyone
+                            # is connected to it
+                            if session is None or session.has_consumers():
+                                return
+                            session_id = self.manager.get_session_id(session)
+                            if session_id is None:
+                                return
+                            LOGGER.debug(
+                                "Closing session %s (TTL EXPIRED)",
+                                session_id,
+                            )
+                            self.manager.close_session(session_id)
 
                     session = self.manager.get_session(self.session_id)
                     cancellation_handle = asyncio.get_event_loop().call_later(
@@ -394,7 +540,9 @@ class WebsocketHandler(SessionConsumer):
         return listener
 
     async def write_operation(self, op: MessageOperation) -> None:
-        await self.message_queue.put((op.name, serialize(op)))
+        await self.message_queue.put(
+            (op.name, serialize_kernel_message(op.name, serialize(op)))
+        )
 
     def on_stop(self) -> None:
         # Cancel the heartbeat task, reader
@@ -3,8 +3,11 @@ from __future__ import annotations
 
 import asyncio
 import contextlib
+import os
+import shutil
 import socket
 import sys
+import tempfile
 
 from marimo._server.api.deps import AppState, AppStateBase
 from marimo._server.file_router import AppFileRouter
@@ -30,6 +33,7 @@ else:
     from typing import TypeAlias
 
 from marimo import _loggers
+from marimo._runtime.virtual_file import VIRTUAL_FILE_SPILL_DIR_ENV
 from marimo._server.api.interrupt import InterruptHandler
 from marimo._server.api.utils import open_url_in_browser
 from marimo._server.model import SessionMode
@@ -149,6 +153,26 @@ async def signal_handler(app: Starlette) -> AsyncIterator[None]:
     yield
 
 
+@contextlib.asynccontextmanager
+async def virtual_files(app: Starlette) -> AsyncIterator[None]:
+    del app
+    # Private directory for the virtual files that kernels spill to disk;
+    # kernels inherit it through the environment. If the variable is
+    # already set, the directory is created inside of it.
+    previous = os.environ.get(VIRTUAL_FILE_SPILL_DIR_ENV)
+    spill_dir = tempfile.mkdtemp(prefix="marimo-virtual-files-", dir=previous)
+    os.environ[VIRTUAL_FILE_SPILL_DIR_ENV] = spill_dir
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(VIRTUAL_FILE_SPILL_DIR_ENV, None)
+        else:
+            os.environ[VIRTUAL_FILE_SPILL_DIR_ENV] = previous
+        # Also removes files left behind by kernels that crashed
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
 @contextlib.asynccontextmanager
 async def etc(app: Starlette) -> AsyncIterator[None]:
     del app
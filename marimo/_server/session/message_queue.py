@@ -0,0 +1,298 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional
+
+from marimo import _loggers
+from marimo._messaging.cell_output import CellChannel
+from marimo._messaging.ops import Alert, CellOp, serialize
+from marimo._messaging.serde import (
+    serialize_kernel_message,
+    with_sequence_number,
+)
+from marimo._messaging.types import KernelMessage
+
+LOGGER = _loggers.marimo_logger()
+
+# Number of messages a consumer can have pending; past it, cell operations
+# are merged and console outputs are dropped, and a consumer that still
+# can't keep up is asked to resync.
+CONSUMER_QUEUE_MAX_SIZE = int(
+    os.getenv("MARIMO_CONSUMER_QUEUE_MAX_SIZE", 1_000)
+)
+
+# Fields of a cell operation other than its id, console and timestamp
+_NON_CONSOLE_FIELDS = ("output", "output_append", "status", "stale_inputs")
+
+# Channels of console outputs that are streamed as text
+_STREAM_CHANNELS = (CellChannel.STDOUT, CellChannel.STDERR)
+
+
+@dataclass
+class MessageQueueStats:
+    # Messages put on the queue
+    enqueued: int = 0
+    # Pending messages merged into a later message for the same cell
+    coalesced: int = 0
+    # Console outputs dropped because the queue was full
+    dropped: int = 0
+    # Times the queue overflowed, and its consumer was asked to resync
+    overflows: int = 0
+    # Largest number of pending messages
+    max_size: int = 0
+
+
+class QueueOverflow(Exception):
+    """Raised to a consumer whose queue overflowed.
+
+    Its pending messages were discarded; it should reconnect, and be sent
+    the messages it missed.
+    """
+
+
+class ConsumerMessageQueue:
+    """Queue of kernel messages pending for a single consumer.
+
+    The queue never blocks a put. Once it holds `capacity` messages, a cell
+    operation is merged into the most recent pending operation for the
+    same cell when it makes that operation redundant, or when it only adds
+    console output; so a slow consumer receives the latest output and
+    status of a cell instead of every intermediate one.
+
+    Otherwise, console output is dropped to make room: the oldest pending
+    operation that only has console output, else the new message if it
+    only has console output. Once the consumer has caught up, it is sent an
+    alert with the number of console outputs dropped.
+
+    Other messages, such as status transitions, appended outputs or
+    function call results, can't be dropped without leaving the page in the
+    wrong state; if one doesn't fit, the queue overflows. Its pending
+    messages are discarded, later ones are ignored, and `get` raises
+    `QueueOverflow`, so that the consumer reconnects and resyncs from the
+    session's replay log.
+    """
+
+    def __init__(self, capacity: int = CONSUMER_QUEUE_MAX_SIZE) -> None:
+        self.capacity = capacity
+        self.stats = MessageQueueStats()
+        self._queue: Deque[KernelMessage] = deque()
+        self._not_empty = asyncio.Event()
+        # Console outputs dropped since the consumer was last told about it
+        self._dropped = 0
+        # Decoded pending cell operations, by id of the message; only
+        # populated once the queue is full
+        self._decoded: Dict[int, Dict[str, Any]] = {}
+        self._overflowed = False
+
+    def qsize(self) -> int:
+        return len(self._queue)
+
+    async def put(self, message: KernelMessage) -> None:
+        self.put_nowait(message)
+
+    def put_nowait(self, message: KernelMessage) -> None:
+        if self._overflowed:
+            # The consumer resyncs from the replay log instead
+            return
+        self.stats.enqueued += 1
+        if len(self._queue) < self.capacity:
+            self._queue.append(message)
+        elif not self._merge(message):
+            self._make_room(message)
+        self.stats.max_size = max(self.stats.max_size, len(self._queue))
+        self._not_empty.set()
+
+    async def get(self) -> KernelMessage:
+        while not self._queue and not self._dropped and not self._overflowed:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        if self._overflowed:
+            raise QueueOverflow()
+        if not self._queue:
+            return self._dropped_alert()
+        message = self._queue.popleft()
+        self._decoded.pop(id(message), None)
+        return message
+
+    def _decode(self, message: KernelMessage) -> Dict[str, Any]:
+        """The message's frame (its op, data, and sequence number)."""
+        key = id(message)
+        if key not in self._decoded:
+            self._decoded[key] = json.loads(message[1])
+        return self._decoded[key]
+
+    def _merge(self, message: KernelMessage) -> bool:
+        """Merge a cell operation into the most recent pending operation
+        for the same cell, in its place; returns False if it can't be
+        merged."""
+        if message[0] != CellOp.name:
+            return False
+        frame = self._decode(message)
+        cell_id = frame["data"]["cell_id"]
+        for index in range(len(self._queue) - 1, -1, -1):
+            pending = self._queue[index]
+            if pending[0] != CellOp.name:
+                continue
+            previous = self._decode(pending)
+            if previous["data"]["cell_id"] != cell_id:
+                continue
+            # Only the most recent operation for the cell is considered,
+            # so that no status transition is skipped
+            merged = merge_cell_ops(previous["data"], frame["data"])
+            if merged is None:
+                break
+            self._decoded.pop(id(pending), None)
+            self._decoded.pop(id(message), None)
+            payload = serialize_kernel_message(CellOp.name, merged)
+            # The merged operation keeps the sequence number of its place,
+            # so that a consumer that reconnects after receiving it is sent
+            # the messages after it
+            if "seq" in previous:
+                payload = with_sequence_number(payload, previous["seq"])
+            self._queue[index] = (CellOp.name, payload)
+            self.stats.coalesced += 1
+            return True
+        self._decoded.pop(id(message), None)
+        return False
+
+    def _make_room(self, message: KernelMessage) -> None:
+        """Append a message to the full queue, dropping console output to
+        make room for it; the queue overflows if there is none."""
+        for index, pending in enumerate(self._queue):
+            if pending[0] == CellOp.name and _is_console_only(
+                self._decode(pending)["data"]
+            ):
+                del self._queue[index]
+                self._decoded.pop(id(pending), None)
+                self._queue.append(message)
+                self._count_dropped()
+                return
+        if message[0] == CellOp.name and _is_console_only(
+            json.loads(message[1])["data"]
+        ):
+            self._count_dropped()
+            return
+        # Only console output can be dropped without leaving the page in
+        # the wrong state
+        self._overflow()
+
+    def _overflow(self) -> None:
+        LOGGER.warning(
+            "Consumer fell behind; more than %s messages are pending, "
+            "asking it to resync.",
+            self.capacity,
+        )
+        self._overflowed = True
+        self._queue.clear()
+        self._decoded.clear()
+        # The consumer is sent the current state when it resyncs
+        self._dropped = 0
+        self.stats.overflows += 1
+
+    def _count_dropped(self) -> None:
+        if self._dropped == 0:
+            LOGGER.warning(
+                "Consumer is falling behind; more than %s messages are "
+                "pending, dropping console outputs.",
+                self.capacity,
+            )
+        self._dropped += 1
+        self.stats.dropped += 1
+
+    def _dropped_alert(self) -> KernelMessage:
+        count, self._dropped = self._dropped, 0
+        alert = Alert(
+            title="Console output dropped",
+            description=(
+                f"{count} console outputs from the kernel were dropped "
+                "because this page fell behind. Reload the page to see "
+                "the latest console output of the notebook."
+            ),
+            variant="danger",
+        )
+        return (
+            Alert.name,
+            serialize_kernel_message(Alert.name, serialize(alert)),
+        )
+
+
+def supersedes(previous: Dict[str, Any], next_: Dict[str, Any]) -> bool:
+    """Whether a serialized cell operation makes a previous one redundant,
+    apart from its console output.
+
+    The previous operation can be dropped when it does not transition the
+    cell to a different status, and every other field it sets is also set
+    by the next operation. Appended output is only made redundant by a full
+    output.
+    """
+    if (
+        previous.get("output_append") is not None
+        and next_.get("output") is None
+    ):
+        return False
+    if previous.get("status") is not None and previous.get(
+        "status"
+    ) != next_.get("status"):
+        return False
+    for key in ("output", "stale_inputs"):
+        if previous.get(key) is not None and next_.get(key) is None:
+            return False
+    return True
+
+
+def merge_cell_ops(
+    previous: Dict[str, Any], next_: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """A serialized cell operation with the effect of `previous` followed by
+    `next_`, or None if there is none that keeps every status transition.
+    """
+    if _is_console_only(next_):
+        merged = dict(previous)
+    elif supersedes(previous, next_):
+        merged = dict(next_)
+    else:
+        return None
+    console = _merge_console(previous.get("console"), next_.get("console"))
+    if console is _UNMERGEABLE:
+        return None
+    merged["console"] = console
+    merged["timestamp"] = next_["timestamp"]
+    return merged
+
+
+# Sentinel for console outputs that can't be merged into one operation
+_UNMERGEABLE: Any = object()
+
+
+def _merge_console(previous: Any, next_: Any) -> Any:
+    """Console field with the effect of `previous` followed by `next_`.
+
+    A list of outputs replaces the console; a single output is appended
+    to it.
+    """
+    if next_ is None:
+        return previous
+    if previous is None or isinstance(next_, list):
+        return next_
+    if isinstance(previous, list):
+        return previous + [next_]
+    # Two appended outputs; only text streamed to the same channel can be
+    # appended as one
+    if (
+        previous["channel"] == next_["channel"]
+        and previous["channel"] in _STREAM_CHANNELS
+        and previous["mimetype"] == next_["mimetype"] == "text/plain"
+    ):
+        return {**next_, "data": previous["data"] + next_["data"]}
+    return _UNMERGEABLE
+
+
+def _is_console_only(data: Dict[str, Any]) -> bool:
+    return data.get("console") is not None and all(
+        data.get(key) is None for key in _NON_CONSOLE_FIELDS
+    )
@@ -0,0 +1,67 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import os
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from marimo._messaging.serde import (
+    BATCH_OP,
+    serialize_batch,
+    with_sequence_number,
+)
+from marimo._messaging.types import KernelMessage
+
+# Total length of the messages kept for replay, in characters; older
+# messages are evicted first.
+REPLAY_LOG_MAX_SIZE = int(
+    os.getenv("MARIMO_REPLAY_LOG_MAX_SIZE", 8 * 1024 * 1024)
+)
+
+
+class ReplayLog:
+    """Bounded log of the kernel messages sent in a session.
+
+    Each message is stamped with a sequence number, starting at 1, and
+    stored as the websocket frame sent to clients. A client that reconnects
+    reports the last sequence number it has seen, and only the messages it
+    missed are sent to it, as long as they are still in the log.
+    """
+
+    def __init__(self, max_size: int = REPLAY_LOG_MAX_SIZE) -> None:
+        self.max_size = max_size
+        self.last_seq = 0
+        self._size = 0
+        self._frames: Deque[Tuple[int, KernelMessage]] = deque()
+
+    def append(self, message: KernelMessage) -> KernelMessage:
+        """Sequence and log a kernel message.
+
+        Returns the message as a websocket frame, with batched messages
+        encoded in a single frame.
+        """
+        op, payload = message
+        if op == BATCH_OP:
+            payload = serialize_batch(payload)
+        self.last_seq += 1
+        frame = (op, with_sequence_number(payload, self.last_seq))
+
+        self._frames.append((self.last_seq, frame))
+        self._size += len(frame[1])
+        while self._size > self.max_size and self._frames:
+            _, evicted = self._frames.popleft()
+            self._size -= len(evicted[1])
+        return frame
+
+    def since(self, seq: int) -> Optional[List[KernelMessage]]:
+        """Frames of the messages sent after the message numbered `seq`.
+
+        Returns None if the log no longer holds all of them, or if `seq`
+        wasn't sent in this session.
+        """
+        if seq < 0 or seq > self.last_seq:
+            return None
+        first_seq = self._frames[0][0] if self._frames else self.last_seq + 1
+        if seq + 1 < first_seq:
+            return None
+        return [frame for s, frame in self._frames if s > seq]
@@ -1,8 +1,9 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
-from typing import Any, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, cast
 
 from marimo._ast.cell import CellId_t
 from marimo._messaging.cell_output import CellChannel, CellOutput
@@ -13,7 +14,10 @@ from marimo._messaging.ops import (
     Variables,
     VariableValue,
     VariableValues,
+    VirtualFileUsage,
 )
+from marimo._messaging.serde import BATCH_OP, deserialize_kernel_message
+from marimo._messaging.types import KernelMessage
 from marimo._runtime.requests import (
     ControlRequest,
     CreationRequest,
@@ -23,6 +27,25 @@ from marimo._runtime.requests import (
 )
 from marimo._utils.parse_dataclass import parse_raw
 
+# Operations that the session view keeps track of, by name; messages
+# for other operations are forwarded to consumers without being decoded.
+TRACKED_OPERATIONS: Dict[str, Type[MessageOperation]] = {
+    CellOp.name: CellOp,
+    Variables.name: Variables,
+    VariableValues.name: VariableValues,
+    Interrupted.name: Interrupted,
+    VirtualFileUsage.name: VirtualFileUsage,
+}
+
+# Console history kept per cell, in number of outputs and characters; the
+# oldest outputs are dropped first.
+CONSOLE_HISTORY_MAX_OUTPUTS = int(
+    os.getenv("MARIMO_CONSOLE_HISTORY_MAX_OUTPUTS", 1_000)
+)
+CONSOLE_HISTORY_MAX_SIZE = int(
+    os.getenv("MARIMO_CONSOLE_HISTORY_MAX_SIZE", 1_000_000)
+)
+
 
 class SessionView:
     """
@@ -42,6 +65,11 @@ class SessionView:
         self.ui_values: dict[str, Any] = {}
         # Map of cell id to the last code that was executed in that cell.
         self.last_executed_code: dict[CellId_t, str] = {}
+        # Map of cell id to the marker heading its truncated console
+        # history, and the number of outputs dropped.
+        self._console_truncation: dict[CellId_t, Tuple[CellOutput, int]] = {}
+        # Last reported usage of the kernel's virtual files
+        self.virtual_file_usage: Optional[VirtualFileUsage] = None
 
     def _add_ui_value(self, name: str, value: Any) -> None:
         self.ui_values[name] = value
@@ -59,6 +87,23 @@ class SessionView:
         operation = parse_raw({"operation": raw_operation}, _Container)
         self.add_operation(operation.operation)
 
+    def add_kernel_message(self, message: KernelMessage) -> None:
+        """Add a serialized message from the kernel.
+
+        Only messages for tracked operations are decoded, directly into
+        the operation's type.
+        """
+        op, payload = message
+        if op == BATCH_OP:
+            for batched_message in payload:
+                self.add_kernel_message(batched_message)
+            return
+        cls = TRACKED_OPERATIONS.get(op)
+        if cls is None:
+            return
+        operation = parse_raw(deserialize_kernel_message(payload), cls)
+        self.add_operation(cast(MessageOperation, operation))
+
     def add_control_request(self, request: ControlRequest) -> None:
         if isinstance(request, SetUIElementValueRequest):
             for object_id, value in request.ids_and_values:
@@ -91,9 +136,9 @@ class SessionView:
 
         if isinstance(operation, CellOp):
             previous = self.cell_operations.get(operation.cell_id)
-            self.cell_operations[operation.cell_id] = merge_cell_operation(
-                previous, operation
-            )
+            merged = merge_cell_operation(previous, operation)
+            self._truncate_console(merged)
+            self.cell_operations[operation.cell_id] = merged
         elif isinstance(operation, Variables):
             self.variable_operations = operation
 
@@ -115,6 +160,68 @@ class SessionView:
             # Resolve stdin
             self.add_stdin("")
 
+        elif isinstance(operation, VirtualFileUsage):
+            self.virtual_file_usage = operation
+
+    def _truncate_console(self, cell_op: CellOp) -> None:
+        """Keep only the tail of a cell's console history.
+
+        Dropped outputs are replaced by a marker at the head of the
+        console, so that clients replaying or exporting the session know
+        that the history was truncated.
+        """
+        console: List[CellOutput] = as_list(cell_op.console)
+        size = sum(_output_size(output) for output in console)
+        if (
+            len(console) <= CONSOLE_HISTORY_MAX_OUTPUTS
+            and size <= CONSOLE_HISTORY_MAX_SIZE
+        ):
+            return
+
+        dropped = 0
+        truncation = self._console_truncation.get(cell_op.cell_id)
+        if truncation is not None and console and console[0] is truncation[0]:
+            size -= _output_size(console[0])
+            console = console[1:]
+            dropped = truncation[1]
+
+        # Keep the most recent outputs that fit; pending stdin prompts are
+        # always kept
+        kept: List[CellOutput] = []
+        budget = CONSOLE_HISTORY_MAX_SIZE
+        for output in reversed(console):
+            output_size = _output_size(output)
+            if output.channel == CellChannel.STDIN or (
+                output_size <= budget
+                and len(kept) < CONSOLE_HISTORY_MAX_OUTPUTS - 1
+            ):
+                kept.append(output)
+                budget -= output_size
+            elif not kept and isinstance(output.data, str):
+                # Keep the end of an output that is too large by itself
+                kept.append(
+                    CellOutput(
+                        channel=output.channel,
+                        mimetype=output.mimetype,
+                        data=output.data[-budget:] if budget else "",
+                        timestamp=output.timestamp,
+                    )
+                )
+                budget = 0
+                dropped += 1
+            else:
+                dropped += 1
+        kept.reverse()
+
+        marker = CellOutput(
+            channel=CellChannel.STDOUT,
+            mimetype="text/plain",
+            data=f"... {dropped} earlier console "
+            f"output{'s' if dropped != 1 else ''} truncated ...\n",
+        )
+        self._console_truncation[cell_op.cell_id] = (marker, dropped)
+        cell_op.console = [marker] + kept
+
     def get_cell_outputs(
         self, ids: list[CellId_t]
     ) -> dict[CellId_t, CellOutput]:
@@ -175,9 +282,22 @@ def merge_cell_operation(
     if next_.output is None:
         next_.output = previous.output
 
+    # Keep the full output, so that it can be replayed to a new client
+    if next_.output_append is not None:
+        next_.output = (
+            next_.output.append(next_.output_append)
+            if next_.output is not None
+            else next_.output_append
+        )
+        next_.output_append = None
+
     return next_
 
 
+def _output_size(output: CellOutput) -> int:
+    return len(output.data) if isinstance(output.data, str) else 0
+
+
 def as_list(value: Union[Any, Optional[Any], list[Any]]) -> list[Any]:
     if value is None:
         return []
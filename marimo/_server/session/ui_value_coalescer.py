@@ -0,0 +1,123 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from marimo import _loggers
+from marimo._runtime.requests import (
+    ControlRequest,
+    CreationRequest,
+    ExecuteMultipleRequest,
+    ExecuteVisibleRequest,
+    FunctionCallRequest,
+    InstallMissingPackagesRequest,
+    SetUIElementValueRequest,
+    UIElementId,
+)
+
+LOGGER = _loggers.marimo_logger()
+
+# Requests after which the kernel broadcasts a CompletedRun
+RUN_REQUESTS = (
+    CreationRequest,
+    ExecuteMultipleRequest,
+    ExecuteVisibleRequest,
+    FunctionCallRequest,
+    InstallMissingPackagesRequest,
+    SetUIElementValueRequest,
+)
+
+# Seconds after which a kernel that hasn't completed its run is no longer
+# waited on, e.g. because the request it was sent was dropped or failed;
+# pending updates are then sent anyway.
+UI_VALUE_BUSY_TIMEOUT = float(os.getenv("MARIMO_UI_VALUE_BUSY_TIMEOUT", 10))
+
+
+@dataclass
+class UIValueCoalescerStats:
+    # UI element value requests received
+    received: int = 0
+    # UI element value requests sent to the kernel
+    sent: int = 0
+    # Runs that weren't completed within the busy timeout
+    timeouts: int = 0
+
+
+class UIValueCoalescer:
+    """Coalesces the UI element value updates sent to a kernel.
+
+    While the kernel is busy running a request, updates to UI element
+    values are merged into a single pending request, keeping the latest
+    value of each element. The pending request is sent once the kernel
+    completes its run, so a kernel receives at most one update per run no
+    matter how fast elements are changed. Other requests are sent right
+    away, after any pending update, to preserve the order of requests.
+
+    If the kernel doesn't complete its run within `timeout` seconds, it is
+    no longer considered busy, so that updates are never held back
+    indefinitely.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[ControlRequest], None],
+        timeout: float = UI_VALUE_BUSY_TIMEOUT,
+    ) -> None:
+        self._send = send
+        self._timeout = timeout
+        # When the kernel was sent the request it is running, if it is busy
+        self._busy_since: Optional[float] = None
+        self._pending: Optional[Dict[UIElementId, Any]] = None
+        self.stats = UIValueCoalescerStats()
+
+    def put(self, request: ControlRequest) -> None:
+        self.check_timeout()
+        if isinstance(request, SetUIElementValueRequest):
+            self.stats.received += 1
+            if self._busy_since is not None:
+                if self._pending is None:
+                    self._pending = {}
+                self._pending.update(request.ids_and_values)
+                return
+            self.stats.sent += 1
+        else:
+            self.flush()
+
+        if isinstance(request, RUN_REQUESTS):
+            self._busy_since = time.monotonic()
+        self._send(request)
+
+    def flush(self) -> None:
+        """Send the pending update, if any."""
+        if self._pending is None:
+            return
+        request = SetUIElementValueRequest(
+            ids_and_values=list(self._pending.items())
+        )
+        self._pending = None
+        self.stats.sent += 1
+        self._busy_since = time.monotonic()
+        self._send(request)
+
+    def on_completed_run(self) -> None:
+        """Called when the kernel completes a run."""
+        self._busy_since = None
+        self.flush()
+
+    def check_timeout(self) -> None:
+        """Stop waiting on a kernel that has been busy for too long."""
+        if (
+            self._busy_since is None
+            or time.monotonic() - self._busy_since < self._timeout
+        ):
+            return
+        LOGGER.debug(
+            "Kernel did not complete its run within %s seconds; sending "
+            "pending UI element values",
+            self._timeout,
+        )
+        self.stats.timeouts += 1
+        self.on_completed_run()
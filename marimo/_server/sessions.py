@@ -22,17 +22,24 @@ import signal
 import subprocess
 import sys
 import threading
+import time
 from multiprocessing import connection
 from multiprocessing.queues import Queue as MPQueue
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 from uuid import uuid4
 
 from marimo import _loggers
 from marimo._ast.cell import CellConfig, CellId_t
 from marimo._cli.print import red
 from marimo._config.manager import UserConfigManager
-from marimo._messaging.ops import Alert, MessageOperation, Reload
+from marimo._messaging.ops import (
+    Alert,
+    CompletedRun,
+    MessageOperation,
+    Reload,
+)
+from marimo._messaging.serde import BATCH_OP
 from marimo._messaging.types import KernelMessage
 from marimo._output.formatters.formatters import register_formatters
 from marimo._runtime import requests, runtime
@@ -57,7 +64,9 @@ from marimo._server.model import (
 )
 from marimo._server.models.models import InstantiateRequest
 from marimo._server.recents import RecentFilesManager
+from marimo._server.session.replay_log import ReplayLog
 from marimo._server.session.session_view import SessionView
+from marimo._server.session.ui_value_coalescer import UIValueCoalescer
 from marimo._server.tokens import AuthToken, SkewProtectionToken
 from marimo._server.types import QueueType
 from marimo._server.utils import print_tabbed
@@ -327,9 +336,14 @@ class Session:
         # This can be optional in case a consumer gets disconnected,
         # and we want to continue the session without a consumer.
         self.session_consumer: Optional[SessionConsumer] = None
+        # When the session consumer disconnected, if it isn't connected
+        self._disconnected_at: Optional[float] = None
         self._queue_manager = queue_manager
         self.kernel_manager = kernel_manager
         self.session_view = SessionView()
+        # UI element value updates sent while the kernel is busy are merged
+        # and sent when it completes its run
+        self.ui_value_coalescer = UIValueCoalescer(self._send_control_request)
 
         self.kernel_manager.start_kernel()
         # Reads from the kernel connection and distributes the
@@ -338,12 +352,33 @@ class Session:
             self.kernel_manager.kernel_connection
         )
         self.message_distributor.add_consumer(
-            lambda msg: self.session_view.add_raw_operation(msg[1])
+            self.session_view.add_kernel_message
         )
+        # Kernel messages are logged, so that a consumer that reconnects
+        # can be sent just the messages it missed
+        self.replay_log = ReplayLog()
+        self._listener: Optional[Callable[[KernelMessage], None]] = None
+        # Read-only consumers of a shared session, and their listeners
+        self._viewers: dict[
+            SessionConsumer, Callable[[KernelMessage], None]
+        ] = {}
+        self.message_distributor.add_consumer(self._on_kernel_message)
         self.connect_consumer(session_consumer)
         self.message_distributor.start()
 
+    def _on_kernel_message(self, message: KernelMessage) -> None:
+        if _has_completed_run(message):
+            self.ui_value_coalescer.on_completed_run()
+        frame = self.replay_log.append(message)
+        if self._listener is not None:
+            self._listener(frame)
+        for listener in self._viewers.values():
+            listener(frame)
+
     def _check_alive(self) -> None:
+        # A kernel that is alive but never completes its run doesn't hold
+        # back UI element values
+        self.ui_value_coalescer.check_timeout()
         if not self.kernel_manager.is_alive():
             LOGGER.debug("Closing session because kernel died")
             self.close()
@@ -356,10 +391,13 @@ class Session:
         self.kernel_manager.interrupt_kernel()
 
     def put_control_request(self, request: requests.ControlRequest) -> None:
+        self.ui_value_coalescer.put(request)
+        self.session_view.add_control_request(request)
+
+    def _send_control_request(self, request: requests.ControlRequest) -> None:
         self._queue_manager.control_queue.put(request)
         if isinstance(request, SetUIElementValueRequest):
             self._queue_manager.set_ui_element_queue.put(request)
-        self.session_view.add_control_request(request)
 
     def put_completion_request(
         self, request: requests.CompletionRequest
@@ -377,8 +415,9 @@ class Session:
         ), "Expecting a session consumer to pause"
         LOGGER.debug("Disconnecting session consumer")
         self.session_consumer.on_stop()
-        self.unsubscribe_consumer()
+        self._listener = None
         self.session_consumer = None
+        self._disconnected_at = time.monotonic()
 
     def maybe_disconnect_consumer(self) -> None:
         if self.session_consumer is not None:
@@ -391,11 +430,31 @@ class Session:
         ), "Expecting no existing session consumer"
 
         self.session_consumer = session_consumer
+        self._disconnected_at = None
 
-        subscribe = self.session_consumer.on_start(self._check_alive)
-        self.unsubscribe_consumer = self.message_distributor.add_consumer(
-            subscribe
-        )
+        self._listener = self.session_consumer.on_start(self._check_alive)
+
+    def connect_viewer(self, viewer: SessionConsumer) -> None:
+        """Connect a read-only consumer to a shared session.
+
+        Viewers are sent the same messages as the session consumer, but
+        can't send requests to the kernel.
+        """
+        self._viewers[viewer] = viewer.on_start(self._check_alive)
+
+    def disconnect_viewer(self, viewer: SessionConsumer) -> None:
+        if self._viewers.pop(viewer, None) is not None:
+            viewer.on_stop()
+
+    def seconds_without_consumer(self) -> float:
+        """How long the session consumer has been disconnected, if it is."""
+        if self._disconnected_at is None:
+            return 0
+        return time.monotonic() - self._disconnected_at
+
+    def has_consumers(self) -> bool:
+        """Whether the session consumer or any viewer is connected."""
+        return self.session_consumer is not None or bool(self._viewers)
 
     def get_current_state(self) -> SessionView:
         return self.session_view
@@ -409,15 +468,20 @@ class Session:
         self.session_view.add_operation(operation)
         if self.session_consumer is not None:
             await self.session_consumer.write_operation(operation)
+        for viewer in self._viewers:
+            await viewer.write_operation(operation)
 
     def close(self) -> None:
         # Could be no consumer if we already disconnect, but the session
         # is running in the background
         if self.session_consumer is not None:
             self.session_consumer.on_stop()
+        for viewer in self._viewers:
+            viewer.on_stop()
+        self._viewers.clear()
         self.message_distributor.stop()
         self.kernel_manager.close_kernel()
-        self.unsubscribe_consumer()
+        self._listener = None
 
     def instantiate(self, request: InstantiateRequest) -> None:
         """Instantiate the app."""
@@ -432,6 +496,11 @@ class Session:
                 set_ui_element_value_request=SetUIElementValueRequest(
                     request.zip(), token=str(uuid4())
                 ),
+                layout=self.app_file_manager.read_layout_config(),
+                defer_offscreen_cells=(
+                    self.kernel_manager.mode == SessionMode.RUN
+                    and self.app_file_manager.app.config.defer_offscreen_cells
+                ),
             )
         )
 
@@ -445,6 +514,15 @@ class Session:
         )
 
 
+def _has_completed_run(message: KernelMessage) -> bool:
+    op, payload = message
+    if op == BATCH_OP:
+        return any(
+            batched_op == CompletedRun.name for batched_op, _ in payload
+        )
+    return op == CompletedRun.name
+
+
 class SessionManager:
     """Mapping from client session IDs to sessions.
 
@@ -456,8 +534,16 @@ class SessionManager:
     - the app mode (edit or run)
     - the auth token
     - the skew-protection token
+
+    In run mode, sessions can be shared: the first client to open an app
+    creates its session, and later clients connect to it as read-only
+    viewers instead of starting kernels of their own.
     """
 
+    # How long the owner of a shared session has to reconnect before
+    # another client can take the session over
+    OWNER_GRACE_SECONDS = Session.TTL_SECONDS
+
     def __init__(
         self,
         file_router: AppFileRouter,
@@ -469,9 +555,14 @@ class SessionManager:
         user_config_manager: UserConfigManager,
         cli_args: SerializedCLIArgs,
         auth_token: Optional[AuthToken],
+        shared_session: bool = False,
     ) -> None:
         self.file_router = file_router
         self.mode = mode
+        self.shared_session = shared_session and mode == SessionMode.RUN
+        # Viewers of shared sessions, mapped to the id of the session
+        # they view
+        self.viewers: dict[SessionId, SessionId] = {}
         self.development_mode = development_mode
         self.quiet = quiet
         self.sessions: dict[SessionId, Session] = {}
@@ -539,6 +630,67 @@ class SessionManager:
     def get_session(self, session_id: SessionId) -> Optional[Session]:
         return self.sessions.get(session_id)
 
+    def get_shared_session_id(
+        self, file_key: MarimoFileKey
+    ) -> Optional[SessionId]:
+        """Id of the session shared by the viewers of an app, if any."""
+        if not self.shared_session:
+            return None
+        for session_id, session in self.sessions.items():
+            if session.initialization_id == file_key:
+                return session_id
+        return None
+
+    def get_session_id(self, session: Session) -> Optional[SessionId]:
+        """Id under which a session is currently registered, if any."""
+        for session_id, maybe_session in self.sessions.items():
+            if maybe_session is session:
+                return session_id
+        return None
+
+    def maybe_take_over_shared_session(
+        self,
+        new_session_id: SessionId,
+        file_key: MarimoFileKey,
+        previous_session_id: Optional[SessionId] = None,
+    ) -> Optional[Session]:
+        """Hand a shared session that lost its owner to a new client.
+
+        The owner of a shared session gets a new session id when they
+        refresh their page, and proves they own the session by sending its
+        id (`previous_session_id`); instead of making them a viewer of
+        their own session, they take it over. Other clients can only take
+        it over once its owner has been gone for `OWNER_GRACE_SECONDS`.
+        Returns None if there is no shared session, or if it can't be
+        taken over.
+        """
+        shared_session_id = self.get_shared_session_id(file_key)
+        if shared_session_id is None:
+            return None
+        session = self.sessions[shared_session_id]
+        if session.session_consumer is not None:
+            return None
+        if (
+            previous_session_id != shared_session_id
+            and session.seconds_without_consumer() < self.OWNER_GRACE_SECONDS
+        ):
+            return None
+
+        LOGGER.debug(
+            "Handing shared session %s over to %s",
+            shared_session_id,
+            new_session_id,
+        )
+        del self.sessions[shared_session_id]
+        self.sessions[new_session_id] = session
+        self.viewers = {
+            viewer_id: (
+                new_session_id if viewed_id == shared_session_id else viewed_id
+            )
+            for viewer_id, viewed_id in self.viewers.items()
+        }
+        return session
+
     def maybe_resume_session(
         self, new_session_id: SessionId, file_key: MarimoFileKey
     ) -> Optional[Session]:
@@ -630,6 +782,11 @@ class SessionManager:
         if session is not None:
             session.close()
             del self.sessions[session_id]
+            self.viewers = {
+                viewer_id: viewed_id
+                for viewer_id, viewed_id in self.viewers.items()
+                if viewed_id != session_id
+            }
             return True
         return False
 
@@ -639,6 +796,7 @@ class SessionManager:
             session.close()
         LOGGER.debug("Closed all sessions.")
         self.sessions = {}
+        self.viewers = {}
 
     def shutdown(self) -> None:
         LOGGER.debug("Shutting down")
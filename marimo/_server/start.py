@@ -35,6 +35,7 @@ def start(
     cli_args: SerializedCLIArgs,
     base_url: str = "",
     auth_token: Optional[AuthToken],
+    shared_session: bool = False,
 ) -> None:
     """
     Start the server.
@@ -55,6 +56,7 @@ def start(
         user_config_manager=user_config_mgr,
         cli_args=cli_args,
         auth_token=auth_token,
+        shared_session=shared_session,
     )
 
     log_level = "info" if development_mode else "error"
@@ -66,6 +68,7 @@ def start(
                 lifespans.lsp,
                 lifespans.watcher,
                 lifespans.etc,
+                lifespans.virtual_files,
                 lifespans.signal_handler,
                 lifespans.logging,
                 lifespans.open_browser,
@@ -111,6 +114,9 @@ def start(
             ws_ping_interval=1,
             # close the websocket if we don't receive a pong after 60 seconds
             ws_ping_timeout=60,
+            # compress messages for clients that support it (uvicorn's
+            # default, made explicit since large outputs rely on it)
+            ws_per_message_deflate=True,
             timeout_graceful_shutdown=1,
         )
     )
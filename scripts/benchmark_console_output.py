@@ -0,0 +1,74 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Benchmark the overhead of console output on a print-heavy cell.
+
+Times a loop that does a small amount of work and prints on every
+iteration, with stdout redirected to marimo's console stream, against the
+same loop with printing disabled, and reports the messages and bytes that
+reach the server.
+
+Usage: python scripts/benchmark_console_output.py
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from queue import Queue
+from typing import Any, List, Tuple, cast
+
+from marimo._messaging.streams import ThreadSafeStdout, ThreadSafeStream
+
+ITERATIONS = 50_000
+
+
+class CountingPipe:
+    def __init__(self) -> None:
+        self.messages = 0
+        self.size = 0
+
+    def send(self, message: Tuple[str, Any]) -> None:
+        self.messages += 1
+        self.size += len(message[1])
+
+
+def training_loop(write: Any) -> float:
+    start = time.perf_counter()
+    loss = 1.0
+    for step in range(ITERATIONS):
+        # Stand-in for a (very short) training step
+        loss = sum(loss * 0.999 for _ in range(200)) / 200
+        write(f"step {step}: loss={loss:.6f}\n")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    pipe = CountingPipe()
+    stream = ThreadSafeStream(pipe=cast(Any, pipe), input_queue=Queue())
+    stream.cell_id = "benchmark"
+    stdout = ThreadSafeStdout(stream)
+
+    baseline = training_loop(lambda _: None)
+    printing = training_loop(stdout.write)
+    # Let the console worker flush
+    time.sleep(1)
+
+    rows: List[Tuple[str, str]] = [
+        ("iterations", f"{ITERATIONS}"),
+        ("loop without printing", f"{baseline:.2f}s"),
+        ("loop with printing", f"{printing:.2f}s"),
+        ("overhead", f"{(printing / baseline - 1) * 100:.1f}%"),
+        (
+            "time per print",
+            f"{(printing - baseline) / ITERATIONS * 1e6:.2f}us",
+        ),
+        ("messages sent", f"{pipe.messages}"),
+        ("bytes sent", f"{pipe.size}"),
+    ]
+    for name, value in rows:
+        print(f"{name:<24}{value:>16}")
+
+
+if __name__ == "__main__":
+    main()
+    # The console worker thread never exits
+    os._exit(0)
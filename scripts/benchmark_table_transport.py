@@ -0,0 +1,84 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Benchmark the formats that table data can be sent to the frontend in.
+
+Encodes a 1M-row table, with integer, float, string, boolean and datetime
+columns, as CSV, JSON records and an Arrow IPC stream, for each installed
+dataframe library, and reports the time taken and the bytes produced.
+
+Usage: python scripts/benchmark_table_transport.py [rows]
+"""
+
+from __future__ import annotations
+
+import datetime
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from marimo._dependencies.dependencies import DependencyManager
+from marimo._plugins.ui._impl.tables.utils import get_table_manager
+
+ROWS = 1_000_000
+
+
+def make_columns(rows: int) -> Dict[str, List[Any]]:
+    start = datetime.datetime(2024, 1, 1)
+    return {
+        "id": list(range(rows)),
+        "value": [i * 0.25 for i in range(rows)],
+        "category": [f"category-{i % 100}" for i in range(rows)],
+        "flag": [i % 3 == 0 for i in range(rows)],
+        "timestamp": [
+            start + datetime.timedelta(seconds=i) for i in range(rows)
+        ],
+    }
+
+
+def make_tables(rows: int) -> Dict[str, Any]:
+    columns = make_columns(rows)
+    tables: Dict[str, Any] = {}
+    if DependencyManager.has_pandas():
+        import pandas as pd
+
+        tables["pandas"] = pd.DataFrame(columns)
+    if DependencyManager.has_polars():
+        import polars as pl
+
+        tables["polars"] = pl.DataFrame(columns)
+    if DependencyManager.has_pyarrow():
+        import pyarrow as pa  # type: ignore
+
+        tables["pyarrow"] = pa.table(columns)
+    return tables
+
+
+def measure(encode: Callable[[], bytes]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    data = encode()
+    return time.perf_counter() - start, len(data)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    print(f"{rows} rows")
+    print(f"{'library':<10}{'format':<8}{'time':>10}{'size':>14}")
+    for library, table in make_tables(rows).items():
+        manager = get_table_manager(table)
+        for name, encode in (
+            ("csv", manager.to_csv),
+            ("json", manager.to_json),
+            ("arrow", manager.to_arrow_ipc),
+        ):
+            try:
+                seconds, size = measure(encode)
+            except Exception as e:
+                print(f"{library:<10}{name:<8}  failed: {e}")
+                continue
+            print(
+                f"{library:<10}{name:<8}{seconds:>9.2f}s"
+                f"{size / 1e6:>11.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
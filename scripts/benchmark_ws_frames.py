@@ -0,0 +1,110 @@
+# Copyright 2024 Marimo. All rights reserved.
+"""Benchmark bytes-on-wire and encode time of websocket frames.
+
+Compares sending cell outputs as uncompressed text frames, compressed with
+permessage-deflate (as negotiated by uvicorn), and as compressed binary
+frames (used when permessage-deflate isn't available).
+
+Usage: python scripts/benchmark_ws_frames.py
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import random
+import time
+import zlib
+from typing import Callable, Dict, List, Tuple
+
+from marimo._messaging.cell_output import CellChannel, CellOutput
+from marimo._messaging.mimetypes import KnownMimeType
+from marimo._messaging.ops import CellOp, serialize
+from marimo._messaging.serde import compress_frame, serialize_kernel_message
+
+REPEAT = 10
+
+
+def html_table(rows: int) -> str:
+    cells = "".join(
+        f"<tr><td>{i}</td><td>name {i}</td>"
+        f"<td>{random.random():.6f}</td><td>{random.choice('abcde')}</td></tr>"
+        for i in range(rows)
+    )
+    return f"<table><tbody>{cells}</tbody></table>"
+
+
+def vega_spec(points: int) -> str:
+    return json.dumps(
+        {
+            "mark": "point",
+            "data": {
+                "values": [
+                    {"x": i, "y": random.random(), "c": random.choice("abc")}
+                    for i in range(points)
+                ]
+            },
+        }
+    )
+
+
+def png_image(size: int) -> str:
+    # Image data is already compressed, so it's mostly incompressible
+    data = zlib.compress(os.urandom(size // 2) + bytes(size // 2))
+    return "data:image/png;base64," + base64.b64encode(data).decode()
+
+
+def frame(mimetype: KnownMimeType, data: str) -> str:
+    op = CellOp(
+        cell_id="Hbol",
+        output=CellOutput(
+            channel=CellChannel.OUTPUT, mimetype=mimetype, data=data
+        ),
+        status="idle",
+    )
+    return serialize_kernel_message(op.name, serialize(op))
+
+
+def permessage_deflate(payload: str) -> bytes:
+    # Raw deflate with a sync flush, like the websockets library
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    data = compressor.compress(payload.encode("utf-8"))
+    return data + compressor.flush(zlib.Z_SYNC_FLUSH)[:-4]
+
+
+def measure(encode: Callable[[str], bytes], payload: str) -> Tuple[int, float]:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        encoded = encode(payload)
+    elapsed = (time.perf_counter() - start) / REPEAT
+    return len(encoded), elapsed * 1000
+
+
+def main() -> None:
+    random.seed(0)
+    outputs: Dict[str, str] = {
+        "html table (1k rows)": frame("text/html", html_table(1_000)),
+        "html table (10k rows)": frame("text/html", html_table(10_000)),
+        "vega spec (20k points)": frame("application/json", vega_spec(20_000)),
+        "png image (500 KB)": frame("image/png", png_image(500_000)),
+    }
+    encoders: List[Tuple[str, Callable[[str], bytes]]] = [
+        ("text", lambda payload: payload.encode("utf-8")),
+        ("permessage-deflate", permessage_deflate),
+        ("binary (level 1)", compress_frame),
+    ]
+
+    print(f"{'output':<24}{'encoding':<20}{'bytes':>12}{'ratio':>8}{'ms':>8}")
+    for name, payload in outputs.items():
+        uncompressed = len(payload.encode("utf-8"))
+        for encoding, encode in encoders:
+            size, ms = measure(encode, payload)
+            print(
+                f"{name:<24}{encoding:<20}{size:>12,}"
+                f"{uncompressed / size:>8.1f}{ms:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
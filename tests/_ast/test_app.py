@@ -287,6 +287,7 @@ class TestApp:
             "app_title": None,
             "width": "full",
             "layout_file": None,
+            "defer_offscreen_cells": False,
         }
 
     @staticmethod
@@ -443,6 +444,7 @@ def test_app_config() -> None:
         "app_title": None,
         "width": "full",
         "layout_file": None,
+        "defer_offscreen_cells": False,
     }
 
 
@@ -456,6 +458,7 @@ def test_app_config_extra_args_ignored() -> None:
         "app_title": None,
         "width": "full",
         "layout_file": None,
+        "defer_offscreen_cells": False,
     }
 
 
@@ -0,0 +1,55 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+from marimo._messaging.cell_output import CellChannel
+from marimo._messaging.console_output_worker import CellConsoleBuffer
+
+
+def test_consecutive_outputs_are_merged() -> None:
+    buffer = CellConsoleBuffer("1")
+    buffer.add(CellChannel.STDOUT, "a\n", "text/plain")
+    buffer.add(CellChannel.STDOUT, "b\n", "text/plain")
+    buffer.add(CellChannel.STDERR, "c\n", "text/plain")
+    outputs = buffer.flush()
+    assert [(o.stream, o.data) for o in outputs] == [
+        (CellChannel.STDOUT, "a\nb\n"),
+        (CellChannel.STDERR, "c\n"),
+    ]
+    assert all(o.cell_id == "1" for o in outputs)
+    assert buffer.flush() == []
+
+
+def test_oldest_outputs_are_dropped() -> None:
+    buffer = CellConsoleBuffer("1", max_size=10)
+    for i in range(10):
+        buffer.add(CellChannel.STDOUT, f"{i}\n", "text/plain")
+    outputs = buffer.flush()
+    assert [(o.stream, o.data) for o in outputs] == [
+        (CellChannel.STDOUT, "... 5 lines of output dropped ...\n"),
+        (CellChannel.STDOUT, "5\n6\n7\n8\n9\n"),
+    ]
+    # The count of dropped lines is reset on flush
+    buffer.add(CellChannel.STDOUT, "x\n", "text/plain")
+    assert [o.data for o in buffer.flush()] == ["x\n"]
+
+
+def test_large_output_keeps_its_end() -> None:
+    buffer = CellConsoleBuffer("1", max_size=4)
+    buffer.add(CellChannel.STDERR, "abcdefgh", "text/plain")
+    outputs = buffer.flush()
+    assert [(o.stream, o.data) for o in outputs] == [
+        (CellChannel.STDERR, "... 1 line of output dropped ...\n"),
+        (CellChannel.STDERR, "efgh"),
+    ]
+
+
+def test_stdin_prompts_are_not_dropped() -> None:
+    buffer = CellConsoleBuffer("1", max_size=8)
+    buffer.add(CellChannel.STDIN, "name?", "text/plain")
+    buffer.add(CellChannel.STDOUT, "abcdefgh", "text/plain")
+    outputs = buffer.flush()
+    assert [(o.stream, o.data) for o in outputs] == [
+        (CellChannel.STDOUT, "... 1 line of output dropped ...\n"),
+        (CellChannel.STDIN, "name?"),
+        (CellChannel.STDOUT, "fgh"),
+    ]
@@ -1,5 +1,11 @@
 # Copyright 2024 Marimo. All rights reserved.
-from marimo._messaging.ops import VariableValue
+from __future__ import annotations
+
+from typing import Any
+
+from marimo._messaging.cell_output import CellChannel
+from marimo._messaging.ops import CellOp, VariableValue, serialize
+from marimo._messaging.types import Stream
 from marimo._output.hypertext import Html
 from marimo._plugins.ui._impl.input import slider
 
@@ -15,3 +21,78 @@ def test_value_html() -> None:
     variable_value = VariableValue(name="h", value=h)
     assert variable_value.datatype == "Html"
     assert variable_value.value == h.text
+
+
+class _RecordingStream(Stream):
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+
+    def write(self, op: str, data: dict[Any, Any]) -> None:
+        del op
+        self.messages.append(data)
+
+
+def test_broadcast_output_skips_unchanged_output() -> None:
+    stream = _RecordingStream()
+    for _ in range(2):
+        CellOp.broadcast_output(
+            channel=CellChannel.OUTPUT,
+            mimetype="text/plain",
+            data="hello",
+            cell_id="1",
+            status="idle",
+            stream=stream,
+        )
+    assert stream.messages[0]["output"]["data"] == "hello"
+    # The repeated output is replaced by a status-only transition
+    assert stream.messages[1]["output"] is None
+    assert stream.messages[1]["status"] == "idle"
+
+    # Outputs of other cells are tracked separately
+    CellOp.broadcast_output(
+        channel=CellChannel.OUTPUT,
+        mimetype="text/plain",
+        data="hello",
+        cell_id="2",
+        status=None,
+        stream=stream,
+    )
+    assert stream.messages[2]["output"]["data"] == "hello"
+
+    # Without a status, an unchanged output sends nothing
+    CellOp.broadcast_output(
+        channel=CellChannel.OUTPUT,
+        mimetype="text/plain",
+        data="hello",
+        cell_id="2",
+        status=None,
+        stream=stream,
+    )
+    assert len(stream.messages) == 3
+
+
+def test_broadcast_output_after_forget_output() -> None:
+    stream = _RecordingStream()
+    for _ in range(2):
+        CellOp.broadcast_output(
+            channel=CellChannel.OUTPUT,
+            mimetype="text/plain",
+            data="hello",
+            cell_id="1",
+            status=None,
+            stream=stream,
+        )
+        CellOp.forget_output("1", stream)
+    assert len(stream.messages) == 2
+    assert stream.messages[1]["output"]["data"] == "hello"
+
+
+def test_value_without_preview() -> None:
+    variable_value = VariableValue.without_preview(name="x", value=[1, 2])
+    assert variable_value.datatype == "list"
+    assert variable_value.value is None
+    # Serialized values that weren't previewed round-trip
+    assert serialize(variable_value) == serialize(
+        VariableValue(name="x", value=None, datatype="list")
+    )
+    assert VariableValue.without_preview(name="x", value=None).value == "None"
@@ -0,0 +1,43 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import json
+
+from marimo._messaging.serde import (
+    BATCH_OP,
+    deserialize_kernel_message,
+    serialize_batch,
+    serialize_kernel_message,
+    with_sequence_number,
+)
+
+
+def test_serialize_kernel_message() -> None:
+    payload = serialize_kernel_message("cell-op", {"cell_id": "1"})
+    assert json.loads(payload) == {"op": "cell-op", "data": {"cell_id": "1"}}
+    assert deserialize_kernel_message(payload) == {"cell_id": "1"}
+
+
+def test_serialize_batch() -> None:
+    messages = [
+        ("cell-op", serialize_kernel_message("cell-op", {"cell_id": "1"})),
+        ("variables", serialize_kernel_message("variables", {"v": []})),
+    ]
+    assert json.loads(serialize_batch(messages)) == {
+        "op": BATCH_OP,
+        "data": {
+            "messages": [
+                {"op": "cell-op", "data": {"cell_id": "1"}},
+                {"op": "variables", "data": {"v": []}},
+            ]
+        },
+    }
+
+
+def test_with_sequence_number() -> None:
+    payload = serialize_kernel_message("cell-op", {"cell_id": "1"})
+    assert json.loads(with_sequence_number(payload, 3)) == {
+        "op": "cell-op",
+        "data": {"cell_id": "1"},
+        "seq": 3,
+    }
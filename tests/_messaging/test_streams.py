@@ -1,5 +1,16 @@
+from __future__ import annotations
+
+import os
 import sys
+import threading
+from queue import Queue
+from typing import Any, List, cast
+
+import pytest
 
+from marimo._messaging import streams
+from marimo._messaging.serde import BATCH_OP
+from marimo._messaging.streams import ThreadSafeStream
 from marimo._runtime.runtime import Kernel
 from tests.conftest import ExecReqProvider, MockedKernel
 
@@ -128,3 +139,97 @@ async def test_import_multiprocessing(
         ]
     )
     assert mocked_kernel.stdout.messages == ["hello", "\n"]
+
+
+class _Pipe:
+    def __init__(self) -> None:
+        self.messages: List[Any] = []
+
+    def send(self, message: Any) -> None:
+        self.messages.append(message)
+
+    def ops(self) -> List[str]:
+        return [op for op, _ in self.messages]
+
+
+class TestThreadSafeStreamBatch:
+    @staticmethod
+    @pytest.fixture
+    def pipe() -> _Pipe:
+        return _Pipe()
+
+    @staticmethod
+    @pytest.fixture
+    def stream(
+        pipe: _Pipe, monkeypatch: pytest.MonkeyPatch
+    ) -> ThreadSafeStream:
+        # Don't start the console worker, which never exits
+        monkeypatch.setattr(streams, "buffered_writer", lambda *_: None)
+        return ThreadSafeStream(pipe=cast(Any, pipe), input_queue=Queue())
+
+    @staticmethod
+    def test_batch(stream: ThreadSafeStream, pipe: _Pipe) -> None:
+        with stream.batch():
+            stream.write("a", {"x": 1})
+            stream.write("b", {"x": 2})
+            assert pipe.messages == []
+        assert pipe.ops() == [BATCH_OP]
+        assert [op for op, _ in pipe.messages[0][1]] == ["a", "b"]
+
+    @staticmethod
+    def test_single_message_is_not_wrapped(
+        stream: ThreadSafeStream, pipe: _Pipe
+    ) -> None:
+        with stream.batch():
+            stream.write("a", {"x": 1})
+        assert pipe.ops() == ["a"]
+
+        with stream.batch():
+            pass
+        assert pipe.ops() == ["a"]
+
+    @staticmethod
+    def test_nested_batches_are_merged(
+        stream: ThreadSafeStream, pipe: _Pipe
+    ) -> None:
+        with stream.batch():
+            stream.write("a", {})
+            with stream.batch():
+                stream.write("b", {})
+            stream.write("c", {})
+        assert pipe.ops() == [BATCH_OP]
+        assert [op for op, _ in pipe.messages[0][1]] == ["a", "b", "c"]
+
+    @staticmethod
+    def test_other_threads_are_not_batched(
+        stream: ThreadSafeStream, pipe: _Pipe
+    ) -> None:
+        with stream.batch():
+            thread = threading.Thread(target=stream.write, args=("a", {}))
+            thread.start()
+            thread.join()
+            assert pipe.ops() == ["a"]
+            stream.write("b", {})
+        assert pipe.ops() == ["a", "b"]
+
+
+def test_forward_os_stream_decodes_split_characters(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class _Writer:
+        def __init__(self) -> None:
+            self.data: List[str] = []
+
+        def write(self, data: str) -> None:
+            self.data.append(data)
+
+    # Read a byte at a time, splitting multi-byte characters across reads
+    monkeypatch.setattr(streams, "FD_READ_SIZE", 1)
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, "héllo ✓".encode())
+    os.close(write_fd)
+
+    writer = _Writer()
+    streams._forward_os_stream(cast(Any, writer), read_fd)
+    os.close(read_fd)
+    assert "".join(writer.data) == "héllo ✓"
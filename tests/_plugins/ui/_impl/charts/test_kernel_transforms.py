@@ -0,0 +1,184 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import base64
+import io
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from marimo._dependencies.dependencies import DependencyManager
+from marimo._plugins.ui._impl.charts.kernel_transforms import (
+    _bin_extent,
+    downsample,
+    evaluate_chart,
+)
+
+HAS_DEPS = (
+    DependencyManager.has_pandas()
+    and DependencyManager.has_polars()
+    and DependencyManager.has_altair()
+)
+
+if HAS_DEPS:
+    import numpy as np
+    import pandas as pd
+    import polars as pl
+
+
+def _sent_data(spec: dict[str, Any]) -> pd.DataFrame:
+    url = spec["data"]["url"]
+    assert url.startswith("data:text/csv;base64,")
+    data = base64.b64decode(url[len("data:text/csv;base64,") :])
+    return pd.read_csv(io.BytesIO(data))
+
+
+def _to_frame(df: pd.DataFrame, library: str) -> Any:
+    return pl.from_pandas(df) if library == "polars" else df
+
+
+@pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
+@pytest.mark.parametrize("library", ["pandas", "polars"])
+class TestEvaluateChart:
+    @staticmethod
+    def test_aggregate(library: str) -> None:
+        import altair as alt
+
+        df = pd.DataFrame(
+            {"group": [1, 1, 2, 2, 2], "value": [1.0, 3.0, 2.0, 4.0, 6.0]}
+        )
+        chart = (
+            alt.Chart(_to_frame(df, library))
+            .mark_bar()
+            .encode(x="group:N", y="mean(value)")
+        )
+        evaluated = evaluate_chart(chart)
+        assert evaluated is not None
+        assert evaluated.spec["encoding"]["y"] == {
+            "field": "mean_value",
+            "type": "quantitative",
+            "title": "Mean of value",
+        }
+        assert "transform" not in evaluated.spec
+        sent = _sent_data(evaluated.spec)
+        assert sent.to_dict("list") == {
+            "group": [1, 2],
+            "mean_value": [2.0, 4.0],
+        }
+
+    @staticmethod
+    def test_filter_bin_and_count(library: str) -> None:
+        import altair as alt
+
+        df = pd.DataFrame(
+            {"x": [0.5, 1.5, 1.7, 3.2, 9.9, 4.0], "keep": [1, 1, 1, 1, 1, 0]}
+        )
+        chart = (
+            alt.Chart(_to_frame(df, library))
+            .mark_bar()
+            .encode(x=alt.X("x", bin=alt.Bin(maxbins=5)), y="count()")
+            .transform_filter(alt.datum.keep == 1)
+        )
+        evaluated = evaluate_chart(chart)
+        assert evaluated is not None
+        encoding = evaluated.spec["encoding"]
+        assert encoding["x"]["field"] == "bin_x"
+        assert encoding["x"]["bin"] == {"binned": True, "step": 2}
+        assert encoding["x2"] == {"field": "bin_x_end"}
+        sent = _sent_data(evaluated.spec).sort_values("bin_x")
+        assert sent["bin_x"].tolist() == [0.0, 2.0, 8.0]
+        assert sent["__count"].tolist() == [3, 1, 1]
+        # selections resolve against the filtered rows, before aggregation
+        assert len(evaluated.get_selection_dataframe()) == 5
+
+    @staticmethod
+    def test_downsample_scatter(library: str) -> None:
+        import altair as alt
+
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {"x": rng.normal(size=10_000), "y": rng.normal(size=10_000)}
+        )
+        chart = (
+            alt.Chart(_to_frame(df, library)).mark_point().encode(x="x", y="y")
+        )
+        evaluated = evaluate_chart(chart, max_points=1_000)
+        assert evaluated is not None
+        assert evaluated.positions is not None
+        sent = _sent_data(evaluated.spec)
+        assert len(sent) == len(evaluated.positions) < 2_000
+        # the extreme points are kept
+        assert sent["x"].max() == pytest.approx(df["x"].max())
+        assert sent["x"].min() == pytest.approx(df["x"].min())
+
+        # Selected points are mapped back to the rows they were sampled from
+        selection = evaluated.resolve_selection(
+            {"select_point": {"_vgsid_": [1, 2], "vlPoint": [""]}}
+        )
+        assert selection["select_point"]["_vgsid_"] == [
+            evaluated.positions[0] + 1,
+            evaluated.positions[1] + 1,
+        ]
+
+        # Small scatter plots are not downsampled
+        evaluated = evaluate_chart(chart, max_points=20_000)
+        assert evaluated is not None
+        assert evaluated.positions is None
+
+    @staticmethod
+    def test_unsupported_transform(library: str) -> None:
+        import altair as alt
+
+        df = pd.DataFrame({"x": [1, 2, 3]})
+        chart = (
+            alt.Chart(_to_frame(df, library))
+            .mark_line()
+            .encode(x="x", y="rank:Q")
+            .transform_window(rank="rank()")
+        )
+        assert evaluate_chart(chart) is None
+
+    @staticmethod
+    def test_data_error(library: str) -> None:
+        import altair as alt
+
+        df = pd.DataFrame({"x": [1, 2, 3], "name": ["a", "b", "c"]})
+        chart = (
+            alt.Chart(_to_frame(df, library))
+            .mark_point()
+            .encode(x="x", y="x")
+            .transform_filter(alt.datum.name > 1)
+        )
+        # Strings can't be compared with numbers
+        assert evaluate_chart(chart) is None
+
+        # Other errors are bugs, and aren't swallowed
+        with patch(
+            "marimo._plugins.ui._impl.charts.kernel_transforms._evaluate",
+            side_effect=AttributeError,
+        ):
+            with pytest.raises(AttributeError):
+                evaluate_chart(chart)
+
+
+@pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
+def test_bin_extent() -> None:
+    # Same bins as Vega
+    assert _bin_extent((0.5, 9.9), {"maxbins": 5}) == (0, 10, 2)
+    assert _bin_extent((-4.2, 4.3), True) == (-5, 5, 1)
+    assert _bin_extent((0, 100), {"step": 25}) == (0, 100, 25)
+    assert _bin_extent((3, 3), True) == (3, 3.5, 0.5)
+
+
+@pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
+def test_downsample_preserves_density() -> None:
+    rng = np.random.default_rng(0)
+    dense = rng.uniform(0, 1, size=9_000)
+    sparse = rng.uniform(9, 10, size=1_000)
+    values = np.concatenate([dense, sparse])
+    positions = downsample([values], len(values), 1_000)
+    sampled = values[positions]
+    assert 900 <= len(sampled) <= 1_100
+    # both regions are sampled in proportion to their density
+    assert (sampled < 5).mean() == pytest.approx(0.9, abs=0.05)
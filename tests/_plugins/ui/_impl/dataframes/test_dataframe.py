@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any, Dict, List
+
 import pytest
 
 from marimo._dependencies.dependencies import DependencyManager
@@ -9,6 +11,8 @@ from marimo._plugins.ui._impl.dataframes.dataframe import (
     GetColumnValuesArgs,
     GetColumnValuesResponse,
 )
+from marimo._plugins.ui._impl.table import GetColumnSummariesArgs
+from marimo._runtime.functions import EmptyArgs
 
 HAS_DEPS = DependencyManager.has_pandas()
 
@@ -39,6 +43,24 @@ def test_dataframe() -> None:
         subject.get_column_values(GetColumnValuesArgs(column="idk"))
 
 
+@pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
+def test_dataframe_column_values_missing() -> None:
+    df = pd.DataFrame({"A": ["b", None, "a", "b"]})
+
+    subject = ui.dataframe(df)
+
+    # Missing values can be picked too
+    assert subject.get_column_values(
+        GetColumnValuesArgs(column="A")
+    ) == GetColumnValuesResponse(
+        values=[None, "a", "b"], too_many_values=False
+    )
+    # but don't match a prefix
+    assert subject.get_column_values(
+        GetColumnValuesArgs(column="A", prefix="n")
+    ) == GetColumnValuesResponse(values=[], too_many_values=False)
+
+
 @pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
 def test_dataframe_numeric_columns() -> None:
     df = pd.DataFrame({1: [1, 2, 3], 2: ["a", "a", "a"]})
@@ -59,3 +81,129 @@ def test_dataframe_numeric_columns() -> None:
         subject.get_column_values(GetColumnValuesArgs(column="idk"))
     with pytest.raises(ColumnNotFound):
         subject.get_column_values(GetColumnValuesArgs(column="1"))
+
+
+@pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
+def test_dataframe_column_summaries() -> None:
+    df = pd.DataFrame({"A": [1, 2, 3], "B": [True, True, False]})
+
+    subject = ui.dataframe(df)
+    summaries = subject.get_column_summaries(
+        GetColumnSummariesArgs(columns=["A", "B"])
+    ).summaries
+    assert (summaries["A"].min, summaries["A"].max) == (1, 3)
+    assert summaries["B"].top_values == [(True, 2), (False, 1)]
+
+    # Summaries are of the transformed dataframe
+    subject._update(
+        {
+            "transforms": [
+                {
+                    "type": "filter_rows",
+                    "operation": "keep_rows",
+                    "where": [
+                        {"column_id": "A", "operator": ">=", "value": 2}
+                    ],
+                }
+            ]
+        }
+    )
+    summaries = subject.get_column_summaries(
+        GetColumnSummariesArgs(columns=["A"])
+    ).summaries
+    assert (summaries["A"].min, summaries["A"].max) == (2, 3)
+
+    with pytest.raises(ColumnNotFound):
+        subject.get_column_summaries(GetColumnSummariesArgs(columns=["idk"]))
+
+
+@pytest.mark.skipif(
+    not DependencyManager.has_polars() or not DependencyManager.has_pyarrow(),
+    reason="optional dependencies not installed",
+)
+@pytest.mark.parametrize("library", ["polars", "pyarrow"])
+def test_dataframe_native(library: str) -> None:
+    import polars as pl
+    import pyarrow as pa
+
+    data: Dict[str, List[Any]] = {"A": [3, 1, 2], "B": ["a", "b", "a"]}
+    df = pl.DataFrame(data) if library == "polars" else pa.table(data)
+
+    subject = ui.dataframe(df)
+    assert subject.value is df
+    assert subject._component_args["columns"] == [
+        ["A", "int64"],
+        ["B", "string"],
+    ]
+    assert subject.get_column_values(
+        GetColumnValuesArgs(column="B")
+    ) == GetColumnValuesResponse(values=["a", "b"], too_many_values=False)
+    with pytest.raises(ColumnNotFound):
+        subject.get_column_values(GetColumnValuesArgs(column="idk"))
+
+    value = subject._convert_value(
+        {
+            "transforms": [
+                {
+                    "type": "sort_column",
+                    "column_id": "A",
+                    "ascending": True,
+                    "na_position": "last",
+                }
+            ]
+        }
+    )
+    # Transforms run natively
+    assert type(value) is type(df)
+    rows = (
+        value.to_dict(as_series=False)
+        if library == "polars"
+        else value.to_pydict()
+    )
+    assert rows == {"A": [1, 2, 3], "B": ["b", "a", "a"]}
+    subject._value = value
+    response = subject.get_dataframe(EmptyArgs())
+    assert response.total_rows == 3
+    assert response.has_more is False
+
+
+@pytest.mark.skipif(
+    not DependencyManager.has_polars(),
+    reason="optional dependencies not installed",
+)
+def test_dataframe_column_values_high_cardinality() -> None:
+    import polars as pl
+
+    df = pl.DataFrame(
+        {
+            "A": [f"value {i}" for i in range(1000)] + ["common"] * 10,
+            "B": ["x", "y"] * 505,
+        }
+    )
+    subject = ui.dataframe(df)
+
+    response = subject.get_column_values(GetColumnValuesArgs(column="A"))
+    assert response.too_many_values is True
+    assert response.values[0] == "common"
+    assert response.counts is not None
+    assert response.counts[0] == 10
+    assert len(response.values) == len(response.counts) == 50
+
+    # Prefix searches count the matching values
+    response = subject.get_column_values(
+        GetColumnValuesArgs(column="A", prefix="VALUE 99")
+    )
+    assert response == GetColumnValuesResponse(
+        values=["value 99"] + [f"value {i}" for i in range(990, 1000)],
+        too_many_values=False,
+    )
+
+    # Values are cached
+    response = subject.get_column_values(GetColumnValuesArgs(column="B"))
+    assert subject._column_values["B"] is response
+    assert response == GetColumnValuesResponse(
+        values=["x", "y"], too_many_values=False
+    )
+    assert subject.get_column_values(
+        GetColumnValuesArgs(column="B", prefix="Y")
+    ) == GetColumnValuesResponse(values=["y"], too_many_values=False)
@@ -1,12 +1,18 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+from typing import Any, Callable, Dict, List, Literal, Tuple, cast
+from unittest.mock import patch
+
 import pytest
 
 from marimo._dependencies.dependencies import DependencyManager
 from marimo._plugins.ui._impl.dataframes.handlers import (
+    PandasTransformHandler,
     TransformsContainer,
+    _transforms_key,
     apply_transforms,
+    optimize_transforms,
 )
 from marimo._plugins.ui._impl.dataframes.transforms import (
     AggregateTransform,
@@ -366,15 +372,17 @@ class TestHandlers:
             where=[Condition(column_id="A", operator=">=", value=2)],
         )
         transformations = Transformations([sort_transform, filter_transform])
-        # Verify the next transformation
-        assert container._is_superset(transformations) is False
-        assert (
-            container._get_next_transformations(transformations)
-            == transformations
-        )
+        # Nothing is cached yet
+        assert not container._snapshots
 
         # Apply the transformations
         result = container.apply(transformations)
+        first_result = result
+        # The result of each prefix is cached
+        key = _transforms_key(transformations.transforms)
+        assert list(container._snapshots) == [key[:1], key]
+        sorted_result = container._snapshots[key[:1]][0]
+        assert sorted_result["B"].tolist() == [5, 4, 3, 2, 1]
 
         # Get the transformed dataframe
         # Check that the transformations were applied correctly
@@ -390,29 +398,407 @@ class TestHandlers:
         transformations = Transformations(
             [sort_transform, filter_transform, filter_again_transform]
         )
-        # Verify the next transformation
-        assert container._is_superset(transformations) is True
-        assert container._get_next_transformations(
-            transformations
-        ) == Transformations([filter_again_transform])
         result = container.apply(
             transformations,
         )
+        # The result is cached under the longer prefix too
+        assert len(container._snapshots) == 3
+        assert _transforms_key(transformations.transforms) in (
+            container._snapshots
+        )
         # Check that the transformations were applied correctly
         assert result["A"].tolist() == [3, 4, 5]
         assert result["B"].tolist() == [3, 2, 1]
 
         transformations = Transformations([sort_transform, filter_transform])
-        # Verify the next transformation
-        assert container._is_superset(transformations) is False
-        assert (
-            container._get_next_transformations(transformations)
-            == transformations
-        )
         # Reapply by removing the last transform
         result = container.apply(
             transformations,
         )
+        # The cached result of the prefix is reused
+        assert result is first_result
         # Check that the transformations were applied correctly
         assert result["A"].tolist() == [2, 3, 4, 5]
         assert result["B"].tolist() == [4, 3, 2, 1]
+
+        # Editing the last transform reuses the cached result of the sort
+        with patch.object(
+            container._handler, "lazy", wraps=container._handler.lazy
+        ) as lazy:
+            result = container.apply(
+                Transformations([sort_transform, filter_again_transform])
+            )
+        assert len(lazy.call_args_list) == 1
+        assert lazy.call_args_list[0].args[0] is sorted_result
+        assert result["A"].tolist() == [1, 3, 4, 5]
+
+
+HAS_NATIVE_DEPS = (
+    DependencyManager.has_polars() and DependencyManager.has_pyarrow()
+)
+
+
+def _pandas(data: Dict[str, List[Any]]) -> Any:
+    import pandas as pd
+
+    return pd.DataFrame(data)
+
+
+def _polars(data: Dict[str, List[Any]]) -> Any:
+    import polars as pl
+
+    return pl.DataFrame(data)
+
+
+def _pyarrow(data: Dict[str, List[Any]]) -> Any:
+    import pyarrow as pa
+
+    return pa.table(data)
+
+
+def _to_dict(df: Any) -> Dict[str, List[Any]]:
+    return cast(
+        Dict[str, List[Any]],
+        df.to_pydict()
+        if hasattr(df, "to_pydict")
+        else df.to_dict(as_series=False),
+    )
+
+
+@pytest.mark.skipif(
+    not HAS_NATIVE_DEPS, reason="optional dependencies not installed"
+)
+@pytest.mark.parametrize("make_df", [_polars, _pyarrow])
+class TestNativeHandlers:
+    @staticmethod
+    def apply(df: Any, *transforms: Transform) -> Dict[str, List[Any]]:
+        result = apply_transforms(df, Transformations(list(transforms)))
+        # The result has the same type as the input
+        assert type(result) is type(df)
+        return _to_dict(result)
+
+    @staticmethod
+    def test_handle_column_conversion(make_df: Callable[..., Any]) -> None:
+        df = make_df({"A": ["1", "2", "3"]})
+        transform = ColumnConversionTransform(
+            type=TransformType.COLUMN_CONVERSION,
+            column_id="A",
+            data_type="int64",
+            errors="raise",
+        )
+        assert TestNativeHandlers.apply(df, transform) == {"A": [1, 2, 3]}
+
+        df = make_df({"A": ["1", "a"]})
+        transform = ColumnConversionTransform(
+            type=TransformType.COLUMN_CONVERSION,
+            column_id="A",
+            data_type="int64",
+            errors="ignore",
+        )
+        assert TestNativeHandlers.apply(df, transform) == {"A": ["1", "a"]}
+
+    @staticmethod
+    def test_handle_rename_and_select(make_df: Callable[..., Any]) -> None:
+        df = make_df({"A": [1, 2], "B": [3, 4]})
+        assert TestNativeHandlers.apply(
+            df,
+            RenameColumnTransform(
+                type=TransformType.RENAME_COLUMN,
+                column_id="A",
+                new_column_id="C",
+            ),
+            SelectColumnsTransform(
+                type=TransformType.SELECT_COLUMNS, column_ids=["C"]
+            ),
+        ) == {"C": [1, 2]}
+
+    @staticmethod
+    def test_handle_sort_column(make_df: Callable[..., Any]) -> None:
+        df = make_df({"A": [2, None, 3, 1]})
+        transform = SortColumnTransform(
+            type=TransformType.SORT_COLUMN,
+            column_id="A",
+            ascending=False,
+            na_position="first",
+        )
+        assert TestNativeHandlers.apply(df, transform) == {
+            "A": [None, 3, 2, 1]
+        }
+
+    @staticmethod
+    def test_handle_filter_rows(make_df: Callable[..., Any]) -> None:
+        df = make_df({"A": [1, 2, 3, None], "B": ["x", "xy", "y", "z"]})
+        keep = FilterRowsTransform(
+            type=TransformType.FILTER_ROWS,
+            operation="keep_rows",
+            where=[
+                Condition(column_id="A", operator=">=", value=2),
+                Condition(column_id="B", operator="contains", value="y"),
+            ],
+        )
+        assert TestNativeHandlers.apply(df, keep) == {
+            "A": [2, 3],
+            "B": ["xy", "y"],
+        }
+
+        # Rows with missing values are kept when removing rows
+        remove = FilterRowsTransform(
+            type=TransformType.FILTER_ROWS,
+            operation="remove_rows",
+            where=[Condition(column_id="A", operator="in", value=[1, 2])],
+        )
+        assert TestNativeHandlers.apply(df, remove) == {
+            "A": [3, None],
+            "B": ["y", "z"],
+        }
+
+        unknown = FilterRowsTransform(
+            type=TransformType.FILTER_ROWS,
+            operation="keep_rows",
+            where=[Condition(column_id="C", operator="is_nan")],
+        )
+        with pytest.raises(KeyError):
+            TestNativeHandlers.apply(df, unknown)
+
+    @staticmethod
+    def test_handle_group_by(make_df: Callable[..., Any]) -> None:
+        df = make_df(
+            {
+                "A": ["foo", "foo", "bar", None],
+                "B": [1, 2, 3, 4],
+                "C": list("abcd"),
+            }
+        )
+        transform = GroupByTransform(
+            type=TransformType.GROUP_BY,
+            column_ids=["A"],
+            drop_na=True,
+            aggregation="sum",
+        )
+        assert TestNativeHandlers.apply(df, transform) == {
+            "A": ["bar", "foo"],
+            "B": [3, 3],
+        }
+
+        transform = GroupByTransform(
+            type=TransformType.GROUP_BY,
+            column_ids=["A"],
+            drop_na=False,
+            aggregation="count",
+        )
+        assert TestNativeHandlers.apply(df, transform) == {
+            "A": ["bar", "foo", None],
+            "B": [1, 2, 1],
+            "C": [1, 2, 1],
+        }
+
+    @staticmethod
+    def test_handle_aggregate(make_df: Callable[..., Any]) -> None:
+        df = make_df({"A": [1, 2, 3], "B": [4, 5, 6]})
+        transform = AggregateTransform(
+            type=TransformType.AGGREGATE,
+            column_ids=["A", "B"],
+            aggregations=["min", "max"],
+        )
+        assert TestNativeHandlers.apply(df, transform) == {
+            "A_min": [1],
+            "A_max": [3],
+            "B_min": [4],
+            "B_max": [6],
+        }
+
+    @staticmethod
+    def test_shuffle_and_sample_rows(make_df: Callable[..., Any]) -> None:
+        df = make_df({"A": [1, 2, 3]})
+        shuffled = TestNativeHandlers.apply(
+            df, ShuffleRowsTransform(type=TransformType.SHUFFLE_ROWS, seed=42)
+        )
+        assert sorted(shuffled["A"]) == [1, 2, 3]
+        sampled = TestNativeHandlers.apply(
+            df,
+            SampleRowsTransform(
+                type=TransformType.SAMPLE_ROWS, n=2, seed=42, replace=False
+            ),
+        )
+        assert len(sampled["A"]) == 2
+
+    @staticmethod
+    def test_transforms_container(make_df: Callable[..., Any]) -> None:
+        df = make_df({"A": [1, 2, 3, 4, 5], "B": [5, 4, 3, 2, 1]})
+        container = TransformsContainer(df)
+        sort_transform = SortColumnTransform(
+            type=TransformType.SORT_COLUMN,
+            column_id="B",
+            ascending=True,
+            na_position="last",
+        )
+        filter_transform = FilterRowsTransform(
+            type=TransformType.FILTER_ROWS,
+            operation="keep_rows",
+            where=[Condition(column_id="A", operator=">=", value=2)],
+        )
+        result = container.apply(Transformations([sort_transform]))
+        assert _to_dict(result)["A"] == [5, 4, 3, 2, 1]
+        result = container.apply(
+            Transformations([sort_transform, filter_transform])
+        )
+        assert _to_dict(result)["A"] == [5, 4, 3, 2]
+
+
+@pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
+class TestTransformsContainerCache:
+    @staticmethod
+    def filter_transform(value: int) -> FilterRowsTransform:
+        return FilterRowsTransform(
+            type=TransformType.FILTER_ROWS,
+            operation="remove_rows",
+            where=[Condition(column_id="A", operator="==", value=value)],
+        )
+
+    @staticmethod
+    def container(**kwargs: Any) -> Tuple[TransformsContainer, List[Any]]:
+        applied: List[Any] = []
+
+        class CountingHandler(PandasTransformHandler):
+            @classmethod
+            def handle(cls, df: Any, transform: Transform) -> Any:
+                applied.append(transform)
+                return super().handle(df, transform)
+
+        df = pd.DataFrame({"A": list(range(10))})
+        return TransformsContainer(df, CountingHandler(), **kwargs), applied
+
+    @staticmethod
+    def test_edit_early_transform() -> None:
+        container, applied = TestTransformsContainerCache.container()
+        first, second, third = (
+            TestTransformsContainerCache.filter_transform(value)
+            for value in (1, 2, 3)
+        )
+        # Transforms are added one at a time
+        container.apply(Transformations([first]))
+        container.apply(Transformations([first, second]))
+        container.apply(Transformations([first, second, third]))
+        assert applied == [first, second, third]
+
+        # Undoing the last transform doesn't re-apply anything
+        applied.clear()
+        result = container.apply(Transformations([first, second]))
+        assert applied == []
+        assert result["A"].tolist() == [0, 3, 4, 5, 6, 7, 8, 9]
+
+        # Editing the second transform only re-applies the later ones
+        edited = TestTransformsContainerCache.filter_transform(4)
+        result = container.apply(Transformations([first, edited, third]))
+        assert applied == [edited, third]
+        assert result["A"].tolist() == [0, 2, 5, 6, 7, 8, 9]
+
+    @staticmethod
+    def test_eviction() -> None:
+        container, applied = TestTransformsContainerCache.container(
+            max_entries=2
+        )
+        transforms = [
+            TestTransformsContainerCache.filter_transform(value)
+            for value in range(3)
+        ]
+        for end in range(1, 4):
+            container.apply(Transformations(transforms[:end]))
+        # The result of the first transform was evicted
+        assert len(container._snapshots) == 2
+        applied.clear()
+        container.apply(Transformations(transforms[:1]))
+        assert applied == transforms[:1]
+
+        # Results larger than the memory bound aren't cached
+        container, applied = TestTransformsContainerCache.container(
+            max_bytes=1
+        )
+        container.apply(Transformations(transforms[:1]))
+        assert len(container._snapshots) == 0
+        assert container._snapshots_size == 0
+
+
+def test_optimize_transforms() -> None:
+    sort = SortColumnTransform(
+        type=TransformType.SORT_COLUMN,
+        column_id="A",
+        ascending=True,
+        na_position="last",
+    )
+    filter_rows = FilterRowsTransform(
+        type=TransformType.FILTER_ROWS,
+        operation="keep_rows",
+        where=[Condition(column_id="B", operator=">=", value=2)],
+    )
+    select = SelectColumnsTransform(
+        type=TransformType.SELECT_COLUMNS, column_ids=["A"]
+    )
+    rename = RenameColumnTransform(
+        type=TransformType.RENAME_COLUMN, column_id="A", new_column_id="C"
+    )
+    # Filters and selections move before sorts
+    assert optimize_transforms([sort, filter_rows, select]) == [
+        filter_rows,
+        select,
+        sort,
+    ]
+    # but not past other transforms
+    assert optimize_transforms([rename, sort, filter_rows]) == [
+        rename,
+        filter_rows,
+        sort,
+    ]
+    assert optimize_transforms([sort, rename, filter_rows]) == [
+        sort,
+        rename,
+        filter_rows,
+    ]
+    # Selections that drop the sorted column stay after the sort
+    select_b = SelectColumnsTransform(
+        type=TransformType.SELECT_COLUMNS, column_ids=["B"]
+    )
+    assert optimize_transforms([sort, select_b]) == [sort, select_b]
+
+
+@pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
+def test_optimized_transforms_give_same_result() -> None:
+    df = pd.DataFrame({"A": [2, 1, 2, 1, 2, 1], "B": [1, 2, 3, 4, 5, 6]})
+    sort = SortColumnTransform(
+        type=TransformType.SORT_COLUMN,
+        column_id="A",
+        ascending=True,
+        na_position="last",
+    )
+    filter_rows = FilterRowsTransform(
+        type=TransformType.FILTER_ROWS,
+        operation="remove_rows",
+        where=[Condition(column_id="B", operator="==", value=4)],
+    )
+    result = apply_transforms(df, Transformations([sort, filter_rows]))
+    # Ties keep their original order
+    assert result["B"].tolist() == [2, 6, 1, 3, 5]
+
+
+@pytest.mark.skipif(
+    not HAS_NATIVE_DEPS or not DependencyManager.has_pandas(),
+    reason="optional dependencies not installed",
+)
+@pytest.mark.parametrize("make_df", [_pandas, _polars, _pyarrow])
+@pytest.mark.parametrize(
+    ("operator", "expected_rows"), [("is_nan", 2), ("is_not_nan", 1)]
+)
+def test_filter_missing_values(
+    make_df: Callable[..., Any],
+    operator: Literal["is_nan", "is_not_nan"],
+    expected_rows: int,
+) -> None:
+    # NaN and None are both missing, whatever the dataframe library
+    df = make_df({"A": [1.0, float("nan"), None]})
+    transform = FilterRowsTransform(
+        type=TransformType.FILTER_ROWS,
+        operation="keep_rows",
+        where=[Condition(column_id="A", operator=operator)],
+    )
+    result = apply_transforms(df, Transformations([transform]))
+    assert len(result) == expected_rows
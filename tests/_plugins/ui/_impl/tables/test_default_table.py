@@ -43,6 +43,27 @@ class TestDefaultTable(unittest.TestCase):
         ]
         assert limited_manager.data == expected_data
 
+    def test_slice(self) -> None:
+        sliced_manager = self.manager.slice(1, 5)
+        assert sliced_manager.data == self.data[1:]
+        assert sliced_manager.get_num_rows() == 2
+
+    def test_sort_values(self) -> None:
+        manager = DefaultTableManager(
+            [{"A": 2}, {"A": None}, {"A": 3}, {"A": 1}]
+        )
+        assert manager.sort_values("A", descending=True).data == [
+            {"A": 3},
+            {"A": 2},
+            {"A": 1},
+            {"A": None},
+        ]
+
+    def test_search(self) -> None:
+        assert self.manager.search("B").data == [{"A": 2, "B": "b"}]
+        assert self.manager.search("3").data == [{"A": 3, "B": "c"}]
+        assert self.manager.search("d").data == []
+
 
 class TestColumnarDefaultTable(unittest.TestCase):
     def setUp(self) -> None:
@@ -83,3 +104,20 @@ class TestColumnarDefaultTable(unittest.TestCase):
             "B": ["a"],
         }
         assert limited_manager.data == expected_data
+
+    def test_get_num_rows(self) -> None:
+        assert self.manager.get_num_rows() == 3
+
+    def test_sort_values(self) -> None:
+        sorted_manager = self.manager.sort_values("B", descending=True)
+        assert sorted_manager.data == {"A": [3, 2, 1], "B": ["c", "b", "a"]}
+
+    def test_search(self) -> None:
+        assert self.manager.search("b").data == {"A": [2], "B": ["b"]}
+
+
+class TestSingleColumnDefaultTable(unittest.TestCase):
+    def test_sort_and_search(self) -> None:
+        manager = DefaultTableManager([3, 1, 2])
+        assert manager.sort_values("value", descending=False).data == [1, 2, 3]
+        assert manager.search("2").data == [2]
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import unittest
+from unittest.mock import patch
 
 import pytest
 
@@ -8,9 +9,18 @@ from marimo._dependencies.dependencies import DependencyManager
 from marimo._plugins.ui._impl.tables.pandas_table import (
     PandasTableManagerFactory,
 )
+from marimo._plugins.ui._impl.tables.table_manager import (
+    ColumnSummary,
+    Histogram,
+    ValueCounts,
+)
 
 HAS_DEPS = DependencyManager.has_pandas()
 
+# Outside of a kernel, virtual files are data URLs
+ARROW_DATA_URL = "data:application/vnd.apache.arrow.stream;base64,"
+CSV_DATA_URL = "data:text/csv;base64,"
+
 
 @pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
 class TestPandasTableManager(unittest.TestCase):
@@ -216,3 +226,162 @@ class TestPandasTableManager(unittest.TestCase):
         limited_manager = self.manager.limit(limit)
         expected_data = self.data.head(limit)
         pd.testing.assert_frame_equal(limited_manager.data, expected_data)
+
+    def test_slice(self) -> None:
+        import pandas as pd
+
+        sliced_manager = self.manager.slice(1, 5)
+        pd.testing.assert_frame_equal(sliced_manager.data, self.data.iloc[1:])
+        assert sliced_manager.get_num_rows() == 2
+
+    def test_sort_values(self) -> None:
+        import pandas as pd
+
+        data = pd.DataFrame({"A": [2, None, 3, 1]})
+        manager = self.factory.create()(data)
+        assert manager.sort_values("A", descending=False).data["A"].tolist()[
+            :3
+        ] == [1, 2, 3]
+        sorted_data = manager.sort_values("A", descending=True).data["A"]
+        assert sorted_data.tolist()[:3] == [3, 2, 1]
+        assert pd.isna(sorted_data.iloc[3])
+
+    def test_sort_values_by_non_string_column_label(self) -> None:
+        import pandas as pd
+
+        # The frontend sends column names as strings
+        data = pd.DataFrame([[2, "b"], [1, "a"]])
+        manager = self.factory.create()(data)
+        assert manager.sort_values("0", descending=False).data[0].tolist() == [
+            1,
+            2,
+        ]
+        with pytest.raises(KeyError):
+            manager.sort_values("2", descending=False)
+
+    def test_sort_values_mixed_types(self) -> None:
+        import pandas as pd
+
+        data = pd.DataFrame({"A": [2, "b", None, "a", 1]}, dtype=object)
+        manager = self.factory.create()(data)
+        # Values of mixed types are sorted as strings, with missing values
+        # last
+        sorted_data = manager.sort_values("A", descending=False).data["A"]
+        assert sorted_data.tolist()[:4] == [1, 2, "a", "b"]
+        assert pd.isna(sorted_data.iloc[4])
+        sorted_data = manager.sort_values("A", descending=True).data["A"]
+        assert sorted_data.tolist()[:4] == ["b", "a", 2, 1]
+        assert pd.isna(sorted_data.iloc[4])
+
+    def test_search(self) -> None:
+        import pandas as pd
+
+        data = pd.DataFrame(
+            {"A": [1, 12, None], "B": ["x", "Y", "z"], "C": ["y", "", None]}
+        )
+        manager = self.factory.create()(data)
+        assert manager.search("y").data.index.tolist() == [0, 1]
+        assert manager.search("1").data.index.tolist() == [0, 1]
+        assert manager.search("nan").data.index.tolist() == []
+
+    def test_to_arrow_ipc(self) -> None:
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(self.manager.to_arrow_ipc()).read_all()
+        assert table.to_pydict() == {"A": [1, 2, 3], "B": ["a", "b", "c"]}
+
+    def test_to_data_arrow(self) -> None:
+        import pandas as pd
+
+        assert str(self.manager.to_data("arrow")).startswith(ARROW_DATA_URL)
+        assert str(self.manager.to_data()).startswith(CSV_DATA_URL)
+        # Columns of mixed types can't be sent as Arrow
+        mixed = self.factory.create()(pd.DataFrame({"A": [1, "a"]}))
+        assert str(mixed.to_data("arrow")).startswith(CSV_DATA_URL)
+
+    def test_get_summary(self) -> None:
+        import pandas as pd
+
+        data = pd.DataFrame(
+            {
+                "A": [1, 2, None, 11, 11],
+                "B": ["x", "y", "x", None, "x"],
+                "C": pd.to_datetime(["2024-01-02", None, "2024-01-01"] * 2)[
+                    :5
+                ],
+            }
+        )
+        manager = self.factory.create()(data)
+        assert manager.get_summary("A") == ColumnSummary(
+            total=5,
+            nulls=1,
+            unique=3,
+            min=1.0,
+            max=11.0,
+            mean=6.25,
+            histogram=Histogram(
+                edges=[float(i) for i in range(1, 12)],
+                counts=[1, 1, 0, 0, 0, 0, 0, 0, 0, 2],
+            ),
+        )
+        assert manager.get_summary("B") == ColumnSummary(
+            total=5, nulls=1, unique=2, top_values=[("x", 3), ("y", 1)]
+        )
+        assert manager.get_summary("C") == ColumnSummary(
+            total=5,
+            nulls=2,
+            unique=2,
+            min="2024-01-01T00:00:00",
+            max="2024-01-02T00:00:00",
+        )
+
+    def test_get_summary_unhashable(self) -> None:
+        import pandas as pd
+
+        data = pd.DataFrame({"A": [[1], [2], None]})
+        manager = self.factory.create()(data)
+        # Lists can't be counted, but the column is still summarized
+        summary = manager.get_summary("A")
+        assert (summary.total, summary.nulls) == (3, 1)
+        assert summary.unique is None
+
+    def test_get_summary_sampled(self) -> None:
+        import pandas as pd
+
+        data = pd.DataFrame({"A": list(range(1000)) + [None] * 10})
+        manager = self.factory.create()(data)
+        with patch(
+            "marimo._plugins.ui._impl.tables.pandas_table.SUMMARY_SAMPLE_SIZE",
+            100,
+        ):
+            summary = manager.get_summary("A")
+        assert summary.sampled
+        assert summary.total == 1010
+        assert summary.nulls == 10
+        # Computed on the sample
+        assert summary.unique == 100
+        assert summary.histogram is not None
+        assert sum(summary.histogram.counts) == 100
+        # Computed on all rows
+        assert (summary.min, summary.max) == (0.0, 999.0)
+
+    def test_get_value_counts(self) -> None:
+        import pandas as pd
+
+        data = pd.DataFrame(
+            {"A": ["ab", "b", "ab", None, "Ac"] * 100, "B": list(range(500))}
+        )
+        manager = self.factory.create()(data)
+        assert manager.get_value_counts("A", 2) == ValueCounts(
+            values=[("ab", 200), ("b", 100)], unique=4
+        )
+        # Missing values are counted as None
+        assert (None, 100) in manager.get_value_counts("A", 5).values
+        assert manager.get_value_counts("A", 5, prefix="A") == ValueCounts(
+            values=[("ab", 200), ("Ac", 100)], unique=2
+        )
+        sampled = manager.get_value_counts("B", 1, sample_size=100)
+        assert sampled.sampled
+        assert sampled.unique == 100
+        # Counts are scaled to all rows
+        assert sampled.values[0][1] == 5
@@ -8,9 +8,17 @@ from marimo._dependencies.dependencies import DependencyManager
 from marimo._plugins.ui._impl.tables.pyarrow_table import (
     PyArrowTableManagerFactory,
 )
+from marimo._plugins.ui._impl.tables.table_manager import (
+    ColumnSummary,
+    Histogram,
+    ValueCounts,
+)
 
 HAS_DEPS = DependencyManager.has_pyarrow()
 
+# Outside of a kernel, virtual files are data URLs
+ARROW_DATA_URL = "data:application/vnd.apache.arrow.stream;base64,"
+
 
 @pytest.mark.skipif(not HAS_DEPS, reason="optional dependencies not installed")
 class TestPyArrowTableManagerFactory(unittest.TestCase):
@@ -82,3 +90,96 @@ class TestPyArrowTableManagerFactory(unittest.TestCase):
         limited_manager = self.manager.limit(1)
         expected_data = self.data.take([0])
         assert limited_manager.data == expected_data
+
+    def test_slice(self) -> None:
+        sliced_manager = self.manager.slice(1, 5)
+        assert sliced_manager.data == self.data.slice(1)
+        assert sliced_manager.get_num_rows() == 2
+
+    def test_sort_values(self) -> None:
+        import pyarrow as pa
+
+        data = pa.table({"A": [2, None, 3, 1]})
+        manager = self.factory.create()(data)
+        assert manager.sort_values("A", descending=False).data[
+            "A"
+        ].to_pylist() == [1, 2, 3, None]
+        assert manager.sort_values("A", descending=True).data[
+            "A"
+        ].to_pylist() == [3, 2, 1, None]
+
+    def test_search(self) -> None:
+        import pyarrow as pa
+
+        data = pa.table(
+            {
+                "A": [1, 12, None],
+                "B": ["x", "Y", "z"],
+                "C": [[1], [2], [3]],
+            }
+        )
+        manager = self.factory.create()(data)
+        assert manager.search("y").data["B"].to_pylist() == ["Y"]
+        assert manager.search("1").data["A"].to_pylist() == [1, 12]
+        assert manager.search("null").get_num_rows() == 0
+
+    def test_to_arrow_ipc(self) -> None:
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(self.manager.to_arrow_ipc()).read_all()
+        assert table == self.data
+        assert str(self.manager.to_data("arrow")).startswith(ARROW_DATA_URL)
+
+    def test_get_summary(self) -> None:
+        import datetime
+
+        import pyarrow as pa
+
+        data = pa.table(
+            {
+                "A": [1, 2, None, 11, 11],
+                "B": ["x", "y", "x", None, "x"],
+                "C": [datetime.date(2024, 1, 2), None] * 2
+                + [datetime.date(2024, 1, 1)],
+            }
+        )
+        manager = self.factory.create()(data)
+        assert manager.get_summary("A") == ColumnSummary(
+            total=5,
+            nulls=1,
+            unique=3,
+            min=1,
+            max=11,
+            mean=6.25,
+            histogram=Histogram(
+                edges=[float(i) for i in range(1, 12)],
+                counts=[1, 1, 0, 0, 0, 0, 0, 0, 0, 2],
+            ),
+        )
+        assert manager.get_summary("B") == ColumnSummary(
+            total=5, nulls=1, unique=2, top_values=[("x", 3), ("y", 1)]
+        )
+        assert manager.get_summary("C") == ColumnSummary(
+            total=5, nulls=2, unique=2, min="2024-01-01", max="2024-01-02"
+        )
+
+    def test_get_value_counts(self) -> None:
+        import pyarrow as pa
+
+        data = pa.table(
+            {"A": ["ab", "b", "ab", None, "Ac"] * 100, "B": list(range(500))}
+        )
+        manager = self.factory.create()(data)
+        assert manager.get_value_counts("A", 2) == ValueCounts(
+            values=[("ab", 200), ("b", 100)], unique=4
+        )
+        # Missing values are counted as None
+        assert (None, 100) in manager.get_value_counts("A", 5).values
+        assert manager.get_value_counts("A", 5, prefix="A") == ValueCounts(
+            values=[("ab", 200), ("Ac", 100)], unique=2
+        )
+        sampled = manager.get_value_counts("B", 1, sample_size=100)
+        assert sampled.sampled
+        assert sampled.unique == 100
+        # Counts are scaled to all rows
+        assert sampled.values[0][1] == 5
@@ -7,6 +7,7 @@ from marimo._dependencies.dependencies import DependencyManager
 from marimo._plugins.ui._impl.altair_chart import (
     ChartSelection,
     _filter_dataframe,
+    _SelectionIndex,
 )
 from marimo._runtime.runtime import Kernel
 from tests.conftest import ExecReqProvider
@@ -107,6 +108,63 @@ class TestAltairChart:
         assert first == "value1"
         assert second == "value2"
 
+    @staticmethod
+    def test_selection_index() -> None:
+        import numpy as np
+
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame(
+            {
+                "x": rng.normal(size=1_000),
+                "y": rng.integers(0, 10, size=1_000),
+                "date": pd.date_range("2020-01-01", periods=1_000, freq="h"),
+            }
+        )
+        df.loc[::7, "x"] = np.nan
+        index = _SelectionIndex(df)
+
+        # Interval selections are answered from the sorted values
+        for low, high in [(-1, 1), (0.5, 0.5), (-10, 10), (3, 4)]:
+            result = index.filter({"select_interval": {"x": [low, high]}})
+            expected = df[(df["x"] >= low) & (df["x"] <= high)]
+            assert result.index.tolist() == expected.index.tolist()
+        # and the sorted values are reused
+        assert list(index._sorted) == ["x"]
+
+        # Intervals on dates are given in milliseconds since epoch
+        start = pd.Timestamp("2020-01-02").value // 10**6
+        stop = pd.Timestamp("2020-01-03").value // 10**6
+        result = index.filter({"select_interval": {"date": [start, stop]}})
+        assert len(result) == 25
+
+        # Points and intervals combine
+        result = index.filter(
+            {
+                "select_interval": {"x": [-1, 1]},
+                "select_point": {"vlPoint": [1], "y": [3, 4]},
+            }
+        )
+        expected = df[(df["x"] >= -1) & (df["x"] <= 1) & df["y"].isin([3, 4])]
+        assert result.index.tolist() == expected.index.tolist()
+
+    @staticmethod
+    def test_selection_index_is_cached() -> None:
+        import altair as alt
+
+        from marimo._plugins.ui._impl.altair_chart import altair_chart
+
+        df = pd.DataFrame({"x": [1, 2, 3, 4], "y": [4, 3, 2, 1]})
+        chart = altair_chart(
+            alt.Chart(df).mark_point().encode(x="x", y="y"),
+            server_side=True,
+        )
+        first = chart._convert_value({"select_interval": {"x": [1, 2]}})
+        index = chart._selection_index
+        second = chart._convert_value({"select_interval": {"x": [2, 4]}})
+        assert chart._selection_index is index
+        assert first["y"].tolist() == [4, 3]
+        assert second["y"].tolist() == [3, 2, 1]
+
     @staticmethod
     async def test_altair_settings_when_set(
         k: Kernel, exec_req: ExecReqProvider
@@ -137,3 +195,48 @@ class TestAltairChart:
         assert k.globals["initial_options"] == {}
         assert k.globals["options_1"] == {"max_rows": None}
         assert k.globals["options_2"] == {"max_rows": None}
+
+    @staticmethod
+    def test_server_side_selection() -> None:
+        import altair as alt
+
+        from marimo._plugins.ui._impl.altair_chart import altair_chart
+
+        df = pd.DataFrame(
+            {"group": [1, 1, 2, 2, 2], "value": [1.0, 3.0, 2.0, 4.0, 6.0]}
+        )
+        chart = altair_chart(
+            alt.Chart(df).mark_bar().encode(x="group:N", y="sum(value)"),
+            server_side=True,
+        )
+        # Only the aggregated rows are sent
+        assert chart._component_args["spec"]["data"]["url"].startswith(
+            "data:text/csv"
+        )
+        assert chart._component_args["spec"]["encoding"]["y"]["field"] == (
+            "sum_value"
+        )
+        # Selecting a bar selects the rows of its group
+        value = chart._convert_value(
+            {"select_point": {"group": [2], "sum_value": [12.0]}}
+        )
+        assert value["value"].tolist() == [2.0, 4.0, 6.0]
+
+    @staticmethod
+    def test_server_side_histogram_selection() -> None:
+        import altair as alt
+
+        from marimo._plugins.ui._impl.altair_chart import altair_chart
+
+        df = pd.DataFrame({"x": [0.5, 1.5, 2.5, 8.5, 9.5]})
+        chart = altair_chart(
+            alt.Chart(df)
+            .mark_bar()
+            .encode(x=alt.X("x", bin=alt.Bin(maxbins=5)), y="count()"),
+            server_side=True,
+        )
+        # Selections are made on the bins, but the selected rows only have
+        # the chart's columns
+        value = chart._convert_value({"select_interval": {"bin_x": [0, 1]}})
+        assert list(value.columns) == ["x"]
+        assert value["x"].tolist() == [0.5, 1.5]
@@ -90,3 +90,66 @@ def test_normalize_data(executing_kernel: Kernel) -> None:
         str(e.value) == "data must be a sequence of JSON-serializable types, "
         "or a sequence of dicts."
     )
+
+
+def test_large_table_is_paged(executing_kernel: Kernel) -> None:
+    del executing_kernel
+    import marimo as mo
+    from marimo._plugins.ui._impl.table import SearchTableArgs, SortArgs
+
+    data = [{"a": i, "b": str(i % 7)} for i in range(20_000)]
+    table = mo.ui.table(data)
+    assert table._component_args["lazy"] is True
+    assert table._component_args["has-more"] is False
+    assert table._component_args["total-rows"] == 20_000
+    assert len(table._component_args["data"]) == 10
+
+    response = table.search(
+        SearchTableArgs(
+            page_size=5,
+            page_number=1,
+            query="6",
+            sort=SortArgs(by="a", descending=True),
+        )
+    )
+    rows = [row for row in data if "6" in str(row["a"]) + row["b"]]
+    assert response.total_rows == len(rows)
+    rows.sort(key=lambda row: row["a"], reverse=True)
+    assert response.data == rows[5:10]
+
+    # Rows are selected within the search
+    assert table._convert_value(["0", "5"]) == [rows[0], rows[5]]
+
+
+def test_small_table_is_not_paged(executing_kernel: Kernel) -> None:
+    del executing_kernel
+    import marimo as mo
+
+    table = mo.ui.table({"a": list(range(100))}, pagination=True)
+    assert table._component_args["lazy"] is False
+    assert table._component_args["total-rows"] == 100
+    assert len(table._component_args["data"]) == 100
+
+
+def test_column_summaries(executing_kernel: Kernel) -> None:
+    del executing_kernel
+    import marimo as mo
+    from marimo._plugins.ui._impl.table import (
+        ColumnNotFound,
+        GetColumnSummariesArgs,
+    )
+
+    table = mo.ui.table({"a": [1, 2, 3], "b": ["x", "y", "x"]})
+    response = table.get_column_summaries(
+        GetColumnSummariesArgs(columns=["a", "b"])
+    )
+    assert response.summaries["a"].min == 1
+    assert response.summaries["a"].max == 3
+    assert response.summaries["b"].top_values == [("x", 2), ("y", 1)]
+
+    # Summaries are computed once
+    cached = table.get_column_summaries(GetColumnSummariesArgs(columns=["a"]))
+    assert cached.summaries["a"] is response.summaries["a"]
+
+    with pytest.raises(ColumnNotFound):
+        table.get_column_summaries(GetColumnSummariesArgs(columns=["c"]))
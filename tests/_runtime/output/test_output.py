@@ -1,6 +1,8 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+from marimo._plugins.stateless.flex import vstack
+from marimo._server.session.session_view import SessionView
 from tests.conftest import ExecReqProvider, MockedKernel
 
 
@@ -58,10 +60,43 @@ async def test_mutating_appended_outputs(
         ]
     )
     outputs: list[str] = []
+    appended: list[str] = []
     for msg in mocked_kernel.stream.messages:
         if msg[0] == "cell-op" and msg[1]["output"] is not None:
             outputs.append(msg[1]["output"]["data"])
-    assert len(outputs) == 2
+        if msg[0] == "cell-op" and msg[1]["output_append"] is not None:
+            appended.append(msg[1]["output_append"]["data"])
+    # only the first output is sent in full; the next item is appended
+    assert len(outputs) == 1
     assert "before" in outputs[0]
-    assert "before" in outputs[1]
-    assert "after" in outputs[1]
+    assert len(appended) == 1
+    assert "after" in appended[0]
+    assert "before" not in appended[0]
+
+
+async def test_appended_outputs_are_sent_incrementally(
+    mocked_kernel: MockedKernel, exec_req: ExecReqProvider
+) -> None:
+    er = exec_req.get(
+        """
+        import marimo as mo
+
+        for i in range(3):
+            mo.output.append(f"item-{i}")
+        mo.output.replace("replaced")
+        mo.output.append("last")
+        """
+    )
+    await mocked_kernel.k.run([er])
+    session_view = SessionView()
+    full_outputs = 0
+    for op, data in mocked_kernel.stream.messages:
+        if op == "cell-op":
+            session_view.add_raw_operation(data)
+            if data["output"] is not None:
+                full_outputs += 1
+    # first append, replace, and first append after a replace
+    assert full_outputs == 3
+
+    (output,) = session_view.get_cell_outputs([er.cell_id]).values()
+    assert output.data == vstack(["replaced", "last"]).text
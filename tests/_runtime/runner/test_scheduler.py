@@ -0,0 +1,65 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+from marimo._runtime.layout.layout import LayoutConfig
+from marimo._runtime.runner.scheduler import CellScheduler
+
+
+def _grid(*positions: list[int] | None) -> LayoutConfig:
+    return LayoutConfig(
+        type="grid",
+        data={
+            "columns": 12,
+            "rowHeight": 20,
+            "cells": [{"position": position} for position in positions],
+        },
+    )
+
+
+def test_no_priorities() -> None:
+    scheduler = CellScheduler()
+    key = scheduler.priority()
+    assert key("0") == key("1")
+
+
+def test_focus_first() -> None:
+    scheduler = CellScheduler()
+    key = scheduler.priority(focus={"1"})
+    assert key("1") < key("0")
+
+
+def test_layout_reading_order() -> None:
+    scheduler = CellScheduler()
+    scheduler.set_layout(
+        _grid([0, 10, 12, 4], None, [6, 0, 6, 4], [0, 0, 6, 4]),
+        ["a", "b", "c", "d"],
+    )
+    key = scheduler.priority()
+    assert sorted(["a", "b", "c", "d", "e"], key=key) == [
+        "d",
+        "c",
+        "a",
+        # hidden or not in the layout
+        "b",
+        "e",
+    ]
+
+    # Only grid layouts are used
+    scheduler.set_layout(LayoutConfig(type="slides", data={}), ["a"])
+    key = scheduler.priority()
+    assert key("a") == key("d")
+
+
+def test_fastest_first() -> None:
+    scheduler = CellScheduler()
+    scheduler.record_run_time("slow", 2.0)
+    scheduler.record_run_time("fast", 0.1)
+    key = scheduler.priority()
+    assert key("fast") < key("slow")
+    # Layout takes precedence over run time
+    scheduler.set_layout(_grid([0, 0, 1, 1], None), ["slow", "fast"])
+    key = scheduler.priority()
+    assert key("slow") < key("fast")
+
+    scheduler.forget("slow")
+    assert "slow" not in scheduler.run_times
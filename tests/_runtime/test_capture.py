@@ -11,12 +11,12 @@ def _has_output(
     messages: list[Tuple[str, Dict[Any, Any]]], pattern: str
 ) -> bool:
     for op, data in messages:
-        if (
-            op == "cell-op"
-            and data["output"] is not None
-            and re.match(pattern, data["output"]["data"])
-        ):
-            return True
+        if op != "cell-op":
+            continue
+        # Items appended to an output are sent on their own
+        for key in ("output", "output_append"):
+            if data[key] is not None and re.match(pattern, data[key]["data"]):
+                return True
     return False
 
 
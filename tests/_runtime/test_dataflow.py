@@ -220,3 +220,28 @@ def test_register_with_stale_ancestor() -> None:
     third_cell = parse_cell(code)
     graph.register_cell("3", third_cell)
     assert graph.get_stale() == set(["0", "1"])
+
+
+def test_topological_sort_with_key() -> None:
+    graph = dataflow.DirectedGraph()
+    graph.register_cell("0", parse_cell("x = 0"))
+    graph.register_cell("1", parse_cell("y = x"))
+    graph.register_cell("2", parse_cell("z = 0"))
+    graph.register_cell("3", parse_cell("w = z"))
+    cell_ids = ["0", "1", "2", "3"]
+
+    assert dataflow.topological_sort(graph, cell_ids) == ["0", "2", "1", "3"]
+
+    # Ready cells are picked by key, but never before their parents
+    priority = {"0": 1, "1": 0, "2": 2, "3": 0}
+    assert dataflow.topological_sort(
+        graph, cell_ids, key=priority.__getitem__
+    ) == ["0", "1", "2", "3"]
+
+    # Ties keep the order without a key
+    assert dataflow.topological_sort(graph, cell_ids, key=lambda _: 0) == [
+        "0",
+        "2",
+        "1",
+        "3",
+    ]
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import sys
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING, Any, Sequence
 
 import pytest
 
@@ -16,16 +16,20 @@ from marimo._messaging.errors import (
 from marimo._messaging.types import NoopStream
 from marimo._plugins.ui._core.ids import IDProvider
 from marimo._runtime.dataflow import EdgeWithVar
+from marimo._runtime.layout.layout import LayoutConfig
 from marimo._runtime.requests import (
     AppMetadata,
     CreationRequest,
     DeleteRequest,
+    ExecuteVisibleRequest,
+    ExecutionPlanRequest,
     ExecutionRequest,
+    PreviewVariableValuesRequest,
     SetCellConfigRequest,
     SetUIElementValueRequest,
 )
 from marimo._runtime.runtime import Kernel
-from tests.conftest import ExecReqProvider
+from tests.conftest import ExecReqProvider, MockedKernel
 
 if TYPE_CHECKING:
     import pathlib
@@ -293,6 +297,75 @@ class TestExecution:
         )
         assert k.globals["s"].value == 2
 
+    async def test_creation_runs_visible_cells_first(
+        self, any_kernel: Kernel
+    ) -> None:
+        k = any_kernel
+        await k.instantiate(
+            CreationRequest(
+                execution_requests=(
+                    ExecutionRequest(cell_id="0", code="order = []"),
+                    ExecutionRequest(cell_id="1", code="order.append(1)"),
+                    ExecutionRequest(cell_id="2", code="order.append(2)"),
+                    ExecutionRequest(cell_id="3", code="order.append(3)"),
+                ),
+                set_ui_element_value_request=SetUIElementValueRequest([]),
+                layout=LayoutConfig(
+                    type="grid",
+                    data={
+                        "cells": [
+                            {"position": None},
+                            {"position": None},
+                            {"position": [0, 4, 12, 4]},
+                            {"position": [0, 0, 12, 4]},
+                        ]
+                    },
+                ),
+            )
+        )
+        # Visible cells run first, top to bottom, after their ancestors
+        assert k.globals["order"] == [3, 2, 1]
+
+    async def test_creation_defers_offscreen_cells(
+        self, any_kernel: Kernel
+    ) -> None:
+        k = any_kernel
+        await k.instantiate(
+            CreationRequest(
+                execution_requests=(
+                    ExecutionRequest(cell_id="0", code="x = 1"),
+                    ExecutionRequest(cell_id="1", code="y = x + 1"),
+                    ExecutionRequest(cell_id="2", code="z = y + 1"),
+                    ExecutionRequest(cell_id="3", code="w = 0"),
+                ),
+                set_ui_element_value_request=SetUIElementValueRequest([]),
+                defer_offscreen_cells=True,
+            )
+        )
+        assert not {"x", "y", "z", "w"} & set(k.globals)
+        assert all(cell.stale for cell in k.graph.cells.values())
+
+        # A visible cell runs along with the cells it needs
+        await k.execute_visible(ExecuteVisibleRequest(cell_ids=["1"]))
+        assert k.globals["y"] == 2
+        assert "z" not in k.globals
+        assert "w" not in k.globals
+        assert not k.graph.cells["0"].stale
+        assert not k.graph.cells["1"].stale
+        assert k.graph.cells["2"].stale
+
+        # Offscreen descendants of visible cells stay deferred
+        await k.run([ExecutionRequest(cell_id="0", code="x = 2")])
+        if not k.lazy():
+            assert k.globals["y"] == 3
+        assert "z" not in k.globals
+        assert k.graph.cells["2"].stale
+
+        await k.execute_visible(ExecuteVisibleRequest(cell_ids=["2", "3"]))
+        assert k.globals["z"] == 4
+        assert k.globals["w"] == 0
+        assert not any(cell.stale for cell in k.graph.cells.values())
+
     # Test errors in marimo semantics
     async def test_kernel_simultaneous_multiple_definition_error(
         self,
@@ -1274,3 +1347,139 @@ class TestAsyncIO:
         )
         assert not k.errors
         assert k.globals["res"] == "done"
+
+
+async def test_variable_values_previewed_on_request(
+    mocked_kernel: MockedKernel, exec_req: ExecReqProvider
+) -> None:
+    k = mocked_kernel.k
+    stream = mocked_kernel.stream
+
+    def variable_values() -> list[dict[str, Any]]:
+        return [
+            v
+            for op, data in stream.messages
+            if op == "variable-values"
+            for v in data["variables"]
+        ]
+
+    er = exec_req.get("x = [1, 2, 3]")
+    await k.run([er])
+    # Only the datatype is sent after a run
+    assert variable_values() == [
+        {"name": "x", "datatype": "list", "value": None}
+    ]
+
+    stream.messages.clear()
+    await k.handle_message(PreviewVariableValuesRequest(names=["x", "y"]))
+    assert variable_values() == [
+        {"name": "x", "datatype": "list", "value": "[1, 2, 3]"}
+    ]
+    preview = k.variable_previews["x"]
+
+    # Previews are cached ...
+    await k.handle_message(PreviewVariableValuesRequest(names=["x"]))
+    assert k.variable_previews["x"] is preview
+
+    # ... until the defining cell runs again
+    await k.run([exec_req.get_with_id(er.cell_id, "x = [4, 5, 6]")])
+    assert "x" not in k.variable_previews
+    stream.messages.clear()
+    await k.handle_message(PreviewVariableValuesRequest(names=["x"]))
+    assert variable_values() == [
+        {"name": "x", "datatype": "list", "value": "[4, 5, 6]"}
+    ]
+
+
+async def test_plan_execution(mocked_kernel: MockedKernel) -> None:
+    k = mocked_kernel.k
+    stream = mocked_kernel.stream
+
+    def plan() -> dict[str, Any]:
+        (plan,) = [
+            data for op, data in stream.messages if op == "execution-plan"
+        ]
+        return plan
+
+    await k.run(
+        [
+            ExecutionRequest(cell_id="0", code="import marimo as mo"),
+            ExecutionRequest(cell_id="1", code="s = mo.ui.slider(0, 10)"),
+            ExecutionRequest(cell_id="2", code="x = s.value + 1"),
+            ExecutionRequest(cell_id="3", code="y = x + 1"),
+            ExecutionRequest(cell_id="4", code="z = 0"),
+        ]
+    )
+    k.scheduler.run_times["3"] = 2.0
+
+    # Editing a cell plans its new descendants, without running anything
+    stream.messages.clear()
+    await k.handle_message(
+        ExecutionPlanRequest(
+            plan_id="edit",
+            execution_requests=[
+                ExecutionRequest(cell_id="4", code="z = y + 1")
+            ],
+        )
+    )
+    assert plan()["plan_id"] == "edit"
+    assert [cell["cell_id"] for cell in plan()["cells"]] == ["4"]
+    assert k.graph.cells["4"].code == "z = 0"
+    assert k.globals["z"] == 0
+    assert not [op for op, _ in stream.messages if op == "cell-op"]
+
+    stream.messages.clear()
+    await k.handle_message(
+        ExecutionPlanRequest(
+            plan_id="edit",
+            execution_requests=[
+                ExecutionRequest(cell_id="2", code="x = s.value + 2")
+            ],
+        )
+    )
+    assert [cell["cell_id"] for cell in plan()["cells"]] == ["2", "3"]
+    assert plan()["cells"][1]["estimated_duration"] == 2.0
+    assert plan()["estimated_duration"] >= 2.0
+
+    # Setting a UI element's value plans the cells that refer to it
+    stream.messages.clear()
+    await k.handle_message(
+        ExecutionPlanRequest(plan_id="ui", ui_element_ids=[k.globals["s"]._id])
+    )
+    assert [cell["cell_id"] for cell in plan()["cells"]] == ["2", "3"]
+    assert plan()["deferred"] == []
+
+    # Expensive cells aren't autorun
+    k.auto_lazy_threshold = 1.0
+    stream.messages.clear()
+    await k.handle_message(
+        ExecutionPlanRequest(plan_id="ui", ui_element_ids=[k.globals["s"]._id])
+    )
+    assert [cell["cell_id"] for cell in plan()["cells"]] == ["2"]
+    assert plan()["deferred"] == ["3"]
+
+
+async def test_auto_lazy_threshold(mocked_kernel: MockedKernel) -> None:
+    k = mocked_kernel.k
+    k.auto_lazy_threshold = 1.0
+    await k.run(
+        [
+            ExecutionRequest(cell_id="0", code="x = 1"),
+            ExecutionRequest(cell_id="1", code="y = x + 1"),
+            ExecutionRequest(cell_id="2", code="z = y + 1"),
+        ]
+    )
+    assert k.globals["z"] == 3
+    k.scheduler.run_times["1"] = 2.0
+
+    # The expensive cell and its descendants are marked stale instead of
+    # being run
+    await k.run([ExecutionRequest(cell_id="0", code="x = 2")])
+    assert k.globals["y"] == 2
+    assert k.graph.cells["1"].stale
+    assert k.graph.cells["2"].stale
+
+    # ... until they're run explicitly
+    await k.run_stale_cells()
+    assert k.globals["z"] == 4
+    assert not k.graph.get_stale()
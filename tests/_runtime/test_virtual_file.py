@@ -1,11 +1,28 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import os
+from typing import TYPE_CHECKING, Optional
+from unittest.mock import patch
+
+import pytest
+
+from marimo._runtime import virtual_file
 from marimo._runtime.context import get_context
 from marimo._runtime.requests import DeleteRequest
 from marimo._runtime.runtime import Kernel
+from marimo._runtime.virtual_file import (
+    VirtualFile,
+    VirtualFileRegistry,
+    random_filename,
+    read_virtual_file,
+)
+from marimo._server.api.status import HTTPException
 from tests.conftest import ExecReqProvider
 
+if TYPE_CHECKING:
+    import pathlib
+
 
 async def test_virtual_file_creation(
     k: Kernel, exec_req: ExecReqProvider
@@ -265,3 +282,124 @@ async def test_virtual_files_not_supported(
     ctx = get_context()
     assert len(ctx.virtual_file_registry.registry) == 0
     ctx.virtual_files_supported = True
+
+
+def test_registry_spills_to_disk(k: Kernel, tmp_path: pathlib.Path) -> None:
+    del k
+    ctx = get_context()
+    with patch.dict(
+        os.environ, {virtual_file.VIRTUAL_FILE_SPILL_DIR_ENV: str(tmp_path)}
+    ):
+        registry = VirtualFileRegistry(max_memory=25)
+        files = [
+            VirtualFile(random_filename("txt"), bytes([i]) * 10)
+            for i in range(3)
+        ]
+        try:
+            registry.add(files[0], ctx)
+            registry.add(files[1], ctx)
+            registry.reference(files[0].filename)
+            assert registry.stats.memory_bytes == 20
+            assert registry.stats.spills == 0
+
+            # Over budget: the unreferenced file is spilled first
+            registry.add(files[2], ctx)
+            assert registry.registry[files[1].filename].shm is None
+            assert registry.registry[files[0].filename].shm is not None
+            assert registry.stats.memory_bytes == 20
+            assert registry.stats.memory_files == 2
+            assert registry.stats.spilled_bytes == 10
+            assert registry.stats.spilled_files == 1
+            assert registry.stats.spills == 1
+            assert os.listdir(tmp_path) == [files[1].filename]
+
+            # Spilled files are read transparently, and keep their refcount
+            for file in files:
+                assert read_virtual_file(file.filename, 10) == file.buffer
+            registry.reference(files[1].filename)
+            assert registry.refcount(files[1].filename) == 1
+
+            # Files too large for the budget are written to disk directly
+            large = VirtualFile(random_filename("txt"), b"x" * 30)
+            registry.add(large, ctx)
+            assert read_virtual_file(large.filename, 30) == large.buffer
+            assert registry.stats.memory_bytes == 20
+            assert registry.stats.spilled_files == 2
+
+            # Removing a spilled file deletes it from disk
+            registry.remove(files[1])
+            registry.remove(large)
+            assert os.listdir(tmp_path) == []
+            assert registry.stats.spilled_bytes == 0
+            with pytest.raises(HTTPException):
+                read_virtual_file(files[1].filename, 10)
+        finally:
+            registry.shutdown()
+        assert registry.stats.memory_bytes == 0
+        assert registry.stats.memory_files == 0
+
+
+@pytest.mark.parametrize("spill_dir", [None, "missing"])
+def test_registry_keeps_files_in_memory_if_spill_fails(
+    k: Kernel, tmp_path: pathlib.Path, spill_dir: Optional[str]
+) -> None:
+    del k
+    ctx = get_context()
+    env_var = virtual_file.VIRTUAL_FILE_SPILL_DIR_ENV
+    with patch.dict(os.environ):
+        if spill_dir is None:
+            os.environ.pop(env_var, None)
+        else:
+            # The directory doesn't exist, so writes to it fail
+            os.environ[env_var] = str(tmp_path / spill_dir)
+        registry = VirtualFileRegistry(max_memory=15)
+        files = [
+            VirtualFile(random_filename("txt"), bytes([i]) * 10)
+            for i in range(2)
+        ]
+        large = VirtualFile(random_filename("txt"), b"x" * 30)
+        try:
+            for file in [*files, large]:
+                registry.add(file, ctx)
+            # Over budget, but nothing could be written to disk
+            assert all(
+                item.shm is not None for item in registry.registry.values()
+            )
+            assert registry.stats.memory_bytes == 50
+            assert registry.stats.spills == 0
+            assert read_virtual_file(large.filename, 30) == large.buffer
+        finally:
+            registry.shutdown()
+
+
+def test_read_virtual_file_stays_in_spill_dir(tmp_path: pathlib.Path) -> None:
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    (tmp_path / "secret.txt").write_bytes(b"secret")
+    with patch.dict(
+        os.environ, {virtual_file.VIRTUAL_FILE_SPILL_DIR_ENV: str(spill_dir)}
+    ):
+        with pytest.raises(HTTPException):
+            read_virtual_file("../secret.txt", 6)
+
+
+async def test_virtual_file_usage_broadcast(
+    k: Kernel, exec_req: ExecReqProvider
+) -> None:
+    await k.run(
+        [
+            exec_req.get(
+                """
+                import io
+                import marimo as mo
+                pdf_plugin = mo.pdf(io.BytesIO(b"hello world"))
+                """
+            ),
+        ]
+    )
+    # the usage is broadcast after each request that changes it
+    k.broadcast_virtual_file_usage()
+    usage = k.virtual_file_usage
+    assert usage is not None
+    assert usage.memory_files == 1
+    assert usage.memory_bytes == len(b"hello world")
@@ -78,6 +78,20 @@ def test_install_missing_packages(client: TestClient) -> None:
     assert "success" in response.json()
 
 
+@with_session(SESSION_ID)
+def test_preview_variable_values(client: TestClient) -> None:
+    response = client.post(
+        "/api/kernel/preview_variable_values",
+        headers=HEADERS,
+        json={
+            "names": ["x"],
+        },
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/json"
+    assert "success" in response.json()
+
+
 @with_session(SESSION_ID)
 def test_set_cell_config(client: TestClient) -> None:
     response = client.post(
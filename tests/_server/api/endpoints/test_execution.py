@@ -104,6 +104,24 @@ class TestExecutionRoutes_EditMode:
         assert response.headers["content-type"] == "application/json"
         assert "success" in response.json()
 
+    @staticmethod
+    @with_session(SESSION_ID)
+    def test_plan_execution(client: TestClient) -> None:
+        response = client.post(
+            "/api/kernel/plan_execution",
+            headers=HEADERS,
+            json={
+                "plan_id": "plan-1",
+                "execution_requests": [
+                    {"cell_id": "cell-1", "code": "x = 1"},
+                ],
+                "ui_element_ids": ["ui-element-1"],
+            },
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"] == "application/json"
+        assert "success" in response.json()
+
 
 class TestExecutionRoutes_RunMode:
     @staticmethod
@@ -153,12 +171,34 @@ class TestExecutionRoutes_RunMode:
         assert response.headers["content-type"] == "application/json"
         assert "success" in response.json()
 
+    @staticmethod
+    @with_read_session(SESSION_ID)
+    def test_run_visible(client: TestClient) -> None:
+        response = client.post(
+            "/api/kernel/run_visible",
+            headers=HEADERS,
+            json={"cell_ids": ["cell-1", "cell-2"]},
+        )
+        assert response.status_code == 200, response.text
+        assert response.headers["content-type"] == "application/json"
+        assert "success" in response.json()
+
     @staticmethod
     @with_read_session(SESSION_ID)
     def test_interrupt(client: TestClient) -> None:
         response = client.post("/api/kernel/interrupt", headers=HEADERS)
         assert response.status_code == 401, response.text
 
+    @staticmethod
+    @with_read_session(SESSION_ID)
+    def test_plan_execution(client: TestClient) -> None:
+        response = client.post(
+            "/api/kernel/plan_execution",
+            headers=HEADERS,
+            json={"plan_id": "plan-1", "ui_element_ids": ["ui-element-1"]},
+        )
+        assert response.status_code == 401, response.text
+
     @staticmethod
     @with_read_session(SESSION_ID)
     def test_restart_session(client: TestClient) -> None:
@@ -33,6 +33,9 @@ def test_status(client: TestClient) -> None:
     assert content["sessions"] == 0
     assert content["version"] == __version__
     assert content["lsp_running"] is False
+    assert content["message_queues"] == {}
+    assert content["ui_value_coalescers"] == {}
+    assert content["virtual_files"] == {}
 
 
 def test_version(client: TestClient) -> None:
@@ -1,13 +1,19 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import asyncio
+import json
+import zlib
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
+from unittest.mock import patch
 
 import pytest
 from starlette.websockets import WebSocketDisconnect
 
-from marimo._messaging.ops import KernelReady
+from marimo._messaging.ops import Alert, CellOp, KernelReady
+from marimo._messaging.serde import serialize_kernel_message
+from marimo._server.api.endpoints import ws
 from marimo._server.model import SessionMode
 from marimo._server.sessions import SessionManager
 from marimo._utils.parse_dataclass import parse_raw
@@ -81,6 +87,29 @@ def test_without_session(client: TestClient) -> None:
     client.post("/api/kernel/shutdown", headers=HEADERS)
 
 
+def test_ws_compresses_large_messages(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(ws, "FRAME_COMPRESSION_THRESHOLD", 1)
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = json.loads(zlib.decompress(websocket.receive_bytes()))
+        assert_kernel_ready_response(data)
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
+def test_ws_no_compression_with_permessage_deflate(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(ws, "FRAME_COMPRESSION_THRESHOLD", 1)
+    with client.websocket_connect(
+        "/ws?session_id=123",
+        headers={"Sec-WebSocket-Extensions": "permessage-deflate"},
+    ) as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
 def test_disconnect_and_reconnect(client: TestClient) -> None:
     with client.websocket_connect("/ws?session_id=123") as websocket:
         data = websocket.receive_json()
@@ -95,6 +124,60 @@ def test_disconnect_and_reconnect(client: TestClient) -> None:
     client.post("/api/kernel/shutdown", headers=HEADERS)
 
 
+def test_reconnect_sends_missed_messages(client: TestClient) -> None:
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+
+    # Sent while the frontend was disconnected
+    session = get_session_manager(client).get_session("123")
+    assert session is not None
+    last_seq = session.replay_log.last_seq
+    session.replay_log.append(
+        ("variables", serialize_kernel_message("variables", {}))
+    )
+
+    with client.websocket_connect(
+        f"/ws?session_id=123&last_seq={last_seq}"
+    ) as websocket:
+        data = websocket.receive_json()
+        assert data == {"op": "reconnected", "data": {}}
+        data = websocket.receive_json()
+        assert data == {"op": "variables", "data": {}, "seq": last_seq + 1}
+        data = websocket.receive_json()
+        assert data["op"] == "alert"
+
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
+def test_reconnect_replays_state_if_messages_not_logged(
+    client: TestClient,
+) -> None:
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+
+    session = get_session_manager(client).get_session("123")
+    assert session is not None
+    session.session_view.add_operation(CellOp(cell_id="Hbol", status="idle"))
+
+    # The frontend reports a message the log doesn't have
+    last_seq = session.replay_log.last_seq + 1
+    with client.websocket_connect(
+        f"/ws?session_id=123&last_seq={last_seq}"
+    ) as websocket:
+        data = websocket.receive_json()
+        assert data == {"op": "reconnected", "data": {}}
+        # The current state of the session is replayed instead
+        operations = session.get_current_state().operations
+        replayed = [websocket.receive_json() for _ in operations]
+        assert [op["op"] for op in replayed] == [op.name for op in operations]
+        data = websocket.receive_json()
+        assert data["op"] == "alert"
+
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
 def test_disconnect_then_reconnect_then_refresh(client: TestClient) -> None:
     with client.websocket_connect("/ws?session_id=123") as websocket:
         data = websocket.receive_json()
@@ -116,6 +199,230 @@ def test_disconnect_then_reconnect_then_refresh(client: TestClient) -> None:
     client.post("/api/kernel/shutdown", headers=HEADERS)
 
 
+def test_ws_resync_on_queue_overflow(client: TestClient) -> None:
+    session_manager = get_session_manager(client)
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+        session = session_manager.get_session("123")
+        assert session is not None
+        consumer = session.session_consumer
+        assert isinstance(consumer, ws.WebsocketHandler)
+
+        # Messages that can't be dropped overflow the consumer's queue, so
+        # the websocket is closed for the frontend to reconnect
+        consumer.message_queue.capacity = 0
+        asyncio.run(session.write_operation(Alert(title="hi", description="")))
+        with pytest.raises(WebSocketDisconnect) as e:
+            websocket.receive_json()
+        assert e.value.code == ws.WebSocketCodes.TRY_AGAIN_LATER
+        assert e.value.reason == "MARIMO_RESYNC"
+
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
+def test_shared_session_viewers(client: TestClient) -> None:
+    session_manager = get_session_manager(client)
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+
+        session = session_manager.get_session("123")
+        assert session is not None
+
+        session_manager.mode = SessionMode.RUN
+        session_manager.shared_session = True
+        with client.websocket_connect("/ws?session_id=456") as viewer:
+            data = viewer.receive_json()
+            assert_kernel_ready_response(
+                data, create_response({"resumed": True})
+            )
+            # The current state of the session is replayed
+            for op in session.get_current_state().operations:
+                assert viewer.receive_json()["op"] == op.name
+            # Viewers don't get a session of their own
+            assert session_manager.get_session("456") is None
+            assert session_manager.viewers == {"456": "123"}
+
+            # Viewers are read-only
+            response = client.post(
+                "/api/kernel/set_ui_element_value",
+                headers={"Marimo-Session-Id": "456", **HEADERS},
+                json={"object_ids": [], "values": []},
+            )
+            assert response.status_code == 403
+
+            # Viewers are sent the session's messages
+            asyncio.run(
+                session.write_operation(Alert(title="hi", description=""))
+            )
+            assert websocket.receive_json()["op"] == "alert"
+            assert viewer.receive_json()["op"] == "alert"
+
+    session_manager.shared_session = False
+    session_manager.mode = SessionMode.EDIT
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
+def test_shared_session_viewers_read_only_requests(
+    client: TestClient,
+) -> None:
+    session_manager = get_session_manager(client)
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+
+        session_manager.mode = SessionMode.RUN
+        session_manager.shared_session = True
+        with client.websocket_connect("/ws?session_id=456") as viewer:
+            data = viewer.receive_json()
+            assert data["op"] == "kernel-ready"
+
+            # Requests that don't change the app's state are routed to the
+            # shared session
+            response = client.post(
+                "/api/kernel/run_visible",
+                headers={"Marimo-Session-Id": "456", **HEADERS},
+                json={"cell_ids": ["Hbol"]},
+            )
+            assert response.status_code == 200, response.text
+
+    session_manager.shared_session = False
+    session_manager.mode = SessionMode.EDIT
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
+def test_shared_session_viewers_cant_call_functions(
+    client: TestClient,
+) -> None:
+    session_manager = get_session_manager(client)
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+        session = session_manager.get_session("123")
+        assert session is not None
+
+        session_manager.mode = SessionMode.RUN
+        session_manager.shared_session = True
+        with client.websocket_connect("/ws?session_id=456") as viewer:
+            data = viewer.receive_json()
+            assert data["op"] == "kernel-ready"
+            # so that the page disables its UI elements
+            assert data["data"]["viewer"] is True
+
+            def search(session_id: str, query: str) -> int:
+                return client.post(
+                    "/api/kernel/function_call",
+                    headers={"Marimo-Session-Id": session_id, **HEADERS},
+                    json={
+                        "function_call_id": f"call-{session_id}",
+                        "namespace": "table-1",
+                        "function_name": "search",
+                        "args": {
+                            "query": query,
+                            "page_size": 10,
+                            "page_number": 0,
+                        },
+                    },
+                ).status_code
+
+            # A table's search is kept by the table, and the owner's
+            # selection is resolved against it; so only the owner can
+            # search
+            with patch.object(session, "put_control_request") as put:
+                assert search("123", "owner") == 200
+                assert search("456", "viewer") == 403
+            assert [
+                call.args[0].args["query"] for call in put.call_args_list
+            ] == ["owner"]
+
+    session_manager.shared_session = False
+    session_manager.mode = SessionMode.EDIT
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
+def test_shared_session_owner_refresh(client: TestClient) -> None:
+    session_manager = get_session_manager(client)
+    session_manager.mode = SessionMode.RUN
+    session_manager.shared_session = True
+
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+    session = session_manager.get_session("123")
+    assert session is not None
+    assert session.session_consumer is None
+
+    # Until the owner's grace period runs out, other clients are viewers
+    with client.websocket_connect("/ws?session_id=000") as viewer:
+        data = viewer.receive_json()
+        assert data["data"]["viewer"] is True
+        assert session_manager.get_session("123") is session
+        assert session_manager.viewers == {"000": "123"}
+        assert session.session_consumer is None
+
+    # The owner refreshes their page, getting a new session id; they send
+    # their previous id, and take over the session instead of becoming a
+    # viewer of it
+    with client.websocket_connect(
+        "/ws?session_id=456&previous_session_id=123"
+    ) as websocket:
+        data = websocket.receive_json()
+        assert data == {"op": "reconnected", "data": {}}
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data, create_response({"resumed": True}))
+
+        assert session_manager.get_session("456") is session
+        assert session_manager.get_session("123") is None
+        assert session_manager.viewers == {}
+        assert session.session_consumer is not None
+
+        # The new owner isn't read-only
+        response = client.post(
+            "/api/kernel/set_ui_element_value",
+            headers={"Marimo-Session-Id": "456", **HEADERS},
+            json={"object_ids": [], "values": []},
+        )
+        assert response.status_code == 200, response.text
+
+        # Other clients are viewers of the live session
+        with client.websocket_connect("/ws?session_id=789") as viewer:
+            data = viewer.receive_json()
+            assert data["op"] == "kernel-ready"
+            assert session_manager.viewers == {"789": "456"}
+
+    session_manager.shared_session = False
+    session_manager.mode = SessionMode.EDIT
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
+def test_shared_session_owner_grace_period(client: TestClient) -> None:
+    session_manager = get_session_manager(client)
+    session_manager.mode = SessionMode.RUN
+    session_manager.shared_session = True
+
+    with client.websocket_connect("/ws?session_id=123") as websocket:
+        data = websocket.receive_json()
+        assert_kernel_ready_response(data)
+    session = session_manager.get_session("123")
+    assert session is not None
+
+    # Once the owner's grace period has run out, the next client to
+    # connect becomes the owner
+    with patch.object(SessionManager, "OWNER_GRACE_SECONDS", 0):
+        with client.websocket_connect("/ws?session_id=456") as websocket:
+            data = websocket.receive_json()
+            assert data == {"op": "reconnected", "data": {}}
+            data = websocket.receive_json()
+            assert data["data"].get("viewer", False) is False
+            assert session_manager.get_session("456") is session
+            assert session.session_consumer is not None
+
+    session_manager.shared_session = False
+    session_manager.mode = SessionMode.EDIT
+    client.post("/api/kernel/shutdown", headers=HEADERS)
+
+
 def test_fails_on_multiple_connections_with_other_sessions(
     client: TestClient,
 ) -> None:
@@ -0,0 +1,28 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import os
+import pathlib
+from unittest.mock import patch
+
+from starlette.applications import Starlette
+
+from marimo._runtime.virtual_file import VIRTUAL_FILE_SPILL_DIR_ENV
+from marimo._server.api import lifespans
+
+
+async def test_virtual_files_lifespan() -> None:
+    with patch.dict(os.environ):
+        os.environ.pop(VIRTUAL_FILE_SPILL_DIR_ENV, None)
+        async with lifespans.virtual_files(Starlette()):
+            spill_dir = os.environ[VIRTUAL_FILE_SPILL_DIR_ENV]
+            # A private directory, owned by the server
+            assert os.path.isdir(spill_dir)
+            if os.name != "nt":
+                assert os.stat(spill_dir).st_mode & 0o777 == 0o700
+            leftover = pathlib.Path(spill_dir) / "leftover.txt"
+            leftover.write_text("left behind by a kernel")
+
+        # Removed on shutdown, along with its files
+        assert not os.path.exists(spill_dir)
+        assert VIRTUAL_FILE_SPILL_DIR_ENV not in os.environ
@@ -0,0 +1,234 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from marimo._messaging.cell_output import CellOutput
+from marimo._messaging.ops import (
+    Alert,
+    CellOp,
+    CompletedRun,
+    Op,
+    serialize,
+)
+from marimo._messaging.serde import (
+    deserialize_kernel_message,
+    serialize_kernel_message,
+    with_sequence_number,
+)
+from marimo._messaging.types import KernelMessage
+from marimo._server.session.message_queue import (
+    ConsumerMessageQueue,
+    QueueOverflow,
+    merge_cell_ops,
+    supersedes,
+)
+
+
+def _message(op: Op) -> KernelMessage:
+    return (op.name, serialize_kernel_message(op.name, serialize(op)))
+
+
+def _output(data: str) -> CellOutput:
+    return CellOutput.stdout(data)
+
+
+async def test_queue_below_capacity_keeps_all_messages() -> None:
+    queue = ConsumerMessageQueue(capacity=10)
+    for i in range(5):
+        queue.put_nowait(_message(CellOp(cell_id="1", output=_output(str(i)))))
+
+    assert queue.qsize() == 5
+    assert queue.stats.coalesced == 0
+
+
+async def test_queue_coalesces_superseded_outputs() -> None:
+    queue = ConsumerMessageQueue(capacity=2)
+    queue.put_nowait(_message(CellOp(cell_id="1", status="running")))
+    for i in range(10):
+        queue.put_nowait(_message(CellOp(cell_id="2", output=_output(str(i)))))
+
+    assert queue.qsize() == 2
+    assert queue.stats.enqueued == 11
+    assert queue.stats.coalesced == 9
+    assert queue.stats.dropped == 0
+
+    first = deserialize_kernel_message((await queue.get())[1])
+    assert first["cell_id"] == "1"
+    last = deserialize_kernel_message((await queue.get())[1])
+    assert last["cell_id"] == "2"
+    assert last["output"]["data"] == "9"
+
+
+async def test_queue_merges_console_outputs() -> None:
+    queue = ConsumerMessageQueue(capacity=2)
+    queue.put_nowait(_message(CompletedRun()))
+    queue.put_nowait(
+        _message(CellOp(cell_id="1", console=[], status="running"))
+    )
+    for i in range(3):
+        queue.put_nowait(
+            _message(CellOp(cell_id="1", console=CellOutput.stdout(str(i))))
+        )
+
+    assert queue.qsize() == 2
+    assert queue.stats.coalesced == 3
+    assert queue.stats.dropped == 0
+
+    await queue.get()
+    merged = deserialize_kernel_message((await queue.get())[1])
+    # The status transition is kept, with all of the console outputs
+    assert merged["status"] == "running"
+    assert [output["data"] for output in merged["console"]] == ["0", "1", "2"]
+
+
+async def test_queue_drops_unmergeable_console_outputs() -> None:
+    queue = ConsumerMessageQueue(capacity=2)
+    queue.put_nowait(_message(CellOp(cell_id="1", status="queued")))
+    queue.put_nowait(
+        _message(CellOp(cell_id="2", console=CellOutput.stdout("a")))
+    )
+    # The oldest console output is dropped first
+    queue.put_nowait(_message(CellOp(cell_id="1", status="running")))
+    # Then console outputs that can't be merged
+    queue.put_nowait(
+        _message(CellOp(cell_id="3", console=CellOutput.stdout("b")))
+    )
+
+    assert queue.qsize() == 2
+    assert queue.stats.dropped == 2
+    assert queue.stats.max_size == 2
+
+    queued = deserialize_kernel_message((await queue.get())[1])
+    assert queued["status"] == "queued"
+    running = deserialize_kernel_message((await queue.get())[1])
+    assert running["status"] == "running"
+    # The consumer is told about the dropped outputs once it caught up
+    op, payload = await queue.get()
+    assert op == Alert.name
+    assert (
+        "2 console outputs"
+        in (deserialize_kernel_message(payload)["description"])
+    )
+    assert queue.qsize() == 0
+
+
+async def test_queue_merges_in_place() -> None:
+    queue = ConsumerMessageQueue(capacity=2)
+    queue.put_nowait(
+        (
+            CellOp.name,
+            with_sequence_number(
+                _message(CellOp(cell_id="1", output=_output("a")))[1], 1
+            ),
+        )
+    )
+    queue.put_nowait(_message(CellOp(cell_id="2", status="queued")))
+    queue.put_nowait(
+        (
+            CellOp.name,
+            with_sequence_number(
+                _message(CellOp(cell_id="1", output=_output("b")))[1], 3
+            ),
+        )
+    )
+
+    assert queue.stats.coalesced == 1
+    # The merged operation keeps its place, and its sequence number
+    op, payload = await queue.get()
+    frame = json.loads(payload)
+    assert frame["data"]["output"]["data"] == "b"
+    assert frame["seq"] == 1
+    second = deserialize_kernel_message((await queue.get())[1])
+    assert second["cell_id"] == "2"
+
+
+async def test_queue_overflows_on_other_messages() -> None:
+    queue = ConsumerMessageQueue(capacity=2)
+    messages = [
+        _message(CompletedRun()),
+        _message(CellOp(cell_id="1", status="queued")),
+        _message(CellOp(cell_id="1", status="running")),
+    ]
+    for message in messages:
+        queue.put_nowait(message)
+
+    # Messages that can't be dropped don't fit, so the consumer is asked
+    # to resync
+    assert queue.qsize() == 0
+    assert queue.stats.overflows == 1
+    with pytest.raises(QueueOverflow):
+        await queue.get()
+
+    # Later messages are ignored; the consumer resyncs from the replay log
+    queue.put_nowait(_message(CompletedRun()))
+    assert queue.qsize() == 0
+    assert queue.stats.enqueued == 3
+
+
+def test_supersedes() -> None:
+    output = {"channel": "output", "mimetype": "text/plain", "data": ""}
+    # Same status, output replaced
+    assert supersedes(
+        {"cell_id": "1", "output": output, "status": "running"},
+        {"cell_id": "1", "output": output, "status": "running"},
+    )
+    # Status transitions are kept
+    assert not supersedes(
+        {"cell_id": "1", "status": "queued"},
+        {"cell_id": "1", "status": "running"},
+    )
+    # Output is kept if the next operation doesn't replace it
+    assert not supersedes(
+        {"cell_id": "1", "output": output},
+        {"cell_id": "1", "stale_inputs": True},
+    )
+    # Appended outputs accumulate, unless a full output replaces them
+    assert not supersedes(
+        {"cell_id": "1", "output_append": output},
+        {"cell_id": "1", "output_append": output},
+    )
+    assert supersedes(
+        {"cell_id": "1", "output_append": output},
+        {"cell_id": "1", "output": output},
+    )
+
+
+def test_merge_cell_ops() -> None:
+    stdout = {"channel": "stdout", "mimetype": "text/plain", "data": "a"}
+    stderr = {"channel": "stderr", "mimetype": "text/plain", "data": "b"}
+    running = {"cell_id": "1", "status": "running", "timestamp": 0}
+
+    # Console outputs are added to the previous operation
+    assert merge_cell_ops(
+        {**running, "console": []},
+        {"cell_id": "1", "console": stdout, "timestamp": 1},
+    ) == {**running, "console": [stdout], "timestamp": 1}
+    # Text streamed to the same channel is appended as one output
+    assert merge_cell_ops(
+        {"cell_id": "1", "console": stdout, "timestamp": 0},
+        {"cell_id": "1", "console": stdout, "timestamp": 1},
+    ) == {"cell_id": "1", "console": {**stdout, "data": "aa"}, "timestamp": 1}
+    # Outputs to different channels can't be one output
+    assert (
+        merge_cell_ops(
+            {"cell_id": "1", "console": stdout, "timestamp": 0},
+            {"cell_id": "1", "console": stderr, "timestamp": 1},
+        )
+        is None
+    )
+    # A list of outputs replaces the console
+    assert merge_cell_ops(
+        {**running, "console": stdout},
+        {**running, "console": [stderr], "timestamp": 1},
+    ) == {**running, "console": [stderr], "timestamp": 1}
+    # Status transitions are kept
+    assert (
+        merge_cell_ops(
+            {"cell_id": "1", "status": "queued", "timestamp": 0},
+            {**running, "console": stdout},
+        )
+        is None
+    )
@@ -0,0 +1,62 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+import json
+
+from marimo._messaging.serde import BATCH_OP, serialize_kernel_message
+from marimo._messaging.types import KernelMessage
+from marimo._server.session.replay_log import ReplayLog
+
+
+def _message(op: str) -> KernelMessage:
+    return (op, serialize_kernel_message(op, {}))
+
+
+def test_append_stamps_sequence_numbers() -> None:
+    log = ReplayLog()
+    op, frame = log.append(_message("variables"))
+    assert op == "variables"
+    assert json.loads(frame) == {"op": "variables", "data": {}, "seq": 1}
+
+    _, frame = log.append(_message("cell-op"))
+    assert json.loads(frame)["seq"] == 2
+    assert log.last_seq == 2
+
+
+def test_append_encodes_batches() -> None:
+    log = ReplayLog()
+    op, frame = log.append((BATCH_OP, [_message("a"), _message("b")]))
+    assert op == BATCH_OP
+    assert json.loads(frame) == {
+        "op": BATCH_OP,
+        "data": {
+            "messages": [{"op": "a", "data": {}}, {"op": "b", "data": {}}]
+        },
+        "seq": 1,
+    }
+
+
+def test_since() -> None:
+    log = ReplayLog()
+    frames = [log.append(_message(str(i))) for i in range(3)]
+    assert log.since(0) == frames
+    assert log.since(2) == frames[2:]
+    assert log.since(3) == []
+    # Not sent in this session
+    assert log.since(4) is None
+    assert log.since(-1) is None
+
+
+def test_since_evicted() -> None:
+    frame_size = len(ReplayLog().append(_message("op"))[1])
+    log = ReplayLog(max_size=2 * frame_size)
+    frames = [log.append(_message("op")) for _ in range(3)]
+    assert log.since(1) == frames[1:]
+    # The first message was evicted
+    assert log.since(0) is None
+
+    # Messages larger than the log are not kept
+    log = ReplayLog(max_size=frame_size - 1)
+    log.append(_message("op"))
+    assert log.since(0) is None
+    assert log.since(1) == []
@@ -8,12 +8,16 @@ from marimo._ast.cell import CellId_t, CellStatusType
 from marimo._messaging.cell_output import CellChannel, CellOutput
 from marimo._messaging.ops import (
     CellOp,
+    CompletedRun,
+    Interrupted,
     VariableDeclaration,
     Variables,
     VariableValue,
     VariableValues,
+    VirtualFileUsage,
     serialize,
 )
+from marimo._messaging.serde import BATCH_OP, serialize_kernel_message
 from marimo._runtime.requests import (
     CreationRequest,
     ExecuteMultipleRequest,
@@ -246,6 +250,84 @@ def test_add_cell_op() -> None:
     assert session_view.cell_operations[cell_id].status == initial_status
 
 
+def test_add_kernel_message() -> None:
+    session_view = SessionView()
+    op = CellOp(cell_id=cell_id, output=initial_output, status="running")
+    session_view.add_kernel_message(
+        (op.name, serialize_kernel_message(op.name, serialize(op)))
+    )
+
+    assert session_view.cell_operations[cell_id].output == initial_output
+    assert session_view.cell_operations[cell_id].status == "running"
+
+    # Untracked operations are not decoded
+    session_view.add_kernel_message((CompletedRun.name, "not json"))
+    assert len(session_view.cell_operations) == 1
+
+
+def test_add_kernel_message_batch() -> None:
+    session_view = SessionView()
+    ops = [
+        CellOp(cell_id=cell_id, status="queued"),
+        CellOp(cell_id=cell_id, output=initial_output, status="idle"),
+        CompletedRun(),
+    ]
+    session_view.add_kernel_message(
+        (
+            BATCH_OP,
+            [
+                (op.name, serialize_kernel_message(op.name, serialize(op)))
+                for op in ops
+            ],
+        )
+    )
+
+    assert session_view.cell_operations[cell_id].output == initial_output
+    assert session_view.cell_operations[cell_id].status == "idle"
+
+
+def test_add_kernel_message_virtual_file_usage() -> None:
+    session_view = SessionView()
+    assert session_view.virtual_file_usage is None
+    op = VirtualFileUsage(
+        memory_bytes=10,
+        memory_files=1,
+        spilled_bytes=20,
+        spilled_files=2,
+        spills=3,
+    )
+    session_view.add_kernel_message(
+        (op.name, serialize_kernel_message(op.name, serialize(op)))
+    )
+    assert session_view.virtual_file_usage == op
+
+
+def test_add_kernel_message_interrupted_resolves_stdin() -> None:
+    session_view = SessionView()
+    session_view.add_operation(
+        CellOp(
+            cell_id=cell_id,
+            console=CellOutput(
+                channel=CellChannel.STDIN,
+                mimetype="text/plain",
+                data="what is your name?",
+            ),
+            status="running",
+        )
+    )
+    session_view.add_kernel_message(
+        (
+            Interrupted.name,
+            serialize_kernel_message(
+                Interrupted.name, serialize(Interrupted())
+            ),
+        )
+    )
+
+    console = session_view.get_cell_console_outputs([cell_id])[cell_id]
+    assert console[0].channel == CellChannel.STDOUT
+
+
 # patch time
 @patch("time.time", return_value=123)
 def test_combine_console_outputs(time_mock: Any) -> None:
@@ -340,6 +422,93 @@ def test_stdin(time_mock: Any) -> None:
     ]
 
 
+@patch("marimo._server.session.session_view.CONSOLE_HISTORY_MAX_OUTPUTS", 4)
+@patch("marimo._server.session.session_view.CONSOLE_HISTORY_MAX_SIZE", 100)
+def test_console_history_truncated() -> None:
+    session_view = SessionView()
+    for i in range(5):
+        session_view.add_operation(
+            CellOp(
+                cell_id=cell_id,
+                console=CellOutput.stdout(f"line {i}"),
+                status="running",
+            )
+        )
+
+    console = session_view.cell_operations[cell_id].console
+    assert isinstance(console, list)
+    assert [output.data for output in console] == [
+        "... 2 earlier console outputs truncated ...\n",
+        "line 2",
+        "line 3",
+        "line 4",
+    ]
+
+    # Dropped outputs accumulate in the marker
+    session_view.add_operation(
+        CellOp(
+            cell_id=cell_id,
+            console=CellOutput.stdout("line 5"),
+            status="running",
+        )
+    )
+    console = session_view.cell_operations[cell_id].console
+    assert isinstance(console, list)
+    assert [output.data for output in console] == [
+        "... 3 earlier console outputs truncated ...\n",
+        "line 3",
+        "line 4",
+        "line 5",
+    ]
+
+    # The count restarts once the console is cleared
+    session_view.add_operation(CellOp(cell_id=cell_id, status="queued"))
+    session_view.add_operation(CellOp(cell_id=cell_id, status="running"))
+    for i in range(5):
+        session_view.add_operation(
+            CellOp(
+                cell_id=cell_id,
+                console=CellOutput.stdout(f"line {i}"),
+                status="running",
+            )
+        )
+    console = session_view.cell_operations[cell_id].console
+    assert isinstance(console, list)
+    assert console[0].data == "... 2 earlier console outputs truncated ...\n"
+
+
+@patch("marimo._server.session.session_view.CONSOLE_HISTORY_MAX_OUTPUTS", 4)
+@patch("marimo._server.session.session_view.CONSOLE_HISTORY_MAX_SIZE", 10)
+def test_console_history_truncated_by_size() -> None:
+    session_view = SessionView()
+    session_view.add_operation(
+        CellOp(
+            cell_id=cell_id,
+            console=CellOutput.stdin("name?"),
+            status="running",
+        )
+    )
+    session_view.add_operation(
+        CellOp(
+            cell_id=cell_id,
+            console=CellOutput.stdout("0123456789abcdef"),
+            status="running",
+        )
+    )
+
+    console = session_view.cell_operations[cell_id].console
+    assert isinstance(console, list)
+    # Pending prompts are kept, and the end of a large output is kept
+    assert [(output.channel, output.data) for output in console] == [
+        (
+            CellChannel.STDOUT,
+            "... 1 earlier console output truncated ...\n",
+        ),
+        (CellChannel.STDIN, "name?"),
+        (CellChannel.STDOUT, "6789abcdef"),
+    ]
+
+
 @patch("time.time", return_value=123)
 def test_get_cell_outputs(time_mock: Any) -> None:
     del time_mock
@@ -0,0 +1,103 @@
+# Copyright 2024 Marimo. All rights reserved.
+from __future__ import annotations
+
+from typing import List
+from unittest.mock import patch
+
+from marimo._runtime.requests import (
+    ControlRequest,
+    ExecuteMultipleRequest,
+    ExecutionRequest,
+    PreviewVariableValuesRequest,
+    SetUIElementValueRequest,
+)
+from marimo._server.session.ui_value_coalescer import UIValueCoalescer
+
+
+def _set_value(ui_id: str, value: int) -> SetUIElementValueRequest:
+    return SetUIElementValueRequest(ids_and_values=[(ui_id, value)])
+
+
+def test_sends_when_idle() -> None:
+    sent: List[ControlRequest] = []
+    coalescer = UIValueCoalescer(sent.append)
+
+    request = _set_value("slider", 1)
+    coalescer.put(request)
+    assert sent == [request]
+
+
+def test_coalesces_while_busy() -> None:
+    sent: List[ControlRequest] = []
+    coalescer = UIValueCoalescer(sent.append)
+
+    coalescer.put(_set_value("slider", 1))
+    for i in range(2, 100):
+        coalescer.put(_set_value("slider", i))
+    coalescer.put(_set_value("text", 0))
+    assert len(sent) == 1
+
+    coalescer.on_completed_run()
+    assert len(sent) == 2
+    merged = sent[1]
+    assert isinstance(merged, SetUIElementValueRequest)
+    assert merged.ids_and_values == [("slider", 99), ("text", 0)]
+    assert coalescer.stats.received == 100
+    assert coalescer.stats.sent == 2
+
+    # Still busy running the merged request
+    coalescer.put(_set_value("slider", 100))
+    assert len(sent) == 2
+    coalescer.on_completed_run()
+    assert len(sent) == 3
+
+    # Idle again
+    coalescer.on_completed_run()
+    coalescer.put(_set_value("slider", 101))
+    assert len(sent) == 4
+
+
+def test_pending_values_sent_before_other_requests() -> None:
+    sent: List[ControlRequest] = []
+    coalescer = UIValueCoalescer(sent.append)
+
+    execute = ExecuteMultipleRequest(
+        execution_requests=[ExecutionRequest(cell_id="0", code="x = 1")]
+    )
+    coalescer.put(execute)
+    coalescer.put(_set_value("slider", 1))
+    coalescer.put(_set_value("slider", 2))
+    assert sent == [execute]
+
+    preview = PreviewVariableValuesRequest(names=["x"])
+    coalescer.put(preview)
+    assert len(sent) == 3
+    assert isinstance(sent[1], SetUIElementValueRequest)
+    assert sent[1].ids_and_values == [("slider", 2)]
+    assert sent[2] is preview
+
+
+def test_stops_waiting_after_timeout() -> None:
+    sent: List[ControlRequest] = []
+    coalescer = UIValueCoalescer(sent.append, timeout=10)
+
+    with patch("time.monotonic", return_value=0):
+        coalescer.put(_set_value("slider", 1))
+        coalescer.put(_set_value("slider", 2))
+    assert len(sent) == 1
+
+    # The kernel never completed its run
+    with patch("time.monotonic", return_value=5):
+        coalescer.check_timeout()
+    assert len(sent) == 1
+    with patch("time.monotonic", return_value=10):
+        coalescer.check_timeout()
+    assert len(sent) == 2
+    assert isinstance(sent[1], SetUIElementValueRequest)
+    assert sent[1].ids_and_values == [("slider", 2)]
+    assert coalescer.stats.timeouts == 1
+
+    # Busy again, running the pending update
+    with patch("time.monotonic", return_value=11):
+        coalescer.put(_set_value("slider", 3))
+    assert len(sent) == 2
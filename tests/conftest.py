@@ -1,12 +1,13 @@
 # Copyright 2024 Marimo. All rights reserved.
 from __future__ import annotations
 
+import contextlib
 import dataclasses
 import inspect
 import sys
 import textwrap
 from tempfile import TemporaryDirectory
-from typing import Any, Generator
+from typing import Any, Generator, Iterator
 
 import pytest
 
@@ -38,6 +39,11 @@ class _MockStream(ThreadSafeStream):
     def write(self, op: str, data: dict[Any, Any]) -> None:
         self.messages.append((op, data))
 
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        # Batched messages are captured individually
+        yield
+
 
 class MockStdout(ThreadSafeStdout):
     """Captures the output sent through the stream"""